@@ -0,0 +1,283 @@
+"""Micro-benchmarks of haintech.pipelines processors.
+
+Measures items per second and memory blocks left allocated per item of each processor
+type, saves results as JSON and compares them with the stored baseline.
+
+    python benchmarks/run.py                      # run and compare with baseline
+    python benchmarks/run.py --quick -k lambda    # fewer items, only matching benchmarks
+    python benchmarks/run.py --update-baseline    # store results as the new baseline
+
+Exit code is 1 when some benchmark is slower than the baseline by more than `--threshold`.
+"""
+
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, override
+
+from pydantic import BaseModel
+
+from haintech.pipelines import (
+    ConcurrentProcessor,
+    FlatMapProcessor,
+    GroupProcessor,
+    JsonlWriter,
+    JsonWriter,
+    LambdaProcessor,
+    Pipeline,
+    PipelineProcessor,
+)
+
+BASELINE_PATH = Path(__file__).parent / "baseline.json"
+
+type Benchmark = Callable[[int], Awaitable[Any]]
+BENCHMARKS: Dict[str, Tuple[Benchmark, int]] = {}
+"""Name -> (function running `n` items, default number of items)"""
+
+
+def benchmark(name: str, items: int = 10_000):
+    def decorator(func: Benchmark) -> Benchmark:
+        BENCHMARKS[name] = (func, items)
+        return func
+
+    return decorator
+
+
+class D(BaseModel):
+    page_no: int
+    content: str
+
+
+def items(n: int) -> List[D]:
+    return [D(page_no=i, content=f"content {i}") for i in range(n)]
+
+
+# --- Benchmarks ---------------------------------------------------------------
+
+
+def _lambda_chain(stages: int) -> Benchmark:
+    async def run(n: int):
+        pl = Pipeline([LambdaProcessor[int, int](lambda x: x + 1) for _ in range(stages)])
+        await pl.run_and_return(list(range(n)))
+
+    return run
+
+
+for _stages in (1, 5, 10, 20):
+    benchmark(f"lambda_chain_{_stages}")(_lambda_chain(_stages))
+
+
+class SleepProcessor(ConcurrentProcessor[int, int]):
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    @override
+    async def process_item(self, data: int) -> int:
+        await asyncio.sleep(self.latency)
+        return data
+
+
+def _concurrent(max_concurrent: int, ordered: bool) -> Benchmark:
+    async def run(n: int):
+        pl = Pipeline([SleepProcessor(0.001, max_concurrent=max_concurrent, ordered=ordered)])
+        await pl.run_and_return(list(range(n)))
+
+    return run
+
+
+for _max_concurrent in (1, 8, 64):
+    benchmark(f"concurrent_{_max_concurrent}_io1ms", 200 if _max_concurrent == 1 else 2_000)(
+        _concurrent(_max_concurrent, False)
+    )
+benchmark("concurrent_64_io1ms_ordered", 2_000)(_concurrent(64, True))
+
+
+@benchmark("group")
+async def group(n: int):
+    pl = Pipeline(
+        [
+            GroupProcessor[int, int, List[int]](
+                group_by=lambda x: x // 10,
+                init_group=lambda key, x: [],
+                aggregate=lambda group, key, x: group.append(x),
+            )
+        ]
+    )
+    await pl.run_and_return(list(range(n)))
+
+
+@benchmark("flat_map")
+async def flat_map(n: int):
+    pl = Pipeline([FlatMapProcessor[List[int], int]()])
+    await pl.run_and_return([list(range(10)) for _ in range(n // 10)])
+
+
+def _pipeline_processor(depth: int) -> Benchmark:
+    async def run(n: int):
+        processor = LambdaProcessor[int, int](lambda x: x + 1)
+        for _ in range(depth):
+            processor = PipelineProcessor[int, int]([processor])
+        await Pipeline([processor]).run_and_return(list(range(n)))
+
+    return run
+
+
+for _depth in (1, 3):
+    benchmark(f"pipeline_processor_depth_{_depth}", 2_000)(_pipeline_processor(_depth))
+
+
+@benchmark("jsonl_writer", 2_000)
+async def jsonl_writer(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        pl = Pipeline([JsonlWriter[D](Path(tmp) / "out.jsonl")])
+        await pl.run_and_return(items(n))
+
+
+@benchmark("json_writer", 1_000)
+async def json_writer(n: int):
+    with tempfile.TemporaryDirectory() as tmp:
+        pl = Pipeline([JsonWriter[D](Path(tmp), "page_no")])
+        await pl.run_and_return(items(n))
+
+
+class FileStorage:
+    """Storage of `D` items in JSON files of the directory (the methods used by `StorageWriter`)"""
+
+    def __init__(self, path: Path):
+        self.path = path
+
+    def get_key(self, data: D) -> str:
+        return str(data.page_no)
+
+    def get(self, key: str) -> D:
+        return D.model_validate_json((self.path / f"{key}.json").read_text())
+
+    def put(self, key: str, data: D) -> None:
+        (self.path / f"{key}.json").write_text(data.model_dump_json())
+
+    def create(self, data: D) -> None:
+        self.put(self.get_key(data), data)
+
+
+@benchmark("storage_writer", 2_000)
+async def storage_writer(n: int):
+    from haintech.pipelines.ampf import StorageWriter
+
+    with tempfile.TemporaryDirectory() as tmp:
+        await Pipeline([StorageWriter(FileStorage(Path(tmp)))]).run_and_return(items(n))  # type: ignore
+
+
+# --- Runner -------------------------------------------------------------------
+
+
+def measure(func: Benchmark, n: int, repeat: int) -> Dict[str, float]:
+    """Returns the best items/s of `repeat` runs, memory blocks (and bytes) per item
+    which are still allocated after a run and peak traced memory of the run."""
+    best = 0.0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        asyncio.run(func(n))
+        best = max(best, n / (time.perf_counter() - start))
+    # Snapshots are compared after warm-up runs, so one-time allocations (imports, caches) are not counted
+    filters = [tracemalloc.Filter(False, tracemalloc.__file__)]
+    gc.collect()
+    tracemalloc.start()
+    try:
+        before = tracemalloc.take_snapshot().filter_traces(filters)
+        tracemalloc.reset_peak()
+        # The snapshot itself is traced, it is not counted in the peak
+        start, _ = tracemalloc.get_traced_memory()
+        asyncio.run(func(n))
+        _, peak = tracemalloc.get_traced_memory()
+        gc.collect()
+        after = tracemalloc.take_snapshot().filter_traces(filters)
+    finally:
+        tracemalloc.stop()
+    stats = after.compare_to(before, "filename")
+    return {
+        "items": n,
+        "items_per_s": round(best, 1),
+        "allocated_blocks_per_item": round(sum(s.count_diff for s in stats) / n, 2),
+        "allocated_bytes_per_item": round(sum(s.size_diff for s in stats) / n, 1),
+        "peak_traced_bytes": peak - start,
+    }
+
+
+def run(selected: List[str], scale: float, repeat: int) -> Dict[str, Any]:
+    results: Dict[str, Any] = {}
+    skipped: Dict[str, str] = {}
+    for name in selected:
+        func, n = BENCHMARKS[name]
+        n = max(1, int(n * scale))
+        try:
+            results[name] = measure(func, n, repeat)
+        except ImportError as e:
+            skipped[name] = f"missing dependency: {e.name}"
+            print(f"{name:36} skipped ({skipped[name]})")
+            continue
+        r = results[name]
+        print(
+            f"{name:36} {r['items_per_s']:>12,.0f} items/s"
+            f" {r['allocated_blocks_per_item']:>8,.2f} blocks/item {r['peak_traced_bytes']:>12,} peak B"
+        )
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "results": results,
+        "skipped": skipped,
+    }
+
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    """Prints comparison with baseline and returns names of regressed benchmarks."""
+    regressions = []
+    print(f"\n{'benchmark':36} {'baseline':>12} {'current':>12} {'change':>8}")
+    for name, result in current["results"].items():
+        base = baseline.get("results", {}).get(name)
+        if not base:
+            print(f"{name:36} {'-':>12} {result['items_per_s']:>12,.0f}")
+            continue
+        change = result["items_per_s"] / base["items_per_s"] - 1
+        mark = ""
+        if change < -threshold:
+            mark = "  REGRESSION"
+            regressions.append(name)
+        print(f"{name:36} {base['items_per_s']:>12,.0f} {result['items_per_s']:>12,.0f} {change:>+8.1%}{mark}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="haintech.pipelines micro-benchmarks")
+    parser.add_argument("-k", dest="keyword", help="run only benchmarks containing this text")
+    parser.add_argument("--quick", action="store_true", help="run 10x fewer items, once")
+    parser.add_argument("--repeat", type=int, default=3, help="runs of each benchmark (the best is taken)")
+    parser.add_argument("--output", type=Path, help="write results to this JSON file")
+    parser.add_argument("--baseline", type=Path, default=BASELINE_PATH, help="baseline JSON file")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed slowdown (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true", help="store results as the baseline")
+    args = parser.parse_args(argv)
+
+    selected = [name for name in BENCHMARKS if not args.keyword or args.keyword in name]
+    scale, repeat = (0.1, 1) if args.quick else (1.0, args.repeat)
+    current = run(selected, scale, repeat)
+    if args.output:
+        args.output.write_text(json.dumps(current, indent=2))
+    if args.update_baseline:
+        args.baseline.write_text(json.dumps(current, indent=2) + "\n")
+        return 0
+    if args.quick or not args.baseline.exists():
+        return 0
+    regressions = compare(current, json.loads(args.baseline.read_text()), args.threshold)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
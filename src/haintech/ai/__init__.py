@@ -6,6 +6,7 @@ from .base import (
     BaseAIChatAsync,
     BaseAIModel,
     BaseAISupervisor,
+    BaseAISupervisorAsync,
     BaseAITextEmbeddingModel,
     BaseRAGSearcher,
     BaseImageGenerator,
@@ -13,6 +14,7 @@ from .base import (
 from .model import (
     AIAgentInteraction,
     AIChatResponse,
+    AIChatResponseDelta,
     AIChatSession,
     AIContext,
     AIFunction,
@@ -28,6 +30,8 @@ from .model import (
     RAGQuery,
 )
 from .ai_task_executor import AITaskExecutor
+from .http_client_pool import HTTPClientConfig, HTTPClientPool, http_clients
+from .retry import RetryPolicy
 try:
     from .mcp_ai_agent import MCPAIAgent
 except ImportError:
@@ -36,6 +40,7 @@ except ImportError:
 
 __all__ = [
     "AIChatResponse",
+    "AIChatResponseDelta",
     "AIModelToolCall",
     "AIChatSession",
     "AIModelInteraction",
@@ -56,6 +61,7 @@ __all__ = [
     "BaseAIAgent",
     "BaseAIAgentAsync",
     "BaseAISupervisor",
+    "BaseAISupervisorAsync",
     "BaseAITextEmbeddingModel",
     "BaseRAGSearcher",
     "BaseAgentSearcher",
@@ -64,5 +70,9 @@ __all__ = [
     "AIFunctionParameter",
     "AITask",
     "AITaskExecutor",
+    "HTTPClientConfig",
+    "HTTPClientPool",
+    "http_clients",
+    "RetryPolicy",
     "MCPAIAgent",
 ]
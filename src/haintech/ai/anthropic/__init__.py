@@ -1,3 +1,4 @@
 from .anthropic_ai_model import AnthropicAIModel
+from .anthropic_batch_backend import AnthropicBatchBackend
 
-__all__ = ["AnthropicAIModel"]
+__all__ = ["AnthropicAIModel", "AnthropicBatchBackend"]
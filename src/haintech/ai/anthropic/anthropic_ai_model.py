@@ -1,5 +1,6 @@
 import logging
-from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, override
+import os
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Optional, Tuple, override
 
 import anthropic
 from pydantic import BaseModel
@@ -11,7 +12,17 @@ from haintech.ai import (
     AIPrompt,
     BaseAIModel,
 )
-from haintech.ai.model import AIContext, AIFunction, AIModelInteractionTool, AIModelToolCall
+from haintech.ai.http_client_pool import http_clients
+from haintech.ai.model import (
+    AIChatResponseDelta,
+    AIContext,
+    AIFunction,
+    AIModelInteractionTool,
+    AIModelToolCall,
+)
+from haintech.ai.retry import RetryPolicy
+
+ANTHROPIC_BASE_URL = "https://api.anthropic.com"
 
 
 class AnthropicAIModel(BaseAIModel):
@@ -21,14 +32,35 @@ class AnthropicAIModel(BaseAIModel):
         self,
         model_name: str = "claude-sonnet-4-20250514",
         parameters: Optional[Dict[str, str | int | float]] = None,
+        prompt_caching: bool = True,
+        cache_ttl: Optional[Literal["5m", "1h"]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
+        """Anthropic implementation of BaseAIModel
+
+        Args:
+            model_name: The name of the model.
+            parameters: Parameters of the model (e.g. `max_tokens`, `temperature`).
+            prompt_caching: Cache breakpoints are set after the system prompt (or tools)
+                and after the history, so the static prefix is read from the prompt cache.
+            cache_ttl: Time to live of cached prompts (5 minutes by default).
+            retry_policy: Retries of transient errors (`RetryPolicy()` by default).
+        """
+        self.prompt_caching = prompt_caching
+        self.cache_ttl = cache_ttl
+        if retry_policy:
+            self.retry_policy = retry_policy
         try:
             import anthropic
 
             self.NOT_GIVEN = anthropic.NOT_GIVEN
 
-            self.client = anthropic.Anthropic()
-            self.async_client = anthropic.AsyncAnthropic()
+            # Clients of all instances share connections, requests are retried with `retry_policy`
+            base_url = os.environ.get("ANTHROPIC_BASE_URL") or ANTHROPIC_BASE_URL
+            self.client = anthropic.Anthropic(http_client=http_clients.get_client(base_url), max_retries=0)
+            self.async_client = anthropic.AsyncAnthropic(
+                http_client=http_clients.get_async_client(base_url), max_retries=0
+            )
             self.model_name = model_name
             self.parameters = parameters or {}
             if "max_tokens" not in self.parameters:
@@ -54,16 +86,12 @@ class AnthropicAIModel(BaseAIModel):
         parameters, ai_model_interaction = self._prepare_parameters(
             system_prompt, history, context, message, functions, response_format
         )
-        try:
+
+        def call() -> AIChatResponse:
             resp: anthropic.types.Message = self.client.messages.create(**parameters)
-            response = self._create_ai_chat_response(resp.content)  # type: ignore
-        except Exception as e:
-            self._log.error("Error: %s", e)
-            response = AIChatResponse(content=str(e))
-        if interaction_logger:
-            ai_model_interaction.response = response
-            interaction_logger(ai_model_interaction)
-        return response
+            return self._create_ai_chat_response(resp.content, resp.usage)  # type: ignore
+
+        return self._call_with_retry(call, ai_model_interaction, interaction_logger)
 
     @override
     async def get_chat_response_async(
@@ -81,16 +109,62 @@ class AnthropicAIModel(BaseAIModel):
         parameters, ai_model_interaction = self._prepare_parameters(
             system_prompt, history, context, message, functions, response_format
         )
-        try:
+
+        async def call() -> AIChatResponse:
             resp: anthropic.types.Message = await self.async_client.messages.create(**parameters)
-            response = self._create_ai_chat_response(resp.content)  # type: ignore
-        except Exception as e:
-            self._log.error("Error: %s", e)
-            response = AIChatResponse(content=str(e))
-        if interaction_logger:
-            ai_model_interaction.response = response
-            interaction_logger(ai_model_interaction)
-        return response
+            return self._create_ai_chat_response(resp.content, resp.usage)  # type: ignore
+
+        return await self._call_with_retry_async(call, ai_model_interaction, interaction_logger)
+
+    @override
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        if not isinstance(history, list):
+            history = list(history or [])
+        parameters, ai_model_interaction = self._prepare_parameters(
+            system_prompt, history, context, message, functions, response_format
+        )
+
+        def deltas() -> Iterator[AIChatResponseDelta]:
+            with self.client.messages.create(**parameters, stream=True) as stream:
+                for event in stream:
+                    yield from self._create_ai_chat_response_deltas(event)
+
+        return self._stream(deltas, ai_model_interaction, interaction_logger)
+
+    @override
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        if not isinstance(history, list):
+            history = list(history or [])
+        parameters, ai_model_interaction = self._prepare_parameters(
+            system_prompt, history, context, message, functions, response_format
+        )
+
+        async def deltas() -> AsyncIterator[AIChatResponseDelta]:
+            async with await self.async_client.messages.create(**parameters, stream=True) as stream:
+                async for event in stream:
+                    for delta in self._create_ai_chat_response_deltas(event):
+                        yield delta
+
+        async for delta in self._stream_async(deltas, ai_model_interaction, interaction_logger):
+            yield delta
 
     def _prepare_parameters(
         self,
@@ -133,6 +207,8 @@ class AnthropicAIModel(BaseAIModel):
             response_format=response_format_param,
         )
         system = self._prompt_to_str(system_prompt) if isinstance(system_prompt, AIPrompt) else system_prompt
+        if self.prompt_caching:
+            system, tools = self._set_cache_breakpoints(system, tools, msg_list, len(msg_list) - 2)
         return (
             {
                 "model": self.model_name,
@@ -144,6 +220,29 @@ class AnthropicAIModel(BaseAIModel):
             ai_model_interaction,
         )
 
+    def _set_cache_breakpoints(
+        self,
+        system: Optional[str],
+        tools: List[Dict[str, Any]],
+        msg_list: List[Dict[str, Any]],
+        last_history_index: int,
+    ) -> Tuple[Optional[str | List[Dict[str, Any]]], List[Dict[str, Any]]]:
+        """Sets cache breakpoints at the end of the static prefix (tools and system prompt)
+        and at the end of the history.
+
+        The prompt is cached in the order: tools, system, messages. Volatile context is
+        added to the current message only, so it is after the last breakpoint.
+        """
+        cache_control = {"type": "ephemeral"} | ({"ttl": self.cache_ttl} if self.cache_ttl else {})
+        if system:
+            system = [{"type": "text", "text": system, "cache_control": cache_control}]
+        elif tools:
+            # Definitions of functions are shared, so the last one is copied
+            tools = tools[:-1] + [tools[-1] | {"cache_control": cache_control}]
+        if last_history_index >= 0 and msg_list[last_history_index]["content"]:
+            msg_list[last_history_index]["content"][-1]["cache_control"] = cache_control
+        return system, tools
+
     @classmethod
     def _create_message(
         cls, interaction_message: AIModelInteractionMessage, context: Optional[AIContext] = None
@@ -194,7 +293,7 @@ class AnthropicAIModel(BaseAIModel):
         return ret
 
     @classmethod
-    def _create_ai_chat_response(cls, lm_resp: List[BaseModel]) -> AIChatResponse:
+    def _create_ai_chat_response(cls, lm_resp: List[BaseModel], usage: Any = None) -> AIChatResponse:
         content = None
         tool_calls = []
         for m_resp in lm_resp:
@@ -209,7 +308,42 @@ class AnthropicAIModel(BaseAIModel):
                         arguments=m_resp["input"],
                     )
                 )
-        return AIChatResponse(content=content, tool_calls=tool_calls)
+        return AIChatResponse(
+            content=content,
+            tool_calls=tool_calls,
+            **(cls._get_input_tokens(usage) | {"output_tokens": usage.output_tokens} if usage else {}),
+        )
+
+    @staticmethod
+    def _get_input_tokens(usage: Any) -> Dict[str, Any]:
+        """Anthropic does not count tokens read from and written to the cache in input tokens."""
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_creation = usage.cache_creation_input_tokens or 0
+        return {
+            "input_tokens": usage.input_tokens + cache_read + cache_creation,
+            "input_tokens_cached": cache_read,
+        }
+
+    @classmethod
+    def _create_ai_chat_response_deltas(
+        cls, event: anthropic.types.RawMessageStreamEvent
+    ) -> Iterator[AIChatResponseDelta]:
+        if event.type == "message_start":
+            usage = event.message.usage
+            yield AIChatResponseDelta(**cls._get_input_tokens(usage), output_tokens=usage.output_tokens)
+        elif event.type == "content_block_start" and event.content_block.type == "tool_use":
+            yield AIChatResponseDelta(
+                tool_call_index=event.index,
+                tool_call_id=event.content_block.id,
+                function_name=event.content_block.name,
+            )
+        elif event.type == "content_block_delta":
+            if event.delta.type == "text_delta":
+                yield AIChatResponseDelta(content=event.delta.text)
+            elif event.delta.type == "input_json_delta":
+                yield AIChatResponseDelta(tool_call_index=event.index, arguments=event.delta.partial_json)
+        elif event.type == "message_delta":
+            yield AIChatResponseDelta(output_tokens=event.usage.output_tokens)
 
     @classmethod
     def model_function_definition(cls, ai_function: AIFunction) -> Dict[str, Any]:
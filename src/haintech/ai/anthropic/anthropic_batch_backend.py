@@ -0,0 +1,84 @@
+from typing import Any, Dict, List, override
+
+from anthropic import DEFAULT_MAX_RETRIES
+
+from ..batch import BaseBatchBackend, BatchJob, BatchRequest, BatchResult
+from ..model import AIModelInteractionMessage
+from .anthropic_ai_model import AnthropicAIModel
+
+
+class AnthropicBatchBackend(BaseBatchBackend):
+    """Anthropic Message Batches API backend.
+
+    Requests are processed within 24 hours at half of the price of interactive requests.
+    Anthropic does not embed texts, so only chat requests are supported.
+    """
+
+    def __init__(self, ai_model: AnthropicAIModel):
+        """Anthropic Message Batches API backend.
+
+        Args:
+            ai_model: The model of chat requests.
+        """
+        self.ai_model = ai_model
+        # Clients of chat models do not retry requests
+        self.client = ai_model.async_client.with_options(max_retries=DEFAULT_MAX_RETRIES)
+
+    @override
+    async def submit(self, requests: List[BatchRequest]) -> BatchJob:
+        if self._get_endpoint(requests) == "embedding":
+            raise ValueError("Anthropic does not support embedding requests")
+        batch = await self.client.messages.batches.create(
+            requests=[{"custom_id": r.custom_id, "params": self._create_params(r)} for r in requests]  # type: ignore
+        )
+        return self._create_job(batch, BatchJob(id=batch.id, total=len(requests)))
+
+    @override
+    async def get_job(self, job: BatchJob) -> BatchJob:
+        return self._create_job(await self.client.messages.batches.retrieve(job.id), job)
+
+    @override
+    async def get_results(self, job: BatchJob) -> List[BatchResult]:
+        ret = []
+        async for entry in await self.client.messages.batches.results(job.id):
+            result = entry.result
+            if result.type == "succeeded":
+                response = self.ai_model._create_ai_chat_response(
+                    result.message.content,  # type: ignore
+                    result.message.usage,
+                )
+                ret.append(BatchResult(custom_id=entry.custom_id, response=response))
+            elif result.type == "errored":
+                ret.append(BatchResult(custom_id=entry.custom_id, error=result.error.error.message))
+            else:
+                ret.append(BatchResult(custom_id=entry.custom_id, error=f"Request {result.type}"))
+        return ret
+
+    @override
+    async def cancel(self, job: BatchJob) -> BatchJob:
+        return self._create_job(await self.client.messages.batches.cancel(job.id), job)
+
+    def _create_params(self, request: BatchRequest) -> Dict[str, Any]:
+        parameters, _ = self.ai_model._prepare_parameters(  # type: ignore
+            request.system_prompt,
+            [],
+            message=AIModelInteractionMessage(role="user", content=request.message),
+            response_format="json" if request.response_format != "text" else "text",
+        )
+        return {k: v for k, v in parameters.items() if v is not self.ai_model.NOT_GIVEN}  # type: ignore
+
+    @staticmethod
+    def _create_job(batch: Any, job: BatchJob) -> BatchJob:
+        job = job.model_copy()
+        counts = batch.request_counts
+        job.completed = counts.succeeded
+        job.failed = counts.errored + counts.canceled + counts.expired
+        job.total = job.completed + job.failed + counts.processing
+        if batch.processing_status == "ended":
+            if counts.expired:
+                job.status = "expired"
+            elif batch.cancel_initiated_at:
+                job.status = "cancelled"
+            else:
+                job.status = "completed"
+        return job
@@ -5,6 +5,7 @@ from .base_ai_chat_async import BaseAIChatAsync
 
 from .base_ai_model import BaseAIModel
 from .base_ai_supervisor import BaseAISupervisor
+from .base_ai_supervisor_async import BaseAISupervisorAsync
 from .base_ai_text_embedding_model import BaseAITextEmbeddingModel
 from .base_rag_searcher import BaseRAGSearcher
 from .base_agent_searcher import BaseAgentSearcher
@@ -21,6 +22,7 @@ __all__ = [
     "BaseAIAgent",
     "BaseAIAgentAsync",
     "BaseAISupervisor",
+    "BaseAISupervisorAsync",
     "BaseAITextEmbeddingModel",
     "BaseImageGenerator",
 ]
@@ -1,13 +1,16 @@
 import asyncio
 import inspect
 import logging
-from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+import weakref
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple
 
 from haintech.ai.ai_task_executor import AITaskExecutor
 from haintech.ai.interfaces import AsyncSessionBlobManager
+from haintech.profiling import Profiler
 
 from ..model import (
     AIChatResponse,
+    AIChatResponseDelta,
     AIContext,
     AIModelInteractionMessage,
     AIModelSession,
@@ -15,7 +18,7 @@ from ..model import (
     AITask,
 )
 from .base_ai_chat_async import BaseAIChatAsync
-from .base_ai_model import BaseAIModel
+from .base_ai_model import BaseAIModel, _ChatResponseBuilder
 from .base_rag_searcher import BaseRAGSearcher
 
 _log = logging.getLogger(__name__)
@@ -36,6 +39,9 @@ class BaseAIAgentAsync(BaseAIChatAsync):
         searcher: Optional[BaseRAGSearcher] = None,
         functions: Optional[List[Callable]] = None,
         session_blob_manager: Optional[AsyncSessionBlobManager] = None,
+        profiler: Optional[Profiler] = None,
+        max_concurrent_tools: int = 10,
+        tool_timeout: Optional[float] = None,
     ):
         """Base AI Agent.
 
@@ -48,6 +54,9 @@ class BaseAIAgentAsync(BaseAIChatAsync):
             session: current session object
             searcher: RAG searcher
             functions: list of functions to add
+            profiler: profiler of model calls and tools
+            max_concurrent_tools: the maximum number of tools called concurrently
+            tool_timeout: the maximum time of one tool call in seconds
         """
         super().__init__(ai_model, system_prompt, session)
         self.name = name or self.__class__.__name__
@@ -56,6 +65,13 @@ class BaseAIAgentAsync(BaseAIChatAsync):
         self.functions: Dict[Callable, Any] = {}
         self.function_names: Dict[str, Callable] = {}
         self.session_blob_manager = session_blob_manager
+        self.profiler = profiler
+        self.tool_timeout = tool_timeout
+        self.max_concurrent_tools = max_concurrent_tools
+        self._tool_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._tool_messages: Optional[Dict[str, Optional[str]]] = None
         if functions:
             for f in functions:
                 self.add_function(f)
@@ -88,16 +104,9 @@ class BaseAIAgentAsync(BaseAIChatAsync):
             response: LLM response
         """
         system_prompt = self.system_prompt
-        history = list(self.iter_messages())
-        download_blobs_tasks = []
-        if message:
-            download_blobs_tasks.append(self.download_blobs(message))
-        for m in history:
-            if m.blob_locations:
-                download_blobs_tasks.append(self.download_blobs(m))
-        await asyncio.gather(*download_blobs_tasks)
+        history = await self._prepare_history(message)
         try:
-            response = await self.ai_model.get_chat_response_async(
+            response = self.ai_model.get_chat_response_async(
                 system_prompt=system_prompt,
                 history=history,
                 context=await self._get_context(system_prompt, history, message),
@@ -105,22 +114,66 @@ class BaseAIAgentAsync(BaseAIChatAsync):
                 functions=self.functions,
                 interaction_logger=self._interaction_logger,
             )
+            if self.profiler:
+                response = await self.profiler.profile(f"{self.name}:model", response)
+            else:
+                response = await response
+        except Exception as e:
+            self._log_request_error(e, history, message)
+            raise e
+        self._clear_message_blobs(message)
+        return response
+
+    async def _get_response_stream(
+        self, message: Optional[AIModelInteractionMessage] = None
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        """Get response from LLM as a stream of deltas (the last one contains the response)"""
+        system_prompt = self.system_prompt
+        history = await self._prepare_history(message)
+        try:
+            async for delta in self.ai_model.get_chat_response_stream_async(
+                system_prompt=system_prompt,
+                history=history,
+                context=await self._get_context(system_prompt, history, message),
+                message=message,
+                functions=self.functions,
+                interaction_logger=self._interaction_logger,
+            ):
+                yield delta
         except Exception as e:
-            _log.error(e)
-            e_mes = "=====>\n"
-            for h in history:
-                e_mes += f"{h.model_dump_json(indent=2, exclude_none=True, exclude_defaults=True)},\n"
-            if message:
-                e_mes += message.model_dump_json(indent=2, exclude_none=True, exclude_defaults=True)
-            e_mes += "\n<===="
-            _log.warning(e_mes)
+            self._log_request_error(e, history, message)
             raise e
+        self._clear_message_blobs(message)
+
+    async def _prepare_history(self, message: Optional[AIModelInteractionMessage]) -> List[AIModelInteractionMessage]:
+        history = list(self.iter_messages())
+        download_blobs_tasks = []
+        if message:
+            download_blobs_tasks.append(self.download_blobs(message))
+        for m in history:
+            if m.blob_locations:
+                download_blobs_tasks.append(self.download_blobs(m))
+        await asyncio.gather(*download_blobs_tasks)
+        return history
+
+    def _log_request_error(
+        self, e: Exception, history: List[AIModelInteractionMessage], message: Optional[AIModelInteractionMessage]
+    ) -> None:
+        _log.error(e)
+        e_mes = "=====>\n"
+        for h in history:
+            e_mes += f"{h.model_dump_json(indent=2, exclude_none=True, exclude_defaults=True)},\n"
+        if message:
+            e_mes += message.model_dump_json(indent=2, exclude_none=True, exclude_defaults=True)
+        e_mes += "\n<===="
+        _log.warning(e_mes)
+
+    def _clear_message_blobs(self, message: Optional[AIModelInteractionMessage]) -> None:
         if message and self.session:
             # Clear blobs from history to save memory
             interaction = self.session.get_last_interaction()
             if interaction and interaction.message and interaction.message == message:
                 interaction.message.blobs = None
-        return response
 
     async def get_response(self, message: Optional[AIModelInteractionMessage | str] = None) -> AIChatResponse:
         """Get response from LLM
@@ -133,7 +186,14 @@ class BaseAIAgentAsync(BaseAIChatAsync):
         if isinstance(message, str):
             message = AIModelInteractionMessage(role="user", content=message)
         # Call LLM
-        m_resp = await self._get_response(message=message)
+        if self.profiler:
+            self.profiler.start()
+            try:
+                m_resp = await self._get_response(message=message)
+            finally:
+                self.profiler.stop()
+        else:
+            m_resp = await self._get_response(message=message)
         # Add message and response to history
         if message:
             self.add_message(message)
@@ -149,6 +209,95 @@ class BaseAIAgentAsync(BaseAIChatAsync):
         else:
             raise ValueError("No content in response")
 
+    async def get_response_stream(
+        self, message: Optional[AIModelInteractionMessage | str] = None
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        """Get response from LLM as a stream, calling all requested tools
+
+        Deltas of each LLM response are yielded as they arrive (the last delta
+        of each response contains the whole response). Each tool call is started
+        as soon as its arguments are complete, while the rest of the response is
+        still generated. Tool results are added to the history in the order of
+        tool calls after the response, then LLM is called again until it returns
+        a response without tool calls.
+
+        Args:
+            message: message to send to LLM
+        Returns:
+            iterator: iterator of response deltas
+        """
+        if isinstance(message, str):
+            message = AIModelInteractionMessage(role="user", content=message)
+        if self.profiler:
+            self.profiler.start()
+        try:
+            while True:
+                builder = _ChatResponseBuilder()
+                tasks: Dict[int, asyncio.Task] = {}
+                last_index: Optional[int] = None
+                response: Optional[AIChatResponse] = None
+                try:
+                    async for delta in self._get_response_stream(message=message):
+                        if delta.response:
+                            response = delta.response
+                        else:
+                            index = builder.add(delta)
+                            if index is not None and index != last_index and last_index is not None:
+                                # Next tool call started, so the previous one is complete
+                                self._start_tool_call(builder, last_index, tasks, complete=True)
+                            if index is not None:
+                                last_index = index
+                                self._start_tool_call(builder, index, tasks)
+                        yield delta
+                    if response is None:
+                        raise ValueError("No response in the stream")
+                    # Add message and response to history
+                    if message:
+                        self.add_message(message)
+                    self.add_response_message(response)
+                    for index in sorted(builder.tool_calls):
+                        tool_call = builder.get_tool_call(index, complete=True)
+                        task = tasks.get(index) or self._start_tool_call(builder, index, tasks, complete=True)
+                        ret = await task
+                        self.add_tool_message(tool_call.id or tool_call.function_name, str(ret))
+                finally:
+                    for task in tasks.values():
+                        task.cancel()
+                    await asyncio.gather(*tasks.values(), return_exceptions=True)
+                if not response.tool_calls:
+                    break
+                message = None
+        finally:
+            if self.profiler:
+                self.profiler.stop()
+
+    async def get_text_response_stream(self, message: Optional[str] = None) -> AsyncIterator[str]:
+        """Get text response from LLM as a stream of text chunks, calling all requested tools
+
+        Args:
+            message: message to send to LLM
+        Returns:
+            iterator: iterator of text chunks
+        """
+        async for delta in self.get_response_stream(message):
+            if delta.content:
+                yield delta.content
+
+    def _start_tool_call(
+        self, builder: _ChatResponseBuilder, index: int, tasks: Dict[int, asyncio.Task], complete: bool = False
+    ) -> Optional[asyncio.Task]:
+        """Starts the tool call if it is not started yet and its arguments are complete."""
+        if index in tasks:
+            return tasks[index]
+        tool_call = builder.get_tool_call(index, complete=complete)
+        if tool_call is None:
+            return None
+        self._log.debug(
+            "Calling tool: %s : %s with arguments: %s", tool_call.id, tool_call.function_name, tool_call.arguments
+        )
+        tasks[index] = asyncio.create_task(self._execute_function(tool_call.function_name, tool_call.arguments))
+        return tasks[index]
+
     async def accept_tools(self, tool_call_ids: str | List[str]) -> AIChatResponse:
         """Accept calling tools, call them and return response
 
@@ -159,10 +308,15 @@ class BaseAIAgentAsync(BaseAIChatAsync):
         """
         if isinstance(tool_call_ids, str):
             tool_call_ids = [tool_call_ids]
-        for id, name, arguments in self.iter_tool_calls():
+        tool_calls = list(self.iter_tool_calls())
+        accepted = [(id, name, arguments) for id, name, arguments in tool_calls if id and id in tool_call_ids]
+        for id, name, arguments in accepted:
+            self._log.debug("Calling tool: %s : %s with arguments: %s", id, name, arguments)
+        # Accepted tools run concurrently, messages are added in the order of tool calls
+        results = await self._call_functions(accepted)
+        for id, name, arguments in tool_calls:
             if id in tool_call_ids:
-                self._log.debug("Calling tool: %s : %s with arguments: %s", id, name, arguments)
-                await self.call_function(id, name, **arguments)
+                self.add_tool_message(id, results[id])  # type: ignore
             else:
                 self._log.debug("Refused calling: %s : %s with arguments: %s", id, name, arguments)
                 self.add_message(
@@ -190,25 +344,93 @@ class BaseAIAgentAsync(BaseAIChatAsync):
         return self.session.get_last_response()
 
     async def call_function(self, tool_call_id: str, name: str, **arguments) -> Any:
-        function = self.function_names[name]
+        ret = await self._execute_function(name, arguments)
+        self.add_tool_message(tool_call_id, str(ret))
+        return ret
+
+    async def _call_functions(self, calls: List[Tuple[str, str, Dict[str, Any]]]) -> Dict[str, str]:
+        """Calls functions concurrently by `call_function` and returns their tool messages by tool call ids.
+
+        Tool messages are not added to the history, so the caller adds them in the order of tool calls.
+        """
+        messages: Dict[str, Optional[str]] = {id: None for id, _, _ in calls}
+        self._tool_messages = messages
+        try:
+            async with asyncio.TaskGroup() as task_group:
+                tasks = [
+                    task_group.create_task(self.call_function(id, name, **arguments)) for id, name, arguments in calls
+                ]
+        finally:
+            self._tool_messages = None
+        # call_function overridden without adding the tool message returns the result only
+        return {id: messages[id] or str(task.result()) for (id, _, _), task in zip(calls, tasks)}
+
+    async def _execute_function(self, name: str, arguments: Dict[str, Any]) -> Any:
+        """Calls the function, returns its result or the error message"""
+        function = self.function_names.get(name)
         if not function:
-            self._log.error("Function %s not found", name)
+            ret = f"Error calling function: function {name} not found"
+            self._log.error(ret)
             for f in self.functions:
                 self._log.debug("Function: %s", f.__name__)
-            raise ValueError(f"Function {name} not found")
+            return ret
+        semaphore = self._get_tool_semaphore()
         try:
-            if inspect.iscoroutinefunction(function):
-                ret = await function(**arguments)
+            await semaphore.acquire()
+            # The slot is released by _call
+            call = asyncio.wait_for(self._call(function, arguments, semaphore), self.tool_timeout)
+            if self.profiler:
+                ret = await self.profiler.profile(f"{self.name}:tool:{name}", call)
             else:
-                ret = function(**arguments)
+                ret = await call
+        except TimeoutError:
+            ret = f"Error calling function: timeout after {self.tool_timeout} s"
+            self._log.error(ret)
         except Exception as e:
             ret = f"Error calling function: {e}"
             self._log.error(ret)
-        content = str(ret)
-        self.add_tool_message(tool_call_id, content)
         return ret
 
+    def _get_tool_semaphore(self) -> asyncio.Semaphore:
+        """Returns the semaphore of tool calls of the running event loop
+        (the agent can be used by many loops, e.g. by many `asyncio.run` calls)."""
+        loop = asyncio.get_running_loop()
+        semaphore = self._tool_semaphores.get(loop)
+        if semaphore is None:
+            semaphore = self._tool_semaphores[loop] = asyncio.Semaphore(self.max_concurrent_tools)
+        return semaphore
+
+    @staticmethod
+    async def _call(function: Callable, arguments: Dict[str, Any], semaphore: asyncio.Semaphore) -> Any:
+        """Calls the function and releases the acquired slot of the semaphore when the call ends."""
+        if inspect.iscoroutinefunction(function):
+            try:
+                return await function(**arguments)
+            finally:
+                semaphore.release()
+        loop = asyncio.get_running_loop()
+
+        def run() -> Any:
+            try:
+                return function(**arguments)
+            finally:
+                try:
+                    loop.call_soon_threadsafe(semaphore.release)
+                except RuntimeError:
+                    # The loop is closed
+                    pass
+
+        # Sync tools run in a thread so they do not block other tools and the event loop.
+        # The thread can't be stopped, so after a timeout it keeps its slot until it ends.
+        task = asyncio.ensure_future(asyncio.to_thread(run))
+        task.add_done_callback(_ignore_result)
+        return await asyncio.shield(task)
+
     def add_tool_message(self, tool_call_id: str, content: str):
+        if self._tool_messages is not None and tool_call_id in self._tool_messages:
+            # Added by the caller of _call_functions in the order of tool calls
+            self._tool_messages[tool_call_id] = content
+            return
         self.add_message(AIModelInteractionMessage(role="tool", tool_call_id=tool_call_id, content=content))
 
     async def _get_context(
@@ -236,3 +458,9 @@ class BaseAIAgentAsync(BaseAIChatAsync):
             if not message.blobs:
                 message.blobs = []
             message.blobs.extend(await asyncio.gather(*[self.session_blob_manager.download_blob(blob_location) for blob_location in message.blob_locations]))
+
+
+def _ignore_result(task: asyncio.Task) -> None:
+    """Retrieves the exception of the task which result is not awaited (after a timeout)."""
+    if not task.cancelled():
+        task.exception()
@@ -1,8 +1,24 @@
+import asyncio
 import json
+import logging
+import time
 from abc import ABC, abstractmethod
 from inspect import Parameter, signature
 from types import UnionType
-from typing import Any, Callable, Dict, Iterable, Literal, Optional, Sequence, Type
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Type,
+)
 
 from ampf.base import Blob, BlobLocation
 from openai.types.shared_params import FunctionDefinition
@@ -12,17 +28,25 @@ from haintech.helpers import get_inner_type, is_list_type
 
 from ..model import (
     AIChatResponse,
+    AIChatResponseDelta,
     AIContext,
     AIFunction,
     AIFunctionParameter,
     AIModelInteraction,
     AIModelInteractionMessage,
+    AIModelToolCall,
     AIPrompt,
     RAGItem,
 )
+from ..retry import RetryPolicy, to_ai_model_error
+
+_log = logging.getLogger(__name__)
 
 
 class BaseAIModel(ABC):
+    retry_policy: RetryPolicy = RetryPolicy()
+    """Retries of transient errors of the provider"""
+
     def get_response(
         self,
         message: str,
@@ -263,6 +287,203 @@ class BaseAIModel(ABC):
             response_format=response_format,
         )
 
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        """Return chat response from LLM as a stream of deltas
+
+        Deltas contain text chunks, fragments of tool call arguments and token usage.
+        The last delta contains the complete response, which is also passed to `interaction_logger`.
+        Models without native streaming return the whole response in a few deltas.
+
+        Args:
+            The same as for `get_chat_response`
+        Returns:
+            Iterator of LLM response deltas
+        """
+        response = self.get_chat_response(
+            message=message,
+            system_prompt=system_prompt,
+            history=history,
+            context=context,
+            functions=functions,
+            interaction_logger=interaction_logger,
+            response_format=response_format,
+        )
+        yield from self._response_to_deltas(response)
+
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        """Async version of `get_chat_response_stream`"""
+        response = await self.get_chat_response_async(
+            message=message,
+            system_prompt=system_prompt,
+            history=history,
+            context=context,
+            functions=functions,
+            interaction_logger=interaction_logger,
+            response_format=response_format,
+        )
+        for delta in self._response_to_deltas(response):
+            yield delta
+
+    @staticmethod
+    def _response_to_deltas(response: AIChatResponse) -> Iterator[AIChatResponseDelta]:
+        if response.content:
+            yield AIChatResponseDelta(content=response.content)
+        for i, tool_call in enumerate(response.tool_calls or []):
+            yield AIChatResponseDelta(
+                tool_call_index=i,
+                tool_call_id=tool_call.id,
+                function_name=tool_call.function_name,
+                arguments=json.dumps(tool_call.arguments),
+                thought_signature=tool_call.thought_signature,
+            )
+        yield AIChatResponseDelta(
+            input_tokens=response.input_tokens,
+            input_tokens_cached=response.input_tokens_cached,
+            reasoning_tokens=response.reasoning_tokens,
+            output_tokens=response.output_tokens,
+            response=response,
+        )
+
+    def _call_with_retry(
+        self,
+        call: Callable[[], AIChatResponse],
+        ai_model_interaction: AIModelInteraction,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+    ) -> AIChatResponse:
+        """Calls the provider, retries transient errors according to `retry_policy` and logs the interaction.
+
+        Errors are raised as `AIModelError` subclasses, the interaction is logged only with a response
+        (so errors never get to the session). Attempts and latency are logged with the interaction.
+        """
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                response = call()
+                break
+            except Exception as e:
+                time.sleep(self._get_retry_delay(attempt, e))
+            attempt += 1
+        self._log_interaction(ai_model_interaction, response, interaction_logger, attempt, time.monotonic() - start)
+        return response
+
+    async def _call_with_retry_async(
+        self,
+        call: Callable[[], Awaitable[AIChatResponse]],
+        ai_model_interaction: AIModelInteraction,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+    ) -> AIChatResponse:
+        """Async version of `_call_with_retry`"""
+        start = time.monotonic()
+        attempt = 1
+        while True:
+            try:
+                response = await call()
+                break
+            except Exception as e:
+                await asyncio.sleep(self._get_retry_delay(attempt, e))
+            attempt += 1
+        self._log_interaction(ai_model_interaction, response, interaction_logger, attempt, time.monotonic() - start)
+        return response
+
+    def _stream(
+        self,
+        create_deltas: Callable[[], Iterator[AIChatResponseDelta]],
+        ai_model_interaction: AIModelInteraction,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+    ) -> Iterator[AIChatResponseDelta]:
+        """Yields deltas of the model and the last delta with the assembled response.
+
+        The stream is retried like `_call_with_retry` until the first delta is received.
+        Later errors are raised, because the consumer has already received a part of the response.
+        """
+        start = time.monotonic()
+        attempt = 1
+        builder = _ChatResponseBuilder()
+        while True:
+            started = False
+            try:
+                for delta in create_deltas():
+                    started = True
+                    builder.add(delta)
+                    yield delta
+                response = builder.build()
+                break
+            except Exception as e:
+                time.sleep(self._get_retry_delay(attempt, e, retry=not started))
+            attempt += 1
+        self._log_interaction(ai_model_interaction, response, interaction_logger, attempt, time.monotonic() - start)
+        yield AIChatResponseDelta(response=response)
+
+    async def _stream_async(
+        self,
+        create_deltas: Callable[[], AsyncIterator[AIChatResponseDelta]],
+        ai_model_interaction: AIModelInteraction,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        """Async version of `_stream`"""
+        start = time.monotonic()
+        attempt = 1
+        builder = _ChatResponseBuilder()
+        while True:
+            started = False
+            try:
+                async for delta in create_deltas():
+                    started = True
+                    builder.add(delta)
+                    yield delta
+                response = builder.build()
+                break
+            except Exception as e:
+                await asyncio.sleep(self._get_retry_delay(attempt, e, retry=not started))
+            attempt += 1
+        self._log_interaction(ai_model_interaction, response, interaction_logger, attempt, time.monotonic() - start)
+        yield AIChatResponseDelta(response=response)
+
+    def _get_retry_delay(self, attempt: int, e: Exception, retry: bool = True) -> float:
+        """Returns seconds to wait before the next attempt or raises the error converted to `AIModelError`."""
+        error = to_ai_model_error(e)
+        delay = self.retry_policy.get_delay(attempt, error) if retry else None
+        if delay is None:
+            _log.error("Error (attempt %d): %s", attempt, error)
+            if error is e:
+                raise e
+            raise error from e
+        _log.warning("Retrying in %.1f s (attempt %d): %s", delay, attempt, error)
+        return delay
+
+    @staticmethod
+    def _log_interaction(
+        ai_model_interaction: AIModelInteraction,
+        response: AIChatResponse,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]],
+        attempts: Optional[int] = None,
+        latency: Optional[float] = None,
+    ) -> None:
+        if interaction_logger:
+            ai_model_interaction.attempts = attempts
+            ai_model_interaction.latency = latency
+            ai_model_interaction.response = response
+            interaction_logger(ai_model_interaction)
+
     @classmethod
     def _prompt_to_str(cls, prompt: str | AIPrompt) -> str:
         """Creates a string representation of AIPrompt object.
@@ -485,3 +706,83 @@ class BaseAIModel(ABC):
 
     except ImportError:
         pass
+
+
+class _ToolCallBuilder:
+    __slots__ = ("id", "function_name", "arguments", "thought_signature")
+
+    def __init__(self):
+        self.id: Optional[str] = None
+        self.function_name: Optional[str] = None
+        self.arguments: List[str] = []
+        self.thought_signature: Optional[str] = None
+
+
+class _ChatResponseBuilder:
+    """Assembles AIChatResponse from streamed deltas."""
+
+    _usage_fields = ("input_tokens", "input_tokens_cached", "reasoning_tokens", "output_tokens")
+
+    def __init__(self):
+        self.content: List[str] = []
+        self.tool_calls: Dict[int, _ToolCallBuilder] = {}
+        self.usage: Dict[str, int] = {}
+        self._last_index: Optional[int] = None
+
+    def add(self, delta: AIChatResponseDelta) -> Optional[int]:
+        """Adds the delta and returns the index of the tool call it belongs to (if any)."""
+        index = None
+        if delta.content:
+            self.content.append(delta.content)
+        if delta.tool_call_index is not None or delta.function_name or delta.arguments:
+            index = delta.tool_call_index
+            if index is None:
+                # Fragment without index belongs to the last tool call, a new name starts a new one
+                if delta.function_name or self._last_index is None:
+                    index = max(self.tool_calls, default=-1) + 1
+                else:
+                    index = self._last_index
+            self._last_index = index
+            tool_call = self.tool_calls.setdefault(index, _ToolCallBuilder())
+            tool_call.id = delta.tool_call_id or tool_call.id
+            tool_call.function_name = delta.function_name or tool_call.function_name
+            tool_call.thought_signature = delta.thought_signature or tool_call.thought_signature
+            if delta.arguments:
+                tool_call.arguments.append(delta.arguments)
+        for field in self._usage_fields:
+            value = getattr(delta, field)
+            if value is not None:
+                self.usage[field] = value
+        return index
+
+    def get_tool_call(self, index: int, complete: bool = False) -> Optional[AIModelToolCall]:
+        """Returns the tool call if its arguments are already complete JSON object.
+
+        Args:
+            index: The index of the tool call.
+            complete: The stream of the tool call has ended (empty arguments mean no arguments).
+        """
+        t = self.tool_calls[index]
+        arguments = "".join(t.arguments)
+        if not complete:
+            # A prefix of a JSON object is not valid JSON unless it is the whole object
+            if not arguments.rstrip().endswith("}"):
+                return None
+            try:
+                json.loads(arguments)
+            except json.JSONDecodeError:
+                return None
+        return AIModelToolCall(
+            id=t.id,
+            function_name=t.function_name or "",
+            arguments=json.loads(arguments or "{}"),
+            thought_signature=t.thought_signature,
+        )
+
+    def build(self) -> AIChatResponse:
+        tool_calls = [self.get_tool_call(index, complete=True) for index in sorted(self.tool_calls)]
+        return AIChatResponse(
+            content="".join(self.content) or None,
+            tool_calls=tool_calls or None,
+            **self.usage,
+        )
@@ -1,12 +1,14 @@
-from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from haintech.ai.base.base_ai_agent import BaseAIAgent
 from haintech.ai.base.base_ai_model import BaseAIModel
 from haintech.ai.base.base_rag_searcher import BaseRAGSearcher
-from haintech.ai.model import AIChatResponse, AIMultiagentSession
+from haintech.ai.base.supervisor_mixin import SupervisorMixin, _group_by_agent, _isolated_session, _merge_interactions
+from haintech.ai.model import AIAgentInteraction, AIChatResponse, AIMultiagentSession
 
 
-class BaseAISupervisor(BaseAIAgent):
+class BaseAISupervisor(SupervisorMixin, BaseAIAgent):
     """Base AI Supervisor. It is AI Agent with subagents."""
 
     def __init__(
@@ -19,7 +21,15 @@ class BaseAISupervisor(BaseAIAgent):
         searcher: Optional[BaseRAGSearcher] = None,
         functions: Optional[List[Callable]] = None,
         agents: Optional[List[BaseAIAgent]] = None,
+        max_concurrent_agents: int = 1,
     ):
+        """Base AI Supervisor.
+
+        Args:
+            max_concurrent_agents: the maximum number of agents called concurrently
+                (in threads), agents are called one by one by default
+            other: see BaseAIAgent
+        """
         super().__init__(
             name=name,
             description=description,
@@ -30,88 +40,56 @@ class BaseAISupervisor(BaseAIAgent):
             functions=functions,
         )
         self.session: Optional[AIMultiagentSession] = session
+        self.max_concurrent_agents = max_concurrent_agents
         self.agents: Dict[str, BaseAIAgent] = {}
         if agents:
             for agent in agents:
                 self.add_agent(agent)
         self.agent_tool_calls: Dict[str, List[str]] = {}
 
-    def add_agent(self, agent: BaseAIAgent):
-        """Add agent to supervisor
-
-        * Agent is added as a function.
-        * Agents' sessions are reflections to
-          Supervisor's session.
-
-        Args:
-            agent: agent to add
-        """
-        self.add_function(
-            agent.get_response,
-            name=agent.get_name(),
-            definition=self.get_agent_definition(agent),
-        )
-        if self.session:
-            agent.set_session(self.session.create_agent_session(agent.name))
-        self.agents[agent.name] = agent
+    def accept_tools(self, tool_call_ids: str | List[str]) -> AIChatResponse:
+        """Accept calling tools, call them and return response
 
-    def get_agent_definition(self, agent: BaseAIAgent) -> Any:
-        """Return agent definition
+        Accepted agents are called concurrently if `max_concurrent_agents` > 1.
+        If agents require calling their tools, the response with their tool calls
+        (ids prefixed with agent names) is returned.
 
         Args:
-            agent: agent
+            tool_call_ids: list of accepted tool call ids
         Returns:
-            definition: agent definition
+            response: AI response
         """
-        return self.ai_model.prepare_function_definition(
-            agent.get_response,
-            name=agent.get_name(),
-            description=agent.description,
+        plan = self._plan_agent_calls(tool_call_ids)
+        responses = self._run_agent_calls(plan.calls)
+        response = self._resolve_agent_responses(
+            plan, responses, lambda id, name, arguments: self.call_function(id, name, **arguments)
         )
+        return response or self.get_response()
 
-    def accept_tools(self, tool_call_ids: str | List[str]) -> AIChatResponse:
-        """Accept calling tools, call them and return response
+    def _run_agent_calls(self, calls: List[Tuple[str, Callable[[], AIChatResponse]]]) -> List[AIChatResponse]:
+        """Runs calls of agents and returns their results in the order of calls.
 
-        Args:
-            tool_call_ids: list of accepted tool call ids
-        Returns:
-            response: AI response
+        Calls of different agents run concurrently if `max_concurrent_agents` > 1,
+        calls of the same agent run one by one.
         """
-        if isinstance(tool_call_ids, str):
-            tool_call_ids = [tool_call_ids]
-
-        agent_responded_ids = []
-        for supervisor_tc_id, agent_tc_ids in self.agent_tool_calls.items():
-            if set(tool_call_ids).intersection(agent_tc_ids):
-                agent = self.agents[agent_tc_ids[0].split("__")[0]]
-                agent_response = self.accept_agent_tools(agent, tool_call_ids)
-                if agent_response.content:
-                    self.add_tool_message(supervisor_tc_id, agent_response.content)
-                    agent_responded_ids.append(supervisor_tc_id)
-
-        for id, name, arguments in self.iter_tool_calls():
-            if id in tool_call_ids:
-                if name.startswith("Agent__"):
-                    self._log.debug(
-                        "Calling agent: %s : %s with arguments: %s", id, name, arguments
-                    )
-                    agent_resp = self.call_agent(id, name[7:], **arguments)
-                    if agent_resp and agent_resp.tool_calls:
-                        return agent_resp
-                    # Agent returns response without calling tools
-                    if agent_resp and agent_resp.content:
-                        self.add_tool_message(id, agent_resp.content)
-
-                else:
-                    self.call_function(id, name, **arguments)
-            elif id and id not in agent_responded_ids:
-                self.add_tool_message(id, "User refused execution.")
-
-        return self.get_response()
-
-    def accept_agent_tools(
-        self, agent: BaseAIAgent, tool_call_ids: str | List[str]
-    ) -> AIChatResponse:
+        groups = _group_by_agent(calls)
+        if self.max_concurrent_agents <= 1 or len(groups) <= 1:
+            return [call() for _, call in calls]
+        results: List[Any] = [None] * len(calls)
+
+        def run_group(agent_name: str, indices: List[int]) -> List[AIAgentInteraction]:
+            with _isolated_session(self.agents[agent_name], self.session) as interactions:
+                for i in indices:
+                    results[i] = calls[i][1]()
+            return interactions
+
+        with ThreadPoolExecutor(min(self.max_concurrent_agents, len(groups))) as pool:
+            futures = [pool.submit(run_group, agent_name, indices) for agent_name, indices in groups.items()]
+            merged = [f.result() for f in futures]
+        _merge_interactions(self.session, merged)
+        return results
+
+    def accept_agent_tools(self, agent: BaseAIAgent, tool_call_ids: str | List[str]) -> AIChatResponse:
         """Accept calling tools, call them and return response
 
         Args:
@@ -120,15 +98,9 @@ class BaseAISupervisor(BaseAIAgent):
         Returns:
             response: AI response
         """
-        prefix = f"{agent.name}__"
-        agent_tool_call_ids = [
-            id.removeprefix(prefix) for id in tool_call_ids if id.startswith(prefix)
-        ]
-        return agent.accept_tools(agent_tool_call_ids)
-
-    def call_agent(
-        self, tool_call_id: str, agent_name: str, **arguments
-    ) -> AIChatResponse | None:
+        return agent.accept_tools(self._get_agent_tool_call_ids(agent, tool_call_ids))
+
+    def call_agent(self, tool_call_id: str, agent_name: str, **arguments) -> AIChatResponse | None:
         """Call agent and return response
 
         Args:
@@ -138,20 +110,6 @@ class BaseAISupervisor(BaseAIAgent):
         Returns:
             response: AI response
         """
-        agent = self.agents[agent_name]
         self._log.debug("Agent: %s", agent_name)
-        response = agent.get_response(**arguments)
-        self._log.debug("Agent response: %s", response)
-
-        if response.tool_calls:
-            # Agent requires calling tools
-            # I store link between supervisor call and agent calls
-            self.agent_tool_calls[tool_call_id] = []
-            # And return copy of agent response with renamed call_ids
-            response = AIChatResponse(**response.model_dump())
-            for tool_call in response.tool_calls or []:
-                tool_call.id = f"{agent_name}__{tool_call.id}"
-                self.agent_tool_calls[tool_call_id].append(tool_call.id)
-        else:
-            self._log.info("%s: %s", agent_name, response.content)
-        return response
+        response = self.agents[agent_name].get_response(**arguments)
+        return self._handle_agent_response(tool_call_id, agent_name, response)
@@ -0,0 +1,131 @@
+import asyncio
+import weakref
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from haintech.ai.base.base_ai_agent_async import BaseAIAgentAsync
+from haintech.ai.base.base_ai_model import BaseAIModel
+from haintech.ai.base.base_rag_searcher import BaseRAGSearcher
+from haintech.ai.base.supervisor_mixin import SupervisorMixin, _group_by_agent, _isolated_session, _merge_interactions
+from haintech.ai.model import AIAgentInteraction, AIChatResponse, AIMultiagentSession
+from haintech.profiling import Profiler
+
+
+class BaseAISupervisorAsync(SupervisorMixin, BaseAIAgentAsync):
+    """Base AI Supervisor async version. It is AI Agent with subagents
+    which are called concurrently."""
+
+    def __init__(
+        self,
+        ai_model: BaseAIModel,
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+        system_prompt: Optional[str] = None,
+        session: Optional[AIMultiagentSession] = None,
+        searcher: Optional[BaseRAGSearcher] = None,
+        functions: Optional[List[Callable]] = None,
+        agents: Optional[List[BaseAIAgentAsync]] = None,
+        profiler: Optional[Profiler] = None,
+        max_concurrent_tools: int = 10,
+        tool_timeout: Optional[float] = None,
+        max_concurrent_agents: int = 10,
+    ):
+        """Base AI Supervisor async version.
+
+        Args:
+            max_concurrent_agents: the maximum number of agents called concurrently
+            other: see BaseAIAgentAsync
+        """
+        super().__init__(
+            name=name,
+            description=description,
+            ai_model=ai_model,
+            system_prompt=system_prompt,
+            session=session,
+            searcher=searcher,
+            functions=functions,
+            profiler=profiler,
+            max_concurrent_tools=max_concurrent_tools,
+            tool_timeout=tool_timeout,
+        )
+        self.session: Optional[AIMultiagentSession] = session
+        self.max_concurrent_agents = max_concurrent_agents
+        self._agent_semaphores: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore] = (
+            weakref.WeakKeyDictionary()
+        )
+        self.agents: Dict[str, BaseAIAgentAsync] = {}
+        if agents:
+            for agent in agents:
+                self.add_agent(agent)
+        self.agent_tool_calls: Dict[str, List[str]] = {}
+
+    async def accept_tools(self, tool_call_ids: str | List[str]) -> AIChatResponse:
+        """Accept calling tools, call them concurrently and return response
+
+        If agents require calling their tools, the response with their tool calls
+        (ids prefixed with agent names) is returned.
+
+        Args:
+            tool_call_ids: list of accepted tool call ids
+        Returns:
+            response: AI response
+        """
+        plan = self._plan_agent_calls(tool_call_ids)
+        # Agents and functions run concurrently
+        responses, function_results = await asyncio.gather(
+            self._run_agent_calls(plan.calls), self._call_functions(plan.function_calls)
+        )
+        response = self._resolve_agent_responses(
+            plan, responses, lambda id, name, arguments: self.add_tool_message(id, function_results[id])
+        )
+        return response or await self.get_response()
+
+    async def _run_agent_calls(
+        self, calls: List[Tuple[str, Callable[[], Awaitable[AIChatResponse | None]]]]
+    ) -> List[AIChatResponse]:
+        """Runs calls of agents concurrently and returns their results in the order of calls.
+
+        Calls of the same agent run one by one.
+        """
+        groups = _group_by_agent(calls)
+        results: List[Any] = [None] * len(calls)
+        loop = asyncio.get_running_loop()
+        semaphore = self._agent_semaphores.get(loop)
+        if semaphore is None:
+            # Semaphores are bound to the event loop, the supervisor can be used by many loops
+            semaphore = self._agent_semaphores[loop] = asyncio.Semaphore(self.max_concurrent_agents)
+
+        async def run_group(agent_name: str, indices: List[int]) -> List[AIAgentInteraction]:
+            async with semaphore:
+                with _isolated_session(self.agents[agent_name], self.session) as interactions:
+                    for i in indices:
+                        results[i] = await calls[i][1]()
+                return interactions
+
+        merged = await asyncio.gather(*[run_group(agent_name, indices) for agent_name, indices in groups.items()])
+        _merge_interactions(self.session, merged)
+        return results
+
+    async def accept_agent_tools(self, agent: BaseAIAgentAsync, tool_call_ids: str | List[str]) -> AIChatResponse:
+        """Accept calling tools, call them and return response
+
+        Args:
+            agent: agent to call
+            tool_call_ids: list of accepted tool call ids
+        Returns:
+            response: AI response
+        """
+        return await agent.accept_tools(self._get_agent_tool_call_ids(agent, tool_call_ids))
+
+    async def call_agent(self, tool_call_id: str, agent_name: str, **arguments) -> AIChatResponse | None:
+        """Call agent and return response
+
+        Args:
+            tool_call_id: tool call id
+            agent_name: agent name
+            arguments: arguments for agent
+        Returns:
+            response: AI response
+        """
+        self._log.debug("Agent: %s", agent_name)
+        response = await self.agents[agent_name].get_response(**arguments)
+        return self._handle_agent_response(tool_call_id, agent_name, response)
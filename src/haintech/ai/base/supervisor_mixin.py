@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from functools import partial
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional, Set, Tuple
+
+from haintech.ai.model import (
+    AIAgentInteraction,
+    AIAgentSession,
+    AIChatResponse,
+    AIModelInteractionMessage,
+    AIMultiagentSession,
+)
+
+if TYPE_CHECKING:
+    from haintech.ai.base.base_ai_agent import BaseAIAgent
+    from haintech.ai.base.base_ai_agent_async import BaseAIAgentAsync
+    from haintech.ai.base.base_ai_model import BaseAIModel
+
+AGENT_PREFIX = "Agent__"
+
+
+@dataclass
+class _AgentCallPlan:
+    """Calls planned by `accept_tools` of supervisors."""
+
+    tool_call_ids: List[str]
+    tool_calls: List[Tuple[str | None, str, Dict[str, Any]]]
+    pending: List[Tuple[str, str]] = field(default_factory=list)
+    """(supervisor tool call id, agent name) of agents waiting for acceptance of their tool calls"""
+    agent_calls: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    """(tool call id, agent name, arguments) of accepted agent calls"""
+    function_calls: List[Tuple[str, str, Dict[str, Any]]] = field(default_factory=list)
+    """(tool call id, function name, arguments) of accepted function calls"""
+    calls: List[Tuple[str, Callable[[], Any]]] = field(default_factory=list)
+    """(agent name, call) - calls of pending and accepted agents"""
+
+    @property
+    def call_ids(self) -> List[str]:
+        """Supervisor tool call ids of `calls` (in the same order)"""
+        return [id for id, _ in self.pending] + [id for id, _, _ in self.agent_calls]
+
+
+class SupervisorMixin:
+    """Steps of supervisors shared by `BaseAISupervisor` and `BaseAISupervisorAsync`.
+
+    Tool calls are planned and agent responses are resolved here,
+    only agents and functions are executed by the supervisors (sync or async).
+    """
+
+    _log: logging.Logger
+    ai_model: BaseAIModel
+    session: Optional[AIMultiagentSession]
+    agents: Dict[str, Any]
+    agent_tool_calls: Dict[str, List[str]]
+    history: List[AIModelInteractionMessage]
+    add_function: Callable[..., None]
+    add_tool_message: Callable[[str, str], None]
+    iter_tool_calls: Callable[[], Iterator[Tuple[str | None, str, Dict[str, Any]]]]
+    accept_agent_tools: Callable[..., Any]
+    call_agent: Callable[..., Any]
+
+    def add_agent(self, agent: BaseAIAgent | BaseAIAgentAsync):
+        """Add agent to supervisor
+
+        * Agent is added as a function.
+        * Agents' sessions are reflections to
+          Supervisor's session.
+
+        Args:
+            agent: agent to add
+        """
+        self.add_function(
+            agent.get_response,
+            name=agent.get_name(),
+            definition=self.get_agent_definition(agent),
+        )
+        if self.session:
+            agent.set_session(self.session.create_agent_session(agent.name))
+        self.agents[agent.name] = agent
+
+    def get_agent_definition(self, agent: BaseAIAgent | BaseAIAgentAsync) -> Any:
+        """Return agent definition
+
+        Args:
+            agent: agent
+        Returns:
+            definition: agent definition
+        """
+        return self.ai_model.prepare_function_definition(
+            agent.get_response,
+            name=agent.get_name(),
+            description=agent.description,
+        )
+
+    def _plan_agent_calls(self, tool_call_ids: str | List[str]) -> _AgentCallPlan:
+        """Returns calls of agents and functions accepted by tool call ids."""
+        if isinstance(tool_call_ids, str):
+            tool_call_ids = [tool_call_ids]
+        plan = _AgentCallPlan(tool_call_ids=tool_call_ids, tool_calls=list(self.iter_tool_calls()))
+        # Agents linked their tool calls in the order they responded, results follow the order of calls
+        order = {id: i for i, (id, _, _) in enumerate(plan.tool_calls)}
+        plan.pending = sorted(
+            (
+                (supervisor_tc_id, agent_tc_ids[0].split("__")[0])
+                for supervisor_tc_id, agent_tc_ids in self.agent_tool_calls.items()
+                if set(tool_call_ids).intersection(agent_tc_ids)
+            ),
+            key=lambda pending: order.get(pending[0], len(order)),
+        )
+        for id, name, arguments in plan.tool_calls:
+            if id and id in tool_call_ids:
+                if name.startswith(AGENT_PREFIX):
+                    self._log.debug("Calling agent: %s : %s with arguments: %s", id, name, arguments)
+                    plan.agent_calls.append((id, name.removeprefix(AGENT_PREFIX), arguments))
+                else:
+                    plan.function_calls.append((id, name, arguments))
+        plan.calls = [
+            (agent_name, partial(self.accept_agent_tools, self.agents[agent_name], tool_call_ids))
+            for _, agent_name in plan.pending
+        ] + [
+            (agent_name, partial(self.call_agent, id, agent_name, **arguments))
+            for id, agent_name, arguments in plan.agent_calls
+        ]
+        return plan
+
+    def _resolve_agent_responses(
+        self,
+        plan: _AgentCallPlan,
+        responses: List[AIChatResponse],
+        add_function_result: Callable[[str, str, Dict[str, Any]], Any],
+    ) -> Optional[AIChatResponse]:
+        """Adds results of agents and functions (in the order of tool calls) and refuses other calls.
+
+        Args:
+            plan: The plan of calls.
+            responses: Responses of `plan.calls`.
+            add_function_result: Adds the result of the accepted function call to the history.
+        Returns:
+            The merged response of agents requiring tool calls or None if all calls are answered.
+        """
+        agent_responses = dict(zip(plan.call_ids, responses))
+        answered = _answered_tool_call_ids(self.history)
+        agent_responded_ids = []
+        tool_call_responses = []
+        for supervisor_tc_id, agent_name in plan.pending:
+            agent_response = agent_responses[supervisor_tc_id]
+            if agent_response.tool_calls:
+                tool_call_responses.append(self._link_agent_tool_calls(supervisor_tc_id, agent_name, agent_response))
+            elif agent_response.content:
+                self.add_tool_message(supervisor_tc_id, agent_response.content)
+                agent_responded_ids.append(supervisor_tc_id)
+                del self.agent_tool_calls[supervisor_tc_id]
+
+        for id, name, arguments in plan.tool_calls:
+            if id and id in plan.tool_call_ids:
+                if name.startswith(AGENT_PREFIX):
+                    agent_resp = agent_responses[id]
+                    if agent_resp and agent_resp.tool_calls:
+                        tool_call_responses.append(agent_resp)
+                    # Agent returns response without calling tools
+                    elif agent_resp and agent_resp.content:
+                        self.add_tool_message(id, agent_resp.content)
+                else:
+                    add_function_result(id, name, arguments)
+            elif id and id not in agent_responded_ids and id not in answered and id not in self.agent_tool_calls:
+                self.add_tool_message(id, "User refused execution.")
+
+        if tool_call_responses:
+            return _merge_responses(tool_call_responses)
+        return None
+
+    @staticmethod
+    def _get_agent_tool_call_ids(agent: BaseAIAgent | BaseAIAgentAsync, tool_call_ids: str | List[str]) -> List[str]:
+        """Returns accepted tool call ids of the agent (without the agent name prefix)."""
+        if isinstance(tool_call_ids, str):
+            tool_call_ids = [tool_call_ids]
+        prefix = f"{agent.name}__"
+        return [id.removeprefix(prefix) for id in tool_call_ids if id.startswith(prefix)]
+
+    def _handle_agent_response(self, tool_call_id: str, agent_name: str, response: AIChatResponse) -> AIChatResponse:
+        """Returns the agent response with tool calls linked to the supervisor tool call."""
+        self._log.debug("Agent response: %s", response)
+        if response.tool_calls:
+            # Agent requires calling tools
+            return self._link_agent_tool_calls(tool_call_id, agent_name, response)
+        self._log.info("%s: %s", agent_name, response.content)
+        return response
+
+    def _link_agent_tool_calls(self, tool_call_id: str, agent_name: str, response: AIChatResponse) -> AIChatResponse:
+        # I store link between supervisor call and agent calls
+        self.agent_tool_calls[tool_call_id] = []
+        # And return copy of agent response with renamed call_ids
+        response = AIChatResponse(**response.model_dump())
+        for tool_call in response.tool_calls or []:
+            tool_call.id = f"{agent_name}__{tool_call.id}"
+            self.agent_tool_calls[tool_call_id].append(tool_call.id)
+        return response
+
+
+def _group_by_agent(calls: Iterable[Tuple[str, Any]]) -> Dict[str, List[int]]:
+    """Returns indices of calls by agent name (in the order of the first call)."""
+    groups: Dict[str, List[int]] = {}
+    for i, (agent_name, _) in enumerate(calls):
+        groups.setdefault(agent_name, []).append(i)
+    return groups
+
+
+@contextmanager
+def _isolated_session(
+    agent: BaseAIAgent | BaseAIAgentAsync, session: Optional[AIMultiagentSession]
+) -> Iterator[List[AIAgentInteraction]]:
+    """Agent writes interactions to its own copy of the supervisor session.
+
+    New interactions are returned in the list (when the block ends), so interactions
+    of agents running concurrently are not interleaved in the supervisor session.
+    """
+    interactions: List[AIAgentInteraction] = []
+    if not session:
+        yield interactions
+        return
+    agent_session, interaction_logger = agent.session, agent._interaction_logger
+    buffer = list(session.interactions)
+    start = len(buffer)
+    agent.session = AIAgentSession(agent_name=agent.name, interactions=buffer)
+    agent.set_interaction_logger(agent.session.add_interaction)
+    try:
+        yield interactions
+    finally:
+        agent.session = agent_session
+        agent._interaction_logger = interaction_logger
+        interactions.extend(buffer[start:])
+
+
+def _merge_interactions(session: Optional[AIMultiagentSession], merged: List[List[AIAgentInteraction]]) -> None:
+    """Adds interactions of agents to the supervisor session in the order of agent calls."""
+    if session:
+        for interactions in merged:
+            session.interactions.extend(interactions)
+
+
+def _answered_tool_call_ids(history: List[AIModelInteractionMessage]) -> Set[str]:
+    """Returns ids of tool calls of the last response which already have results."""
+    ret = set()
+    for m in reversed(history):
+        if m.tool_calls:
+            break
+        if m.role == "tool" and m.tool_call_id:
+            ret.add(m.tool_call_id)
+    return ret
+
+
+def _merge_responses(responses: List[AIChatResponse]) -> AIChatResponse:
+    """Merges responses of agents requiring tools into one response."""
+    if len(responses) == 1:
+        return responses[0]
+    return AIChatResponse(
+        content="\n".join(r.content for r in responses if r.content) or None,
+        tool_calls=[tc for r in responses for tc in r.tool_calls or []],
+    )
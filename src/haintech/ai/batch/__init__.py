@@ -0,0 +1,11 @@
+from .base_batch_backend import BaseBatchBackend
+from .local_batch_backend import LocalBatchBackend
+from .model import BatchJob, BatchRequest, BatchResult
+
+__all__ = [
+    "BaseBatchBackend",
+    "BatchJob",
+    "BatchRequest",
+    "BatchResult",
+    "LocalBatchBackend",
+]
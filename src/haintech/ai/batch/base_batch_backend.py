@@ -0,0 +1,95 @@
+import asyncio
+import logging
+import time
+from abc import ABC, abstractmethod
+from typing import Iterable, List, Optional
+
+from ..base import BaseAIModel
+from ..exceptions import BatchRequestError
+from .model import BatchEndpoint, BatchJob, BatchRequest, BatchResult
+
+
+class BaseBatchBackend(ABC):
+    """Submits requests as one batch job and returns the results when the job is done.
+
+    Batch jobs are processed offline (within hours), so they are cheaper and are not
+    limited by interactive rate limits.
+    """
+
+    _log = logging.getLogger(__name__)
+    ai_model: Optional[BaseAIModel] = None
+    """The model which prepares requests and parses responses of chat requests"""
+
+    @abstractmethod
+    async def submit(self, requests: List[BatchRequest]) -> BatchJob:
+        """Submits the requests and returns the job."""
+
+    @abstractmethod
+    async def get_job(self, job: BatchJob) -> BatchJob:
+        """Returns the current state of the job."""
+
+    @abstractmethod
+    async def get_results(self, job: BatchJob) -> List[BatchResult]:
+        """Returns the results of the finished job (in any order)."""
+
+    @abstractmethod
+    async def cancel(self, job: BatchJob) -> BatchJob:
+        """Cancels the job, the results of finished requests are still available."""
+
+    async def wait(self, job: BatchJob, poll_interval: float = 60.0, timeout: Optional[float] = None) -> BatchJob:
+        """Polls the job until it is done.
+
+        Args:
+            job: The job.
+            poll_interval: Seconds between polls.
+            timeout: Seconds to wait, then the job is cancelled and TimeoutError is raised.
+        """
+        start = time.monotonic()
+        while True:
+            job = await self.get_job(job)
+            if job.is_done:
+                self._log.info("Batch %s %s: %d completed, %d failed", job.id, job.status, job.completed, job.failed)
+                return job
+            if timeout is not None and time.monotonic() - start + poll_interval > timeout:
+                await self.cancel(job)
+                raise TimeoutError(f"Batch {job.id} is not done in {timeout} seconds")
+            self._log.debug("Batch %s: %d of %d done", job.id, job.completed + job.failed, job.total)
+            await asyncio.sleep(poll_interval)
+
+    async def run(
+        self, requests: List[BatchRequest], poll_interval: float = 60.0, timeout: Optional[float] = None
+    ) -> List[BatchResult]:
+        """Submits the requests, waits for the job and returns the results in the order of requests.
+
+        Requests without result (e.g. expired) are returned with an error.
+        """
+        job = await self.submit(requests)
+        self._log.info("Batch %s submitted: %d requests", job.id, len(requests))
+        job = await self.wait(job, poll_interval, timeout)
+        results = {r.custom_id: r for r in await self.get_results(job)}
+        return [
+            results.get(r.custom_id) or BatchResult(custom_id=r.custom_id, error=f"No result, batch {job.status}")
+            for r in requests
+        ]
+
+    async def get_embeddings(
+        self, texts: Iterable[str], poll_interval: float = 60.0, timeout: Optional[float] = None
+    ) -> List[List[float] | BatchRequestError]:
+        """Embeds texts in one batch job, failed texts are returned as errors."""
+        requests = [BatchRequest(custom_id=f"text-{i}", text=text) for i, text in enumerate(texts)]
+        return [
+            r.embedding if r.embedding is not None else BatchRequestError(r.custom_id, r.error or "No embedding")
+            for r in await self.run(requests, poll_interval, timeout)
+        ]
+
+    @staticmethod
+    def _get_endpoint(requests: List[BatchRequest]) -> BatchEndpoint:
+        """Returns the endpoint of requests, a batch contains requests of one endpoint with unique ids."""
+        if not requests:
+            raise ValueError("Batch is empty")
+        endpoints = {r.endpoint for r in requests}
+        if len(endpoints) > 1:
+            raise ValueError("Batch contains both chat and embedding requests")
+        if len({r.custom_id for r in requests}) < len(requests):
+            raise ValueError("Custom ids of batch requests are not unique")
+        return endpoints.pop()
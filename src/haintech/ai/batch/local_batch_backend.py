@@ -0,0 +1,107 @@
+import asyncio
+import uuid
+from pathlib import Path
+from typing import List, Optional, override
+
+from ..base import BaseAIModel, BaseAITextEmbeddingModel
+from ..model import AIModelInteractionMessage
+from .base_batch_backend import BaseBatchBackend
+from .model import BatchJob, BatchRequest, BatchResult
+
+
+class LocalBatchBackend(BaseBatchBackend):
+    """File based batch backend, requests are sent to interactive models when the job is polled.
+
+    It is a stand-in of provider backends for tests and development. Each job is stored
+    in its own directory (`input.jsonl`, `job.json` and `output.jsonl`), so jobs can be
+    polled by another process.
+    """
+
+    def __init__(
+        self,
+        path: str | Path,
+        ai_model: Optional[BaseAIModel] = None,
+        embedding_model: Optional[BaseAITextEmbeddingModel] = None,
+        max_concurrent: int = 10,
+    ):
+        """File based batch backend.
+
+        Args:
+            path: The directory of jobs.
+            ai_model: The model of chat requests.
+            embedding_model: The model of embedding requests.
+            max_concurrent: The maximum number of requests processed concurrently.
+        """
+        self.path = Path(path)
+        self.ai_model = ai_model
+        self.embedding_model = embedding_model
+        self.max_concurrent = max_concurrent
+
+    @override
+    async def submit(self, requests: List[BatchRequest]) -> BatchJob:
+        endpoint = self._get_endpoint(requests)
+        if endpoint == "chat" and not self.ai_model:
+            raise ValueError("AI model is required for chat requests")
+        if endpoint == "embedding" and not self.embedding_model:
+            raise ValueError("Embedding model is required for embedding requests")
+        job = BatchJob(id=f"batch_{uuid.uuid4().hex}", endpoint=endpoint, total=len(requests))
+        job_path = self.path / job.id
+        job_path.mkdir(parents=True)
+        (job_path / "input.jsonl").write_text("".join(r.model_dump_json() + "\n" for r in requests), encoding="utf-8")
+        self._save_job(job)
+        return job
+
+    @override
+    async def get_job(self, job: BatchJob) -> BatchJob:
+        job = BatchJob.model_validate_json((self.path / job.id / "job.json").read_text(encoding="utf-8"))
+        if job.is_done:
+            return job
+        lines = (self.path / job.id / "input.jsonl").read_text(encoding="utf-8").splitlines()
+        semaphore = asyncio.Semaphore(self.max_concurrent)
+
+        async def process(request: BatchRequest) -> BatchResult:
+            async with semaphore:
+                return await self._process_request(request)
+
+        results = await asyncio.gather(*[process(BatchRequest.model_validate_json(line)) for line in lines])
+        (self.path / job.id / "output.jsonl").write_text(
+            "".join(r.model_dump_json() + "\n" for r in results), encoding="utf-8"
+        )
+        job.failed = sum(1 for r in results if r.error)
+        job.completed = len(results) - job.failed
+        job.status = "completed"
+        self._save_job(job)
+        return job
+
+    @override
+    async def get_results(self, job: BatchJob) -> List[BatchResult]:
+        output_path = self.path / job.id / "output.jsonl"
+        if not output_path.exists():
+            return []
+        return [BatchResult.model_validate_json(line) for line in output_path.read_text(encoding="utf-8").splitlines()]
+
+    @override
+    async def cancel(self, job: BatchJob) -> BatchJob:
+        job = BatchJob.model_validate_json((self.path / job.id / "job.json").read_text(encoding="utf-8"))
+        if not job.is_done:
+            job.status = "cancelled"
+            self._save_job(job)
+        return job
+
+    async def _process_request(self, request: BatchRequest) -> BatchResult:
+        try:
+            if request.endpoint == "embedding":
+                embedding = await self.embedding_model.get_embedding_async(request.text)  # type: ignore
+                return BatchResult(custom_id=request.custom_id, embedding=embedding)
+            response = await self.ai_model.get_chat_response_async(  # type: ignore
+                system_prompt=request.system_prompt,
+                message=AIModelInteractionMessage(role="user", content=request.message),
+                response_format=request.response_format,
+            )
+            return BatchResult(custom_id=request.custom_id, response=response)
+        except Exception as e:
+            self._log.warning("Batch request %s failed: %s", request.custom_id, e)
+            return BatchResult(custom_id=request.custom_id, error=str(e))
+
+    def _save_job(self, job: BatchJob) -> None:
+        (self.path / job.id / "job.json").write_text(job.model_dump_json(), encoding="utf-8")
@@ -0,0 +1,53 @@
+import time
+from typing import Any, Dict, List, Literal, Optional
+
+from pydantic import BaseModel, Field
+
+from ..model import AIChatResponse
+
+BatchEndpoint = Literal["chat", "embedding"]
+BatchStatus = Literal["in_progress", "completed", "failed", "cancelled", "expired"]
+
+
+class BatchRequest(BaseModel):
+    """A request of a batch job - a chat request or a text to embed (if `text` is set)."""
+
+    custom_id: str
+    """Id of the request, unique in the batch (Anthropic accepts only letters, digits, `_` and `-`)"""
+    system_prompt: Optional[str] = None
+    message: Optional[str] = None
+    response_format: Literal["text", "json"] | Dict[str, Any] = "text"
+    """Response format prepared by the model (see `BaseAIModel._prepare_response_format`)"""
+    text: Optional[str] = None
+    """Text to embed"""
+
+    @property
+    def endpoint(self) -> BatchEndpoint:
+        return "embedding" if self.text is not None else "chat"
+
+
+class BatchResult(BaseModel):
+    """A result of a batch request, `error` is set if the request failed."""
+
+    custom_id: str
+    response: Optional[AIChatResponse] = None
+    embedding: Optional[List[float]] = None
+    error: Optional[str] = None
+
+
+class BatchJob(BaseModel):
+    """A batch job submitted to a backend."""
+
+    id: str
+    endpoint: BatchEndpoint = "chat"
+    status: BatchStatus = "in_progress"
+    total: int = 0
+    completed: int = 0
+    failed: int = 0
+    created: float = Field(default_factory=time.time)
+    metadata: Dict[str, Any] = {}
+    """Backend specific data (e.g. ids of output files)"""
+
+    @property
+    def is_done(self) -> bool:
+        return self.status != "in_progress"
@@ -0,0 +1,17 @@
+from .cached_ai_model import CacheStats, CachedAIModel
+from .prompt_cache import PromptCacheStats, get_prompt_cache_stats
+from .response_cache import BaseResponseCache, MemoryResponseCache, SQLiteResponseCache, TieredResponseCache
+from .semantic_cached_ai_model import SemanticCachedAIModel, SemanticResponseCache
+
+__all__ = [
+    "BaseResponseCache",
+    "CachedAIModel",
+    "CacheStats",
+    "MemoryResponseCache",
+    "PromptCacheStats",
+    "SemanticCachedAIModel",
+    "SemanticResponseCache",
+    "SQLiteResponseCache",
+    "TieredResponseCache",
+    "get_prompt_cache_stats",
+]
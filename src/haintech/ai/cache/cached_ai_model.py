@@ -0,0 +1,385 @@
+import asyncio
+import hashlib
+import json
+import logging
+import threading
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Optional, override
+
+from pydantic import BaseModel, computed_field
+
+from ..base import BaseAIModel
+from ..model import (
+    AIChatResponse,
+    AIChatResponseDelta,
+    AIContext,
+    AIModelInteraction,
+    AIModelInteractionMessage,
+    AIPrompt,
+)
+from .response_cache import BaseResponseCache, MemoryResponseCache, SQLiteResponseCache, TieredResponseCache
+
+
+class CacheStats(BaseModel):
+    """Statistics of the response cache."""
+
+    hits: int = 0
+    misses: int = 0
+    input_tokens: int = 0
+    """Input tokens of responses returned by the model (misses)"""
+    output_tokens: int = 0
+    """Output tokens of responses returned by the model (misses)"""
+    input_tokens_saved: int = 0
+    """Input tokens of responses returned from the cache (hits)"""
+    output_tokens_saved: int = 0
+    """Output tokens of responses returned from the cache (hits)"""
+
+    @computed_field
+    @property
+    def hit_rate(self) -> float:
+        return self.hits / (self.hits + self.misses) if self.hits or self.misses else 0.0
+
+
+class CachedAIModel(BaseAIModel):
+    """AI model which returns stored responses for repeated identical requests.
+
+    The request key is a hash of the model (class, name and parameters), system prompt,
+    history, context, message (with hashes of blobs), function definitions and response format.
+    Responses with tool calls are not cached by default, because tools can give other results
+    when they are called again.
+    """
+
+    _log = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        ai_model: BaseAIModel,
+        cache: Optional[BaseResponseCache] = None,
+        max_size: int = 1000,
+        ttl: Optional[float] = None,
+        path: Optional[str | Path] = None,
+        cache_tool_calls: bool = False,
+    ):
+        """AI model which returns stored responses for repeated identical requests.
+
+        Args:
+            ai_model: The model to cache.
+            cache: The cache of responses, by default the in-memory LRU cache
+                (and SQLite cache in `path` if it is set).
+            max_size: The maximum number of responses in the in-memory cache.
+            ttl: Time to live of responses in seconds (no expiration by default).
+            path: Path to the SQLite database file of the persistent cache.
+            cache_tool_calls: Responses with tool calls are also cached.
+        """
+        self.ai_model = ai_model
+        if cache is None:
+            cache = MemoryResponseCache(max_size=max_size, ttl=ttl)
+            if path:
+                cache = TieredResponseCache(cache, SQLiteResponseCache(path, ttl=ttl))
+        self.cache = cache
+        self.cache_tool_calls = cache_tool_calls
+        self.stats = CacheStats()
+        self._stats_lock = threading.Lock()
+
+    def __getattr__(self, name: str) -> Any:
+        # model_name, parameters etc. of the cached model
+        if name == "ai_model":
+            raise AttributeError(name)
+        return getattr(self.ai_model, name)
+
+    @override
+    def get_chat_response(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AIChatResponse:
+        request = _Request(system_prompt, list(history or []), context, message, functions, response_format)
+        response = self._get(request, interaction_logger)
+        if response is None:
+            response = self.ai_model.get_chat_response(
+                system_prompt=system_prompt,
+                history=request.history,
+                context=context,
+                message=message,
+                functions=functions,
+                interaction_logger=interaction_logger,
+                response_format=response_format,
+            )
+            self._set(request, response)
+        return response
+
+    @override
+    async def get_chat_response_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AIChatResponse:
+        request = _Request(system_prompt, list(history or []), context, message, functions, response_format)
+        response = await self._get_async(request, interaction_logger)
+        if response is None:
+            response = await self.ai_model.get_chat_response_async(
+                system_prompt=system_prompt,
+                history=request.history,
+                context=context,
+                message=message,
+                functions=functions,
+                interaction_logger=interaction_logger,
+                response_format=response_format,
+            )
+            await self._set_async(request, response)
+        return response
+
+    @override
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        request = _Request(system_prompt, list(history or []), context, message, functions, response_format)
+        response = self._get(request, interaction_logger)
+        if response is not None:
+            yield from self._response_to_deltas(response)
+            return
+        for delta in self.ai_model.get_chat_response_stream(
+            system_prompt=system_prompt,
+            history=request.history,
+            context=context,
+            message=message,
+            functions=functions,
+            interaction_logger=interaction_logger,
+            response_format=response_format,
+        ):
+            if delta.response:
+                self._set(request, delta.response)
+            yield delta
+
+    @override
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        request = _Request(system_prompt, list(history or []), context, message, functions, response_format)
+        response = await self._get_async(request, interaction_logger)
+        if response is not None:
+            for delta in self._response_to_deltas(response):
+                yield delta
+            return
+        async for delta in self.ai_model.get_chat_response_stream_async(
+            system_prompt=system_prompt,
+            history=request.history,
+            context=context,
+            message=message,
+            functions=functions,
+            interaction_logger=interaction_logger,
+            response_format=response_format,
+        ):
+            if delta.response:
+                await self._set_async(request, delta.response)
+            yield delta
+
+    def get_key(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[List[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> str:
+        """Returns the cache key of the request (SHA-256 of its canonical JSON)."""
+        return _hash(
+            {
+                **self._get_model_fingerprint(),
+                "system_prompt": system_prompt,
+                "history": [_message_to_dict(m) for m in history or []],
+                "context": context,
+                "message": _message_to_dict(message) if message else None,
+                "functions": list(functions.values()) if functions else None,
+                "response_format": response_format,
+            }
+        )
+
+    def _get_model_fingerprint(self) -> Dict[str, Any]:
+        return {
+            "model": type(self.ai_model).__qualname__,
+            "model_name": getattr(self.ai_model, "model_name", None),
+            "parameters": getattr(self.ai_model, "parameters", None),
+        }
+
+    def _lookup(self, request: "_Request") -> Optional[AIChatResponse]:
+        """Returns the stored response for the request."""
+        return self.cache.get(self._get_request_key(request))
+
+    async def _lookup_async(self, request: "_Request") -> Optional[AIChatResponse]:
+        if self.cache.in_memory:
+            return self._lookup(request)
+        # Persistent caches (e.g. SQLite) block, so they are not read on the event loop
+        return await asyncio.to_thread(self._lookup, request)
+
+    def _store(self, request: "_Request", response: AIChatResponse) -> None:
+        """Stores the response of the request."""
+        self.cache.set(self._get_request_key(request), response)
+
+    async def _store_async(self, request: "_Request", response: AIChatResponse) -> None:
+        if self.cache.in_memory:
+            self._store(request, response)
+        else:
+            await asyncio.to_thread(self._store, request, response)
+
+    def _get_request_key(self, request: "_Request") -> str:
+        if request.key is None:
+            request.key = self.get_key(
+                request.system_prompt,
+                request.history,
+                request.context,
+                request.message,
+                request.functions,
+                request.response_format,
+            )
+        return request.key
+
+    def _get(
+        self, request: "_Request", interaction_logger: Optional[Callable[[AIModelInteraction], None]]
+    ) -> Optional[AIChatResponse]:
+        return self._on_lookup(request, self._lookup(request), interaction_logger)
+
+    async def _get_async(
+        self, request: "_Request", interaction_logger: Optional[Callable[[AIModelInteraction], None]]
+    ) -> Optional[AIChatResponse]:
+        return self._on_lookup(request, await self._lookup_async(request), interaction_logger)
+
+    def _on_lookup(
+        self,
+        request: "_Request",
+        response: Optional[AIChatResponse],
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]],
+    ) -> Optional[AIChatResponse]:
+        if response is None:
+            return None
+        self._log.debug("Cache hit: %s", request.key)
+        with self._stats_lock:
+            self.stats.hits += 1
+            self.stats.input_tokens_saved += response.input_tokens or 0
+            self.stats.output_tokens_saved += response.output_tokens or 0
+        if interaction_logger and (request.history or request.message):
+            # Sessions of agents are built from logged interactions
+            interaction_logger(
+                AIModelInteraction(
+                    model=getattr(self.ai_model, "model_name", None) or type(self.ai_model).__name__,
+                    prompt=request.system_prompt,
+                    history=request.history,
+                    context=request.context,
+                    message=request.message,
+                    response=response,
+                )
+            )
+        return response
+
+    def _set(self, request: "_Request", response: AIChatResponse) -> None:
+        if self._on_response(request, response):
+            self._store(request, response)
+
+    async def _set_async(self, request: "_Request", response: AIChatResponse) -> None:
+        if self._on_response(request, response):
+            await self._store_async(request, response)
+
+    def _on_response(self, request: "_Request", response: AIChatResponse) -> bool:
+        """Counts the response of the model and returns True if it can be cached."""
+        with self._stats_lock:
+            self.stats.misses += 1
+            self.stats.input_tokens += response.input_tokens or 0
+            self.stats.output_tokens += response.output_tokens or 0
+        if response.tool_calls and not self.cache_tool_calls:
+            return False
+        return response.content is not None or bool(response.tool_calls)
+
+    @override
+    def prepare_function_definition(
+        self,
+        func: Callable[..., Any],
+        name: Optional[str] = None,
+        description: Optional[str] = None,
+    ) -> Any:
+        return self.ai_model.prepare_function_definition(func, name=name, description=description)
+
+    def prepare_mcp_tool_definition(self, tool: Any) -> Dict[str, Any]:
+        return self.ai_model.prepare_mcp_tool_definition(tool)  # type: ignore
+
+
+class _Request:
+    """Arguments of one request to the model."""
+
+    __slots__ = ("system_prompt", "history", "context", "message", "functions", "response_format", "key", "embedding")
+
+    def __init__(
+        self,
+        system_prompt: Optional[str | AIPrompt],
+        history: List[AIModelInteractionMessage],
+        context: Optional[AIContext],
+        message: Optional[AIModelInteractionMessage],
+        functions: Optional[Dict[Callable, Any]],
+        response_format: Literal["text", "json"] | dict,
+    ):
+        self.system_prompt = system_prompt
+        self.history = history
+        self.context = context
+        self.message = message
+        self.functions = functions
+        self.response_format = response_format
+        self.key: Optional[str] = None
+        self.embedding: Optional[List[float]] = None
+
+
+def _hash(o: Any) -> str:
+    """Returns SHA-256 of canonical JSON of the object."""
+    canonical = json.dumps(o, sort_keys=True, separators=(",", ":"), default=_to_json)
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _message_to_dict(message: AIModelInteractionMessage) -> Dict[str, Any]:
+    ret = message.model_dump(mode="json", exclude={"blobs"})
+    if message.blobs:
+        ret["blobs"] = [
+            {
+                "name": blob.name,
+                "content_type": blob.content_type,
+                "sha256": hashlib.sha256(blob.content or b"").hexdigest(),
+            }
+            for blob in message.blobs
+        ]
+    return ret
+
+
+def _to_json(o: Any) -> Any:
+    if isinstance(o, BaseModel):
+        return o.model_dump(mode="json")
+    if isinstance(o, bytes):
+        return hashlib.sha256(o).hexdigest()
+    if isinstance(o, type):
+        return o.__qualname__
+    to_dict = getattr(o, "to_dict", None)
+    if callable(to_dict):
+        return to_dict()
+    # Objects without stable representation change the key, so they are never served from the cache
+    return repr(o)
@@ -0,0 +1,42 @@
+from typing import Iterable
+
+from pydantic import BaseModel, computed_field
+
+from ..model import AIAgentInteraction, AIChatResponse, AIModelInteraction
+
+
+class PromptCacheStats(BaseModel):
+    """Usage of prompt caches of providers."""
+
+    requests: int = 0
+    input_tokens: int = 0
+    input_tokens_cached: int = 0
+
+    @computed_field
+    @property
+    def hit_ratio(self) -> float:
+        """Part of input tokens read from the prompt cache."""
+        return self.input_tokens_cached / self.input_tokens if self.input_tokens else 0.0
+
+
+def get_prompt_cache_stats(
+    items: Iterable[AIChatResponse | AIModelInteraction | AIAgentInteraction],
+) -> PromptCacheStats:
+    """Sums cached input tokens of responses (e.g. interactions of a session).
+
+    Args:
+        items: responses or interactions with responses
+    Returns:
+        Statistics of the prompt cache
+    """
+    ret = PromptCacheStats()
+    for item in items:
+        if isinstance(item, AIAgentInteraction):
+            item = item.interaction
+        response = item.response if isinstance(item, AIModelInteraction) else item
+        if response is None or response.input_tokens is None:
+            continue
+        ret.requests += 1
+        ret.input_tokens += response.input_tokens
+        ret.input_tokens_cached += response.input_tokens_cached or 0
+    return ret
@@ -0,0 +1,156 @@
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from pathlib import Path
+from typing import Optional, Tuple
+
+from ..model import AIChatResponse
+
+
+class BaseResponseCache(ABC):
+    """Stores AI model responses by request key."""
+
+    in_memory: bool = False
+    """Responses are kept in the process memory, so they are read and stored without blocking I/O"""
+
+    @abstractmethod
+    def get(self, key: str) -> Optional[AIChatResponse]:
+        """Returns the response stored under the key (None if missing or expired)."""
+
+    @abstractmethod
+    def set(self, key: str, response: AIChatResponse) -> None:
+        """Stores the response under the key."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Removes all responses."""
+
+
+class MemoryResponseCache(BaseResponseCache):
+    """In-memory LRU cache of responses with time to live."""
+
+    in_memory = True
+
+    def __init__(self, max_size: int = 1000, ttl: Optional[float] = None):
+        """In-memory LRU cache of responses.
+
+        Args:
+            max_size: The maximum number of responses, the least recently used are removed.
+            ttl: Time to live of responses in seconds (no expiration by default).
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._items: OrderedDict[str, Tuple[float, AIChatResponse]] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[AIChatResponse]:
+        with self._lock:
+            item = self._items.get(key)
+            if item is None:
+                return None
+            created, response = item
+            if self.ttl is not None and time.time() - created > self.ttl:
+                del self._items[key]
+                return None
+            self._items.move_to_end(key)
+            return response.model_copy(deep=True)
+
+    def set(self, key: str, response: AIChatResponse) -> None:
+        with self._lock:
+            self._items[key] = (time.time(), response.model_copy(deep=True))
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._items.clear()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+
+class SQLiteResponseCache(BaseResponseCache):
+    """Persistent cache of responses in SQLite database, it survives restarts of the process."""
+
+    def __init__(self, path: str | Path, ttl: Optional[float] = None, table: str = "ai_response_cache"):
+        """Persistent cache of responses in SQLite database.
+
+        Args:
+            path: Path to the database file (created if it does not exist).
+            ttl: Time to live of responses in seconds (no expiration by default).
+            table: The name of the table.
+        """
+        if not table.isidentifier():
+            raise ValueError(f"Invalid table name: {table}")
+        self.path = Path(path)
+        self.ttl = ttl
+        self.table = table
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # One connection is shared by threads, access is serialized by the lock
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"CREATE TABLE IF NOT EXISTS {table} "
+                "(key TEXT PRIMARY KEY, created REAL NOT NULL, response TEXT NOT NULL)"
+            )
+
+    def get(self, key: str) -> Optional[AIChatResponse]:
+        with self._lock:
+            row = self._conn.execute(f"SELECT created, response FROM {self.table} WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            created, response = row
+            if self.ttl is not None and time.time() - created > self.ttl:
+                with self._conn:
+                    self._conn.execute(f"DELETE FROM {self.table} WHERE key = ?", (key,))
+                return None
+        return AIChatResponse.model_validate_json(response)
+
+    def set(self, key: str, response: AIChatResponse) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                f"INSERT OR REPLACE INTO {self.table} (key, created, response) VALUES (?, ?, ?)",
+                (key, time.time(), response.model_dump_json()),
+            )
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(f"DELETE FROM {self.table}")
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class TieredResponseCache(BaseResponseCache):
+    """Looks up responses in caches one by one (e.g. memory, then SQLite).
+
+    A response found in a later cache is copied to the earlier ones.
+    """
+
+    def __init__(self, *caches: BaseResponseCache):
+        self.caches = caches
+
+    @property
+    def in_memory(self) -> bool:  # type: ignore[override]
+        return all(cache.in_memory for cache in self.caches)
+
+    def get(self, key: str) -> Optional[AIChatResponse]:
+        for i, cache in enumerate(self.caches):
+            response = cache.get(key)
+            if response is not None:
+                for earlier in self.caches[:i]:
+                    earlier.set(key, response)
+                return response
+        return None
+
+    def set(self, key: str, response: AIChatResponse) -> None:
+        for cache in self.caches:
+            cache.set(key, response)
+
+    def clear(self) -> None:
+        for cache in self.caches:
+            cache.clear()
@@ -0,0 +1,239 @@
+import copy
+import math
+import threading
+import time
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from ..base import BaseAIModel, BaseAITextEmbeddingModel
+from ..model import AIChatResponse
+from .cached_ai_model import CachedAIModel, CacheStats, _hash, _message_to_dict, _Request
+
+
+class _Entry:
+    __slots__ = ("bucket", "vector", "response", "created")
+
+    def __init__(self, bucket: Tuple[Any, str], vector: array, response: AIChatResponse):
+        self.bucket = bucket
+        self.vector = vector
+        self.response = response
+        self.created = time.time()
+
+
+class SemanticResponseCache:
+    """In-process vector index of questions and their responses.
+
+    Questions are searched only among entries of the same tenant and the same fingerprint
+    (system prompt, context etc.), so the index is a set of small buckets searched by brute force.
+    """
+
+    def __init__(
+        self,
+        max_size: int = 10_000,
+        max_size_per_tenant: Optional[int] = None,
+        ttl: Optional[float] = None,
+    ):
+        """In-process vector index of questions and their responses.
+
+        Args:
+            max_size: The maximum number of entries, the least recently used are removed.
+            max_size_per_tenant: The maximum number of entries of one tenant, so one tenant
+                cannot evict entries of the others.
+            ttl: Time to live of entries in seconds (no expiration by default).
+        """
+        self.max_size = max_size
+        self.max_size_per_tenant = max_size_per_tenant
+        self.ttl = ttl
+        self._entries: OrderedDict[int, _Entry] = OrderedDict()
+        self._buckets: Dict[Tuple[Any, str], Dict[int, _Entry]] = {}
+        # Ids of entries of each tenant from the least recently used
+        self._tenant_entries: Dict[Any, OrderedDict[int, None]] = {}
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+    def search(
+        self, tenant: Optional[Hashable], fingerprint: str, embedding: List[float], threshold: float
+    ) -> Optional[Tuple[AIChatResponse, float]]:
+        """Returns the response of the most similar question and the similarity (cosine)
+        if it is at least the threshold."""
+        vector = _normalize(embedding)
+        now = time.time()
+        best_id, best_similarity = None, threshold
+        with self._lock:
+            bucket = self._buckets.get((tenant, fingerprint))
+            if not bucket:
+                return None
+            for entry_id, entry in list(bucket.items()):
+                if self.ttl is not None and now - entry.created > self.ttl:
+                    self._remove(entry_id)
+                    continue
+                similarity = math.sumprod(vector, entry.vector) if len(vector) == len(entry.vector) else -1.0
+                if similarity >= best_similarity:
+                    best_id, best_similarity = entry_id, similarity
+            if best_id is None:
+                return None
+            self._entries.move_to_end(best_id)
+            self._tenant_entries[tenant].move_to_end(best_id)
+            return self._entries[best_id].response.model_copy(deep=True), best_similarity
+
+    def add(
+        self, tenant: Optional[Hashable], fingerprint: str, embedding: List[float], response: AIChatResponse
+    ) -> None:
+        """Adds the question embedding with its response."""
+        bucket_key = (tenant, fingerprint)
+        entry = _Entry(bucket_key, _normalize(embedding), response.model_copy(deep=True))
+        with self._lock:
+            entry_id = self._next_id
+            self._next_id += 1
+            self._entries[entry_id] = entry
+            self._buckets.setdefault(bucket_key, {})[entry_id] = entry
+            tenant_entries = self._tenant_entries.setdefault(tenant, OrderedDict())
+            tenant_entries[entry_id] = None
+            if self.max_size_per_tenant is not None and len(tenant_entries) > self.max_size_per_tenant:
+                # The least recently used entry of the tenant
+                self._remove(next(iter(tenant_entries)))
+            while len(self._entries) > self.max_size:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self, tenant: Optional[Hashable] = None) -> None:
+        """Removes all entries (of the tenant if it is set)."""
+        with self._lock:
+            if tenant is None:
+                self._entries.clear()
+                self._buckets.clear()
+                self._tenant_entries.clear()
+                return
+            for entry_id in list(self._tenant_entries.get(tenant, ())):
+                self._remove(entry_id)
+
+    def _remove(self, entry_id: int) -> None:
+        entry = self._entries.pop(entry_id)
+        bucket = self._buckets[entry.bucket]
+        del bucket[entry_id]
+        if not bucket:
+            del self._buckets[entry.bucket]
+        tenant_entries = self._tenant_entries[entry.bucket[0]]
+        del tenant_entries[entry_id]
+        if not tenant_entries:
+            del self._tenant_entries[entry.bucket[0]]
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SemanticCachedAIModel(CachedAIModel):
+    """AI model which returns stored responses for similar questions.
+
+    The user message is embedded and compared with previous questions asked with the same
+    fingerprint - the model, system prompt, context, history, function definitions and response format.
+    Requests without user message (e.g. with tool results) or with blobs are not cached.
+    """
+
+    def __init__(
+        self,
+        ai_model: BaseAIModel,
+        embedding_model: BaseAITextEmbeddingModel,
+        cache: Optional[SemanticResponseCache] = None,
+        threshold: float = 0.95,
+        tenant: Optional[Hashable] = None,
+        include_history: bool = True,
+        max_size: int = 10_000,
+        ttl: Optional[float] = None,
+        cache_tool_calls: bool = False,
+    ):
+        """AI model which returns stored responses for similar questions.
+
+        Args:
+            ai_model: The model to cache.
+            embedding_model: The model to embed user messages.
+            cache: The vector index of questions, it can be shared by models of many tenants.
+            threshold: The minimal cosine similarity of questions to return the stored response.
+            tenant: Responses are returned only to the same tenant.
+            include_history: The history is a part of the fingerprint, so only the questions
+                asked after the same conversation are similar.
+            max_size: The maximum number of entries of the new cache.
+            ttl: Time to live of entries of the new cache in seconds.
+            cache_tool_calls: Responses with tool calls are also cached.
+        """
+        # Questions are looked up in `semantic_cache`, the exact-match cache of CachedAIModel is not used
+        super().__init__(ai_model, max_size=0, cache_tool_calls=cache_tool_calls)
+        self.semantic_cache = cache if cache is not None else SemanticResponseCache(max_size=max_size, ttl=ttl)
+        self.embedding_model = embedding_model
+        self.threshold = threshold
+        self.tenant = tenant
+        self.include_history = include_history
+
+    def with_tenant(self, tenant: Hashable) -> "SemanticCachedAIModel":
+        """Returns the model of the tenant which shares the cache (with own statistics)."""
+        ret = copy.copy(self)
+        ret.tenant = tenant
+        ret.stats = CacheStats()
+        ret._stats_lock = threading.Lock()
+        return ret
+
+    def _lookup(self, request: _Request) -> Optional[AIChatResponse]:
+        if not self._is_cacheable(request):
+            return None
+        request.embedding = self.embedding_model.get_embedding(request.message.content)  # type: ignore
+        return self._search(request)
+
+    async def _lookup_async(self, request: _Request) -> Optional[AIChatResponse]:
+        if not self._is_cacheable(request):
+            return None
+        request.embedding = await self.embedding_model.get_embedding_async(request.message.content)  # type: ignore
+        return self._search(request)
+
+    async def _store_async(self, request: _Request, response: AIChatResponse) -> None:
+        # The index is in memory
+        self._store(request, response)
+
+    def _search(self, request: _Request) -> Optional[AIChatResponse]:
+        fingerprint = self._get_fingerprint(request)
+        found = self.semantic_cache.search(self.tenant, fingerprint, request.embedding, self.threshold)  # type: ignore
+        if found is None:
+            return None
+        response, similarity = found
+        self._log.debug("Similar question found (%.3f): %s", similarity, request.message.content)  # type: ignore
+        return response
+
+    def _store(self, request: _Request, response: AIChatResponse) -> None:
+        if request.embedding is not None:
+            self.semantic_cache.add(self.tenant, self._get_fingerprint(request), request.embedding, response)
+
+    def _on_response(self, request: _Request, response: AIChatResponse) -> bool:
+        # Requests which are not looked up in the cache are not counted as misses
+        return request.embedding is not None and super()._on_response(request, response)
+
+    def _is_cacheable(self, request: _Request) -> bool:
+        message = request.message
+        return bool(
+            message
+            and message.role == "user"
+            and message.content
+            and not message.blobs
+            and not message.blob_locations
+        )
+
+    def _get_fingerprint(self, request: _Request) -> str:
+        if request.key is None:
+            request.key = _hash(
+                {
+                    **self._get_model_fingerprint(),
+                    "system_prompt": request.system_prompt,
+                    "history": [_message_to_dict(m) for m in request.history] if self.include_history else None,
+                    "context": request.context,
+                    "functions": list(request.functions.values()) if request.functions else None,
+                    "response_format": request.response_format,
+                }
+            )
+        return request.key
+
+
+def _normalize(embedding: List[float]) -> array:
+    vector = array("d", embedding)
+    norm = math.sqrt(math.sumprod(vector, vector))
+    if norm:
+        for i in range(len(vector)):
+            vector[i] /= norm
+    return vector
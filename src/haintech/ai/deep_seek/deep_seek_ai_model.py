@@ -2,28 +2,37 @@ import logging
 import os
 from typing import Dict, Optional
 
-from openai import AsyncOpenAI, OpenAI
-
 from haintech.ai.open_ai import OpenAIModel, OpenAIParameters
+from haintech.ai.open_ai.clients import create_openai_clients
+from haintech.ai.retry import RetryPolicy
+
+DEEP_SEEK_BASE_URL = "https://api.deepseek.com"
 
 
 class DeepSeekAIModel(OpenAIModel):
     _log = logging.getLogger(__name__)
+    _deep_seek_configured = False
+
+    @classmethod
+    def setup(cls):
+        # Clients of OpenAIModel are inherited, so DeepSeek has its own flag
+        if not cls._deep_seek_configured:
+            cls.openai, cls.async_openai = create_openai_clients(
+                DEEP_SEEK_BASE_URL, os.getenv("DEEP_SEEK_API_KEY"), max_retries=0
+            )
+            cls._deep_seek_configured = True
+            cls._log.debug("DeepSeek AI Model configured")
 
     def __init__(
         self,
         model_name: str = "deepseek-chat",
         parameters: Optional[OpenAIParameters | Dict[str, str | int | float]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
-        self.openai = OpenAI(
-            api_key=os.getenv("DEEP_SEEK_API_KEY"),
-            base_url="https://api.deepseek.com",
-        )
-        self.async_openai = AsyncOpenAI(
-            api_key=os.getenv("DEEP_SEEK_API_KEY"),
-            base_url="https://api.deepseek.com",
-        )
+        self.setup()
         self.model_name = model_name
         if parameters and isinstance(parameters, dict):
             parameters = OpenAIParameters.model_validate(parameters)
         self.parameters = parameters or OpenAIParameters()
+        if retry_policy:
+            self.retry_policy = retry_policy
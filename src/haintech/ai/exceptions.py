@@ -1,5 +1,53 @@
+from typing import Optional
 
 
-class UnsupportedMimeTypeError(Exception):
+class AIModelError(Exception):
+    """Base class of errors of AI model providers (independent of the provider SDK)"""
+
+    retryable = False
+    """The request can succeed if it is repeated"""
+
+    def __init__(self, message: str = "", status_code: Optional[int] = None, retry_after: Optional[float] = None):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+        """Seconds to wait before the next request (sent by the provider)"""
+
+
+class AIRateLimitError(AIModelError):
+    """Raised when the rate limit of the provider is exceeded (HTTP 429)"""
+
+    retryable = True
+
+
+class AITimeoutError(AIModelError):
+    """Raised when the request times out or the connection fails"""
+
+    retryable = True
+
+
+class AIOverloadedError(AIModelError):
+    """Raised when the provider is overloaded or unavailable (HTTP 5xx, 529)"""
+
+    retryable = True
+
+
+class AIInvalidRequestError(AIModelError):
+    """Raised when the provider rejects the request (HTTP 4xx, e.g. authentication or validation errors)"""
+
+
+class AIContextTooLongError(AIInvalidRequestError):
+    """Raised when the prompt exceeds the context window of the model"""
+
+
+class UnsupportedMimeTypeError(AIInvalidRequestError):
     """Raised when unsupported mime type is used"""
-    pass
\ No newline at end of file
+    pass
+
+
+class BatchRequestError(Exception):
+    """Raised (or returned) when a request of a batch job fails"""
+
+    def __init__(self, custom_id: str, message: str):
+        super().__init__(f"{custom_id}: {message}")
+        self.custom_id = custom_id
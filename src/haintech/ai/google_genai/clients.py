@@ -0,0 +1,25 @@
+from typing import Optional
+
+from google import genai
+from google.genai import types
+
+from ..http_client_pool import http_clients
+
+GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+
+
+def create_genai_client(
+    api_key: Optional[str] = None, vertexai: Optional[bool] = None, location: Optional[str] = None
+) -> genai.Client:
+    """Returns Google GenAI client which shares connections to the API.
+
+    Older versions of `google-genai` cannot use external HTTP clients, then the client has its own.
+    """
+    kwargs = {}
+    if "httpx_client" in types.HttpOptions.model_fields:
+        base_url = f"https://{location}-aiplatform.googleapis.com" if vertexai and location else GEMINI_BASE_URL
+        kwargs["http_options"] = types.HttpOptions(
+            httpx_client=http_clients.get_client(base_url),
+            httpx_async_client=http_clients.get_async_client(base_url),
+        )
+    return genai.Client(api_key=api_key, vertexai=vertexai, location=location, **kwargs)
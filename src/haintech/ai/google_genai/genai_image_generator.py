@@ -2,11 +2,12 @@ import logging
 from typing import AsyncGenerator, Generator
 
 from ampf.base import BlobCreate
-from google import genai
 from google.genai import types
 
 from haintech.ai.base.base_image_generator import BaseImageGenerator
 
+from .clients import create_genai_client
+
 
 _log = logging.getLogger(__name__)
 
@@ -22,7 +23,7 @@ class GenAIImageGenerator(BaseImageGenerator):
     @classmethod
     def setup(cls, api_key: str | None = None):
         if not cls._configured:
-            cls.client = genai.Client(api_key=api_key)
+            cls.client = create_genai_client(api_key=api_key)
             cls._configured = True
             _log.debug("Google AI Model configured")
 
@@ -1,7 +1,24 @@
 import base64
+import hashlib
+import json
 import logging
 import re
-from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, Sequence, Type, override
+import time
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Literal,
+    Optional,
+    Sequence,
+    Tuple,
+    Type,
+    override,
+)
 
 from google import genai
 from google.genai.types import (
@@ -9,6 +26,7 @@ from google.genai.types import (
     Blob,
     Content,
     ContentOrDict,
+    CreateCachedContentConfig,
     FunctionCall,
     FunctionDeclaration,
     FunctionResponse,
@@ -28,6 +46,7 @@ from haintech.helpers import get_inner_type, is_list_type
 from ..base import BaseAIModel
 from ..model import (
     AIChatResponse,
+    AIChatResponseDelta,
     AIContext,
     AIFunction,
     AIModelInteraction,
@@ -36,6 +55,8 @@ from ..model import (
     AIPrompt,
     RAGItem,
 )
+from ..retry import RetryPolicy
+from .clients import create_genai_client
 
 _log = logging.getLogger(__name__)
 
@@ -54,7 +75,26 @@ class GoogleAIModel(BaseAIModel):
         model_name: str = "gemini-2.5-flash",
         parameters: Optional[GenerationConfig | Dict[str, Any]] = None,
         api_key: Optional[str] = None,
+        cache_min_tokens: Optional[int] = None,
+        cache_ttl: int = 3600,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
+        """Google AI implementation of BaseAIModel
+
+        Args:
+            model_name: The name of the model.
+            parameters: Parameters of the model.
+            api_key: Google API key.
+            cache_min_tokens: System instructions and tools of at least this size (estimated tokens)
+                are stored as cached content and sent as its handle (explicit caching is disabled by default).
+            cache_ttl: Time to live of the cached content in seconds.
+            retry_policy: Retries of transient errors (`RetryPolicy()` by default).
+        """
+        self.cache_min_tokens = cache_min_tokens
+        self.cache_ttl = cache_ttl
+        self._cached_contents: Dict[str, Tuple[Optional[str], float]] = {}
+        if retry_policy:
+            self.retry_policy = retry_policy
         if api_key:
             self.setup(api_key=api_key)
         self.model_name = model_name
@@ -68,7 +108,7 @@ class GoogleAIModel(BaseAIModel):
     @classmethod
     def setup(cls, api_key: Optional[str] = None):
         if not cls._configured:
-            cls.client = genai.Client(api_key=api_key)
+            cls.client = create_genai_client(api_key=api_key)
             cls._configured = True
             _log.debug("Google AI Model configured")
 
@@ -133,18 +173,12 @@ class GoogleAIModel(BaseAIModel):
     ) -> AIChatResponse:
         history = list(history or [])
         parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
-        response = self._get_chat_response(**parameters)
-        if interaction_logger:
-            interaction_logger(
-                AIModelInteraction(
-                    model=self.model_name,
-                    message=message,
-                    context=context,
-                    history=history,
-                    response=response,
-                )
-            )
-        return response
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        return self._call_with_retry(
+            lambda: self._get_chat_response(**parameters), ai_model_interaction, interaction_logger
+        )
 
     @override
     async def get_chat_response_async(
@@ -159,18 +193,53 @@ class GoogleAIModel(BaseAIModel):
     ) -> AIChatResponse:
         history = list(history or [])
         parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
-        response = await self._get_chat_response_async(**parameters)
-        if interaction_logger:
-            interaction_logger(
-                AIModelInteraction(
-                    model=self.model_name,
-                    message=message,
-                    context=context,
-                    history=history,
-                    response=response,
-                )
-            )
-        return response
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        return await self._call_with_retry_async(
+            lambda: self._get_chat_response_async(**parameters), ai_model_interaction, interaction_logger
+        )
+
+    @override
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        history = list(history or [])
+        parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        return self._stream(
+            lambda: self._get_chat_response_stream(**parameters), ai_model_interaction, interaction_logger
+        )
+
+    @override
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        history = list(history or [])
+        parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        async for delta in self._stream_async(
+            lambda: self._get_chat_response_stream_async(**parameters), ai_model_interaction, interaction_logger
+        ):
+            yield delta
 
     def _prepare_parameters(
         self,
@@ -193,11 +262,12 @@ class GoogleAIModel(BaseAIModel):
             if isinstance(message, str):
                 message = AIModelInteractionMessage(role="user", content=message)
 
+        # Context changes every turn, so it is sent with the message to keep the prefix
+        # (system instructions, tools and history) stable for the prompt cache
         system_instructions = self._prompt_to_str(system_prompt) if system_prompt else ""
+        message_parts = list(self._create_content_from_message(message).parts or [])
         if context:
-            if system_instructions:
-                system_instructions += "\n\n"
-            system_instructions += self._context_to_str(context)
+            message_parts.append(Part(text=self._context_to_str(context)))
 
         tools: ToolListUnion | None = None
         if functions:
@@ -215,7 +285,7 @@ class GoogleAIModel(BaseAIModel):
         ret = {
             "config": config,
             "history": msg_list,
-            "message": self._create_content_from_message(message).parts,
+            "message": message_parts,
         }
         _log.debug("===========>\n %s\n <==========", ret)
         return ret
@@ -227,6 +297,7 @@ class GoogleAIModel(BaseAIModel):
         message: list[Part] | Part,
     ) -> AIChatResponse:
         try:
+            config = self._use_cached_content(config)
             chat = self.client.chats.create(model=self.model_name, config=config, history=history)
             native_response = chat.send_message(message)
             return self._create_response_from_content_response(native_response)
@@ -243,6 +314,7 @@ class GoogleAIModel(BaseAIModel):
         message: list[Part] | Part,
     ) -> AIChatResponse:
         try:
+            config = await self._use_cached_content_async(config)
             chat = self.client.aio.chats.create(model=self.model_name, config=config, history=history)
             native_response = await chat.send_message(message)
             return self._create_response_from_content_response(native_response)
@@ -252,6 +324,123 @@ class GoogleAIModel(BaseAIModel):
             else:
                 raise e
 
+    def _get_chat_response_stream(
+        self,
+        config: GenerateContentConfig,
+        history: list[ContentOrDict] | None,
+        message: list[Part] | Part,
+    ) -> Iterator[AIChatResponseDelta]:
+        try:
+            config = self._use_cached_content(config)
+            chat = self.client.chats.create(model=self.model_name, config=config, history=history)
+            name_indices: Dict[str, int] = {}
+            for chunk in chat.send_message_stream(message):
+                yield from self._create_deltas_from_content_response(chunk, name_indices)
+        except Exception as e:
+            if "Unsupported MIME type" in str(e):
+                raise UnsupportedMimeTypeError()
+            else:
+                raise e
+
+    async def _get_chat_response_stream_async(
+        self,
+        config: GenerateContentConfig,
+        history: list[ContentOrDict] | None,
+        message: list[Part] | Part,
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        try:
+            config = await self._use_cached_content_async(config)
+            chat = self.client.aio.chats.create(model=self.model_name, config=config, history=history)
+            name_indices: Dict[str, int] = {}
+            async for chunk in await chat.send_message_stream(message):
+                for delta in self._create_deltas_from_content_response(chunk, name_indices):
+                    yield delta
+        except Exception as e:
+            if "Unsupported MIME type" in str(e):
+                raise UnsupportedMimeTypeError()
+            else:
+                raise e
+
+    def _use_cached_content(self, config: GenerateContentConfig) -> GenerateContentConfig:
+        """Replaces large system instructions and tools with the handle of the cached content."""
+        key = self._get_cached_content_key(config)
+        if key is None:
+            return config
+        name = self._get_cached_content_name(key)
+        if name is None and key not in self._cached_contents:
+            try:
+                cached_content = self.client.caches.create(
+                    model=self.model_name, config=self._create_cached_content_config(config)
+                )
+                name = self._add_cached_content(key, cached_content.name)
+            except Exception as e:
+                name = self._add_cached_content(key, None, e)
+        return self._create_config_with_cached_content(config, name)
+
+    async def _use_cached_content_async(self, config: GenerateContentConfig) -> GenerateContentConfig:
+        """Async version of `_use_cached_content`"""
+        key = self._get_cached_content_key(config)
+        if key is None:
+            return config
+        name = self._get_cached_content_name(key)
+        if name is None and key not in self._cached_contents:
+            try:
+                cached_content = await self.client.aio.caches.create(
+                    model=self.model_name, config=self._create_cached_content_config(config)
+                )
+                name = self._add_cached_content(key, cached_content.name)
+            except Exception as e:
+                name = self._add_cached_content(key, None, e)
+        return self._create_config_with_cached_content(config, name)
+
+    def _get_cached_content_key(self, config: GenerateContentConfig) -> Optional[str]:
+        if self.cache_min_tokens is None or config.cached_content:
+            return None
+        static_prefix = json.dumps(
+            [
+                self.model_name,
+                config.system_instruction,
+                [t.model_dump(mode="json", exclude_none=True) for t in config.tools or []],  # type: ignore
+            ],
+            default=str,
+        )
+        # About 4 characters per token
+        if len(static_prefix) // 4 < self.cache_min_tokens:
+            return None
+        return hashlib.sha256(static_prefix.encode("utf-8")).hexdigest()
+
+    def _get_cached_content_name(self, key: str) -> Optional[str]:
+        """Returns the name of the cached content, expired entries are removed."""
+        name, expires = self._cached_contents.get(key, (None, 0.0))
+        # The content must not expire during the request
+        if expires - 60 < time.time():
+            self._cached_contents.pop(key, None)
+            return None
+        return name
+
+    def _add_cached_content(self, key: str, name: Optional[str], error: Optional[Exception] = None) -> Optional[str]:
+        if error:
+            # E.g. the content is smaller than the minimum of the model, it is not created again until ttl
+            _log.warning("Cached content is not created: %s", error)
+        else:
+            _log.debug("Cached content created: %s", name)
+        self._cached_contents[key] = (name, time.time() + self.cache_ttl)
+        return name
+
+    def _create_cached_content_config(self, config: GenerateContentConfig) -> CreateCachedContentConfig:
+        return CreateCachedContentConfig(
+            system_instruction=config.system_instruction,
+            tools=config.tools,
+            ttl=f"{self.cache_ttl}s",
+        )
+
+    @staticmethod
+    def _create_config_with_cached_content(config: GenerateContentConfig, name: Optional[str]) -> GenerateContentConfig:
+        if not name:
+            return config
+        # System instructions and tools are not allowed with the cached content
+        return config.model_copy(update={"system_instruction": None, "tools": None, "cached_content": name})
+
     @classmethod
     def _prompt_to_str(cls, prompt: str | AIPrompt) -> str:
         if isinstance(prompt, str):
@@ -421,11 +610,59 @@ class GoogleAIModel(BaseAIModel):
                 )
             if part.text:
                 texts.append(part.text)
+        usage = n_resp.usage_metadata
         return AIChatResponse(
             content="\n".join(texts) or None,
             tool_calls=tool_calls or None,
+            input_tokens=usage.prompt_token_count if usage else None,
+            input_tokens_cached=usage.cached_content_token_count if usage else None,
+            reasoning_tokens=usage.thoughts_token_count if usage else None,
+            output_tokens=usage.candidates_token_count if usage else None,
         )
 
+    @classmethod
+    def _create_deltas_from_content_response(
+        cls, n_resp: GenerateContentResponse, name_indices: Dict[str, int]
+    ) -> Iterator[AIChatResponseDelta]:
+        """Converts streamed chunk of GenerateContentResponse to AIChatResponseDelta
+
+        Args:
+            n_resp: chunk of GenerateContentResponse
+            name_indices: numbering of tool calls without id (shared by chunks of one response)
+        Returns:
+            Iterator of AIChatResponseDelta
+        """
+        content = n_resp.candidates[0].content if n_resp.candidates else None
+        for part in (content.parts if content else None) or []:
+            if part.function_call:
+                fc = part.function_call
+                name = fc.name
+                if fc.id:
+                    tool_id = fc.id
+                else:
+                    idx = name_indices.get(name, 1)  # type: ignore
+                    tool_id = f"{name}__{idx}"
+                    name_indices[name] = idx + 1  # type: ignore
+                # Function calls are not split between chunks
+                yield AIChatResponseDelta(
+                    tool_call_id=tool_id,
+                    function_name=name,
+                    arguments=json.dumps(dict(fc.args or {})),
+                    thought_signature=base64.b64encode(part.thought_signature).decode("utf-8")
+                    if part.thought_signature
+                    else None,
+                )
+            if part.text and not part.thought:
+                yield AIChatResponseDelta(content=part.text)
+        if n_resp.usage_metadata:
+            usage = n_resp.usage_metadata
+            yield AIChatResponseDelta(
+                input_tokens=usage.prompt_token_count,
+                input_tokens_cached=usage.cached_content_token_count,
+                reasoning_tokens=usage.thoughts_token_count,
+                output_tokens=usage.candidates_token_count,
+            )
+
     try:
         from agents.mcp import MCPServer
         from mcp import Tool as MCPTool
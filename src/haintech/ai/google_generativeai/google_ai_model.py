@@ -1,7 +1,8 @@
+import json
 import logging
 import re
 from itertools import chain
-from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, override
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Optional, override
 from warnings import deprecated
 
 import google.generativeai as genai
@@ -16,6 +17,7 @@ from haintech.ai.exceptions import UnsupportedMimeTypeError
 from ..base import BaseAIModel
 from ..model import (
     AIChatResponse,
+    AIChatResponseDelta,
     AIContext,
     AIFunction,
     AIModelInteraction,
@@ -76,18 +78,12 @@ class GoogleAIModel(BaseAIModel):
     ) -> AIChatResponse:
         history = list(history or [])
         parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
-        response = self._get_chat_response(**parameters)
-        if interaction_logger:
-            interaction_logger(
-                AIModelInteraction(
-                    model=self.model_name,
-                    message=message,
-                    context=context,
-                    history=history,
-                    response=response,
-                )
-            )
-        return response
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        return self._call_with_retry(
+            lambda: self._get_chat_response(**parameters), ai_model_interaction, interaction_logger
+        )
 
     @override
     async def get_chat_response_async(
@@ -102,18 +98,53 @@ class GoogleAIModel(BaseAIModel):
     ) -> AIChatResponse:
         history = list(history or [])
         parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
-        response = await self._get_chat_response_async(**parameters)
-        if interaction_logger:
-            interaction_logger(
-                AIModelInteraction(
-                    model=self.model_name,
-                    message=message,
-                    context=context,
-                    history=history,
-                    response=response,
-                )
-            )
-        return response
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        return await self._call_with_retry_async(
+            lambda: self._get_chat_response_async(**parameters), ai_model_interaction, interaction_logger
+        )
+
+    @override
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        history = list(history or [])
+        parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        return self._stream(
+            lambda: self._get_chat_response_stream(**parameters), ai_model_interaction, interaction_logger
+        )
+
+    @override
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        history = list(history or [])
+        parameters = self._prepare_parameters(system_prompt, history, context, message, functions, response_format)
+        ai_model_interaction = AIModelInteraction(
+            model=self.model_name, message=message, context=context, history=history
+        )
+        async for delta in self._stream_async(
+            lambda: self._get_chat_response_stream_async(**parameters), ai_model_interaction, interaction_logger
+        ):
+            yield delta
 
     def _prepare_parameters(
         self,
@@ -189,6 +220,53 @@ class GoogleAIModel(BaseAIModel):
             else:
                 raise e
 
+    def _get_chat_response_stream(
+        self,
+        chat: ChatSession,
+        message: AIModelInteractionMessage,
+        generation_config: GenerationConfig,
+        functions: Optional[Dict[Callable, Any]] = None,
+    ) -> Iterator[AIChatResponseDelta]:
+        try:
+            native_response = chat.send_message(
+                self._create_content_from_message(message),
+                generation_config=generation_config,
+                tools=functions.values() if functions else None,
+                stream=True,
+            )
+            name_indices: Dict[str, int] = {}
+            for chunk in native_response:
+                yield from self._create_deltas_from_content_response(chunk, name_indices)
+        except exceptions.InvalidArgument as e:
+            if "Unsupported MIME type" in str(e):
+                raise UnsupportedMimeTypeError()
+            else:
+                raise e
+
+    async def _get_chat_response_stream_async(
+        self,
+        chat: ChatSession,
+        message: AIModelInteractionMessage,
+        generation_config: GenerationConfig,
+        functions: Optional[Dict[Callable, Any]] = None,
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        try:
+            native_response = await chat.send_message_async(
+                self._create_content_from_message(message),
+                generation_config=generation_config,
+                tools=functions.values() if functions else None,
+                stream=True,
+            )
+            name_indices: Dict[str, int] = {}
+            async for chunk in native_response:
+                for delta in self._create_deltas_from_content_response(chunk, name_indices):
+                    yield delta
+        except exceptions.InvalidArgument as e:
+            if "Unsupported MIME type" in str(e):
+                raise UnsupportedMimeTypeError()
+            else:
+                raise e
+
     @classmethod
     def _prompt_to_str(cls, prompt: str | AIPrompt) -> str:
         if isinstance(prompt, str):
@@ -384,6 +462,44 @@ class GoogleAIModel(BaseAIModel):
             tool_calls=tool_calls or None,
         )
 
+    @classmethod
+    def _create_deltas_from_content_response(
+        cls, n_resp: generation_types.GenerateContentResponse, name_indices: Dict[str, int]
+    ) -> Iterator[AIChatResponseDelta]:
+        """Converts streamed chunk of GenerateContentResponse to AIChatResponseDelta
+
+        Args:
+            n_resp: chunk of GenerateContentResponse
+            name_indices: numbering of tool calls without id (shared by chunks of one response)
+        Returns:
+            Iterator of AIChatResponseDelta
+        """
+        for part in n_resp.parts:
+            if part.function_call:
+                fc = part.function_call
+                name = fc.name
+                if fc.id:
+                    tool_id = fc.id
+                else:
+                    idx = name_indices.get(name, 1)
+                    tool_id = f"{name}__{idx}"
+                    name_indices[name] = idx + 1
+                # Function calls are not split between chunks
+                yield AIChatResponseDelta(
+                    tool_call_id=tool_id,
+                    function_name=name,
+                    arguments=json.dumps(protos.FunctionCall.to_dict(fc).get("args", {})),
+                )
+            if part.text:
+                yield AIChatResponseDelta(content=part.text)
+        if n_resp.usage_metadata:
+            usage = n_resp.usage_metadata
+            yield AIChatResponseDelta(
+                input_tokens=usage.prompt_token_count,
+                input_tokens_cached=usage.cached_content_token_count,
+                output_tokens=usage.candidates_token_count,
+            )
+
     try:
         from agents.mcp import MCPServer
         from mcp import Tool as MCPTool
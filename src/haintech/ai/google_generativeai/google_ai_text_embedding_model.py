@@ -4,6 +4,7 @@ from google import genai
 from google.genai.types import EmbedContentConfig
 
 from ..base import BaseAITextEmbeddingModel
+from ..google_genai.clients import create_genai_client
 
 
 class GoogleAITextEmbeddingModel(BaseAITextEmbeddingModel):
@@ -21,7 +22,7 @@ class GoogleAITextEmbeddingModel(BaseAITextEmbeddingModel):
 
     @classmethod
     def setup(cls, vertexai: bool = True, location: str = "us-central1"):
-        cls.client = genai.Client(vertexai=vertexai, location=location)
+        cls.client = create_genai_client(vertexai=vertexai, location=location)
 
     @override
     def get_embedding(self, text: str) -> List[float]:
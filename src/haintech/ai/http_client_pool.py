@@ -0,0 +1,178 @@
+import asyncio
+import logging
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+from pydantic import BaseModel
+
+_log = logging.getLogger(__name__)
+
+
+class HTTPClientConfig(BaseModel):
+    """Connection limits, keep-alive and timeouts of shared HTTP clients."""
+
+    max_connections: Optional[int] = 1000
+    """The maximum number of connections of one pool (None - no limit)"""
+    max_keepalive_connections: Optional[int] = 100
+    """The maximum number of idle connections kept alive"""
+    keepalive_expiry: Optional[float] = 30.0
+    """Seconds an idle connection is kept alive"""
+    http2: bool = False
+    """HTTP/2 is used (requires `h2` package - `pip install httpx[http2]`)"""
+    timeout: float = 600.0
+    """Timeout of requests in seconds"""
+    connect_timeout: float = 5.0
+    """Timeout of establishing connections in seconds"""
+
+
+class _EventLoopTransport(httpx.AsyncBaseTransport):
+    """Async transport with one connection pool per event loop.
+
+    Connections are bound to the event loop which opened them, so the async client shared by
+    SDK clients (which are created once) can be used by many loops, e.g. by many `asyncio.run` calls.
+    """
+
+    def __init__(self, **kwargs: Any):
+        self._kwargs = kwargs
+        self._transports: weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncHTTPTransport] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._lock = threading.Lock()
+
+    def _get_transport(self) -> httpx.AsyncHTTPTransport:
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            transport = self._transports.get(loop)
+            if transport is None:
+                # Connections of closed loops can be neither used nor closed
+                for closed_loop in [lp for lp in self._transports if lp.is_closed()]:
+                    del self._transports[closed_loop]
+                transport = self._transports[loop] = httpx.AsyncHTTPTransport(**self._kwargs)
+            return transport
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        return await self._get_transport().handle_async_request(request)
+
+    async def aclose(self) -> None:
+        """Closes connections of the running loop and of other running loops (in their threads).
+
+        Transports of loops which are open but not running can't be closed now, they are kept,
+        so the connections are not dropped without closing them.
+        """
+        loop = asyncio.get_running_loop()
+        closing = []
+        with self._lock:
+            for lp, transport in list(self._transports.items()):
+                if lp is loop:
+                    closing.append(transport.aclose())
+                elif lp.is_closed():
+                    # Connections of closed loops can be neither used nor closed
+                    pass
+                elif lp.is_running():
+                    closing.append(asyncio.wrap_future(asyncio.run_coroutine_threadsafe(transport.aclose(), lp)))
+                else:
+                    _log.warning("Connections of the event loop which is not running are not closed: %s", lp)
+                    continue
+                del self._transports[lp]
+        for result in await asyncio.gather(*closing, return_exceptions=True):
+            if isinstance(result, Exception):
+                _log.warning("Error closing connections: %s", result)
+
+
+class HTTPClientPool:
+    """Shared HTTP clients of AI providers, one sync and one async client per base URL.
+
+    Provider SDK clients (OpenAI, Anthropic, Google) are created with these clients,
+    so all models of a provider reuse open connections instead of opening new ones
+    (with TLS handshakes) in their own clients. Async clients keep connections
+    of each event loop separately.
+    """
+
+    def __init__(self, config: Optional[HTTPClientConfig] = None):
+        self.config = config or HTTPClientConfig()
+        self._clients: Dict[str, httpx.Client] = {}
+        self._async_clients: Dict[str, httpx.AsyncClient] = {}
+        self._lock = threading.Lock()
+
+    def configure(self, config: Optional[HTTPClientConfig] = None, **kwargs) -> None:
+        """Sets the configuration of clients created later (call it before models are created).
+
+        Args:
+            config: The new configuration.
+            kwargs: Fields of the configuration to change.
+        """
+        self.config = (config or self.config).model_copy(update=kwargs)
+
+    def get_client(self, base_url: str | httpx.URL | None = None) -> httpx.Client:
+        """Returns the shared client of the base URL."""
+        key = self._get_key(base_url)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None or client.is_closed:
+                _log.debug("Creating HTTP client: %s", key)
+                client = self._clients[key] = httpx.Client(**self._get_client_args())
+            return client
+
+    def get_async_client(self, base_url: str | httpx.URL | None = None) -> httpx.AsyncClient:
+        """Returns the shared async client of the base URL."""
+        key = self._get_key(base_url)
+        with self._lock:
+            client = self._async_clients.get(key)
+            if client is None or client.is_closed:
+                _log.debug("Creating async HTTP client: %s", key)
+                client = self._async_clients[key] = httpx.AsyncClient(
+                    timeout=self._get_timeout(),
+                    follow_redirects=True,
+                    transport=_EventLoopTransport(**self._get_transport_args()),
+                )
+            return client
+
+    def close(self) -> None:
+        """Closes sync clients."""
+        with self._lock:
+            clients, self._clients = list(self._clients.values()), {}
+        for client in clients:
+            client.close()
+
+    async def aclose(self) -> None:
+        """Closes all clients (e.g. on shutdown of the server)."""
+        self.close()
+        with self._lock:
+            clients, self._async_clients = list(self._async_clients.values()), {}
+        for client in clients:
+            await client.aclose()
+
+    def _get_client_args(self) -> dict:
+        return {
+            **self._get_transport_args(),
+            "timeout": self._get_timeout(),
+            # The same as default clients of provider SDKs
+            "follow_redirects": True,
+        }
+
+    def _get_transport_args(self) -> dict:
+        config = self.config
+        return {
+            "limits": httpx.Limits(
+                max_connections=config.max_connections,
+                max_keepalive_connections=config.max_keepalive_connections,
+                keepalive_expiry=config.keepalive_expiry,
+            ),
+            "http2": config.http2,
+        }
+
+    def _get_timeout(self) -> httpx.Timeout:
+        return httpx.Timeout(self.config.timeout, connect=self.config.connect_timeout)
+
+    @staticmethod
+    def _get_key(base_url: str | httpx.URL | None) -> str:
+        if base_url is None:
+            return ""
+        url = httpx.URL(base_url)
+        return f"{url.scheme}://{url.netloc.decode('ascii')}"
+
+
+http_clients = HTTPClientPool()
+"""The default pool of HTTP clients used by AI models"""
@@ -33,6 +33,8 @@ try:
             searcher: Optional[BaseRAGSearcher] = None,
             functions: Optional[List[Callable]] = None,
             session_blob_manager: Optional[AsyncSessionBlobManager] = None,
+            max_concurrent_tools: int = 10,
+            tool_timeout: Optional[float] = None,
         ):
             """Initializes the MCPAIAgent.
 
@@ -46,6 +48,8 @@ try:
                 session: The session object to store conversation history.
                 searcher: A RAG searcher for retrieving documents.
                 functions: A list of additional callable functions to be used as tools.
+                max_concurrent_tools: The maximum number of tools called concurrently.
+                tool_timeout: The maximum time of one tool call in seconds.
             """
             super().__init__(
                 ai_model=ai_model,
@@ -56,6 +60,8 @@ try:
                 searcher=searcher,
                 functions=functions,
                 session_blob_manager=session_blob_manager,
+                max_concurrent_tools=max_concurrent_tools,
+                tool_timeout=tool_timeout,
             )
             self.mcp_servers = mcp_servers or []
 
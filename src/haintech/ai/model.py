@@ -55,6 +55,13 @@ class AIChatResponse(BaseModel):
     reasoning_tokens: int | None = None
     output_tokens: int | None = None
 
+    @property
+    def input_tokens_cached_ratio(self) -> float | None:
+        """Part of input tokens read from the prompt cache of the provider."""
+        if not self.input_tokens or self.input_tokens_cached is None:
+            return None
+        return self.input_tokens_cached / self.input_tokens
+
     def __str__(self) -> str:
         ret = []
         if self.content:
@@ -65,6 +72,30 @@ class AIChatResponse(BaseModel):
         return "\n".join(ret)
 
 
+class AIChatResponseDelta(BaseModel):
+    """Part of chat response streamed by AIModel.
+
+    Fragments of one tool call have the same `tool_call_index`; `tool_call_id` and
+    `function_name` are set in the first fragment only. The last delta of the stream
+    contains the complete `response`.
+    """
+
+    content: str | None = None
+    """Text chunk"""
+    tool_call_index: int | None = None
+    tool_call_id: str | None = None
+    function_name: str | None = None
+    arguments: str | None = None
+    """Fragment of tool call arguments (JSON)"""
+    thought_signature: str | None = Field(None, description="Thought signature required by Google API")
+    input_tokens: int | None = None
+    input_tokens_cached: int | None = None
+    reasoning_tokens: int | None = None
+    output_tokens: int | None = None
+    response: AIChatResponse | None = None
+    """Complete response assembled from all deltas (the last delta only)"""
+
+
 class AIModelInteractionMessage(BaseModel):
     """One message within AIModelInteraction"""
 
@@ -141,6 +172,10 @@ class AIModelInteraction[T: AIModelInteractionMessage](BaseModel):
     message: Optional[T] = None
     response: Optional[AIChatResponse] = Field(default=None, exclude=True)
     response_message: Optional[T] = None
+    attempts: Optional[int] = None
+    """The number of requests sent to the provider (retries included)"""
+    latency: Optional[float] = None
+    """Seconds from the first request to the response"""
 
     model_config = ConfigDict(validate_assignment=True)
 
@@ -1,5 +1,6 @@
 from .model import OpenAIParameters, ResponsesAIParameters
 from .open_ai_model import OpenAIModel
+from .open_ai_batch_backend import OpenAIBatchBackend
 from .open_ai_text_embedding_model import OpenAITextEmbeddingModel
 from .open_ai_image_generator import OpenAIImageGenerator
 from .responses_ai_model import ResponsesAIModel
@@ -7,6 +8,7 @@ from .responses_ai_model import ResponsesAIModel
 
 
 __all__ = [
+    "OpenAIBatchBackend",
     "OpenAIModel",
     "OpenAIParameters",
     "OpenAITextEmbeddingModel",
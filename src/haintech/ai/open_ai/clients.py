@@ -0,0 +1,28 @@
+import os
+from typing import Optional, Tuple
+
+import httpx
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI, OpenAI
+
+from ..http_client_pool import http_clients
+
+OPENAI_BASE_URL = "https://api.openai.com/v1"
+
+
+def create_openai_clients(
+    base_url: str | httpx.URL | None = None, api_key: Optional[str] = None, max_retries: int = DEFAULT_MAX_RETRIES
+) -> Tuple[OpenAI, AsyncOpenAI]:
+    """Returns OpenAI clients (sync and async) which share connections to the base URL.
+
+    Args:
+        base_url: The base URL of the API (`OPENAI_BASE_URL` environment variable by default).
+        api_key: The API key (`OPENAI_API_KEY` environment variable by default).
+        max_retries: Retries of the SDK (chat models retry with their own `RetryPolicy` instead).
+    """
+    url = base_url or os.environ.get("OPENAI_BASE_URL") or OPENAI_BASE_URL
+    return (
+        OpenAI(base_url=base_url, api_key=api_key, http_client=http_clients.get_client(url), max_retries=max_retries),
+        AsyncOpenAI(
+            base_url=base_url, api_key=api_key, http_client=http_clients.get_async_client(url), max_retries=max_retries
+        ),
+    )
@@ -0,0 +1,146 @@
+import json
+from typing import Any, Dict, List, Optional, override
+
+from openai import DEFAULT_MAX_RETRIES, AsyncOpenAI
+from openai.types import Batch
+from openai.types.chat import ChatCompletion
+from openai.types.responses import Response
+
+from ..batch import BaseBatchBackend, BatchJob, BatchRequest, BatchResult
+from ..batch.model import BatchStatus
+from ..model import AIModelInteractionMessage
+from .open_ai_model import OpenAIModel
+from .open_ai_text_embedding_model import OpenAITextEmbeddingModel
+from .responses_ai_model import ResponsesAIModel
+
+_STATUSES: Dict[str, BatchStatus] = {
+    "completed": "completed",
+    "failed": "failed",
+    "cancelled": "cancelled",
+    "expired": "expired",
+}
+
+
+class OpenAIBatchBackend(BaseBatchBackend):
+    """OpenAI Batch API backend.
+
+    Requests are uploaded as a JSONL file and processed within the completion window
+    at half of the price of interactive requests.
+    """
+
+    def __init__(
+        self,
+        ai_model: Optional[ResponsesAIModel | OpenAIModel] = None,
+        embedding_model: Optional[OpenAITextEmbeddingModel] = None,
+        completion_window: str = "24h",
+    ):
+        """OpenAI Batch API backend.
+
+        Args:
+            ai_model: The model of chat requests (Responses or Chat Completions API).
+            embedding_model: The model of embedding requests.
+            completion_window: The time frame within which the batch should be processed.
+        """
+        self.ai_model = ai_model
+        self.embedding_model = embedding_model
+        self.completion_window = completion_window
+        if ai_model:
+            # Clients of chat models do not retry requests
+            self.client: AsyncOpenAI = ai_model.async_openai.with_options(max_retries=DEFAULT_MAX_RETRIES)
+        elif embedding_model:
+            self.client = embedding_model.client_async
+        else:
+            raise ValueError("AI model or embedding model is required")
+
+    @override
+    async def submit(self, requests: List[BatchRequest]) -> BatchJob:
+        endpoint = self._get_endpoint(requests)
+        url = self._get_url(endpoint)
+        lines = [
+            json.dumps({"custom_id": r.custom_id, "method": "POST", "url": url, "body": self._create_body(r)})
+            for r in requests
+        ]
+        input_file = await self.client.files.create(
+            file=("batch.jsonl", "\n".join(lines).encode("utf-8"), "application/jsonl"), purpose="batch"
+        )
+        batch = await self.client.batches.create(
+            input_file_id=input_file.id,
+            endpoint=url,  # type: ignore
+            completion_window=self.completion_window,  # type: ignore
+        )
+        return self._create_job(batch, BatchJob(id=batch.id, endpoint=endpoint, total=len(requests)))
+
+    @override
+    async def get_job(self, job: BatchJob) -> BatchJob:
+        return self._create_job(await self.client.batches.retrieve(job.id), job)
+
+    @override
+    async def get_results(self, job: BatchJob) -> List[BatchResult]:
+        ret = []
+        # Failed requests are in the error file
+        for file_id in (job.metadata.get("output_file_id"), job.metadata.get("error_file_id")):
+            if file_id:
+                content = await self.client.files.content(file_id)
+                ret.extend(self._create_result(json.loads(line), job) for line in content.text.splitlines() if line)
+        return ret
+
+    @override
+    async def cancel(self, job: BatchJob) -> BatchJob:
+        return self._create_job(await self.client.batches.cancel(job.id), job)
+
+    def _get_url(self, endpoint: str) -> str:
+        if endpoint == "embedding":
+            if not self.embedding_model:
+                raise ValueError("Embedding model is required for embedding requests")
+            return "/v1/embeddings"
+        if not self.ai_model:
+            raise ValueError("AI model is required for chat requests")
+        return "/v1/responses" if isinstance(self.ai_model, ResponsesAIModel) else "/v1/chat/completions"
+
+    def _create_body(self, request: BatchRequest) -> Dict[str, Any]:
+        if request.endpoint == "embedding":
+            return {
+                "model": self.embedding_model.ai_model_name,  # type: ignore
+                "input": request.text,
+                "dimensions": self.embedding_model.dimensions,  # type: ignore
+            }
+        parameters, _ = self.ai_model._prepare_parameters(  # type: ignore
+            request.system_prompt,
+            [],
+            message=AIModelInteractionMessage(role="user", content=request.message),
+            response_format=request.response_format,
+        )
+        # The body is sent as is, so extra body is merged and not given parameters are removed
+        extra_body = parameters.pop("extra_body", None) or {}
+        return {k: v for k, v in parameters.items() if v is not None} | extra_body
+
+    def _create_result(self, line: Dict[str, Any], job: BatchJob) -> BatchResult:
+        custom_id = line["custom_id"]
+        response = line.get("response") or {}
+        if line.get("error") or response.get("status_code") != 200:
+            error = line.get("error") or response.get("body", {}).get("error") or {}
+            return BatchResult(custom_id=custom_id, error=error.get("message") or str(error))
+        body = response["body"]
+        if job.endpoint == "embedding":
+            return BatchResult(custom_id=custom_id, embedding=body["data"][0]["embedding"])
+        # Bodies are constructed without validation, as the SDK does with responses of the API
+        if isinstance(self.ai_model, ResponsesAIModel):
+            chat_response = self.ai_model._create_ai_chat_response(Response.model_construct(**body))
+        else:
+            completion = ChatCompletion.model_construct(**body)
+            chat_response = self.ai_model._create_ai_chat_response(  # type: ignore
+                completion.choices[0].message, completion.usage
+            )
+        return BatchResult(custom_id=custom_id, response=chat_response)
+
+    @staticmethod
+    def _create_job(batch: Batch, job: BatchJob) -> BatchJob:
+        job = job.model_copy()
+        # Validating, finalizing and cancelling batches are still in progress
+        job.status = _STATUSES.get(batch.status, "in_progress")
+        if batch.request_counts:
+            job.total = batch.request_counts.total or job.total
+            job.completed = batch.request_counts.completed
+            job.failed = batch.request_counts.failed
+        job.metadata = {"output_file_id": batch.output_file_id, "error_file_id": batch.error_file_id}
+        return job
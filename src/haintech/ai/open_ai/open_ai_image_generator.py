@@ -3,10 +3,11 @@ import logging
 from typing import Any, AsyncGenerator, Generator
 
 from ampf.base import BlobCreate
-from openai import AsyncOpenAI, OpenAI
 
 from haintech.ai.base.base_image_generator import BaseImageGenerator
 
+from .clients import create_openai_clients
+
 _log = logging.getLogger(__name__)
 
 
@@ -21,8 +22,7 @@ class OpenAIImageGenerator(BaseImageGenerator):
     @classmethod
     def setup(cls, api_key: str | None = None):
         if not cls._configured:
-            cls.client = OpenAI(api_key=api_key)
-            cls.async_openai = AsyncOpenAI(api_key=api_key)
+            cls.client, cls.async_openai = create_openai_clients(api_key=api_key)
             cls._configured = True
             _log.debug("OpenAI AI Model configured")
 
@@ -1,10 +1,11 @@
 import json
 import logging
-from typing import Any, Callable, Dict, Iterable, List, Literal, Optional, override
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Literal, Optional, override
 from warnings import deprecated
 
-from openai import AsyncOpenAI, OpenAI
+from openai.types import CompletionUsage
 from openai.types.chat import (
+    ChatCompletionChunk,
     ChatCompletionMessage,
     ChatCompletionMessageParam,
     ChatCompletionToolParam,
@@ -13,12 +14,15 @@ from openai.types.chat import (
 from ..base import BaseAIModel
 from ..model import (
     AIChatResponse,
+    AIChatResponseDelta,
     AIContext,
     AIModelInteraction,
     AIModelInteractionMessage,
     AIModelToolCall,
     AIPrompt,
 )
+from ..retry import RetryPolicy
+from .clients import create_openai_clients
 from .model import OpenAIParameters
 
 _log = logging.getLogger(__name__)
@@ -28,12 +32,12 @@ class OpenAIModel(BaseAIModel):
     """OpenAI implementation of BaseAIModel"""
 
     _configured = False
+    _stream_parameters = {"stream": True, "stream_options": {"include_usage": True}}
 
     @classmethod
     def setup(cls):
         if not cls._configured:
-            cls.openai = OpenAI()
-            cls.async_openai = AsyncOpenAI()
+            cls.openai, cls.async_openai = create_openai_clients(max_retries=0)
             cls._configured = True
             _log.debug("OpenAI AI Model configured")
 
@@ -41,12 +45,15 @@ class OpenAIModel(BaseAIModel):
         self,
         model_name: str = "gpt-4o-mini",
         parameters: Optional[OpenAIParameters | Dict[str, Any]] = None,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
         self.setup()
         self.model_name = model_name
         if parameters and isinstance(parameters, dict):
             parameters = OpenAIParameters(**parameters)
         self.parameters = parameters or OpenAIParameters()
+        if retry_policy:
+            self.retry_policy = retry_policy
 
     @classmethod
     def get_model_names(cls) -> List[str]:
@@ -69,18 +76,12 @@ class OpenAIModel(BaseAIModel):
         parameters, ai_model_interaction = self._prepare_parameters(
             system_prompt, history, context, message, functions, response_format
         )
-        try:
+
+        def call() -> AIChatResponse:
             resp = self.openai.chat.completions.create(**parameters)
-            response = self._create_ai_chat_response(resp.choices[0].message)
-            return response
-        except Exception as e:
-            _log.error("Error: %s", e)
-            response = AIChatResponse(content=str(e))
-            return response
-        finally:
-            if interaction_logger:
-                ai_model_interaction.response = response
-                interaction_logger(ai_model_interaction)
+            return self._create_ai_chat_response(resp.choices[0].message, resp.usage)
+
+        return self._call_with_retry(call, ai_model_interaction, interaction_logger)
 
     @override
     async def get_chat_response_async(
@@ -98,18 +99,64 @@ class OpenAIModel(BaseAIModel):
         parameters, ai_model_interaction = self._prepare_parameters(
             system_prompt, history, context, message, functions, response_format
         )
-        try:
+
+        async def call() -> AIChatResponse:
             resp = await self.async_openai.chat.completions.create(**parameters)
-            response = self._create_ai_chat_response(resp.choices[0].message)
-            return response
-        except Exception as e:
-            _log.error("Error: %s", e)
-            response = AIChatResponse(content=str(e))
-            return response
-        finally:
-            if interaction_logger:
-                ai_model_interaction.response = response
-                interaction_logger(ai_model_interaction)
+            return self._create_ai_chat_response(resp.choices[0].message, resp.usage)
+
+        return await self._call_with_retry_async(call, ai_model_interaction, interaction_logger)
+
+    @override
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        if not isinstance(history, list):
+            history = list(history or [])
+        parameters, ai_model_interaction = self._prepare_parameters(
+            system_prompt, history, context, message, functions, response_format
+        )
+
+        def deltas() -> Iterator[AIChatResponseDelta]:
+            with self.openai.chat.completions.create(**parameters, **self._stream_parameters) as stream:
+                for chunk in stream:
+                    yield from self._create_ai_chat_response_deltas(chunk)
+
+        return self._stream(deltas, ai_model_interaction, interaction_logger)
+
+    @override
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        if not isinstance(history, list):
+            history = list(history or [])
+        parameters, ai_model_interaction = self._prepare_parameters(
+            system_prompt, history, context, message, functions, response_format
+        )
+
+        async def deltas() -> AsyncIterator[AIChatResponseDelta]:
+            async with await self.async_openai.chat.completions.create(
+                **parameters, **self._stream_parameters
+            ) as stream:
+                async for chunk in stream:
+                    for delta in self._create_ai_chat_response_deltas(chunk):
+                        yield delta
+
+        async for delta in self._stream_async(deltas, ai_model_interaction, interaction_logger):
+            yield delta
 
     def _prepare_parameters(
         self,
@@ -227,7 +274,9 @@ class OpenAIModel(BaseAIModel):
         return ret  # type: ignore
 
     @classmethod
-    def _create_ai_chat_response(cls, m_resp: ChatCompletionMessage) -> AIChatResponse:
+    def _create_ai_chat_response(
+        cls, m_resp: ChatCompletionMessage, usage: Optional[CompletionUsage] = None
+    ) -> AIChatResponse:
         if m_resp.tool_calls:
             tool_calls = [
                 AIModelToolCall(
@@ -239,4 +288,37 @@ class OpenAIModel(BaseAIModel):
             ]
         else:
             tool_calls = None
-        return AIChatResponse(content=m_resp.content, tool_calls=tool_calls)
+        return AIChatResponse(content=m_resp.content, tool_calls=tool_calls, **cls._get_usage(usage))
+
+    @staticmethod
+    def _get_usage(usage: Optional[CompletionUsage]) -> Dict[str, Any]:
+        if not usage:
+            return {}
+        if usage.prompt_tokens_details:
+            input_tokens_cached = usage.prompt_tokens_details.cached_tokens
+        else:
+            # DeepSeek reports cache hits in its own field
+            input_tokens_cached = getattr(usage, "prompt_cache_hit_tokens", None)
+        return {
+            "input_tokens": usage.prompt_tokens,
+            "input_tokens_cached": input_tokens_cached,
+            "reasoning_tokens": usage.completion_tokens_details.reasoning_tokens
+            if usage.completion_tokens_details
+            else None,
+            "output_tokens": usage.completion_tokens,
+        }
+
+    @classmethod
+    def _create_ai_chat_response_deltas(cls, chunk: ChatCompletionChunk) -> Iterator[AIChatResponseDelta]:
+        for choice in chunk.choices[:1]:
+            if choice.delta.content:
+                yield AIChatResponseDelta(content=choice.delta.content)
+            for tool_call in choice.delta.tool_calls or []:
+                yield AIChatResponseDelta(
+                    tool_call_index=tool_call.index,
+                    tool_call_id=tool_call.id,
+                    function_name=tool_call.function.name if tool_call.function else None,
+                    arguments=tool_call.function.arguments if tool_call.function else None,
+                )
+        if chunk.usage:
+            yield AIChatResponseDelta(**cls._get_usage(chunk.usage))
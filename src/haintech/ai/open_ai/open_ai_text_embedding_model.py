@@ -2,7 +2,9 @@ from typing import List, override
 
 import httpx
 from haintech.ai import BaseAITextEmbeddingModel
-from openai import AsyncOpenAI, OpenAI
+from openai import OpenAI
+
+from .clients import create_openai_clients
 
 
 class OpenAITextEmbeddingModel(BaseAITextEmbeddingModel):
@@ -18,15 +20,13 @@ class OpenAITextEmbeddingModel(BaseAITextEmbeddingModel):
         self.ai_model_name = ai_model_name
         self.dimensions = dimensions
         if base_url:
-            self.client = OpenAI(base_url=base_url, api_key=api_key)
-            self.client_async = AsyncOpenAI(base_url=base_url, api_key=api_key)
+            self.client, self.client_async = create_openai_clients(base_url, api_key)
         elif not self.client:
             self.setup()
 
     @classmethod
     def setup(cls):
-        cls.client = OpenAI()
-        cls.client_async = AsyncOpenAI()
+        cls.client, cls.client_async = create_openai_clients()
 
     @override
     def get_embedding(self, text: str) -> List[float]:
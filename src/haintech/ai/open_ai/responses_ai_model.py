@@ -1,15 +1,16 @@
+import hashlib
 import json
 import logging
 from itertools import chain
-from typing import Any, Callable, Dict, Iterable, Literal, Optional, Sequence, Type, override
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, Literal, Optional, Sequence, Type, override
 
-from openai import AsyncOpenAI, OpenAI
 from openai.types.responses import (
     EasyInputMessageParam,
     FunctionToolParam,
     Response,
     ResponseFunctionToolCallParam,
     ResponseInputParam,
+    ResponseStreamEvent,
 )
 from openai.types.responses.response_input_param import FunctionCallOutput
 from pydantic import BaseModel
@@ -17,8 +18,10 @@ from pydantic import BaseModel
 from haintech.helpers import get_inner_type, is_list_type
 
 from ..base import BaseAIModel
+from ..exceptions import AIModelError
 from ..model import (
     AIChatResponse,
+    AIChatResponseDelta,
     AIContext,
     AIFunction,
     AIModelInteraction,
@@ -26,6 +29,8 @@ from ..model import (
     AIModelToolCall,
     AIPrompt,
 )
+from ..retry import RetryPolicy, error_code_to_ai_model_error
+from .clients import create_openai_clients
 from .model import ResponsesAIParameters
 
 _log = logging.getLogger(__name__)
@@ -39,8 +44,7 @@ class ResponsesAIModel(BaseAIModel):
     @classmethod
     def setup(cls):
         if not cls._configured:
-            cls.openai = OpenAI()
-            cls.async_openai = AsyncOpenAI()
+            cls.openai, cls.async_openai = create_openai_clients(max_retries=0)
             cls._configured = True
             _log.debug("OpenAI AI Model configured")
 
@@ -48,10 +52,30 @@ class ResponsesAIModel(BaseAIModel):
         self,
         model_name: str = "gpt-5.4-nano",
         parameters: ResponsesAIParameters | Dict[str, Any] | None = None,
+        prompt_cache_key: Optional[str] = None,
+        prompt_cache_retention: Optional[Literal["in_memory", "24h"]] = None,
+        prompt_caching: bool = True,
+        retry_policy: Optional[RetryPolicy] = None,
     ):
+        """OpenAI Responses API implementation of BaseAIModel
+
+        Args:
+            model_name: The name of the model.
+            parameters: Parameters of the model.
+            prompt_cache_key: The key which routes requests with the same prefix to the same cache,
+                by default the hash of the system prompt and tools.
+            prompt_cache_retention: How long cached prompts are kept (`24h` - extended retention).
+            prompt_caching: The prompt cache key is sent.
+            retry_policy: Retries of transient errors (`RetryPolicy()` by default).
+        """
         self.setup()
         self.model_name = model_name
         self.parameters = parameters or ResponsesAIParameters()
+        self.prompt_cache_key = prompt_cache_key
+        self.prompt_cache_retention = prompt_cache_retention
+        self.prompt_caching = prompt_caching
+        if retry_policy:
+            self.retry_policy = retry_policy
 
     @classmethod
     def get_model_names(cls) -> list[str]:
@@ -74,18 +98,11 @@ class ResponsesAIModel(BaseAIModel):
         parameters, ai_model_interaction = self._prepare_parameters(
             system_prompt, history, context, message, functions, response_format
         )
-        try:
-            resp: Response = self.openai.responses.create(**parameters)
-            response = self._create_ai_chat_response(resp)
-            return response
-        except Exception as e:
-            _log.error("Error: %s", e)
-            response = AIChatResponse(content=str(e))
-            return response
-        finally:
-            if interaction_logger:
-                ai_model_interaction.response = response
-                interaction_logger(ai_model_interaction)
+
+        def call() -> AIChatResponse:
+            return self._create_ai_chat_response(self.openai.responses.create(**parameters))
+
+        return self._call_with_retry(call, ai_model_interaction, interaction_logger)
 
     @override
     async def get_chat_response_async(
@@ -103,18 +120,61 @@ class ResponsesAIModel(BaseAIModel):
         parameters, ai_model_interaction = self._prepare_parameters(
             system_prompt, history, context, message, functions, response_format
         )
-        try:
-            resp = await self.async_openai.responses.create(**parameters)
-            response = self._create_ai_chat_response(resp)
-            return response
-        except Exception as e:
-            _log.error("Error: %s", e)
-            response = AIChatResponse(content=str(e))
-            return response
-        finally:
-            if interaction_logger:
-                ai_model_interaction.response = response
-                interaction_logger(ai_model_interaction)
+
+        async def call() -> AIChatResponse:
+            return self._create_ai_chat_response(await self.async_openai.responses.create(**parameters))
+
+        return await self._call_with_retry_async(call, ai_model_interaction, interaction_logger)
+
+    @override
+    def get_chat_response_stream(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> Iterator[AIChatResponseDelta]:
+        if not isinstance(history, list):
+            history = list(history or [])
+        parameters, ai_model_interaction = self._prepare_parameters(
+            system_prompt, history, context, message, functions, response_format
+        )
+
+        def deltas() -> Iterator[AIChatResponseDelta]:
+            with self.openai.responses.create(**parameters, stream=True) as stream:
+                for event in stream:
+                    yield from self._create_ai_chat_response_deltas(event)
+
+        return self._stream(deltas, ai_model_interaction, interaction_logger)
+
+    @override
+    async def get_chat_response_stream_async(
+        self,
+        system_prompt: Optional[str | AIPrompt] = None,
+        history: Optional[Iterable[AIModelInteractionMessage]] = None,
+        context: Optional[AIContext] = None,
+        message: Optional[AIModelInteractionMessage] = None,
+        functions: Optional[Dict[Callable, Any]] = None,
+        interaction_logger: Optional[Callable[[AIModelInteraction], None]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+    ) -> AsyncIterator[AIChatResponseDelta]:
+        if not isinstance(history, list):
+            history = list(history or [])
+        parameters, ai_model_interaction = self._prepare_parameters(
+            system_prompt, history, context, message, functions, response_format
+        )
+
+        async def deltas() -> AsyncIterator[AIChatResponseDelta]:
+            async with await self.async_openai.responses.create(**parameters, stream=True) as stream:
+                async for event in stream:
+                    for delta in self._create_ai_chat_response_deltas(event):
+                        yield delta
+
+        async for delta in self._stream_async(deltas, ai_model_interaction, interaction_logger):
+            yield delta
 
     def _prepare_parameters(
         self,
@@ -173,10 +233,25 @@ class ResponsesAIModel(BaseAIModel):
             "text": response_format_dict,
             **parameters_dict,
         }
+        if self.prompt_caching:
+            # Sent as extra body, older SDKs do not have these parameters
+            prompt_cache_key = self.prompt_cache_key or self._get_prompt_cache_key(system_prompt, tools)
+            ret["extra_body"] = {"prompt_cache_key": prompt_cache_key}
+            if self.prompt_cache_retention:
+                ret["extra_body"]["prompt_cache_retention"] = self.prompt_cache_retention
         if _log.isEnabledFor(logging.DEBUG):
             _log.debug("===========>\n %s\n <==========", ret)
         return (ret, ai_model_interaction)
 
+    def _get_prompt_cache_key(self, system_prompt: str | AIPrompt | None, tools: list | None) -> str:
+        """Returns the hash of the static prefix of the prompt (model, system prompt and tools)."""
+        prefix = json.dumps(
+            [self.model_name, self._prompt_to_str(system_prompt) if system_prompt else None, tools],
+            sort_keys=True,
+            default=str,
+        )
+        return hashlib.sha256(prefix.encode("utf-8")).hexdigest()[:32]
+
     @staticmethod
     def _create_input(messages: Iterable[AIModelInteractionMessage]) -> ResponseInputParam:
         ret = []
@@ -296,6 +371,33 @@ class ResponsesAIModel(BaseAIModel):
             output_tokens=output_tokens,
         )
 
+    @classmethod
+    def _create_ai_chat_response_deltas(cls, event: ResponseStreamEvent) -> Iterator[AIChatResponseDelta]:
+        if event.type == "response.output_text.delta":
+            yield AIChatResponseDelta(content=event.delta)
+        elif event.type == "response.output_item.added" and event.item.type == "function_call":
+            yield AIChatResponseDelta(
+                tool_call_index=event.output_index,
+                tool_call_id=event.item.call_id,
+                function_name=event.item.name,
+                arguments=event.item.arguments or None,
+            )
+        elif event.type == "response.function_call_arguments.delta":
+            yield AIChatResponseDelta(tool_call_index=event.output_index, arguments=event.delta)
+        elif event.type == "response.completed" and event.response.usage:
+            usage = event.response.usage
+            yield AIChatResponseDelta(
+                input_tokens=usage.input_tokens,
+                input_tokens_cached=usage.input_tokens_details.cached_tokens,
+                reasoning_tokens=usage.output_tokens_details.reasoning_tokens,
+                output_tokens=usage.output_tokens,
+            )
+        elif event.type in ("response.failed", "error"):
+            error = event.response.error if event.type == "response.failed" else event
+            if not error:
+                raise AIModelError(f"Response failed: {event.type}")
+            raise error_code_to_ai_model_error(error.code, f"Response failed: {error.message}")
+
     def _prepare_response_format(
         self,
         response_format: Literal["text", "json"]
@@ -1,9 +1,11 @@
 import logging
-from typing import Callable, Literal, Type
+from typing import Any, Callable, Iterable, Literal, Optional, Type
 
 from ampf.base import Blob, BlobLocation
 
 from haintech.ai import BaseAIModel
+from haintech.ai.batch import BaseBatchBackend, BatchRequest, BatchResult
+from haintech.ai.exceptions import BatchRequestError
 from haintech.ai.model import AIModelInteraction
 from pydantic import BaseModel
 
@@ -20,10 +22,12 @@ class PromptExecutor:
         ai_model: BaseAIModel,
         prompt_service: PromptService,
         interaction_logger: Callable[[AIModelInteraction], None] | None = None,
+        batch_backend: BaseBatchBackend | None = None,
     ):
         self.ai_model = ai_model
         self.prompt_service = prompt_service
         self.interaction_logger = interaction_logger
+        self.batch_backend = batch_backend
 
     def execute(
         self,
@@ -72,12 +76,7 @@ class PromptExecutor:
         blobs: list[Blob] | None = None,
         **kwargs,
     ) -> T:
-        output_class = self.prompt_service.get_output_class(prompt_name)
-        if output_class:
-            json_schema = output_class.model_json_schema()
-        else:
-            json_schema = clazz.model_json_schema()
-        kwargs["json_schema"] = json_schema
+        output_class = self._set_json_schema(prompt_name, clazz, kwargs)
         system, user = self.prompt_service.render(prompt_name, **kwargs)
         ret = self.ai_model.get_response_typed(
             system_prompt=system,
@@ -86,11 +85,7 @@ class PromptExecutor:
             blobs=blobs,
             response_format=output_class or clazz,
         )
-        if output_class and isinstance(ret, BaseOutput):
-            return ret.convert(**kwargs)
-        elif isinstance(ret, clazz):
-            return ret
-        raise ValueError(f"Invalid response format: {ret}")
+        return self._convert(ret, clazz, output_class, kwargs)
 
     def execute_typed_list[T: BaseModel](
         self,
@@ -160,12 +155,7 @@ class PromptExecutor:
         blobs: list[Blob] | None = None,
         **kwargs,
     ) -> T:
-        output_class = self.prompt_service.get_output_class(prompt_name)
-        if output_class:
-            json_schema = output_class.model_json_schema()
-        else:
-            json_schema = clazz.model_json_schema()
-        kwargs["json_schema"] = json_schema
+        output_class = self._set_json_schema(prompt_name, clazz, kwargs)
         system, user = self.prompt_service.render(prompt_name, **kwargs)
         ret = await self.ai_model.get_response_typed_async(
             system_prompt=system,
@@ -174,11 +164,7 @@ class PromptExecutor:
             blobs=blobs,
             response_format=output_class or clazz,
         )
-        if output_class and isinstance(ret, BaseOutput):
-            return ret.convert(**kwargs)
-        elif isinstance(ret, clazz):
-            return ret
-        raise ValueError(f"Invalid response format: {ret}")
+        return self._convert(ret, clazz, output_class, kwargs)
 
     async def execute_typed_list_async[T: BaseModel](
         self,
@@ -199,3 +185,103 @@ class PromptExecutor:
             response_format= clazz,
         )
         return ret
+
+    async def execute_batch_async(
+        self,
+        prompt_name: str,
+        items: Iterable[dict[str, Any]],
+        response_format: Literal["text", "json"] | dict = "text",
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None,
+    ) -> list[str | BatchRequestError]:
+        """Executes the prompt for each item (prompt arguments) in one batch job.
+
+        Results are returned in the order of items, failed items are returned as errors.
+        """
+        results = await self._run_batch(prompt_name, items, response_format, poll_interval, timeout)
+        return [
+            r.response.content
+            if r.response and r.response.content is not None
+            else BatchRequestError(r.custom_id, r.error or "AI model returned empty content")
+            for r in results
+        ]
+
+    async def execute_typed_batch_async[T: BaseModel](
+        self,
+        prompt_name: str,
+        clazz: Type[T],
+        items: Iterable[dict[str, Any]],
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None,
+    ) -> list[T | Exception]:
+        """Executes the typed prompt for each item (prompt arguments) in one batch job.
+
+        Results are returned in the order of items, failed items (also invalid responses)
+        are returned as errors.
+        """
+        output_class = self.prompt_service.get_output_class(prompt_name)
+        json_schema = (output_class or clazz).model_json_schema()
+        items = [dict(item, json_schema=json_schema) for item in items]
+        response_format = self._get_batch_backend().ai_model._prepare_response_format(  # type: ignore
+            output_class or clazz
+        )
+        results = await self._run_batch(prompt_name, items, response_format, poll_interval, timeout)
+        ret: list[T | Exception] = []
+        for item, result in zip(items, results):
+            if not result.response or not result.response.content:
+                ret.append(BatchRequestError(result.custom_id, result.error or "AI model returned empty content"))
+                continue
+            try:
+                typed = (output_class or clazz).model_validate_json(result.response.content)
+                ret.append(self._convert(typed, clazz, output_class, item))
+            except Exception as e:
+                _log.warning("Invalid response of batch request %s: %s", result.custom_id, e)
+                ret.append(e)
+        return ret
+
+    async def _run_batch(
+        self,
+        prompt_name: str,
+        items: Iterable[dict[str, Any]],
+        response_format: Literal["text", "json"] | dict | None,
+        poll_interval: float,
+        timeout: Optional[float],
+    ) -> list[BatchResult]:
+        batch_backend = self._get_batch_backend()
+        requests = []
+        for i, item in enumerate(items):
+            system, user = self.prompt_service.render(prompt_name, **item)
+            requests.append(
+                BatchRequest(
+                    custom_id=f"item-{i}",
+                    system_prompt=system or None,
+                    message=user,
+                    response_format=response_format or "text",
+                )
+            )
+        if not requests:
+            return []
+        return await batch_backend.run(requests, poll_interval, timeout)
+
+    def _get_batch_backend(self) -> BaseBatchBackend:
+        if not self.batch_backend or not self.batch_backend.ai_model:
+            raise ValueError("Batch backend with AI model is required to execute prompts in batch")
+        return self.batch_backend
+
+    def _set_json_schema(self, prompt_name: str, clazz: Type[BaseModel], kwargs: dict) -> Type[BaseOutput] | None:
+        """Sets the JSON schema of the output in prompt arguments and returns the output class of the prompt."""
+        output_class = self.prompt_service.get_output_class(prompt_name)
+        if output_class:
+            json_schema = output_class.model_json_schema()
+        else:
+            json_schema = clazz.model_json_schema()
+        kwargs["json_schema"] = json_schema
+        return output_class
+
+    @staticmethod
+    def _convert[T: BaseModel](ret: Any, clazz: Type[T], output_class: Type[BaseOutput] | None, kwargs: dict) -> T:
+        if output_class and isinstance(ret, BaseOutput):
+            return ret.convert(**kwargs)
+        elif isinstance(ret, clazz):
+            return ret
+        raise ValueError(f"Invalid response format: {ret}")
@@ -0,0 +1,141 @@
+import random
+import time
+from email.utils import parsedate_to_datetime
+from typing import Any, Optional
+
+import httpx
+from pydantic import BaseModel
+
+from .exceptions import (
+    AIContextTooLongError,
+    AIInvalidRequestError,
+    AIModelError,
+    AIOverloadedError,
+    AIRateLimitError,
+    AITimeoutError,
+)
+
+_CONTEXT_TOO_LONG_MESSAGES = (
+    "context_length_exceeded",
+    "context length",
+    "context window",
+    "prompt is too long",
+    "exceeds the maximum number of tokens",
+    "too many tokens",
+)
+_CONNECTION_ERRORS = {"APIConnectionError", "APITimeoutError", "ClientConnectionError"}
+
+
+class RetryPolicy(BaseModel):
+    """Retries of transient errors (rate limits, timeouts, overloaded providers)
+    with jittered exponential backoff. `Retry-After` sent by the provider is honoured."""
+
+    max_attempts: int = 3
+    """The maximum number of requests (1 - no retries)"""
+    initial_delay: float = 1.0
+    """Seconds to wait before the first retry"""
+    max_delay: float = 60.0
+    """The maximum number of seconds between retries"""
+    multiplier: float = 2.0
+    """The delay is multiplied by it after each retry"""
+    jitter: float = 0.5
+    """The part of the delay which is random, so clients do not retry at the same time"""
+    max_retry_after: float = 120.0
+    """Errors with longer `Retry-After` are raised instead of waiting"""
+
+    def get_delay(self, attempt: int, error: Exception) -> Optional[float]:
+        """Returns seconds to wait before the next attempt or None if the error is not retried.
+
+        Args:
+            attempt: The number of the failed attempt (starting with 1).
+            error: The error of the attempt (converted by `to_ai_model_error`).
+        """
+        if attempt >= self.max_attempts or not isinstance(error, AIModelError) or not error.retryable:
+            return None
+        delay = min(self.max_delay, self.initial_delay * self.multiplier ** (attempt - 1))
+        delay -= random.uniform(0, delay * self.jitter)
+        if error.retry_after is not None:
+            if error.retry_after > self.max_retry_after:
+                return None
+            delay = max(delay, error.retry_after)
+        return delay
+
+
+def to_ai_model_error(e: Exception) -> Exception:
+    """Converts errors of provider SDKs (OpenAI, Anthropic, Google) and HTTP clients to `AIModelError`.
+
+    Errors are recognised by the HTTP status code and the message, so SDKs are not imported.
+    Other errors (e.g. of parsing responses) are returned unchanged.
+    """
+    if isinstance(e, AIModelError):
+        return e
+    message = str(e)
+    if isinstance(e, (TimeoutError, ConnectionError, httpx.TransportError)) or _CONNECTION_ERRORS.intersection(
+        c.__name__ for c in type(e).__mro__
+    ):
+        return AITimeoutError(message)
+    status_code = _get_status_code(e)
+    if status_code is None:
+        return e
+    retry_after = _get_retry_after(getattr(e, "response", None))
+    if status_code == 429:
+        # Exhausted quota is not reset by waiting
+        if "insufficient_quota" in message:
+            return AIInvalidRequestError(message, status_code)
+        return AIRateLimitError(message, status_code, retry_after)
+    if status_code == 408:
+        return AITimeoutError(message, status_code, retry_after)
+    if status_code >= 500:
+        return AIOverloadedError(message, status_code, retry_after)
+    if status_code == 413 or any(m in message.lower() for m in _CONTEXT_TOO_LONG_MESSAGES):
+        return AIContextTooLongError(message, status_code)
+    if status_code >= 400:
+        return AIInvalidRequestError(message, status_code)
+    return e
+
+
+def error_code_to_ai_model_error(code: Optional[str], message: str) -> AIModelError:
+    """Converts the error code sent in the response body (e.g. an error event of a stream) to `AIModelError`.
+
+    Codes are mapped like HTTP status codes of `to_ai_model_error`.
+    """
+    code = code or ""
+    if code == "insufficient_quota":
+        return AIInvalidRequestError(message)
+    if "rate_limit" in code:
+        return AIRateLimitError(message)
+    if "timeout" in code:
+        return AITimeoutError(message)
+    if code in ("server_error", "overloaded_error", "api_error"):
+        return AIOverloadedError(message)
+    if any(m in f"{code} {message}".lower() for m in _CONTEXT_TOO_LONG_MESSAGES):
+        return AIContextTooLongError(message)
+    if code:
+        return AIInvalidRequestError(message)
+    return AIModelError(message)
+
+
+def _get_status_code(e: Exception) -> Optional[int]:
+    # OpenAI and Anthropic errors have `status_code`, Google errors have `code`
+    for name in ("status_code", "code"):
+        value = getattr(e, name, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def _get_retry_after(response: Any) -> Optional[float]:
+    headers = getattr(response, "headers", None)
+    if not headers:
+        return None
+    try:
+        if retry_after_ms := headers.get("retry-after-ms"):
+            return float(retry_after_ms) / 1000
+        if retry_after := headers.get("retry-after"):
+            try:
+                return float(retry_after)
+            except ValueError:
+                return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        pass
+    return None
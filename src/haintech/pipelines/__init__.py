@@ -1,5 +1,6 @@
 from .base_processor import BaseProcessor, FieldNameOrLambda
 from .base_flat_map_processor import BaseFlatMapProcessor
+from .cancel_token import CancelToken, PipelineCancelledError
 from .concurrent_processor import ConcurrentProcessor
 from .filter_processor import FilterProcessor
 from .flat_map_processor import FlatMapProcessor
@@ -7,13 +8,25 @@ from .group_processor import GroupProcessor
 
 # from .pdf_loader import PdfLoader
 from .json_writer import JsonWriter
+from .join_processor import JoinProcessor
 from .jsonl_writer import JsonlWriter
 from .lambda_processor import LambdaProcessor
 from .limit import Limit
 from .log_processor import LogProcessor
+from .metrics import (
+    InMemoryMetricsExporter,
+    LoggingMetricsExporter,
+    MetricsExporter,
+    PipelineMetrics,
+    PrometheusMetricsExporter,
+)
 from .pipeline import Pipeline
 from .pipeline_processor import PipelineProcessor
-from .progress_tracker import ProgressTracker
+from .progress_tracker import ProgressSnapshot, ProgressTracker
+from .streaming_pipeline_processor import StreamingPipelineProcessor
+from .tee_processor import TeeProcessor
+from .text_splitter import TextSplitter
+from .window_processor import Window, WindowProcessor
 
 # from .ai_text_generator import AiTextGenerator
 
@@ -31,9 +44,23 @@ __all__ = [
     "JsonLoader",
     "AiTextGenerator",
     "PipelineProcessor",
+    "StreamingPipelineProcessor",
+    "TeeProcessor",
+    "JoinProcessor",
+    "WindowProcessor",
+    "Window",
     "LogProcessor",
     "ProgressTracker",
+    "ProgressSnapshot",
     "ConcurrentProcessor",
     "JsonlWriter",
     "Limit",
+    "TextSplitter",
+    "CancelToken",
+    "PipelineCancelledError",
+    "PipelineMetrics",
+    "MetricsExporter",
+    "LoggingMetricsExporter",
+    "PrometheusMetricsExporter",
+    "InMemoryMetricsExporter",
 ]
@@ -0,0 +1,76 @@
+from operator import attrgetter, itemgetter
+from typing import Any, Callable, Dict, Optional
+
+from pydantic import BaseModel
+
+_is_object_cache: Dict[type, bool] = {}
+
+
+def _is_object(t: type) -> bool:
+    """Returns True if fields of the type are read as attributes
+    (pydantic models and objects without `__getitem__`), False for dicts."""
+    ret = _is_object_cache.get(t)
+    if ret is None:
+        ret = issubclass(t, BaseModel) or not hasattr(t, "__getitem__")
+        _is_object_cache[t] = ret
+    return ret
+
+
+class FieldGetter:
+    """Reads field (or dotted path of fields) from pydantic model, object or dict.
+
+    The access strategy is resolved once per item type, so reading a field
+    costs one attribute or item lookup. The model is never dumped.
+    """
+
+    __slots__ = ("path", "_parts", "_type", "_get")
+
+    def __init__(self, path: str):
+        self.path = path
+        self._parts = tuple(path.split("."))
+        self._type: Optional[type] = None
+        self._get: Optional[Callable[[Any], Any]] = None
+
+    def __call__(self, data: Any) -> Any:
+        if type(data) is not self._type:
+            self._get = self._compile(type(data))
+            self._type = type(data)
+        return self._get(data)
+
+    def _compile(self, t: type) -> Callable[[Any], Any]:
+        if len(self._parts) == 1:
+            return attrgetter(self.path) if _is_object(t) else itemgetter(self.path)
+        return self._walk
+
+    def _walk(self, data: Any) -> Any:
+        for part in self._parts:
+            data = getattr(data, part) if _is_object(type(data)) else data[part]
+        return data
+
+
+class FieldSetter:
+    """Sets field (or the last field of dotted path) of pydantic model, object or dict."""
+
+    __slots__ = ("path", "name", "_parent")
+
+    def __init__(self, path: str):
+        self.path = path
+        parent, _, self.name = path.rpartition(".")
+        self._parent = FieldGetter(parent) if parent else None
+
+    def __call__(self, data: Any, value: Any) -> None:
+        target = self._parent(data) if self._parent else data
+        if _is_object(type(target)):
+            setattr(target, self.name, value)
+        else:
+            target[self.name] = value
+
+
+def compile_getter(exp: str | Callable[[Any], Any]) -> Callable[[Any], Any]:
+    """Returns function reading the value of the field name (dotted path) or lambda."""
+    if isinstance(exp, str):
+        return FieldGetter(exp)
+    elif callable(exp):
+        return exp
+    else:
+        raise TypeError("Wrong field_name_or_lambda type")
@@ -1,3 +1,4 @@
+from .batch_processor import BatchProcessor, BatchPromptProcessor, BatchTextEmbedder
 from .text_embedder import TextEmbedder
 
-__all__ = ["TextEmbedder"]
+__all__ = ["BatchProcessor", "BatchPromptProcessor", "BatchTextEmbedder", "TextEmbedder"]
@@ -0,0 +1,169 @@
+import logging
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator, List, Literal, Optional, Sequence, Type, override
+
+from pydantic import BaseModel
+
+from ...ai.batch import BaseBatchBackend
+from ..base_processor import BaseProcessor, FieldNameOrLambda, FieldNameOrLambda2, close_iterator
+from .text_embedder import Vector
+
+if TYPE_CHECKING:
+    from ...ai.prompts import PromptExecutor
+
+
+class BatchProcessor[I, O](BaseProcessor[I, O]):
+    """Collects items in chunks of `batch_size` and processes each chunk as one batch job.
+
+    Items are returned in the input order when the job is done. Failed items are skipped
+    (and logged) if `skip_errors` is set, otherwise the first error is raised.
+    """
+
+    _log = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        batch_size: int = 10_000,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None,
+        skip_errors: bool = True,
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+        output: Optional[FieldNameOrLambda2] = None,
+    ):
+        """Collects items in chunks and processes each chunk as one batch job.
+
+        Args:
+            batch_size: The maximum number of items of one batch job.
+            poll_interval: Seconds between polls of the job.
+            timeout: Seconds to wait for the job.
+            skip_errors: Failed items are skipped, otherwise the error is raised.
+            name: The name of the processor.
+            input: The name of the input field.
+            output: The name of the output field.
+        """
+        super().__init__(name=name, input=input, output=output)
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.timeout = timeout
+        self.skip_errors = skip_errors
+
+    async def process_batch(self, data: List[I]) -> Sequence[O | Exception]:
+        """Processes the chunk of items and returns results (or errors) in the same order.
+        Override this method in subclasses.
+        """
+        raise NotImplementedError
+
+    @override
+    async def process(self, data) -> AsyncIterator[O]:
+        iterator = self._get_iterator(data)
+        try:
+            chunk: List[Any] = []
+            if isinstance(iterator, Iterator):
+                for item in iterator:
+                    chunk.append(item)
+                    if len(chunk) >= self.batch_size:
+                        for ret in await self._process_chunk(chunk):
+                            yield ret
+                        chunk = []
+            else:
+                async for item in iterator:
+                    chunk.append(item)
+                    if len(chunk) >= self.batch_size:
+                        for ret in await self._process_chunk(chunk):
+                            yield ret
+                        chunk = []
+            if chunk:
+                for ret in await self._process_chunk(chunk):
+                    yield ret
+        finally:
+            await close_iterator(iterator)
+
+    async def _process_chunk(self, chunk: List[Any]) -> List[Any]:
+        input_data = [self._get_input_data(item) for item in chunk] if self.input else chunk
+        results = await self.process_batch(input_data)
+        ret = []
+        for item, result in zip(chunk, results):
+            if isinstance(result, Exception):
+                if not self.skip_errors:
+                    raise result
+                self._log.warning("Item skipped: %s", result)
+                continue
+            ret.append(self._put_output_data(item, result))
+        return ret
+
+
+class BatchTextEmbedder[I: str, O: Vector](BatchProcessor[I, O]):
+    """Embeds texts in batch jobs."""
+
+    def __init__(
+        self,
+        batch_backend: BaseBatchBackend,
+        batch_size: int = 10_000,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None,
+        skip_errors: bool = True,
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+        output: Optional[FieldNameOrLambda2] = None,
+    ):
+        super().__init__(
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            skip_errors=skip_errors,
+            name=name,
+            input=input,
+            output=output,
+        )
+        self.batch_backend = batch_backend
+
+    @override
+    async def process_batch(self, data: List[I]) -> Sequence[O | Exception]:
+        return await self.batch_backend.get_embeddings(data, self.poll_interval, self.timeout)  # type: ignore
+
+
+class BatchPromptProcessor[I: dict, O](BatchProcessor[I, O]):
+    """Executes the prompt in batch jobs, input items are prompt arguments.
+
+    Responses are parsed to `clazz` if it is set, otherwise text responses are returned.
+    """
+
+    def __init__(
+        self,
+        prompt_executor: "PromptExecutor",
+        prompt_name: str,
+        clazz: Optional[Type[BaseModel]] = None,
+        response_format: Literal["text", "json"] | dict = "text",
+        batch_size: int = 10_000,
+        poll_interval: float = 60.0,
+        timeout: Optional[float] = None,
+        skip_errors: bool = True,
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+        output: Optional[FieldNameOrLambda2] = None,
+    ):
+        super().__init__(
+            batch_size=batch_size,
+            poll_interval=poll_interval,
+            timeout=timeout,
+            skip_errors=skip_errors,
+            name=name,
+            input=input,
+            output=output,
+        )
+        self.prompt_executor = prompt_executor
+        self.prompt_name = prompt_name
+        self.clazz = clazz
+        self.response_format = response_format
+
+    @override
+    async def process_batch(self, data: List[I]) -> Sequence[O | Exception]:
+        if self.clazz:
+            return await self.prompt_executor.execute_typed_batch_async(  # type: ignore
+                self.prompt_name, self.clazz, data, self.poll_interval, self.timeout
+            )
+        return await self.prompt_executor.execute_batch_async(  # type: ignore
+            self.prompt_name, data, self.response_format, self.poll_interval, self.timeout
+        )
@@ -1,6 +1,7 @@
 from .blob_storage_reader import BlobStorageReader
 from .blob_storage_writer import BlobStorageWriter
 from .blob_storage_iterator import BlobStorageIterator
+from .blob_stream import BlobStream
 from .storage_iterator import StorageIterator
 from .storage_reader import StorageReader
 from .storage_writer import StorageWriter
@@ -9,6 +10,7 @@ __all__ = [
     "BlobStorageReader",
     "BlobStorageWriter",
     "BlobStorageIterator",
+    "BlobStream",
     "StorageReader",
     "StorageWriter",
     "StorageIterator",
@@ -1,35 +1,84 @@
-from typing import AsyncIterator, Callable, Iterator, Optional, override
+from contextlib import aclosing
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, override
 
 from ampf.base import BaseAsyncBlobStorage, Blob, BaseBlobMetadata
 
 from ..base_flat_map_processor import BaseProcessor
+from ..base_processor import close_iterator
+from ..byte_budget import ByteBudget
+from ..concurrent_map import concurrent_map
 from ..progress_tracker import ProgressTracker
+from .blob_stream import DEFAULT_CHUNK_SIZE, BlobStream
 
 
-class BlobStorageIterator[I, M: BaseBlobMetadata](BaseProcessor[I, Blob[M]]):
+class BlobStorageIterator[I, M: BaseBlobMetadata](BaseProcessor[I, Blob[M] | BlobStream[M]]):
+    """Iterate over blobs from storage.
+
+    Blob headers are streamed from `list_blobs()` and up to `max_concurrent`
+    blobs are downloaded at the same time. In stream mode `BlobStream`
+    objects are returned and content is read when they are iterated.
+    """
+
     def __init__(
         self,
         storage: BaseAsyncBlobStorage[M] | Callable[[I], BaseAsyncBlobStorage[M]],
         progress_tracker: Optional[ProgressTracker] = None,
+        max_concurrent: int = 5,
+        ordered: bool = True,
+        max_bytes_in_flight: Optional[int] = None,
+        blob_filter: Optional[Callable[[Any], bool]] = None,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
         name=None,
         input=None,
         output=None,
     ):
+        """Iterate over blobs from storage.
+
+        Args:
+            storage: Storage or function returning storage for the input item.
+            progress_tracker: Progress tracker. If it is set, all blob headers
+                are listed first to set total steps.
+            max_concurrent: The maximum number of concurrent downloads.
+            ordered: If True, blobs are returned in listing order,
+                otherwise as soon as they are downloaded.
+            max_bytes_in_flight: The maximum number of bytes of downloaded blobs
+                which are not consumed by the next processors yet.
+            blob_filter: Function which gets blob header (name and metadata)
+                and returns True if the blob should be downloaded.
+            stream: If True, `BlobStream` objects are returned instead of
+                downloaded blobs. The storage must have
+                `download_stream_async(name, chunk_size)` method then.
+            chunk_size: Size of chunks in stream mode.
+        """
         super().__init__(name, input, output)
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be greater than 0")
         self.storage = storage
         self.progress_tracker = progress_tracker
+        self.max_concurrent = max_concurrent
+        self.ordered = ordered
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self.blob_filter = blob_filter
+        self.stream = stream
+        self.chunk_size = chunk_size
 
     @override
     async def process(self, data: I) -> AsyncIterator[Blob[M]]:
         iterator = self._get_iterator(data)
-        if isinstance(iterator, Iterator):
-            for data in iterator:
-                async for item in self.wrap_process_flat_map(data):
-                    yield item
-        else:
-            async for data in iterator:
-                async for item in self.wrap_process_flat_map(data):
-                    yield item
+        try:
+            if isinstance(iterator, Iterator):
+                for data in iterator:
+                    async with aclosing(self.wrap_process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+            else:
+                async for data in iterator:
+                    async with aclosing(self.wrap_process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+        finally:
+            await close_iterator(iterator)
 
     async def wrap_process_flat_map(self, data):
         """
@@ -48,14 +97,64 @@ class BlobStorageIterator[I, M: BaseBlobMetadata](BaseProcessor[I, Blob[M]]):
             storage = self.storage(data)
         else:
             storage = self.storage
-        blob_headers = list([bh async for bh in storage.list_blobs()])
+        headers = self._list_blobs(storage)
         if self.progress_tracker:
-            self.progress_tracker.set_total_steps(len(blob_headers))
-        for header in blob_headers:
-            item = await storage.download_async(header.name)
-            if self.progress_tracker:
-                self.progress_tracker.increment()
-            yield self._put_output_data(data, item)
+            headers = [bh async for bh in headers]
+            self.progress_tracker.set_total_steps(len(headers))
+        if self.stream:
+            async for header in self._aiter(headers):
+                if self.progress_tracker:
+                    self.progress_tracker.increment()
+                yield BlobStream.from_storage(
+                    storage, header.name, getattr(header, "metadata", None), self.chunk_size
+                )
+            return
+        budget = ByteBudget(self.max_bytes_in_flight) if self.max_bytes_in_flight else None
+
+        async def download(header) -> Blob[M]:
+            size = getattr(header, "size", None) or 0
+            if budget:
+                await budget.acquire(size)
+            try:
+                blob = await storage.download_async(header.name)
+            except BaseException:
+                if budget:
+                    await budget.release(size)
+                raise
+            if budget:
+                # Replace the estimated size with the real one
+                budget.add(self._get_size(blob))
+                await budget.release(size)
+            return blob
+
+        blobs = concurrent_map(headers, download, self.max_concurrent, self.ordered)
+        async with aclosing(blobs):
+            async for item in blobs:
+                try:
+                    if self.progress_tracker:
+                        self.progress_tracker.increment()
+                    yield item
+                finally:
+                    if budget:
+                        await budget.release(self._get_size(item))
+
+    async def _list_blobs(self, storage: BaseAsyncBlobStorage[M]) -> AsyncIterator[Any]:
+        async for header in storage.list_blobs():
+            if not self.blob_filter or self.blob_filter(header):
+                yield header
+
+    @staticmethod
+    async def _aiter(headers) -> AsyncIterator[Any]:
+        if isinstance(headers, list):
+            for header in headers:
+                yield header
+        else:
+            async for header in headers:
+                yield header
+
+    @staticmethod
+    def _get_size(blob: Blob[M]) -> int:
+        return len(blob.content) if blob.content else 0
 
     @override
     async def process_item(self, data: Blob[M]) -> Blob[M]:
@@ -1,26 +1,54 @@
+import asyncio
+from pathlib import Path
 from typing import Tuple
 from pydantic import BaseModel
 
 from ..base_processor import BaseProcessor
 from ampf.base import BaseBlobStorage
 
+from .blob_stream import DEFAULT_CHUNK_SIZE, BlobStream
 
-class BlobStorageReader[str, M: BaseModel](BaseProcessor[str, Tuple[bytes | str, M]]):
+
+class BlobStorageReader[str, M: BaseModel](BaseProcessor[str, Tuple[bytes | str | BlobStream[M], M]]):
     """Read from storage blob and metadata."""
 
     def __init__(
         self,
-        storage: BaseBlobStorage,
+        storage: BaseBlobStorage | Path,
         name=None,
         input=None,
         output=None,
+        stream: bool = False,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
     ):
+        """Read from storage blob and metadata.
+
+        Args:
+            storage: Blob storage or local directory.
+            stream: If True, `BlobStream` is returned instead of content,
+                so the content is read chunk by chunk by the next processors.
+                Files from local directory are memory mapped, other storages
+                must have `download_stream_async(name, chunk_size)` method.
+            chunk_size: Size of chunks in stream mode.
+        """
         super().__init__(name, input, output)
         self.storage = storage
+        self.stream = stream
+        self.chunk_size = chunk_size
 
-    async def process_item(self, file_name: str) -> Tuple[bytes | str, M]:
-        blob = self.storage.download_blob(file_name)
+    async def process_item(self, file_name: str) -> Tuple[bytes | str | BlobStream[M], M]:
+        if isinstance(self.storage, Path):
+            path = self.storage / file_name
+            if self.stream:
+                return (BlobStream.from_file(path, chunk_size=self.chunk_size), None)
+            return (await asyncio.to_thread(path.read_bytes), None)
+        metadata = await asyncio.to_thread(self.storage.get_metadata, file_name)
+        if self.stream:
+            stream = BlobStream.from_storage(
+                self.storage, file_name, metadata, self.chunk_size, self.storage.content_type
+            )
+            return (stream, metadata)
+        blob = await asyncio.to_thread(self.storage.download_blob, file_name)
         if isinstance(blob, bytes) and any(x in self.storage.content_type for x in ("text", "json", "xml")):
             blob = blob.decode("utf-8")
-        metadata = self.storage.get_metadata(file_name)
         return (blob, metadata)
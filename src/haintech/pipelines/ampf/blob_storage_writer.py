@@ -1,16 +1,27 @@
+import asyncio
+import hashlib
 import logging
+import tempfile
+from pathlib import Path
 from typing import Callable, Optional, override
 
-from ampf.base import Blob, BaseAsyncBlobStorage, BaseBlobMetadata
+from ampf.base import Blob, BaseAsyncBlobStorage, BaseBlobMetadata, KeyNotExistsException
 
-from ..base_processor import BaseProcessor, FieldNameOrLambda, FieldNameOrLambda2
+from ..base_processor import FieldNameOrLambda, FieldNameOrLambda2
+from ..byte_budget import ByteBudget
+from ..concurrent_processor import ConcurrentProcessor
 from ..progress_tracker import ProgressTracker
+from .blob_stream import BlobStream
 
 _log = logging.getLogger(__name__)
 
 
-class BlobStorageWriter[M: BaseBlobMetadata](BaseProcessor[Blob[M], Blob[M]]):
-    """Write to storage blob and metadata."""
+class BlobStorageWriter[M: BaseBlobMetadata](ConcurrentProcessor[Blob[M] | BlobStream[M], Blob[M]]):
+    """Write to storage blob and metadata.
+
+    `BlobStream` items are uploaded chunk by chunk, the storage must have
+    `upload_stream_async(stream)` method. Streams are never read into memory.
+    """
 
     def __init__(
         self,
@@ -19,12 +30,144 @@ class BlobStorageWriter[M: BaseBlobMetadata](BaseProcessor[Blob[M], Blob[M]]):
         name: Optional[str] = None,
         input: Optional[FieldNameOrLambda] = None,
         output: Optional[FieldNameOrLambda2] = None,
+        read_after_write: bool = True,
+        max_concurrent: int = 1,
+        ordered: bool = False,
+        max_bytes_in_flight: Optional[int] = None,
+        changed_only: bool = False,
+        hash_field: str = "content_hash",
     ):
-        super().__init__(name, input, output)
+        """Write to storage blob and metadata.
+
+        Args:
+            storage: Storage or function returning storage for the blob.
+            progress_tracker: Progress tracker.
+            read_after_write: If True, the blob is downloaded after upload
+                and the downloaded one is returned (for streams `BlobStream`
+                of the stored blob). Otherwise the uploaded blob is returned.
+            max_concurrent: The maximum number of concurrent uploads.
+            ordered: If True, blobs are returned in the input order.
+            max_bytes_in_flight: The maximum number of bytes uploaded at the same time.
+                Streams hold the budget for the chunk being uploaded.
+            changed_only: If True, the blob is not uploaded (and not returned)
+                when the same content is already stored under its name.
+                The stored hash is read from metadata, blobs stored without
+                it are uploaded again.
+            hash_field: Metadata field where the content hash is stored
+                (only if metadata class has such field).
+        """
+        super().__init__(
+            max_concurrent=max_concurrent, ordered=ordered, name=name, input=input, output=output
+        )
         self.storage = storage
         self.progress_tracker = progress_tracker
+        self.read_after_write = read_after_write
+        self.budget = ByteBudget(max_bytes_in_flight) if max_bytes_in_flight else None
+        self.changed_only = changed_only
+        self.hash_field = hash_field
 
     @override
-    async def process_item(self, item: Blob[M]) -> Blob[M]:
-        await self.storage.upload_async(item)
-        return await self.storage.download_async(item.name)       
+    async def process_item(self, item: Blob[M] | BlobStream[M]) -> Blob[M] | BlobStream[M] | None:
+        if isinstance(self.storage, Callable):
+            storage = self.storage(item)
+        else:
+            storage = self.storage
+        if isinstance(item, BlobStream):
+            return await self._process_stream(storage, item)
+        if self.changed_only:
+            content_hash = self._get_content_hash(item.content)
+            if item.metadata is not None and self.hash_field in type(item.metadata).model_fields:
+                setattr(item.metadata, self.hash_field, content_hash)
+            if await self._get_stored_hash(storage, item.name) == content_hash:
+                _log.debug("Skip: %s", item.name)
+                return None
+        return await self._upload(storage, item)
+
+    async def _upload(self, storage: BaseAsyncBlobStorage[M], item: Blob[M]) -> Blob[M]:
+        size = len(item.content) if item.content else 0
+        if self.budget:
+            await self.budget.acquire(size)
+        try:
+            await storage.upload_async(item)
+        finally:
+            if self.budget:
+                await self.budget.release(size)
+        if self.read_after_write:
+            return await storage.download_async(item.name)
+        return item
+
+    async def _process_stream(
+        self, storage: BaseAsyncBlobStorage[M], item: BlobStream[M]
+    ) -> Blob[M] | BlobStream[M] | None:
+        upload_stream = getattr(storage, "upload_stream_async", None)
+        if not callable(upload_stream):
+            raise TypeError(f"{type(storage).__name__} can't upload streams (no upload_stream_async method)")
+        if self.changed_only:
+            # The stream is read once: hashed and spooled to a local file which is uploaded
+            with tempfile.TemporaryDirectory() as tmp:
+                spool = Path(tmp) / "blob"
+                content_hash = await self._spool(item, spool)
+                if item.metadata is not None and self.hash_field in type(item.metadata).model_fields:
+                    setattr(item.metadata, self.hash_field, content_hash)
+                if await self._get_stored_hash(storage, item.name) == content_hash:
+                    _log.debug("Skip: %s", item.name)
+                    return None
+                await self._upload_stream(
+                    upload_stream, BlobStream.from_file(spool, item.name, item.metadata, item.content_type)
+                )
+        else:
+            await self._upload_stream(upload_stream, item)
+        if self.read_after_write:
+            return BlobStream.from_storage(storage, item.name, item.metadata)
+        return item
+
+    async def _upload_stream(self, upload_stream: Callable, item: BlobStream[M]) -> None:
+        await upload_stream(self._with_budget(item, self.budget) if self.budget else item)
+
+    @staticmethod
+    def _with_budget(stream: BlobStream[M], budget: ByteBudget) -> BlobStream[M]:
+        """Returns the stream which holds the budget for the chunk until the next one is requested."""
+
+        async def chunks():
+            async for chunk in stream:
+                size = len(chunk)
+                await budget.acquire(size)
+                try:
+                    yield chunk
+                finally:
+                    await budget.release(size)
+
+        return BlobStream(stream.name, chunks, stream.metadata, stream.content_type)
+
+    async def _get_stored_hash(self, storage: BaseAsyncBlobStorage[M], name: str) -> str | None:
+        """Returns hash of the blob content already stored under the name.
+
+        The hash is read from metadata only. If the storage can't read metadata
+        alone or the stored metadata has no hash, None is returned and the blob
+        is treated as changed (the stored blob is never downloaded).
+        """
+        try:
+            get_metadata = getattr(storage, "get_metadata_async", None)
+            if callable(get_metadata):
+                metadata = await get_metadata(name)
+            elif callable(getattr(storage, "get_metadata", None)):
+                metadata = await asyncio.to_thread(storage.get_metadata, name)
+            else:
+                return None
+        except (KeyNotExistsException, FileNotFoundError):
+            return None
+        return getattr(metadata, self.hash_field, None) or None
+
+    @staticmethod
+    async def _spool(stream: BlobStream[M], path: Path) -> str:
+        """Writes the stream to the file and returns hash of its content."""
+        content_hash = hashlib.sha256()
+        with path.open("wb") as f:
+            async for chunk in stream:
+                content_hash.update(chunk)
+                await asyncio.to_thread(f.write, chunk)
+        return content_hash.hexdigest()
+
+    @staticmethod
+    def _get_content_hash(content: bytes | None) -> str:
+        return hashlib.sha256(content or b"").hexdigest()
@@ -0,0 +1,132 @@
+import asyncio
+import mmap
+import os
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Optional
+
+from ampf.base import Blob
+
+Chunk = bytes | memoryview
+
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+
+class BlobStream[M]:
+    """Blob which content is read chunk by chunk.
+
+    Chunks are `memoryview` slices when it is possible (no copying),
+    so they are valid only until the next chunk is requested.
+    Use `bytes(chunk)` to keep one. The stream can be iterated many times,
+    but each iteration reads content again (e.g. downloads it again).
+    """
+
+    def __init__(
+        self,
+        name: str,
+        chunks: Callable[[], AsyncIterator[Chunk]],
+        metadata: Optional[M] = None,
+        content_type: Optional[str] = None,
+    ):
+        """Blob which content is read chunk by chunk.
+
+        Args:
+            name: Blob name.
+            chunks: Function returning a new iterator of content chunks.
+            metadata: Blob metadata.
+            content_type: Blob content type.
+        """
+        self.name = name
+        self.metadata = metadata
+        self.content_type = content_type or getattr(metadata, "content_type", None)
+        self._chunks = chunks
+
+    def __aiter__(self) -> AsyncIterator[Chunk]:
+        return self._chunks()
+
+    async def read(self) -> bytes:
+        """Reads the whole content."""
+        return b"".join([bytes(chunk) async for chunk in self])
+
+    async def save_to_file(self, path: Path) -> None:
+        """Writes content to the file chunk by chunk."""
+        with path.open("wb") as f:
+            async for chunk in self:
+                await asyncio.to_thread(f.write, chunk)
+
+    @classmethod
+    def from_bytes(
+        cls,
+        name: str,
+        content: bytes,
+        metadata: Optional[M] = None,
+        content_type: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> "BlobStream[M]":
+        """Creates stream of memoryview slices of already loaded content."""
+
+        async def chunks() -> AsyncIterator[Chunk]:
+            view = memoryview(content)
+            for i in range(0, len(view), chunk_size):
+                yield view[i : i + chunk_size]
+
+        return cls(name, chunks, metadata, content_type)
+
+    @classmethod
+    def from_blob(cls, blob: Blob[M], chunk_size: int = DEFAULT_CHUNK_SIZE) -> "BlobStream[M]":
+        return cls.from_bytes(
+            blob.name, blob.content, blob.metadata, getattr(blob, "content_type", None), chunk_size
+        )
+
+    @classmethod
+    def from_file(
+        cls,
+        path: Path,
+        name: Optional[str] = None,
+        metadata: Optional[M] = None,
+        content_type: Optional[str] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+    ) -> "BlobStream[M]":
+        """Creates stream of local file content. The file is memory mapped,
+        so only pages which are read are loaded into memory."""
+
+        async def chunks() -> AsyncIterator[Chunk]:
+            with path.open("rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+                view = memoryview(mm)
+                try:
+                    for i in range(0, len(view), chunk_size):
+                        yield view[i : i + chunk_size]
+                finally:
+                    try:
+                        view.release()
+                        mm.close()
+                    except BufferError:
+                        # Some chunk is still referenced, it is closed by GC
+                        pass
+
+        return cls(name or path.name, chunks, metadata, content_type)
+
+    @classmethod
+    def from_storage(
+        cls,
+        storage: Any,
+        name: str,
+        metadata: Optional[M] = None,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        content_type: Optional[str] = None,
+    ) -> "BlobStream[M]":
+        """Creates stream of blob stored in the storage. Nothing is read until
+        the stream is iterated.
+
+        The storage must have `download_stream_async(name, chunk_size)` method
+        returning an async iterator of chunks.
+
+        Raises:
+            TypeError: The storage can't download blobs chunk by chunk.
+        """
+        download_stream = getattr(storage, "download_stream_async", None)
+        if not callable(download_stream):
+            raise TypeError(f"{type(storage).__name__} can't stream blobs (no download_stream_async method)")
+        return cls(name, lambda: download_stream(name, chunk_size), metadata, content_type)
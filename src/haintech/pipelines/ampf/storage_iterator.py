@@ -1,15 +1,24 @@
-from typing import AsyncIterator, Callable, Iterator, override
+import asyncio
+import math
+from contextlib import aclosing
+from itertools import islice
+from typing import AsyncIterator, Callable, Iterator, List, override
 
 from ampf.base import BaseStorage
 from pydantic import BaseModel
 
-from ..base_processor import BaseProcessor
+from ..base_processor import BaseProcessor, close_iterator
+from ..concurrent_map import concurrent_map
 from ..progress_tracker import ProgressTracker
 
 
 class StorageIterator[I, O: BaseModel](BaseProcessor[I, O]):
     """Iterate over data from storage.
 
+    Keys are read page by page and items are read ahead concurrently
+    (in threads, so the event loop is not blocked by storage calls).
+    If the storage has `get_many(keys)` method, whole pages are read in bulk.
+
     Args:
         I: Input items are ignored
         O: Output items data type (read from storage)
@@ -19,34 +28,89 @@ class StorageIterator[I, O: BaseModel](BaseProcessor[I, O]):
         self,
         storage: BaseStorage[O] | Callable[[I], BaseStorage[O]],
         progress_tracker: ProgressTracker = None,
+        prefetch: int = 10,
+        page_size: int = 100,
         name=None,
         input=None,
         output=None,
     ):
+        """Iterate over data from storage.
+
+        Args:
+            storage: Storage or function returning storage for the input item.
+            progress_tracker: Progress tracker. If it is set, the storage is
+                counted first to set total steps.
+            prefetch: Number of items read ahead concurrently (with `get_many` - pages
+                covering this number of items are read ahead of the page being consumed).
+            page_size: Number of keys read from storage at once.
+        """
         super().__init__(name, input, output)
+        if prefetch <= 0:
+            raise ValueError("prefetch must be greater than 0")
+        if page_size <= 0:
+            raise ValueError("page_size must be greater than 0")
         self.storage = storage
         self.progress_tracker = progress_tracker
+        self.prefetch = prefetch
+        self.page_size = page_size
 
-    def process_flat_map(self, data: I) -> Iterator[O]:
+    async def process_flat_map(self, data: I) -> AsyncIterator[O]:
         if isinstance(self.storage, Callable):
             storage = self.storage(data)
         else:
             storage = self.storage
         if self.progress_tracker:
-            self.progress_tracker.set_total_steps(storage.count())
-        for key in storage.keys():
-            item = storage.get(key)
-            yield self._put_output_data(data, item)
+            self.progress_tracker.set_total_steps(await asyncio.to_thread(storage.count))
+        get_many = getattr(storage, "get_many", None)
+        if callable(get_many):
+            pages = concurrent_map(
+                self._iter_key_pages(storage),
+                lambda keys: asyncio.to_thread(get_many, keys),
+                # The page being consumed and pages read ahead of it
+                math.ceil(self.prefetch / self.page_size) + 1,
+            )
+            async with aclosing(pages):
+                async for page in pages:
+                    for item in page:
+                        yield self._put_output_data(data, item)
+        else:
+            items = concurrent_map(
+                self._iter_keys(storage),
+                lambda key: asyncio.to_thread(storage.get, key),
+                self.prefetch,
+            )
+            async with aclosing(items):
+                async for item in items:
+                    yield self._put_output_data(data, item)
+
+    async def _iter_key_pages(self, storage: BaseStorage[O]) -> AsyncIterator[List[str]]:
+        """Reads keys from storage page by page without blocking the event loop."""
+        keys = iter(storage.keys())
+        while True:
+            page = await asyncio.to_thread(lambda: list(islice(keys, self.page_size)))
+            if not page:
+                return
+            yield page
+
+    async def _iter_keys(self, storage: BaseStorage[O]) -> AsyncIterator[str]:
+        async for page in self._iter_key_pages(storage):
+            for key in page:
+                yield key
 
     @override
     async def process(self, data) -> AsyncIterator[O]:
         """Add extra iteration based on the iterable expression"""
         iterator = self._get_iterator(data)
-        if isinstance(iterator, Iterator):
-            for data in iterator:
-                for item in self.process_flat_map(data):
-                    yield item
-        else:
-            async for data in iterator:
-                for item in self.process_flat_map(data):
-                    yield item
+        try:
+            if isinstance(iterator, Iterator):
+                for data in iterator:
+                    async with aclosing(self.process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+            else:
+                async for data in iterator:
+                    async with aclosing(self.process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+        finally:
+            await close_iterator(iterator)
@@ -1,19 +1,31 @@
+import asyncio
+
 from pydantic import BaseModel
 
-from ..base_processor import BaseProcessor
+from ..concurrent_processor import ConcurrentProcessor
 from ampf.base import BaseStorage
 
 
-class StorageReader[str, M: BaseModel](BaseProcessor[str, M]):
+class StorageReader[str, M: BaseModel](ConcurrentProcessor[str, M]):
+    """Reads items from storage by key.
+
+    Storage calls run in threads, so the event loop is not blocked.
+    Up to `max_concurrent` items are read ahead, the output order
+    is the same as the input order.
+    """
+
     def __init__(
         self,
         storage: BaseStorage[M],
         name=None,
         input=None,
         output=None,
+        max_concurrent: int = 1,
     ):
-        super().__init__(name, input, output)
+        super().__init__(
+            max_concurrent=max_concurrent, ordered=True, name=name, input=input, output=output
+        )
         self.storage = storage
 
     async def process_item(self, key: str) -> M:
-        return self.storage.get(key)
+        return await asyncio.to_thread(self.storage.get, key)
@@ -4,7 +4,7 @@ from typing import Callable, Optional, Union, override
 from ampf.base import BaseStorage, KeyNotExistsException
 from pydantic import BaseModel
 
-from haintech.pipelines.base_processor import get_field_name_or_lambda
+from haintech.pipelines.accessors import compile_getter
 from haintech.pipelines.checkpoint_processor import CheckpointProcessor
 from haintech.pipelines.progress_tracker import ProgressTracker
 from haintech.pipelines.ampf.storage_reader import StorageReader
@@ -27,6 +27,7 @@ class StorageWriter[M: BaseModel](CheckpointProcessor[M]):
         super().__init__(name, input, output)
         self.storage = storage
         self.key_name = key_name
+        self._get_key = compile_getter(key_name) if key_name else None
         self.changed_only = changed_only
         self.progress_tracker = progress_tracker
 
@@ -36,8 +37,8 @@ class StorageWriter[M: BaseModel](CheckpointProcessor[M]):
         else:
             storage = self.storage
 
-        if self.key_name:
-            key = get_field_name_or_lambda(self.key_name, data)
+        if self._get_key:
+            key = self._get_key(data)
         else:
             key = storage.get_key(data)
 
@@ -1,6 +1,7 @@
 from abc import ABC, abstractmethod
 from typing import AsyncIterator, Iterator, Optional, override
 from haintech.pipelines import BaseProcessor, FieldNameOrLambda
+from haintech.pipelines.base_processor import close_iterator
 
 
 class BaseFlatMapProcessor[I, O](BaseProcessor[I, O], ABC):
@@ -16,14 +17,17 @@ class BaseFlatMapProcessor[I, O](BaseProcessor[I, O], ABC):
     @override
     async def process(self, data: I) -> AsyncIterator[O]:
         iterator = self._get_iterator(data)
-        if isinstance(iterator, Iterator):
-            for data in iterator:
-                for item in self.wrap_process_flat_map(data):
-                    yield item
-        else:
-            async for data in iterator:
-                for item in self.wrap_process_flat_map(data):
-                    yield item
+        try:
+            if isinstance(iterator, Iterator):
+                for data in iterator:
+                    for item in self.wrap_process_flat_map(data):
+                        yield item
+            else:
+                async for data in iterator:
+                    for item in self.wrap_process_flat_map(data):
+                        yield item
+        finally:
+            await close_iterator(iterator)
 
     def wrap_process_flat_map(self, data):
         """
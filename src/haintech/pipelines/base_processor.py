@@ -1,10 +1,17 @@
 from __future__ import annotations
 
 from abc import ABC
-from typing import Any, AsyncGenerator, AsyncIterator, Callable, Iterator, List, Optional, Union
+from typing import TYPE_CHECKING, Any, AsyncGenerator, AsyncIterator, Callable, Iterator, List, Optional, Union
 
 from pydantic import BaseModel
 
+from .accessors import FieldGetter, FieldSetter
+
+if TYPE_CHECKING:
+    from haintech.profiling import Profiler
+
+    from .metrics import StageMetrics
+
 FieldNameOrLambda = Union[str, Callable[[Any], str]]
 FieldNameOrLambda2 = Union[str, Callable[[Any, Any], str]]
 ListOrIterator = Union[List, Iterator]
@@ -22,6 +29,15 @@ def get_field_name_or_lambda(
         raise TypeError("Wrong field_name_or_lambda type")
 
 
+async def close_iterator(iterator: Any) -> None:
+    """Closes (async) generator, so it stops pulling data from its source
+    and runs its cleanup code. Other iterators are left as they are."""
+    if hasattr(iterator, "aclose"):
+        await iterator.aclose()
+    elif hasattr(iterator, "close"):
+        iterator.close()
+
+
 class BaseProcessor[I, O](ABC):
     """Base class for all processors.
 
@@ -30,6 +46,11 @@ class BaseProcessor[I, O](ABC):
         O: Output items data type
     """
 
+    metrics: Optional[StageMetrics] = None
+    """Stage metrics, set by Pipeline when metrics are enabled"""
+    profiler: Optional[Profiler] = None
+    """Profiler, set by Pipeline when profiling is enabled"""
+
     def __init__(
         self,
         name: Optional[str] = None,
@@ -40,6 +61,9 @@ class BaseProcessor[I, O](ABC):
         self.input = input
         self.output = output
         self.source = None
+        self._getters: dict[str, FieldGetter] = {}
+        self._input_getter: tuple[Any, Callable[[Any], Any]] | None = None
+        self._output_setter: tuple[Any, FieldSetter] | None = None
 
     async def process_item(self, data: I) -> O:
         """The main method that processes data.
@@ -66,16 +90,25 @@ class BaseProcessor[I, O](ABC):
         process the data from it.
         """
         iterator = self._get_iterator(data)
-        if isinstance(iterator, Iterator):
-            for item in iterator:
-                ret =await self.wrap_process_item(item)
-                if ret is not None:
-                    yield ret
-        else:
-            async for item in iterator:
-                ret = await self.wrap_process_item(item)
-                if ret is not None:
-                    yield ret
+        try:
+            if isinstance(iterator, Iterator):
+                for item in iterator:
+                    ret =await self.wrap_process_item(item)
+                    if ret is not None:
+                        yield ret
+            else:
+                async for item in iterator:
+                    ret = await self.wrap_process_item(item)
+                    if ret is not None:
+                        yield ret
+        finally:
+            await close_iterator(iterator)
+
+    async def close(self) -> None:
+        """Releases resources held by the processor.
+        It is called by Pipeline when the run ends (also on error or cancellation).
+        Override this method in subclasses.
+        """
 
     def generate(self, data: I | Iterator[I]) -> Iterator[I]:
         """It is called when current processor if the first in pipeline. It iterates
@@ -86,10 +119,14 @@ class BaseProcessor[I, O](ABC):
             yield item
 
     def get_value(self, exp: FieldNameOrLambda, data: I | O) -> Any:
-        """Get or evaluate the value of the expression from the data."""
+        """Get or evaluate the value of the expression (field name,
+        dotted path or lambda) from the data."""
         if callable(exp):
             return exp(data)
-        return data.model_dump()[exp] if isinstance(data, BaseModel) else data[exp]
+        getter = self._getters.get(exp)
+        if getter is None:
+            getter = self._getters[exp] = FieldGetter(exp)
+        return getter(data)
 
     async def wrap_process_item(self, data):
         """
@@ -100,30 +137,46 @@ class BaseProcessor[I, O](ABC):
             input_data = self._get_input_data(data)
         else:
             input_data = data
-        ret = await self.process_item(input_data)
+        if self.metrics is None and self.profiler is None:
+            ret = await self.process_item(input_data)
+        else:
+            ret = await self._process_item_instrumented(input_data)
         return self._put_output_data(data, ret)
 
+    async def _process_item_instrumented(self, data: I) -> O:
+        """Runs process_item() with metrics and profiling."""
+        start = self.metrics.start_item() if self.metrics else 0.0
+        error = False
+        try:
+            if self.profiler:
+                return await self.profiler.profile(self.name, self.process_item(data))
+            return await self.process_item(data)
+        except Exception:
+            error = True
+            raise
+        finally:
+            if self.metrics:
+                self.metrics.end_item(start, error)
+
     def _get_input_data(self, data) -> Any:
         """Returns data sent to the processor based on input type."""
-        if isinstance(self.input, str):
-            return (
-                getattr(data, self.input)
-                if isinstance(data, BaseModel)
-                else data[self.input]
-            )
-        elif callable(self.input):
-            return self.input(data)
-        else:
-            raise TypeError("Wrong input type")
+        if self._input_getter is None or self._input_getter[0] is not self.input:
+            if isinstance(self.input, str):
+                getter = FieldGetter(self.input)
+            elif callable(self.input):
+                getter = self.input
+            else:
+                raise TypeError("Wrong input type")
+            self._input_getter = (self.input, getter)
+        return self._input_getter[1](data)
 
     def _put_output_data(self, data, ret) -> Any:
         """Returns data sent to the processor based on ouptut type."""
         if self.output:
             if isinstance(self.output, str):
-                if isinstance(data, BaseModel):
-                    setattr(data, self.output, ret)
-                else:
-                    data[self.output] = ret
+                if self._output_setter is None or self._output_setter[0] is not self.output:
+                    self._output_setter = (self.output, FieldSetter(self.output))
+                self._output_setter[1](data, ret)
                 return data
             elif callable(self.output):
                 return self.output(data, ret) or data
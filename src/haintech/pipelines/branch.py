@@ -0,0 +1,99 @@
+import asyncio
+from typing import Any, AsyncIterator, Callable, List, Optional, override
+
+from .base_processor import BaseProcessor
+from .pipeline import Pipeline
+
+_DONE = object()
+
+type BranchDefinition = Pipeline | List[BaseProcessor]
+
+
+class _BranchSource(BaseProcessor[Any, Any]):
+    """The first processor of the branch which returns items put into the queue."""
+
+    def __init__(self, queue: asyncio.Queue, name: str):
+        super().__init__(name=name)
+        self.queue = queue
+
+    @override
+    async def process(self, data) -> AsyncIterator[Any]:
+        while (item := await self.queue.get()) is not _DONE:
+            yield item
+
+
+class Branch:
+    """Sub-pipeline run in its own task and fed with items through a bounded queue.
+
+    It is used by processors which send items to several sub-pipelines
+    (`TeeProcessor`, `JoinProcessor`), so each branch runs at its own pace and
+    only a branch with the full queue holds back the sender.
+    """
+
+    def __init__(
+        self,
+        definition: BranchDefinition,
+        name: str,
+        buffer_size: int = 10,
+        on_result: Optional[Callable[[Any], None]] = None,
+    ):
+        """Sub-pipeline run in its own task.
+
+        Args:
+            definition: Pipeline or list of processors.
+            name: The name of the branch.
+            buffer_size: The maximum number of items waiting for the branch.
+            on_result: Function called with each result of the branch.
+        """
+        self.name = name
+        self.on_result = on_result
+        self._queue: asyncio.Queue = asyncio.Queue(buffer_size)
+        processors = definition.processors if isinstance(definition, Pipeline) else definition
+        self.pipeline = Pipeline(
+            [_BranchSource(self._queue, name), *processors],
+            metrics=definition.metrics if isinstance(definition, Pipeline) else None,
+            profiler=definition.profiler if isinstance(definition, Pipeline) else None,
+        )
+        self._task: Optional[asyncio.Task] = None
+
+    def start(self) -> None:
+        self._task = asyncio.create_task(self._run(), name=self.name)
+        self._task.add_done_callback(self._on_done)
+
+    async def _run(self) -> None:
+        async for ret in await self.pipeline.run():
+            if self.on_result:
+                self.on_result(ret)
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        # Wakes up the sender waiting for the queue of the ended branch
+        while not self._queue.empty():
+            self._queue.get_nowait()
+
+    async def put(self, item: Any) -> None:
+        """Sends the item to the branch (waits if the queue is full).
+        Items sent after the branch stopped reading (e.g. by `Limit`) are dropped.
+
+        Raises:
+            Exception: The error of the branch if it failed.
+        """
+        if self._task.done():
+            self._task.result()
+            return
+        await self._queue.put(item)
+
+    async def finish(self) -> None:
+        """Waits until the branch processes all sent items.
+
+        Raises:
+            Exception: The error of the branch if it failed.
+        """
+        if not self._task.done():
+            await self._queue.put(_DONE)
+        await self._task
+
+    async def cancel(self) -> None:
+        """Cancels the branch if it is still running."""
+        if self._task and not self._task.done():
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
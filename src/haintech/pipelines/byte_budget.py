@@ -0,0 +1,43 @@
+import asyncio
+
+
+class ByteBudget:
+    """Limits the total number of bytes held at the same time,
+    e.g. downloaded blobs which are not consumed yet.
+
+    Requests are served in FIFO order. A request bigger than the limit
+    is allowed when nothing else is held, so it never blocks forever.
+    """
+
+    def __init__(self, max_bytes: int):
+        """Limits the total number of bytes held at the same time.
+
+        Args:
+            max_bytes: The maximum number of bytes in use.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be greater than 0")
+        self.max_bytes = max_bytes
+        self.in_use = 0
+        self._lock = asyncio.Lock()
+        self._condition = asyncio.Condition()
+
+    async def acquire(self, size: int) -> None:
+        """Waits until `size` bytes are available and reserves them."""
+        async with self._lock:
+            async with self._condition:
+                await self._condition.wait_for(
+                    lambda: self.in_use == 0 or self.in_use + size <= self.max_bytes
+                )
+                self.in_use += size
+
+    def add(self, size: int) -> None:
+        """Reserves `size` bytes without waiting.
+        It is used when the real size is known after reading data."""
+        self.in_use += size
+
+    async def release(self, size: int) -> None:
+        """Releases `size` bytes."""
+        async with self._condition:
+            self.in_use -= size
+            self._condition.notify_all()
@@ -0,0 +1,37 @@
+import asyncio
+from typing import Optional, Set
+
+
+class PipelineCancelledError(Exception):
+    """Raised by the pipeline run cancelled with `CancelToken`."""
+
+
+class CancelToken:
+    """Cancels pipeline runs which use it.
+
+    The waiting for the next item is interrupted, so in-flight tasks
+    are cancelled and sources are closed. `cancel()` must be called
+    from the event loop thread.
+    """
+
+    def __init__(self):
+        self.cancelled = False
+        self.reason: Optional[str] = None
+        self._timeouts: Set[asyncio.Timeout] = set()
+
+    def cancel(self, reason: Optional[str] = None) -> None:
+        """Cancels all runs using this token."""
+        self.cancelled = True
+        self.reason = reason
+        for timeout in list(self._timeouts):
+            timeout.reschedule(-1)
+
+    def raise_if_cancelled(self) -> None:
+        if self.cancelled:
+            raise PipelineCancelledError(self.reason or "Pipeline cancelled")
+
+    def _register(self, timeout: asyncio.Timeout) -> None:
+        self._timeouts.add(timeout)
+
+    def _unregister(self, timeout: asyncio.Timeout) -> None:
+        self._timeouts.discard(timeout)
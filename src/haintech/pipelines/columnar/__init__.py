@@ -0,0 +1,21 @@
+from .dataset_reader import DatasetReader
+from .dataset_writer import DatasetWriter
+from .frame import Frame
+from .frame_filter_processor import FrameFilterProcessor
+from .frame_lambda_processor import FrameLambdaProcessor
+from .frame_to_models import FrameToModels
+from .models_to_frame import ModelsToFrame
+from .vectors import cosine_similarity, normalize, top_k
+
+__all__ = [
+    "DatasetReader",
+    "DatasetWriter",
+    "Frame",
+    "FrameFilterProcessor",
+    "FrameLambdaProcessor",
+    "FrameToModels",
+    "ModelsToFrame",
+    "cosine_similarity",
+    "normalize",
+    "top_k",
+]
@@ -0,0 +1,103 @@
+import asyncio
+from contextlib import aclosing
+from pathlib import Path
+from typing import Any, AsyncIterator, Callable, Iterator, List, Literal, Optional, Sequence, Tuple, Type, override
+
+from pydantic import BaseModel
+
+from ..base_processor import BaseProcessor, close_iterator
+from .frame import Frame, _import_pyarrow
+
+type Filter = Any | List[Tuple[str, str, Any]]
+"""`pyarrow.compute.Expression` or list of (column, operator, value) tuples."""
+
+
+class DatasetReader[I, O: BaseModel | Frame](BaseProcessor[I, O]):
+    """Reads a Parquet or Arrow IPC dataset (e.g. written by `DatasetWriter`).
+
+    Only the given `columns` are read and `filter` is pushed down to the dataset,
+    so Parquet row groups which cannot match (by their statistics) and partitions
+    which do not match are skipped. Rows are returned as frames of up to `batch_size`
+    rows or, if `model` is set, as pydantic models.
+
+    Args:
+        I: Input items are ignored (unless `path` is a function)
+        O: Frames or models
+    """
+
+    def __init__(
+        self,
+        path: Path | Callable[[I], Path],
+        format: Literal["parquet", "arrow"] = "parquet",
+        columns: Optional[Sequence[str]] = None,
+        filter: Optional[Filter] = None,
+        batch_size: int = 10_000,
+        model: Optional[Type[BaseModel]] = None,
+        name: Optional[str] = None,
+    ):
+        """Reads a Parquet or Arrow IPC dataset.
+
+        Args:
+            path: Directory (or file) of the dataset or function returning it for the input item.
+            format: "parquet" or "arrow" (IPC file format).
+            columns: Columns to read (all by default).
+            filter: Rows to read, e.g. `pc.field("lang") == "en"` or `[("lang", "=", "en")]`.
+            batch_size: The maximum number of rows of returned frames.
+            model: If set, rows are returned as pydantic models.
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        self.path = path
+        self.format = format
+        self.columns = list(columns) if columns is not None else None
+        self.filter = filter
+        self.batch_size = batch_size
+        self.model = model
+
+    def _filter_expression(self) -> Any:
+        if self.filter is None or not isinstance(self.filter, list):
+            return self.filter
+        import pyarrow.parquet as pq
+
+        return pq.filters_to_expression(self.filter)
+
+    async def process_flat_map(self, data: I) -> AsyncIterator[O]:
+        import pyarrow.dataset as ds
+
+        _import_pyarrow()
+        path = self.path(data) if callable(self.path) else self.path
+        dataset = await asyncio.to_thread(
+            ds.dataset, str(path), format="ipc" if self.format == "arrow" else "parquet", partitioning="hive"
+        )
+        batches = dataset.to_batches(
+            columns=self.columns, filter=self._filter_expression(), batch_size=self.batch_size
+        )
+        try:
+            while (batch := await asyncio.to_thread(next, batches, None)) is not None:
+                if batch.num_rows == 0:
+                    continue
+                frame = Frame.from_arrow(batch)
+                if self.model:
+                    for item in frame.iter_models(self.model):
+                        yield item
+                else:
+                    yield frame
+        finally:
+            await close_iterator(batches)
+
+    @override
+    async def process(self, data) -> AsyncIterator[O]:
+        iterator = self._get_iterator(data)
+        try:
+            if isinstance(iterator, Iterator):
+                for data in iterator:
+                    async with aclosing(self.process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+            else:
+                async for data in iterator:
+                    async with aclosing(self.process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+        finally:
+            await close_iterator(iterator)
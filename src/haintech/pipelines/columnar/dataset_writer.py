@@ -0,0 +1,171 @@
+import asyncio
+import uuid
+from pathlib import Path
+from typing import Any, Dict, List, Literal, Optional, Sequence, Tuple, override
+
+from pydantic import BaseModel
+
+from ..base_processor import BaseProcessor
+from .frame import Frame, _import_pyarrow
+
+
+class _Partition:
+    """Rows buffered for one partition, its file and open file writer."""
+
+    __slots__ = ("path", "models", "frames", "rows", "writer")
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.models: List[BaseModel] = []
+        self.frames: List[Frame] = []
+        self.rows = 0
+        self.writer: Any = None
+
+
+class DatasetWriter[T: BaseModel | Frame](BaseProcessor[T, T]):
+    """Writes items (pydantic models or frames) to a Parquet or Arrow IPC dataset
+    and passes them on.
+
+    Rows are buffered and written in row groups of `row_group_size` rows.
+    Vectors (lists of floats) are stored as fixed size lists of float32.
+    With `partition_by` the dataset is partitioned by column values
+    (hive style directories `column=value`). Files are closed when the run ends.
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        format: Literal["parquet", "arrow"] = "parquet",
+        partition_by: Optional[Sequence[str]] = None,
+        row_group_size: int = 10_000,
+        float32: bool = True,
+        compression: Optional[str] = "zstd",
+        file_name: Optional[str] = None,
+        overwrite: bool = False,
+        name: Optional[str] = None,
+    ):
+        """Writes items to a Parquet or Arrow IPC dataset.
+
+        Args:
+            path: Directory of the dataset.
+            format: "parquet" or "arrow" (IPC file format).
+            partition_by: Columns the dataset is partitioned by.
+            row_group_size: Number of rows buffered and written at once (one row group).
+            float32: If True, float vectors are stored as float32.
+            compression: Compression codec (None disables compression).
+            file_name: Name of the file in each partition (without suffix). By default
+                each run writes new files `part-<uuid>`, so runs add files to the dataset.
+            overwrite: If True, existing files with `file_name` are overwritten,
+                otherwise `FileExistsError` is raised.
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        if row_group_size <= 0:
+            raise ValueError("row_group_size must be greater than 0")
+        self.path = Path(path)
+        self.format = format
+        self.partition_by = tuple(partition_by or ())
+        self.row_group_size = row_group_size
+        self.float32 = float32
+        self.compression = compression
+        self.file_name = file_name
+        self.overwrite = overwrite
+        self._run_file_name: Optional[str] = None
+        self._partitions: Dict[Tuple[Any, ...], _Partition] = {}
+        self._schema: Any = None
+
+    @override
+    async def process_item(self, data: T) -> T:
+        if isinstance(data, Frame):
+            for key, frame in self._split(data):
+                self._partition(key).frames.append(frame)
+                await self._buffered(key, len(frame))
+        else:
+            key = tuple(getattr(data, c) for c in self.partition_by)
+            self._partition(key).models.append(data)
+            await self._buffered(key, 1)
+        return data
+
+    def _split(self, frame: Frame) -> List[Tuple[Tuple[Any, ...], Frame]]:
+        if not self.partition_by:
+            return [((), frame)]
+        rows: Dict[Tuple[Any, ...], List[int]] = {}
+        for i, key in enumerate(zip(*(frame[c].tolist() for c in self.partition_by))):
+            rows.setdefault(key, []).append(i)
+        if len(rows) == 1:
+            return [(next(iter(rows)), frame)]
+        return [(key, frame.filter(idx)) for key, idx in rows.items()]
+
+    def _partition(self, key: Tuple[Any, ...]) -> _Partition:
+        partition = self._partitions.get(key)
+        if partition is None:
+            path = self.path.joinpath(*(f"{c}={v}" for c, v in zip(self.partition_by, key)))
+            if self._run_file_name is None:
+                self._run_file_name = self.file_name or f"part-{uuid.uuid4().hex}"
+            file_path = path / f"{self._run_file_name}.{self.format}"
+            # Checked before rows are buffered, errors of close() are only logged
+            if file_path.exists() and not self.overwrite:
+                raise FileExistsError(f"{file_path} already exists (set overwrite=True to replace it)")
+            partition = self._partitions[key] = _Partition(file_path)
+        return partition
+
+    async def _buffered(self, key: Tuple[Any, ...], rows: int) -> None:
+        partition = self._partitions[key]
+        partition.rows += rows
+        if partition.rows >= self.row_group_size:
+            await self._flush(partition)
+
+    async def _flush(self, partition: _Partition) -> None:
+        frames = partition.frames
+        if partition.models:
+            frames = [Frame.from_models(partition.models), *frames]
+        partition.models, partition.frames, partition.rows = [], [], 0
+        frame = Frame.concat(frames)
+        if len(frame):
+            await asyncio.to_thread(self._write, partition, frame)
+
+    def _write(self, partition: _Partition, frame: Frame) -> None:
+        pa = _import_pyarrow()
+        table = frame.select(*(c for c in frame.columns if c not in self.partition_by)).to_arrow()
+        if self._schema is None:
+            self._schema = self._target_schema(table.schema)
+        table = table.cast(self._schema)
+        if partition.writer is None:
+            partition.path.parent.mkdir(parents=True, exist_ok=True)
+            if self.format == "parquet":
+                import pyarrow.parquet as pq
+
+                partition.writer = pq.ParquetWriter(
+                    str(partition.path), self._schema, compression=self.compression or "none"
+                )
+            else:
+                options = pa.ipc.IpcWriteOptions(compression=self.compression) if self.compression else None
+                partition.writer = pa.ipc.new_file(str(partition.path), self._schema, options=options)
+        if self.format == "parquet":
+            partition.writer.write_table(table, row_group_size=len(table))
+        else:
+            partition.writer.write_table(table, max_chunksize=len(table))
+
+    def _target_schema(self, schema: Any) -> Any:
+        """Stores float vectors as float32 if `float32` is set."""
+        pa = _import_pyarrow()
+        if not self.float32:
+            return schema
+        fields = []
+        for field in schema:
+            if pa.types.is_fixed_size_list(field.type) and pa.types.is_floating(field.type.value_type):
+                field = field.with_type(pa.list_(pa.float32(), field.type.list_size))
+            fields.append(field)
+        return pa.schema(fields)
+
+    @override
+    async def close(self) -> None:
+        """Writes buffered rows and closes files."""
+        partitions = list(self._partitions.values())
+        self._partitions = {}
+        for partition in partitions:
+            await self._flush(partition)
+            if partition.writer is not None:
+                await asyncio.to_thread(partition.writer.close)
+        self._schema = None
+        self._run_file_name = None
@@ -0,0 +1,165 @@
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Type
+
+import numpy as np
+from pydantic import BaseModel
+
+
+def _to_array(values: Sequence[Any]) -> np.ndarray:
+    """Converts column values to an array. Numbers (and lists of numbers
+    of the same length) become numeric arrays, other values an object array."""
+    try:
+        array = np.asarray(values)
+    except ValueError:
+        array = None
+    if array is None or array.dtype == object:
+        array = np.empty(len(values), dtype=object)
+        for i, value in enumerate(values):
+            array[i] = value
+    return array
+
+
+class Frame:
+    """Batch of rows stored as columns (NumPy arrays of the same length).
+
+    Vectors (e.g. embeddings) are stored as 2-D arrays (rows x dimensions),
+    so operations on the whole column are matrix operations.
+
+    >>>
+    frame = Frame.from_models(chunks)
+    frame["embedding"] = normalize(frame["embedding"])
+    frame = frame.filter(frame["embedding"] @ centroid > 0.8)
+    chunks = frame.to_models(Chunk)
+    """
+
+    __slots__ = ("_columns", "_length")
+
+    def __init__(self, columns: Optional[Mapping[str, Any]] = None):
+        """Batch of rows stored as columns.
+
+        Args:
+            columns: Arrays (or sequences) by column name, all of the same length.
+        """
+        self._columns: Dict[str, np.ndarray] = {}
+        self._length: Optional[int] = None
+        for name, values in (columns or {}).items():
+            self[name] = values
+
+    @property
+    def columns(self) -> List[str]:
+        return list(self._columns)
+
+    def __len__(self) -> int:
+        return self._length or 0
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._columns
+
+    def __getitem__(self, name: str) -> np.ndarray:
+        return self._columns[name]
+
+    def __setitem__(self, name: str, values: Any) -> None:
+        """Adds or replaces the column."""
+        array = values if isinstance(values, np.ndarray) else _to_array(values)
+        if array.ndim == 0:
+            raise ValueError(f"Column {name} must be an array, not a scalar")
+        if self._length is None or not self._columns:
+            self._length = len(array)
+        elif len(array) != self._length:
+            raise ValueError(f"Column {name} has {len(array)} rows, frame has {self._length}")
+        self._columns[name] = array
+
+    def __repr__(self) -> str:
+        return f"<Frame({len(self)} rows: {', '.join(self._columns)})>"
+
+    def with_columns(self, **columns: Any) -> "Frame":
+        """Returns a new frame with added or replaced columns (arrays are not copied)."""
+        frame = Frame(self._columns)
+        for name, values in columns.items():
+            frame[name] = values
+        return frame
+
+    def select(self, *names: str) -> "Frame":
+        """Returns a new frame with the given columns."""
+        return Frame({name: self._columns[name] for name in names})
+
+    def filter(self, mask: np.ndarray) -> "Frame":
+        """Returns a new frame with rows where the mask is True (or rows with given indexes)."""
+        return Frame({name: column[mask] for name, column in self._columns.items()})
+
+    @classmethod
+    def concat(cls, frames: Iterable["Frame"]) -> "Frame":
+        """Joins rows of frames with the same columns."""
+        frames = [f for f in frames if len(f)]
+        if not frames:
+            return cls()
+        return cls({name: np.concatenate([f[name] for f in frames]) for name in frames[0].columns})
+
+    @classmethod
+    def from_records(cls, records: Sequence[Mapping[str, Any]], columns: Optional[Sequence[str]] = None) -> "Frame":
+        """Creates frame from dicts (columns of the first record by default)."""
+        if columns is None:
+            columns = list(records[0]) if records else []
+        return cls({name: _to_array([r[name] for r in records]) for name in columns})
+
+    @classmethod
+    def from_models(cls, models: Sequence[BaseModel], columns: Optional[Sequence[str]] = None) -> "Frame":
+        """Creates frame from pydantic models (all fields by default).
+        Fields are read as attributes, models are not dumped."""
+        if columns is None:
+            columns = list(type(models[0]).model_fields) if models else []
+        return cls({name: _to_array([getattr(m, name) for m in models]) for name in columns})
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Returns rows as dicts of Python values."""
+        names = list(self._columns)
+        values = [column.tolist() for column in self._columns.values()]
+        return [dict(zip(names, row)) for row in zip(*values)]
+
+    def iter_models[M: BaseModel](self, model: Type[M]) -> Iterator[M]:
+        """Returns rows as pydantic models (columns which are not fields are skipped)."""
+        names = [name for name in self._columns if name in model.model_fields]
+        values = [self._columns[name].tolist() for name in names]
+        for row in zip(*values):
+            yield model(**dict(zip(names, row)))
+
+    def to_models[M: BaseModel](self, model: Type[M]) -> List[M]:
+        return list(self.iter_models(model))
+
+    def to_arrow(self) -> Any:
+        """Returns `pyarrow.Table`; 2-D columns become fixed size lists."""
+        pa = _import_pyarrow()
+        arrays = {}
+        for name, column in self._columns.items():
+            if column.ndim == 2:
+                arrays[name] = pa.FixedSizeListArray.from_arrays(pa.array(column.ravel()), column.shape[1])
+            elif column.dtype == object:
+                arrays[name] = pa.array(column.tolist())
+            else:
+                arrays[name] = pa.array(column)
+        return pa.table(arrays)
+
+    @classmethod
+    def from_arrow(cls, table: Any) -> "Frame":
+        """Creates frame from `pyarrow.Table` or `RecordBatch`; fixed size lists become 2-D arrays."""
+        pa = _import_pyarrow()
+        columns = {}
+        for name, column in zip(table.schema.names, table.columns):
+            if isinstance(column, pa.ChunkedArray):
+                column = column.combine_chunks()
+            if pa.types.is_fixed_size_list(column.type):
+                size = column.type.list_size
+                columns[name] = column.flatten().to_numpy(zero_copy_only=False).reshape(len(column), size)
+            else:
+                columns[name] = column.to_numpy(zero_copy_only=False)
+        return cls(columns)
+
+
+def _import_pyarrow():
+    try:
+        import pyarrow
+
+        return pyarrow
+    except ImportError as e:
+        raise ImportError(
+            "The 'pyarrow' library is not installed. Please install it to convert frames (e.g., `pip install haintech[columnar]`)."
+        ) from e
@@ -0,0 +1,51 @@
+from typing import Any, AsyncIterator, Callable, Iterator, Optional, Sequence, override
+
+from ..base_processor import BaseProcessor, close_iterator
+from .frame import Frame
+
+
+class FrameFilterProcessor(BaseProcessor[Frame, Frame]):
+    """Filters rows of frames with a (vectorised) function returning a boolean mask.
+    Frames without rows are dropped."""
+
+    def __init__(
+        self,
+        expression: Callable[..., Any],
+        input: Optional[str | Sequence[str]] = None,
+        name: Optional[str] = None,
+    ):
+        """Filters rows of frames.
+
+        Args:
+            expression: The function returning the mask (or indexes) of rows to keep,
+                gets the frame or columns given by `input`.
+            input: Column or list of columns passed to the function (the frame by default).
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        self.expression = expression
+        self.columns = (input,) if isinstance(input, str) else tuple(input or ())
+
+    @override
+    async def process(self, data) -> AsyncIterator[Frame]:
+        iterator = self._get_iterator(data)
+        try:
+            if isinstance(iterator, Iterator):
+                for frame in iterator:
+                    frame = self._filter(frame)
+                    if len(frame):
+                        yield frame
+            else:
+                async for frame in iterator:
+                    frame = self._filter(frame)
+                    if len(frame):
+                        yield frame
+        finally:
+            await close_iterator(iterator)
+
+    def _filter(self, frame: Frame) -> Frame:
+        if self.columns:
+            mask = self.expression(*(frame[name] for name in self.columns))
+        else:
+            mask = self.expression(frame)
+        return frame.filter(mask)
@@ -0,0 +1,42 @@
+from typing import Any, Callable, Optional, Sequence, override
+
+from ..base_processor import BaseProcessor
+from .frame import Frame
+
+
+class FrameLambdaProcessor(BaseProcessor[Frame, Frame]):
+    """Processes whole columns of frames with a (vectorised) function.
+
+    The function gets the frame or, if `input` is set, the column(s) and returns
+    a new frame or, if `output` is set, values of the output column.
+    """
+
+    def __init__(
+        self,
+        expression: Callable[..., Any],
+        input: Optional[str | Sequence[str]] = None,
+        output: Optional[str] = None,
+        name: Optional[str] = None,
+    ):
+        """Processes whole columns of frames.
+
+        Args:
+            expression: The function processing the frame or columns.
+            input: Column or list of columns passed to the function (the frame by default).
+            output: Column where the result is stored (the result is the frame by default).
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        self.expression = expression
+        self.columns = (input,) if isinstance(input, str) else tuple(input or ())
+        self.output_column = output
+
+    @override
+    async def process_item(self, data: Frame) -> Frame:
+        if self.columns:
+            ret = self.expression(*(data[name] for name in self.columns))
+        else:
+            ret = self.expression(data)
+        if self.output_column:
+            return data.with_columns(**{self.output_column: ret})
+        return ret if ret is not None else data
@@ -0,0 +1,28 @@
+from typing import Any, Iterator, Optional, Type, override
+
+from pydantic import BaseModel
+
+from ..base_flat_map_processor import BaseFlatMapProcessor
+from .frame import Frame
+
+
+class FrameToModels[M: BaseModel](BaseFlatMapProcessor[Frame, M]):
+    """Returns rows of frames as pydantic models (or dicts if `model` is not set)."""
+
+    def __init__(self, model: Optional[Type[M]] = None, name: Optional[str] = None):
+        """Returns rows of frames as pydantic models.
+
+        Args:
+            model: Pydantic model of rows (columns which are not its fields are skipped),
+                rows are returned as dicts if not set.
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        self.model = model
+
+    @override
+    def process_flat_map(self, data: Frame) -> Iterator[M | dict[str, Any]]:
+        if self.model:
+            yield from data.iter_models(self.model)
+        else:
+            yield from data.to_records()
@@ -0,0 +1,56 @@
+from typing import AsyncIterator, Iterator, List, Optional, Sequence, override
+
+from pydantic import BaseModel
+
+from ..base_processor import BaseProcessor, close_iterator
+from .frame import Frame
+
+
+class ModelsToFrame[M: BaseModel](BaseProcessor[M, Frame]):
+    """Collects pydantic models (or dicts) into frames of `batch_size` rows."""
+
+    def __init__(
+        self,
+        batch_size: int = 1000,
+        columns: Optional[Sequence[str]] = None,
+        name: Optional[str] = None,
+    ):
+        """Collects pydantic models (or dicts) into frames.
+
+        Args:
+            batch_size: The maximum number of rows of the frame.
+            columns: Fields converted into columns (all fields by default).
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        if batch_size <= 0:
+            raise ValueError("batch_size must be greater than 0")
+        self.batch_size = batch_size
+        self.columns = columns
+
+    @override
+    async def process(self, data) -> AsyncIterator[Frame]:
+        iterator = self._get_iterator(data)
+        batch: List[M] = []
+        try:
+            if isinstance(iterator, Iterator):
+                for item in iterator:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        yield self._to_frame(batch)
+                        batch = []
+            else:
+                async for item in iterator:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        yield self._to_frame(batch)
+                        batch = []
+            if batch:
+                yield self._to_frame(batch)
+        finally:
+            await close_iterator(iterator)
+
+    def _to_frame(self, batch: List[M]) -> Frame:
+        if isinstance(batch[0], BaseModel):
+            return Frame.from_models(batch, self.columns)
+        return Frame.from_records(batch, self.columns)
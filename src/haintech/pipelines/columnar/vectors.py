@@ -0,0 +1,21 @@
+import numpy as np
+
+
+def normalize(vectors: np.ndarray) -> np.ndarray:
+    """Returns rows scaled to unit length (zero rows are left as they are)."""
+    norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+    return vectors / np.where(norms == 0, 1, norms)
+
+
+def cosine_similarity(vectors: np.ndarray, others: np.ndarray) -> np.ndarray:
+    """Returns similarity of each row of `vectors` to each row of `others`
+    (rows x others), or to the vector if `others` is 1-D."""
+    return normalize(vectors) @ normalize(others).T
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """Returns indexes of `k` highest scores of each row (sorted descending)."""
+    k = min(k, scores.shape[-1])
+    idx = np.argpartition(-scores, k - 1, axis=-1)[..., :k]
+    order = np.take_along_axis(scores, idx, axis=-1).argsort(axis=-1)[..., ::-1]
+    return np.take_along_axis(idx, order, axis=-1)
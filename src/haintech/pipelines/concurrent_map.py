@@ -0,0 +1,54 @@
+import asyncio
+from collections import deque
+from typing import AsyncIterable, AsyncIterator, Awaitable, Callable, Deque, Iterable
+
+
+async def concurrent_map[T, R](
+    iterable: Iterable[T] | AsyncIterable[T],
+    func: Callable[[T], Awaitable[R]],
+    max_concurrent: int = 5,
+    ordered: bool = True,
+) -> AsyncIterator[R]:
+    """Applies async function to items with at most `max_concurrent` calls in flight.
+
+    Items are pulled from the iterable only when there is a free slot,
+    so the input is never materialised. Calls still running when
+    the generator is closed are cancelled.
+
+    Args:
+        iterable: Sync or async source of items.
+        func: Async function applied to each item.
+        max_concurrent: The maximum number of calls running at the same time.
+        ordered: If True, results are yielded in input order,
+            otherwise as soon as they are ready.
+    """
+    if max_concurrent <= 0:
+        raise ValueError("max_concurrent must be greater than 0")
+    is_async = isinstance(iterable, AsyncIterable)
+    iterator = aiter(iterable) if is_async else iter(iterable)  # type: ignore
+    pending: Deque[asyncio.Future[R]] = deque()
+    exhausted = False
+    try:
+        while True:
+            while not exhausted and len(pending) < max_concurrent:
+                try:
+                    item = await anext(iterator) if is_async else next(iterator)  # type: ignore
+                except (StopIteration, StopAsyncIteration):
+                    exhausted = True
+                    break
+                pending.append(asyncio.ensure_future(func(item)))
+            if not pending:
+                break
+            if ordered:
+                yield await pending.popleft()
+            else:
+                done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    pending.remove(task)
+                for task in done:
+                    yield task.result()
+    finally:
+        for task in pending:
+            task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
@@ -1,12 +1,15 @@
 import asyncio
+from contextlib import aclosing
 from typing import AsyncIterator, Iterator, Set, override
 
-from .base_processor import BaseProcessor, FieldNameOrLambda
+from .base_processor import BaseProcessor, FieldNameOrLambda, close_iterator
+from .concurrent_map import concurrent_map
 
 
 class ConcurrentProcessor[I, O](BaseProcessor[I, O]):
     """Processor that processes data concurrently.
-    The output order is not guaranteed to be the same as the input order.
+    The output order is not guaranteed to be the same as the input order
+    unless `ordered` is set.
     The number of concurrent tasks is limited by max_concurrent.
 
     Args:
@@ -17,6 +20,7 @@ class ConcurrentProcessor[I, O](BaseProcessor[I, O]):
     def __init__(
         self,
         max_concurrent: int = 5,
+        ordered: bool = False,
         name: str = None,
         input: FieldNameOrLambda = None,
         output: FieldNameOrLambda = None,
@@ -25,6 +29,7 @@ class ConcurrentProcessor[I, O](BaseProcessor[I, O]):
 
         Args:
             max_concurrent: The maximum number of concurrent tasks.
+            ordered: If True, results are returned in the input order.
             name: The name of the processor.
             input: The name of the input field.
             output: The name of the output field.
@@ -33,6 +38,7 @@ class ConcurrentProcessor[I, O](BaseProcessor[I, O]):
         if max_concurrent <= 0:
             raise ValueError("max_concurrent must be greater than 0")
         self.max_concurrent = max_concurrent
+        self.ordered = ordered
 
     @override
     async def process(self, data) -> AsyncIterator[O]:
@@ -42,42 +48,66 @@ class ConcurrentProcessor[I, O](BaseProcessor[I, O]):
         Limits the number of concurrently running processing tasks.
         """
         iterator = self._get_iterator(data)
+        try:
+            if self.ordered:
+                results = concurrent_map(iterator, self.wrap_process_item, self.max_concurrent)
+                async with aclosing(results):
+                    async for ret in results:
+                        if ret is not None:
+                            yield ret
+            else:
+                results = self._process_unordered(iterator)
+                async with aclosing(results):
+                    async for ret in results:
+                        yield ret
+        finally:
+            await close_iterator(iterator)
+
+    async def _process_unordered(self, iterator: Iterator[I] | AsyncIterator[I]) -> AsyncIterator[O]:
         pending_tasks: Set[asyncio.Task] = set()
         iterator_exhausted = False
+        try:
+            while True:
+                while len(pending_tasks) < self.max_concurrent and not iterator_exhausted:
+                    try:
+                        if isinstance(iterator, Iterator):
+                            item = next(iterator)  # Can raise StopIteration
+                        else:  # AsyncIterator
+                            item = await anext(iterator)  # Can raise StopAsyncIteration
+                    except (StopIteration, StopAsyncIteration):
+                        iterator_exhausted = True
+                        break  # Stop trying to fetch new items
+                    except Exception as e:
+                        # Handle potential errors during iteration itself
+                        # Log or re-raise depending on desired behavior
+                        print(f"Error fetching item from iterator: {e}")  # Or use logging
+                        iterator_exhausted = True  # Assume iterator is broken
+                        break
+                    task = asyncio.create_task(self.wrap_process_item(item))
+                    pending_tasks.add(task)
 
-        while True:
-            while len(pending_tasks) < self.max_concurrent and not iterator_exhausted:
-                try:
-                    if isinstance(iterator, Iterator):
-                        item = next(iterator)  # Can raise StopIteration
-                    else:  # AsyncIterator
-                        item = await anext(iterator)  # Can raise StopAsyncIteration
-                except (StopIteration, StopAsyncIteration):
-                    iterator_exhausted = True
-                    break  # Stop trying to fetch new items
-                except Exception as e:
-                    # Handle potential errors during iteration itself
-                    # Log or re-raise depending on desired behavior
-                    print(f"Error fetching item from iterator: {e}")  # Or use logging
-                    iterator_exhausted = True  # Assume iterator is broken
+                # 2. If no tasks are running or waiting, and the iterator is done, exit.
+                if not pending_tasks:
                     break
-                task = asyncio.create_task(self.wrap_process_item(item))
-                pending_tasks.add(task)
-
-            # 2. If no tasks are running or waiting, and the iterator is done, exit.
-            if not pending_tasks:
-                break
-            done, pending_tasks = await asyncio.wait(
-                pending_tasks, return_when=asyncio.FIRST_COMPLETED
-            )
-            for task in done:
-                try:
-                    yield await task
-                except Exception as e:
-                    print(
-                        f"Error processing item in task {task.get_name()}: {e}"
-                    )  # Or use logging
-                    raise e
+                done, pending_tasks = await asyncio.wait(
+                    pending_tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    try:
+                        ret = await task
+                    except Exception as e:
+                        print(
+                            f"Error processing item in task {task.get_name()}: {e}"
+                        )  # Or use logging
+                        raise e
+                    if ret is not None:
+                        yield ret
+        finally:
+            # Tasks still running when the output is abandoned are cancelled
+            for task in pending_tasks:
+                task.cancel()
+            if pending_tasks:
+                await asyncio.gather(*pending_tasks, return_exceptions=True)
 
     @override
     async def wrap_process_item(self, data):
@@ -1,6 +1,6 @@
 from typing import AsyncIterator, Callable
 
-from .base_processor import BaseProcessor
+from .base_processor import BaseProcessor, close_iterator
 
 
 class FilterProcessor[I](BaseProcessor[I,I]):
@@ -19,6 +19,10 @@ class FilterProcessor[I](BaseProcessor[I,I]):
         """
         Run the processor on the data.
         """
-        async for data in self.source(source_data):
-            if self.expression(data):
-                yield data
+        iterator = self.source(source_data)
+        try:
+            async for data in iterator:
+                if self.expression(data):
+                    yield data
+        finally:
+            await close_iterator(iterator)
@@ -1,8 +1,7 @@
 from typing import AsyncGenerator, AsyncIterator, Callable, Iterator, override
 
-from pydantic import BaseModel
-
-from .base_processor import BaseProcessor
+from .accessors import compile_getter
+from .base_processor import BaseProcessor, close_iterator
 
 
 class GroupProcessor[I, K, O](BaseProcessor):
@@ -24,6 +23,7 @@ class GroupProcessor[I, K, O](BaseProcessor):
         """
         super().__init__(**kwargs)
         self.group_by = group_by
+        self._grouping_key = compile_getter(group_by)
         self.init_group = init_group
         self.aggregate = aggregate
         self.org_source = None
@@ -37,8 +37,12 @@ class GroupProcessor[I, K, O](BaseProcessor):
 
     async def source_wrapper(self, data: I) -> AsyncIterator[O]:
         """Add extra iteration based on the expression to the original source"""
-        async for item in self.aprocess_grouping(self.org_source(data)):
-            yield item
+        iterator = self.org_source(data)
+        try:
+            async for item in self.aprocess_grouping(iterator):
+                yield item
+        finally:
+            await close_iterator(iterator)
 
     @override
     def generate(self, data) -> Iterator[I] | AsyncIterator[I]:
@@ -85,16 +89,7 @@ class GroupProcessor[I, K, O](BaseProcessor):
 
     def _get_grouping_key(self, data: I) -> str:
         """Get the grouping key based on the expression"""
-        if isinstance(self.group_by, str):
-            return (
-                getattr(data, self.group_by)
-                if isinstance(data, BaseModel)
-                else data[self.group_by]
-            )
-        elif callable(self.group_by):
-            return self.group_by(data)
-        else:
-            raise TypeError("Wrong input type")
+        return self._grouping_key(data)
 
     @override
     async def process(self, data) -> AsyncIterator[O]:
@@ -104,9 +99,12 @@ class GroupProcessor[I, K, O](BaseProcessor):
             source_iterator = self.generate(data)
         else:
             source_iterator = self.source(data)
-        if isinstance(source_iterator, Iterator):
-            for data in source_iterator:
-                yield data
-        else:
-            async for data in source_iterator:
-                yield data
+        try:
+            if isinstance(source_iterator, Iterator):
+                for data in source_iterator:
+                    yield data
+            else:
+                async for data in source_iterator:
+                    yield data
+        finally:
+            await close_iterator(source_iterator)
@@ -0,0 +1,117 @@
+import logging
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Iterator, List, Literal, Optional, Tuple, override
+
+from .accessors import compile_getter
+from .base_processor import BaseProcessor, FieldNameOrLambda, FieldNameOrLambda2, close_iterator
+from .branch import Branch, BranchDefinition
+
+
+class JoinProcessor[I, O](BaseProcessor[I, O]):
+    """Sends each item to several named sub-pipelines (branches) running concurrently
+    and merges their results back by key.
+
+    When every branch returns a result with the key of the item, the dict
+    `{branch name: result}` is returned (or put into the item by `output`).
+    Each branch should return at most one result per item.
+    """
+
+    _log = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        branches: Dict[str, BranchDefinition],
+        key: FieldNameOrLambda,
+        result_key: Optional[FieldNameOrLambda] = None,
+        how: Literal["inner", "left"] = "inner",
+        buffer_size: int = 10,
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+        output: Optional[FieldNameOrLambda2] = None,
+    ):
+        """Sends each item to several sub-pipelines and merges their results by key.
+
+        Args:
+            branches: Pipelines or lists of processors by branch name.
+            key: The key of the item (field name or lambda).
+            result_key: The key of branch results (`key` by default).
+            how: "inner" drops items without results of all branches,
+                "left" returns them with the results they have when branches end.
+            buffer_size: The maximum number of items waiting for each branch.
+            name: The name of the processor.
+            input: Value (of the item) sent to branches.
+            output: Where to put merged results (the item is returned).
+        """
+        super().__init__(name=name, input=input, output=output)
+        if not branches:
+            raise ValueError("JoinProcessor needs at least one branch")
+        self.branches = branches
+        self.key = key
+        self.result_key = result_key or key
+        self.how = how
+        self.buffer_size = buffer_size
+        self._get_key = compile_getter(key)
+        self._get_result_key = compile_getter(self.result_key)
+
+    @override
+    async def process(self, data) -> AsyncIterator[O]:
+        iterator = self._get_iterator(data)
+        pending: Dict[Any, Tuple[I, Dict[str, Any]]] = {}
+        ready: Deque[Tuple[I, Dict[str, Any]]] = deque()
+
+        def on_result(branch_name: str, ret: Any) -> None:
+            key = self._get_result_key(ret)
+            entry = pending.get(key)
+            if entry is None:
+                self._log.warning("%s: result of %s with unknown key %s", self.name, branch_name, key)
+                return
+            entry[1][branch_name] = ret
+            if len(entry[1]) == len(self.branches):
+                ready.append(pending.pop(key))
+
+        branches = [
+            Branch(
+                definition,
+                f"{self.name}[{branch_name}]",
+                self.buffer_size,
+                lambda ret, branch_name=branch_name: on_result(branch_name, ret),
+            )
+            for branch_name, definition in self.branches.items()
+        ]
+        for branch in branches:
+            branch.start()
+        try:
+            if isinstance(iterator, Iterator):
+                for item in iterator:
+                    await self._put(item, pending, branches)
+                    while ready:
+                        yield self._merge(*ready.popleft())
+            else:
+                async for item in iterator:
+                    await self._put(item, pending, branches)
+                    while ready:
+                        yield self._merge(*ready.popleft())
+            for branch in branches:
+                await branch.finish()
+            while ready:
+                yield self._merge(*ready.popleft())
+            if self.how == "left":
+                for item, results in list(pending.values()):
+                    yield self._merge(item, results)
+            pending.clear()
+        finally:
+            for branch in branches:
+                await branch.cancel()
+            await close_iterator(iterator)
+
+    async def _put(self, item: I, pending: Dict[Any, Tuple[I, Dict[str, Any]]], branches: List[Branch]) -> None:
+        key = self._get_key(item)
+        if key in pending:
+            raise ValueError(f"{self.name}: duplicated key {key}")
+        pending[key] = (item, {})
+        value = self._get_input_data(item) if self.input else item
+        for branch in branches:
+            await branch.put(value)
+
+    def _merge(self, item: I, results: Dict[str, Any]) -> O:
+        return self._put_output_data(item, results)
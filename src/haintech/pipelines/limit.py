@@ -1,9 +1,13 @@
 from typing import AsyncIterator, Iterator, override
-from .base_processor import BaseProcessor, FieldNameOrLambda
+from .base_processor import BaseProcessor, FieldNameOrLambda, close_iterator
 
 
 class Limit[I, O](BaseProcessor[I, O]):
-    """Simply limits numer of items floating over pipeline."""
+    """Simply limits numer of items floating over pipeline.
+
+    When the last item is passed, the source is closed, so the previous
+    processors stop reading and processing data.
+    """
     def __init__(
         self,
         min: int = 0,
@@ -28,13 +32,22 @@ class Limit[I, O](BaseProcessor[I, O]):
     @override
     async def process(self, data) -> AsyncIterator[O]:
         iterator = self._get_iterator(data)
-        if isinstance(iterator, Iterator):
-            for i, item in enumerate(iterator):
-                if self.min <= i <= self.max:
-                    yield item
-        else:
-            i = 0
-            async for item in iterator:
-                if self.min <= i <= self.max:
-                    yield item
-                i += 1
+        try:
+            if self.max < self.min:
+                return
+            if isinstance(iterator, Iterator):
+                for i, item in enumerate(iterator):
+                    if i >= self.min:
+                        yield item
+                    if i >= self.max:
+                        break
+            else:
+                i = 0
+                async for item in iterator:
+                    if i >= self.min:
+                        yield item
+                    if i >= self.max:
+                        break
+                    i += 1
+        finally:
+            await close_iterator(iterator)
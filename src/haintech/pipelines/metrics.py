@@ -0,0 +1,286 @@
+import logging
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from pydantic import BaseModel
+
+from .base_processor import close_iterator
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+class HistogramSnapshot(BaseModel):
+    buckets: List[Tuple[float, int]]
+    """Upper bounds with cumulative counts (the last bound is +Inf)"""
+    count: int
+    sum: float
+
+
+class StageMetricsSnapshot(BaseModel):
+    name: str
+    items_in: int
+    items_out: int
+    errors: int
+    in_flight: int
+    max_in_flight: int
+    latency: HistogramSnapshot
+    upstream_wait: float
+    """Seconds spent waiting for items from the previous processor"""
+    downstream_wait: float
+    """Seconds spent waiting for the next processor to take an item"""
+
+
+class PipelineMetricsSnapshot(BaseModel):
+    name: str
+    stages: List[StageMetricsSnapshot]
+
+
+class Histogram:
+    """Histogram with fixed buckets (like Prometheus histogram)."""
+
+    def __init__(self, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.bounds = tuple(buckets)
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def snapshot(self) -> HistogramSnapshot:
+        buckets = []
+        cumulative = 0
+        for bound, count in zip(self.bounds + (float("inf"),), self.counts):
+            cumulative += count
+            buckets.append((bound, cumulative))
+        return HistogramSnapshot(buckets=buckets, count=self.count, sum=self.sum)
+
+
+class StageMetrics:
+    """Metrics of one pipeline stage (processor)."""
+
+    def __init__(self, name: str, buckets: Sequence[float] = DEFAULT_BUCKETS):
+        self.name = name
+        self.items_in = 0
+        self.items_out = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.latency = Histogram(buckets)
+        self.upstream_wait = 0.0
+        self.downstream_wait = 0.0
+
+    def start_item(self) -> float:
+        self.in_flight += 1
+        if self.in_flight > self.max_in_flight:
+            self.max_in_flight = self.in_flight
+        return time.perf_counter()
+
+    def end_item(self, start: float, error: bool = False) -> None:
+        self.in_flight -= 1
+        self.latency.observe(time.perf_counter() - start)
+        if error:
+            self.errors += 1
+
+    def snapshot(self) -> StageMetricsSnapshot:
+        return StageMetricsSnapshot(
+            name=self.name,
+            items_in=self.items_in,
+            items_out=self.items_out,
+            errors=self.errors,
+            in_flight=self.in_flight,
+            max_in_flight=self.max_in_flight,
+            latency=self.latency.snapshot(),
+            upstream_wait=self.upstream_wait,
+            downstream_wait=self.downstream_wait,
+        )
+
+
+class MetricsExporter(ABC):
+    """Base class for metrics exporters."""
+
+    @abstractmethod
+    def export(self, snapshot: PipelineMetricsSnapshot) -> None:
+        raise NotImplementedError
+
+
+class PipelineMetrics:
+    """Collects metrics of pipeline stages.
+
+    Pass it to `Pipeline(metrics=...)`. Metrics are exported
+    when the run ends or when `export()` is called.
+    """
+
+    def __init__(
+        self,
+        name: str = "pipeline",
+        exporters: Optional[List[MetricsExporter]] = None,
+        buckets: Sequence[float] = DEFAULT_BUCKETS,
+    ):
+        """Collects metrics of pipeline stages.
+
+        Args:
+            name: Name of the pipeline (used as a label).
+            exporters: Exporters called by `export()`.
+            buckets: Upper bounds (in seconds) of latency histogram buckets.
+        """
+        self.name = name
+        self.exporters = exporters or []
+        self.buckets = buckets
+        self.stages: Dict[str, StageMetrics] = {}
+
+    def stage(self, name: str) -> StageMetrics:
+        """Returns metrics of the stage with the given name (creates them if needed)."""
+        if name not in self.stages:
+            self.stages[name] = StageMetrics(name, self.buckets)
+        return self.stages[name]
+
+    def snapshot(self) -> PipelineMetricsSnapshot:
+        return PipelineMetricsSnapshot(
+            name=self.name, stages=[s.snapshot() for s in self.stages.values()]
+        )
+
+    def export(self) -> None:
+        if not self.exporters:
+            return
+        snapshot = self.snapshot()
+        for exporter in self.exporters:
+            exporter.export(snapshot)
+
+
+async def meter(
+    iterator: Iterator[Any] | AsyncIterator[Any],
+    upstream: Optional[StageMetrics],
+    downstream: Optional[StageMetrics],
+) -> AsyncIterator[Any]:
+    """Counts items passed from `upstream` to `downstream` stage and measures
+    time each of them is blocked by the other one."""
+    is_async = not isinstance(iterator, Iterator)
+    try:
+        while True:
+            start = time.perf_counter()
+            try:
+                item = await anext(iterator) if is_async else next(iterator)
+            except (StopIteration, StopAsyncIteration):
+                break
+            ready = time.perf_counter()
+            if upstream:
+                upstream.items_out += 1
+            if downstream:
+                downstream.items_in += 1
+                downstream.upstream_wait += ready - start
+            yield item
+            if upstream:
+                upstream.downstream_wait += time.perf_counter() - ready
+    finally:
+        await close_iterator(iterator)
+
+
+class LoggingMetricsExporter(MetricsExporter):
+    """Logs one line per stage."""
+
+    def __init__(self, level: int = logging.INFO, logger: Optional[logging.Logger] = None):
+        self.level = level
+        self._log = logger or logging.getLogger(__name__)
+
+    def export(self, snapshot: PipelineMetricsSnapshot) -> None:
+        for s in snapshot.stages:
+            latency = s.latency.sum / s.latency.count if s.latency.count else 0.0
+            self._log.log(
+                self.level,
+                "%s.%s: in=%d out=%d errors=%d max_in_flight=%d avg_latency=%.3fs upstream_wait=%.3fs downstream_wait=%.3fs",
+                snapshot.name,
+                s.name,
+                s.items_in,
+                s.items_out,
+                s.errors,
+                s.max_in_flight,
+                latency,
+                s.upstream_wait,
+                s.downstream_wait,
+            )
+
+
+class PrometheusMetricsExporter(MetricsExporter):
+    """Renders metrics in Prometheus text format.
+
+    The last rendered text is kept in `text`. If `path` is set,
+    it is also written to the file (e.g. for node exporter textfile collector).
+    """
+
+    def __init__(self, path: Optional[Path] = None, prefix: str = "haintech_pipeline"):
+        self.path = path
+        self.prefix = prefix
+        self.text = ""
+
+    def export(self, snapshot: PipelineMetricsSnapshot) -> None:
+        self.text = self.render(snapshot)
+        if self.path:
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(self.text)
+            tmp_path.replace(self.path)
+
+    def render(self, snapshot: PipelineMetricsSnapshot) -> str:
+        p = self.prefix
+        lines = []
+
+        def metric(name: str, type: str, help: str, values: List[Tuple[str, Any]]):
+            lines.append(f"# HELP {p}_{name} {help}")
+            lines.append(f"# TYPE {p}_{name} {type}")
+            for labels_and_suffix, value in values:
+                lines.append(f"{p}_{name}{labels_and_suffix} {value}")
+
+        def labels(s: StageMetricsSnapshot, extra: str = "") -> str:
+            pipeline = _escape(snapshot.name)
+            stage = _escape(s.name)
+            return f'{{pipeline="{pipeline}",stage="{stage}"{extra}}}'
+
+        stages = snapshot.stages
+        metric("items_in_total", "counter", "Items taken by the stage.", [(labels(s), s.items_in) for s in stages])
+        metric("items_out_total", "counter", "Items returned by the stage.", [(labels(s), s.items_out) for s in stages])
+        metric("errors_total", "counter", "Items which processing failed.", [(labels(s), s.errors) for s in stages])
+        metric("in_flight", "gauge", "Items processed at the moment.", [(labels(s), s.in_flight) for s in stages])
+        metric(
+            "upstream_wait_seconds_total",
+            "counter",
+            "Time spent waiting for the previous stage.",
+            [(labels(s), s.upstream_wait) for s in stages],
+        )
+        metric(
+            "downstream_wait_seconds_total",
+            "counter",
+            "Time spent waiting for the next stage.",
+            [(labels(s), s.downstream_wait) for s in stages],
+        )
+        values = []
+        for s in stages:
+            for bound, count in s.latency.buckets:
+                le = "+Inf" if bound == float("inf") else repr(bound)
+                values.append(("_bucket" + labels(s, f',le="{le}"'), count))
+            values.append(("_sum" + labels(s), s.latency.sum))
+            values.append(("_count" + labels(s), s.latency.count))
+        metric("item_latency_seconds", "histogram", "Processing time of one item.", values)
+        return "\n".join(lines) + "\n"
+
+
+class InMemoryMetricsExporter(MetricsExporter):
+    """Keeps exported snapshots in memory, e.g. for tests or UI."""
+
+    def __init__(self):
+        self.snapshots: List[PipelineMetricsSnapshot] = []
+
+    def export(self, snapshot: PipelineMetricsSnapshot) -> None:
+        self.snapshots.append(snapshot)
+
+    @property
+    def last(self) -> Optional[PipelineMetricsSnapshot]:
+        return self.snapshots[-1] if self.snapshots else None
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -1,17 +1,37 @@
 from __future__ import annotations
 
+import asyncio
 import logging
-from typing import Any, Iterator, List, Optional
+from typing import TYPE_CHECKING, Any, AsyncIterator, Iterator, List, Optional
 
-from .base_processor import BaseProcessor, ListOrIterator
+from .base_processor import BaseProcessor, ListOrIterator, close_iterator
+from .cancel_token import CancelToken
 from .checkpoint_processor import CheckpointProcessor
+from .metrics import PipelineMetrics, meter
+
+if TYPE_CHECKING:
+    from haintech.profiling import Profiler
 
 
 class Pipeline[I, O]:
     """Pipeline class that runs a series of processors on data."""
 
-    def __init__(self, processors: Optional[List[BaseProcessor]] = None):
+    def __init__(
+        self,
+        processors: Optional[List[BaseProcessor]] = None,
+        metrics: Optional[PipelineMetrics] = None,
+        profiler: Optional[Profiler] = None,
+    ):
+        """Pipeline class that runs a series of processors on data.
+
+        Args:
+            processors: Processors run in the given order.
+            metrics: If set, metrics of each processor (stage) are collected.
+            profiler: If set, processors are profiled during runs.
+        """
         self.processors = processors or []
+        self.metrics = metrics
+        self.profiler = profiler
         self._log = logging.getLogger(__name__)
 
     def add_processor(self, processor: BaseProcessor):
@@ -24,33 +44,132 @@ class Pipeline[I, O]:
         """
         Build pipeline from processors.
         """
+        if self.profiler:
+            for processor in self.processors:
+                processor.profiler = self.profiler
+        if self.metrics:
+            return self._build_metered()
         pipeline = None
-        for i, processor in enumerate(self.processors):
-            if i != 0:
-                if pipeline:
-                    processor.set_source(pipeline)
+        for processor in self.processors:
+            # Processors may have been metered by a previous build
+            processor.metrics = None
+            processor.source = None
+            if pipeline:
+                processor.set_source(pipeline)
             pipeline = processor
         if pipeline:
             return pipeline
         else:
             raise ValueError("Pipeline is empty")
 
-    async def run(self, data: I | Iterator[I] = None):
+    def _build_metered(self) -> BaseProcessor[Any, Any]:
+        """Build pipeline where items passed between processors are metered."""
+        if not self.processors:
+            raise ValueError("Pipeline is empty")
+        upstream = None
+        for processor in self.processors:
+            name = processor.name
+            i = 2
+            while name in self.metrics.stages and self.metrics.stages[name] is not processor.metrics:
+                name = f"{processor.name}#{i}"
+                i += 1
+            processor.metrics = self.metrics.stage(name)
+            if upstream is None:
+                processor.set_source(
+                    lambda data, p=processor: meter(BaseProcessor.generate(p, data), None, p.metrics)
+                )
+            else:
+                processor.set_source(
+                    lambda data, u=upstream, p=processor: meter(u.process(data), u.metrics, p.metrics)
+                )
+            upstream = processor
+        return upstream
+
+    async def run(
+        self,
+        data: I | Iterator[I] = None,
+        cancel_token: Optional[CancelToken] = None,
+        timeout: Optional[float] = None,
+    ):
         """Run pipeline with data. Return async generator of results.
 
+        When the generator is closed (also when it is abandoned, cancelled
+        or times out), in-flight tasks are cancelled, sources are closed
+        and `close()` of all processors is called.
+
         Args:
             data: Data to process which is sent to the first processor.
+            cancel_token: Token which cancels the run (`PipelineCancelledError` is raised).
+            timeout: The maximum run time in seconds (`TimeoutError` is raised).
         """
         self._log.debug(f"Running pipeline with data: {data}")
         pipeline = self._build()
-        return pipeline.process(data)
+        deadline = asyncio.get_running_loop().time() + timeout if timeout is not None else None
+        iterator = pipeline.process(data)
+        if self.metrics:
+            iterator = meter(iterator, pipeline.metrics, None)
+        return self._run(iterator, cancel_token, deadline)
+
+    async def _run(
+        self,
+        iterator: AsyncIterator[O],
+        cancel_token: Optional[CancelToken],
+        deadline: Optional[float],
+    ) -> AsyncIterator[O]:
+        if self.profiler:
+            self.profiler.start()
+        try:
+            if cancel_token is None and deadline is None:
+                async for item in iterator:
+                    yield item
+                return
+            while True:
+                if cancel_token:
+                    cancel_token.raise_if_cancelled()
+                try:
+                    async with asyncio.timeout_at(deadline) as timeout:
+                        if cancel_token:
+                            cancel_token._register(timeout)
+                        try:
+                            item = await anext(iterator)
+                        finally:
+                            if cancel_token:
+                                cancel_token._unregister(timeout)
+                except StopAsyncIteration:
+                    break
+                except TimeoutError:
+                    if cancel_token:
+                        cancel_token.raise_if_cancelled()
+                    raise
+                yield item
+        finally:
+            await close_iterator(iterator)
+            await self.close()
+            if self.metrics:
+                self.metrics.export()
+            if self.profiler:
+                self.profiler.stop()
+
+    async def close(self) -> None:
+        """Calls `close()` of all processors. Errors are logged,
+        so every processor is closed."""
+        for processor in self.processors:
+            try:
+                await processor.close()
+            except Exception:
+                self._log.exception("Error while closing %s", processor.name)
 
-    async def run_and_return(self, data: I | Iterator[I] = None) -> O | List[O] | None:
+    async def run_and_return(
+        self,
+        data: I | Iterator[I] = None,
+        cancel_token: Optional[CancelToken] = None,
+        timeout: Optional[float] = None,
+    ) -> O | List[O] | None:
         """Run pipeline and return result.
         If the last processor returns a generator, return a list of results.
         """
         ret_list = data is None or isinstance(data, ListOrIterator)
-        ret = list([r async for r in await self.run(data)])
+        ret = list([r async for r in await self.run(data, cancel_token, timeout)])
         if ret is not None:
             return ret if ret_list or len(ret) > 1 else ret[0]
         else:
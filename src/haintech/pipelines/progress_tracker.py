@@ -1,11 +1,34 @@
+import asyncio
 import logging
 import threading
-from typing import Optional
+import time
+from typing import AsyncIterator, Callable, List, Optional, Tuple
+
+from pydantic import BaseModel
+
+
+class ProgressSnapshot(BaseModel):
+    """State of the progress tracker."""
+
+    name: Optional[str] = None
+    completed: int
+    total: int
+    progress: float
+    """Progress value (0.0 to 1.0)"""
+    rate: Optional[float] = None
+    """Moving average of steps per second"""
+    eta: Optional[float] = None
+    """Estimated remaining time in seconds"""
+    elapsed: float
+    """Seconds since the first step"""
 
 
 class ProgressTracker:
     """Tracks progress of a task with a defined number of steps.
     Can be nested, where completing a child tracker increments its parent.
+
+    By default every step is reported. Set `min_interval_ms` and/or `min_percent`
+    to report at most every N ms or P percent (and always on completion).
     """
 
     _log = logging.getLogger(__name__)
@@ -15,18 +38,35 @@ class ProgressTracker:
         total_steps: int = 0,
         parent: Optional["ProgressTracker"] = None,
         name: str = None,
+        min_interval_ms: Optional[float] = None,
+        min_percent: Optional[float] = None,
+        on_progress: Optional[Callable[[ProgressSnapshot], None]] = None,
+        smoothing: float = 0.3,
     ):
         """Initializes the ProgressTracker.
 
         Args:
             parent: An optional parent ProgressTracker. If provided,
                     this tracker will increment the parent when it completes.
+            min_interval_ms: Progress is reported at most every N ms.
+            min_percent: Progress is reported at most every P percent.
+            on_progress: Function called with progress snapshot when progress is reported.
+            smoothing: Weight of the last measurement in moving average of rate (0.0 - 1.0).
         """
         self.total_steps = total_steps  # Total steps required for completion
         self.completed_steps = 0  # Number of steps completed so far
         self._lock = threading.Lock()  # Lock for thread safety
         self.parent = parent  # Reference to the parent tracker, if any
         self.name = name
+        self.min_interval = min_interval_ms / 1000 if min_interval_ms else None
+        self.min_percent = min_percent
+        self.on_progress = on_progress
+        self.smoothing = smoothing
+        self._start_time: Optional[float] = None
+        self._reported_time = 0.0
+        self._reported_steps = 0
+        self._rate: Optional[float] = None
+        self._subscribers: List[Tuple[asyncio.AbstractEventLoop, asyncio.Queue]] = []
 
     def set_total_steps(self, total_steps: int):
         """Sets the total number of steps required for this tracker.
@@ -50,14 +90,17 @@ class ProgressTracker:
     def reset(self, total_steps: int = None):
         with self._lock:
             self.completed_steps = 0
+            self._start_time = None
+            self._reported_steps = 0
+            self._rate = None
             if total_steps:
                 self.total_steps = total_steps
                 self._log.info("Progress tracker reset.")
         # Optionally notify about the reset state
         self.notify(0, self.total_steps)
 
-    def increment(self):
-        """Increases the number of completed steps by one.
+    def increment(self, n: int = 1):
+        """Increases the number of completed steps by `n` (one by default).
         If this tracker reaches completion (completed_steps == total_steps)
         and has a parent tracker, it increments the parent tracker.
         """
@@ -67,24 +110,103 @@ class ProgressTracker:
             )
 
         is_complete = False
+        report = False
+        snapshot = None
         with self._lock:
-            self.completed_steps += 1
-            if self.completed_steps > self.total_steps:
+            if self.completed_steps + n > self.total_steps:
                 raise ValueError(
                     f"{self.name} Completed steps cannot exceed total steps."
                 )
+            now = time.monotonic()
+            if self._start_time is None:
+                self._start_time = now
+                self._reported_time = now
+            self.completed_steps += n
             if self.completed_steps == self.total_steps:
                 is_complete = True
+            if is_complete or self._should_report(now):
+                report = True
+                self._update_rate(now)
+                if self.on_progress or self._subscribers:
+                    snapshot = self._create_snapshot(now)
             current_completed = self.completed_steps
             current_total = self.total_steps
 
         # --- Lock is released here ---
 
-        self.notify(current_completed, current_total)
+        if report:
+            self.notify(current_completed, current_total)
+        if snapshot:
+            self._publish(snapshot, is_complete)
         if is_complete and self.parent:
             self._log.debug(f"Tracker complete. Incrementing parent: {self.parent}")
             self.parent.increment()
 
+    def _should_report(self, now: float) -> bool:
+        """Checks throttling limits (called with the lock held)."""
+        if self.min_interval is None and self.min_percent is None:
+            return True
+        if self.min_interval is not None and now - self._reported_time >= self.min_interval:
+            return True
+        if self.min_percent is not None:
+            percent = (self.completed_steps - self._reported_steps) * 100 / self.total_steps
+            if percent >= self.min_percent:
+                return True
+        return False
+
+    def _update_rate(self, now: float) -> None:
+        """Updates moving average of rate (called with the lock held)."""
+        interval = now - self._reported_time
+        if interval > 0:
+            rate = (self.completed_steps - self._reported_steps) / interval
+            self._rate = rate if self._rate is None else self.smoothing * rate + (1 - self.smoothing) * self._rate
+        self._reported_time = now
+        self._reported_steps = self.completed_steps
+
+    def _create_snapshot(self, now: float) -> ProgressSnapshot:
+        """Returns current state (called with the lock held)."""
+        remaining = self.total_steps - self.completed_steps
+        return ProgressSnapshot(
+            name=self.name,
+            completed=self.completed_steps,
+            total=self.total_steps,
+            progress=min(self.completed_steps, self.total_steps) / self.total_steps if self.total_steps else 0.0,
+            rate=self._rate,
+            eta=remaining / self._rate if self._rate else None,
+            elapsed=now - self._start_time if self._start_time is not None else 0.0,
+        )
+
+    def get_snapshot(self) -> ProgressSnapshot:
+        """Returns the current state with the last reported rate and ETA."""
+        with self._lock:
+            return self._create_snapshot(time.monotonic())
+
+    def _publish(self, snapshot: ProgressSnapshot, is_complete: bool) -> None:
+        if self.on_progress:
+            self.on_progress(snapshot)
+        for loop, queue in list(self._subscribers):
+            loop.call_soon_threadsafe(queue.put_nowait, snapshot)
+            if is_complete:
+                loop.call_soon_threadsafe(queue.put_nowait, None)
+
+    async def snapshots(self) -> AsyncIterator[ProgressSnapshot]:
+        """Returns reported progress snapshots until the tracker is complete.
+
+        >>>
+        async for snapshot in tracker.snapshots():
+            print(f"{snapshot.progress:.0%} ETA: {snapshot.eta}")
+        """
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+        self._subscribers.append(subscriber)
+        try:
+            while not self.is_complete() or not subscriber[1].empty():
+                snapshot = await subscriber[1].get()
+                if snapshot is None:
+                    break
+                yield snapshot
+        finally:
+            self._subscribers.remove(subscriber)
+
     def get_progress(self) -> float:
         """Returns the current progress as a float value between 0.0 and 1.0.
 
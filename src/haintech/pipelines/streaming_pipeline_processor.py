@@ -0,0 +1,277 @@
+import asyncio
+import copy
+import logging
+from collections import deque
+from contextlib import aclosing
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Deque,
+    Dict,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    override,
+)
+
+from .base_processor import BaseProcessor, FieldNameOrLambda, close_iterator
+from .metrics import meter
+from .pipeline import Pipeline
+
+_DONE = object()
+
+
+class _Failed:
+    """Error of sub-pipeline passed to the consumer."""
+
+    __slots__ = ("error",)
+
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+class StreamingPipelineProcessor[I, O](BaseProcessor[I, O]):
+    """The processor that uses other pipeline to process items and yields
+    results of the sub-pipeline one by one (as a flat map).
+
+    Unlike `PipelineProcessor` the sub-pipeline is built once and its processors
+    are reused for all parent items, results are not collected into a list
+    and sub-pipelines of up to `max_concurrent` parent items run concurrently.
+    Each of concurrent parent items is processed by its own copy of processors,
+    so stages keeping state of a run in attributes don't mix items of different
+    parent items.
+    """
+
+    _log = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        processors: Optional[List[BaseProcessor]] = None,
+        pipeline: Optional[Pipeline[I, O] | Callable[[I], Pipeline[I, O]]] = None,
+        max_concurrent: int = 1,
+        ordered: bool = False,
+        buffer_size: int = 10,
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+        output: Optional[FieldNameOrLambda] = None,
+    ):
+        """The processor that streams results of other pipeline.
+
+        Args:
+            processors: Processors of the sub-pipeline.
+            pipeline: Sub-pipeline or function returning sub-pipeline for the parent item.
+            max_concurrent: The maximum number of parent items processed concurrently.
+            ordered: If True, results of the parent item are returned after all results
+                of previous parent items (results of one item are always in order).
+            buffer_size: The maximum number of results waiting for the consumer
+                (per parent item if `ordered` is set).
+            name: The name of the processor.
+            input: Value (of the parent item) sent to the sub-pipeline.
+            output: Where to put each result of the sub-pipeline (the parent item is returned).
+        """
+        super().__init__(name=name, input=input, output=output)
+        if max_concurrent <= 0:
+            raise ValueError("max_concurrent must be greater than 0")
+        self.pipeline = pipeline if pipeline else Pipeline(processors)
+        self.max_concurrent = max_concurrent
+        self.ordered = ordered
+        self.buffer_size = buffer_size
+        self._idle: Dict[Pipeline, List[Tuple[Pipeline, BaseProcessor]]] = {}
+        """Built slots of the sub-pipeline which are not used by any parent item"""
+        self._slots: Dict[Pipeline, List[Pipeline]] = {}
+        """All built slots of the sub-pipeline (the sub-pipeline and copies of it)"""
+        self._active: Dict[Pipeline, int] = {}
+        """The number of parent items using the sub-pipeline"""
+
+    @override
+    async def process(self, data) -> AsyncIterator[O]:
+        iterator = self._get_iterator(data)
+        try:
+            if self.max_concurrent == 1:
+                results = self._process_sequential(iterator)
+            elif self.ordered:
+                results = self._process_ordered(iterator)
+            else:
+                results = self._process_unordered(iterator)
+            async with aclosing(results):
+                async for ret in results:
+                    yield ret
+        finally:
+            await close_iterator(iterator)
+
+    async def _process_sequential(self, iterator: Iterator[I] | AsyncIterator[I]) -> AsyncIterator[O]:
+        while (parent := await _next(iterator)) is not _DONE:
+            results = self.process_sub_pipeline(parent)
+            async with aclosing(results):
+                async for ret in results:
+                    yield ret
+
+    async def _process_ordered(self, iterator: Iterator[I] | AsyncIterator[I]) -> AsyncIterator[O]:
+        pending: Deque[Tuple[asyncio.Task, asyncio.Queue]] = deque()
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and len(pending) < self.max_concurrent:
+                    parent = await _next(iterator)
+                    if parent is _DONE:
+                        exhausted = True
+                        break
+                    queue = asyncio.Queue(self.buffer_size)
+                    pending.append((asyncio.create_task(self._pump(parent, queue)), queue))
+                if not pending:
+                    break
+                queue = pending[0][1]
+                while (ret := await queue.get()) is not _DONE:
+                    if isinstance(ret, _Failed):
+                        raise ret.error
+                    yield ret
+                pending.popleft()
+        finally:
+            await _cancel([task for task, _ in pending])
+
+    async def _process_unordered(self, iterator: Iterator[I] | AsyncIterator[I]) -> AsyncIterator[O]:
+        queue = asyncio.Queue(self.buffer_size)
+        tasks: Set[asyncio.Task] = set()
+        running = 0
+        exhausted = False
+        try:
+            while True:
+                while not exhausted and running < self.max_concurrent:
+                    parent = await _next(iterator)
+                    if parent is _DONE:
+                        exhausted = True
+                        break
+                    task = asyncio.create_task(self._pump(parent, queue))
+                    tasks.add(task)
+                    task.add_done_callback(tasks.discard)
+                    running += 1
+                if running == 0:
+                    break
+                ret = await queue.get()
+                if ret is _DONE:
+                    running -= 1
+                elif isinstance(ret, _Failed):
+                    raise ret.error
+                else:
+                    yield ret
+        finally:
+            await _cancel(list(tasks))
+
+    async def _pump(self, parent: I, queue: asyncio.Queue) -> None:
+        """Puts results of the sub-pipeline to the queue (waits when it is full)."""
+        try:
+            results = self.process_sub_pipeline(parent)
+            async with aclosing(results):
+                async for ret in results:
+                    await queue.put(ret)
+        except Exception as e:
+            await queue.put(_Failed(e))
+        await queue.put(_DONE)
+
+    async def process_sub_pipeline(self, data: I) -> AsyncIterator[O]:
+        """Runs the sub-pipeline for the parent item and yields its results."""
+        input_data = self._get_input_data(data) if self.input else data
+        pipeline, slot, root = self._acquire(data)
+        iterator = root.process(input_data)
+        if pipeline.metrics:
+            iterator = meter(iterator, root.metrics, None)
+        try:
+            async for ret in iterator:
+                yield self._put_output_data(data, ret)
+        finally:
+            await close_iterator(iterator)
+            await self._release(pipeline, slot, root)
+
+    def _acquire(self, data: I) -> Tuple[Pipeline, Pipeline, BaseProcessor]:
+        """Returns the sub-pipeline for the parent item, the pipeline which runs it (slot)
+        and the built root processor of the slot.
+
+        A slot is used by one parent item at a time. The first slot is the sub-pipeline
+        itself, when it is used by other parent items, a copy of its processors is built,
+        so at most `max_concurrent` slots are built and reused for all parent items.
+        A pipeline returned by the function can be returned for many items too."""
+        pipeline = self.pipeline if isinstance(self.pipeline, Pipeline) else self.pipeline(data)
+        idle = self._idle.setdefault(pipeline, [])
+        if idle:
+            slot, root = idle.pop()
+        else:
+            slots = self._slots.setdefault(pipeline, [])
+            slot = _copy_pipeline(pipeline) if slots else pipeline
+            root = slot._build()
+            slots.append(slot)
+        self._active[pipeline] = self._active.get(pipeline, 0) + 1
+        return pipeline, slot, root
+
+    async def _release(self, pipeline: Pipeline, slot: Pipeline, root: BaseProcessor) -> None:
+        """Returns the slot to the pool. The pipeline returned by the function
+        is closed when no parent item uses it."""
+        self._idle[pipeline].append((slot, root))
+        self._active[pipeline] -= 1
+        if pipeline is self.pipeline or self._active[pipeline] > 0:
+            return
+        del self._active[pipeline]
+        await self._close_pipeline(pipeline)
+
+    async def _close_pipeline(self, pipeline: Pipeline) -> None:
+        """Closes all slots of the pipeline."""
+        self._idle.pop(pipeline, None)
+        for slot in self._slots.pop(pipeline, []):
+            await slot.close()
+        if pipeline.metrics:
+            pipeline.metrics.export()
+
+    @override
+    async def close(self) -> None:
+        """Closes the sub-pipeline (once, after all parent items)."""
+        if isinstance(self.pipeline, Pipeline) and self.pipeline in self._slots:
+            self._active.pop(self.pipeline, None)
+            await self._close_pipeline(self.pipeline)
+
+    def __copy__(self) -> "StreamingPipelineProcessor[I, O]":
+        """Copy has its own slots of the sub-pipeline."""
+        ret = object.__new__(type(self))
+        ret.__dict__.update(self.__dict__)
+        ret._idle, ret._slots, ret._active = {}, {}, {}
+        return ret
+
+
+def _copy_pipeline(pipeline: Pipeline) -> Pipeline:
+    """Returns the pipeline with copies of processors."""
+    return Pipeline([_copy_value(p) for p in pipeline.processors], pipeline.metrics, pipeline.profiler)
+
+
+def _copy_processor[P: BaseProcessor](processor: P) -> P:
+    """Returns a shallow copy of the processor where sub-processors and sub-pipelines
+    (e.g. branches of `TeeProcessor`) are copied too. Other attributes (models,
+    storages, caches) are shared with the original processor."""
+    ret = copy.copy(processor)
+    ret.__dict__.update({name: _copy_value(value) for name, value in vars(ret).items()})
+    return ret
+
+
+def _copy_value(value: Any) -> Any:
+    if isinstance(value, BaseProcessor):
+        return _copy_processor(value)
+    if isinstance(value, Pipeline):
+        return _copy_pipeline(value)
+    if isinstance(value, list) and any(isinstance(v, (BaseProcessor, Pipeline, list)) for v in value):
+        return [_copy_value(v) for v in value]
+    return value
+
+
+async def _next(iterator: Iterator[Any] | AsyncIterator[Any]) -> Any:
+    """Returns the next item or `_DONE`."""
+    try:
+        return next(iterator) if isinstance(iterator, Iterator) else await anext(iterator)
+    except (StopIteration, StopAsyncIteration):
+        return _DONE
+
+
+async def _cancel(tasks: List[asyncio.Task]) -> None:
+    for task in tasks:
+        task.cancel()
+    if tasks:
+        await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,73 @@
+from contextlib import aclosing
+from typing import AsyncIterator, Iterator, List, Optional, override
+
+from .base_processor import BaseProcessor, FieldNameOrLambda, close_iterator
+from .branch import Branch, BranchDefinition
+
+
+class TeeProcessor[I](BaseProcessor[I, I]):
+    """Sends each item to several sub-pipelines (branches) running concurrently
+    and passes the item on. Results of branches are dropped, so it is used for sinks
+    (writers, storages, indexes).
+
+    Each branch has its own queue of `buffer_size` items, so a slow branch
+    holds back items only when its queue is full. The run ends when all branches
+    process all items; an error of any branch is raised.
+    """
+
+    def __init__(
+        self,
+        branches: List[BranchDefinition],
+        buffer_size: int = 10,
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+    ):
+        """Sends each item to several sub-pipelines running concurrently.
+
+        Args:
+            branches: Pipelines or lists of processors.
+            buffer_size: The maximum number of items waiting for each branch.
+            name: The name of the processor.
+            input: Value (of the item) sent to branches.
+        """
+        super().__init__(name=name, input=input)
+        if not branches:
+            raise ValueError("TeeProcessor needs at least one branch")
+        self.branches = branches
+        self.buffer_size = buffer_size
+
+    @override
+    async def process(self, data) -> AsyncIterator[I]:
+        iterator = self._get_iterator(data)
+        branches = [
+            Branch(definition, f"{self.name}[{i}]", self.buffer_size)
+            for i, definition in enumerate(self.branches)
+        ]
+        for branch in branches:
+            branch.start()
+        try:
+            items = self._send(iterator, branches)
+            async with aclosing(items):
+                async for item in items:
+                    yield item
+            for branch in branches:
+                await branch.finish()
+        finally:
+            for branch in branches:
+                await branch.cancel()
+            await close_iterator(iterator)
+
+    async def _send(self, iterator: Iterator[I] | AsyncIterator[I], branches: List[Branch]) -> AsyncIterator[I]:
+        if isinstance(iterator, Iterator):
+            for item in iterator:
+                await self._put(item, branches)
+                yield item
+        else:
+            async for item in iterator:
+                await self._put(item, branches)
+                yield item
+
+    async def _put(self, item: I, branches: List[Branch]) -> None:
+        value = self._get_input_data(item) if self.input else item
+        for branch in branches:
+            await branch.put(value)
@@ -0,0 +1,126 @@
+import codecs
+from contextlib import aclosing
+from typing import Any, AsyncIterable, AsyncIterator, Iterable, Iterator, Optional, Sequence, override
+
+from .base_processor import BaseProcessor, FieldNameOrLambda, close_iterator
+
+TextSource = str | bytes | Iterable[str | bytes | memoryview] | AsyncIterable[str | bytes | memoryview]
+
+
+class TextSplitter[I](BaseProcessor[I, str]):
+    """Splits text into chunks of the given size.
+
+    Input can be a string, bytes or (async) iterable of chunks,
+    e.g. `BlobStream`. Bytes are decoded incrementally, so only
+    the current chunk and the not yet returned text are held in memory.
+    """
+
+    def __init__(
+        self,
+        chunk_size: int = 1000,
+        chunk_overlap: int = 0,
+        separators: Sequence[str] = ("\n\n", "\n", " "),
+        encoding: str = "utf-8",
+        name: Optional[str] = None,
+        input: Optional[FieldNameOrLambda] = None,
+        output: Optional[FieldNameOrLambda] = None,
+    ):
+        """Splits text into chunks of the given size.
+
+        Args:
+            chunk_size: The maximum number of characters in the chunk.
+            chunk_overlap: The number of characters repeated from the end
+                of the previous chunk.
+            separators: Text is split at the last separator found in the second
+                half of the chunk (in the given order of preference).
+                If none is found, text is split at `chunk_size`.
+            encoding: Encoding of bytes input.
+        """
+        super().__init__(name=name, input=input, output=output)
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be greater than 0")
+        if chunk_overlap < 0 or chunk_overlap >= chunk_size:
+            raise ValueError("chunk_overlap must be between 0 and chunk_size")
+        self.chunk_size = chunk_size
+        self.chunk_overlap = chunk_overlap
+        self.separators = separators
+        self.encoding = encoding
+
+    @override
+    async def process(self, data: I) -> AsyncIterator[str]:
+        iterator = self._get_iterator(data)
+        try:
+            if isinstance(iterator, Iterator):
+                for data in iterator:
+                    async with aclosing(self.wrap_process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+            else:
+                async for data in iterator:
+                    async with aclosing(self.wrap_process_flat_map(data)) as items:
+                        async for item in items:
+                            yield item
+        finally:
+            await close_iterator(iterator)
+
+    async def wrap_process_flat_map(self, data):
+        """
+        Run process method.
+        If result_key_name is set, store result in input data and return it.
+        """
+        if self.input:
+            input_data = self._get_input_data(data)
+        else:
+            input_data = data
+        async for ret in self.process_flat_map(input_data):
+            yield self._put_output_data(data, ret)
+
+    async def process_flat_map(self, data: TextSource) -> AsyncIterator[str]:
+        buffer = ""
+        async for text in self._iter_text(data):
+            buffer += text
+            start = 0
+            while len(buffer) - start > self.chunk_size:
+                end, next_start = self._find_cut(buffer, start)
+                chunk = buffer[start:end].strip()
+                if chunk:
+                    yield chunk
+                start = end - self.chunk_overlap if end - self.chunk_overlap > start else next_start
+            buffer = buffer[start:]
+        chunk = buffer.strip()
+        if chunk:
+            yield chunk
+
+    def _find_cut(self, buffer: str, start: int) -> tuple[int, int]:
+        """Returns the end of the chunk and the start of the next one."""
+        end = start + self.chunk_size
+        for separator in self.separators:
+            pos = buffer.rfind(separator, start + self.chunk_size // 2, end + len(separator))
+            if pos != -1:
+                return pos, pos + len(separator)
+        return end, end
+
+    async def _iter_text(self, data: TextSource) -> AsyncIterator[str]:
+        if isinstance(data, str):
+            yield data
+            return
+        decoder = codecs.getincrementaldecoder(self.encoding)()
+        if isinstance(data, (bytes, bytearray, memoryview)):
+            yield decoder.decode(data, final=True)
+            return
+        async for chunk in self._aiter(data):
+            yield chunk if isinstance(chunk, str) else decoder.decode(chunk)
+        yield decoder.decode(b"", final=True)
+
+    @staticmethod
+    async def _aiter(data: Any) -> AsyncIterator[Any]:
+        if isinstance(data, AsyncIterable):
+            async for chunk in data:
+                yield chunk
+        else:
+            for chunk in data:
+                yield chunk
+
+    @override
+    async def process_item(self, data: str) -> str:
+        return data
@@ -0,0 +1,321 @@
+import asyncio
+import heapq
+import logging
+import math
+import time
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, Iterator, List, Optional, Tuple, override
+
+from pydantic import BaseModel
+
+from .accessors import compile_getter
+from .base_processor import BaseProcessor, FieldNameOrLambda, close_iterator
+
+
+class Window(BaseModel):
+    """Closed window passed to `finalize`."""
+
+    key: Any = None
+    start: float
+    """Timestamp (or index of the first item for count windows). Items of a key are counted
+    from the start of the stream, unless the key had no open windows while more than
+    `max_windows` other keys had none, then they are counted from 0 again."""
+    end: float
+    """Timestamp (or index after the last item for count windows), exclusive"""
+    count: int
+    """Number of aggregated items"""
+    value: Any
+    """Aggregated value"""
+
+
+class _WindowState:
+    __slots__ = ("key", "start", "end", "count", "value")
+
+    def __init__(self, key: Any, start: float, end: float):
+        self.key = key
+        self.start = start
+        self.end = end
+        self.count = 0
+        self.value = None
+
+
+class WindowProcessor[I, K, O](BaseProcessor):
+    """Aggregates items of a continuous stream in windows and returns the result
+    of each window as soon as the window is closed.
+
+    Windows:
+
+    * tumbling - `size` items or `duration` seconds,
+    * sliding - as above, a new window starts every `slide` items or seconds,
+    * session - ends when there is no item for `gap` seconds.
+
+    Time windows use item `timestamp` (event time) or the time of arrival.
+    Windows are kept separately for each `key`.
+    """
+
+    _log = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        init_window: Callable[[K, I], O],
+        aggregate: Callable[[O, K, I], O | None],
+        size: Optional[int] = None,
+        duration: Optional[float] = None,
+        slide: Optional[float] = None,
+        gap: Optional[float] = None,
+        key: Optional[FieldNameOrLambda] = None,
+        timestamp: Optional[FieldNameOrLambda] = None,
+        allowed_lateness: float = 0,
+        max_windows: int = 10_000,
+        finalize: Optional[Callable[[Window], Any]] = None,
+        name: Optional[str] = None,
+    ):
+        """Aggregates items of a continuous stream in windows.
+
+        Args:
+            init_window: The function to initialize the window value, gets the key and the first item.
+            aggregate: The function to aggregate the item into the window value, gets the value,
+                the key and the item and returns the value or None (if the value is modified in place).
+            size: Number of items in the count window.
+            duration: Length of the time window in seconds.
+            slide: Step of sliding windows (items for count windows, seconds for time windows).
+            gap: Inactivity in seconds which ends the session window.
+            key: Windows are kept for each key (field name or lambda).
+            timestamp: Time of the item (field name or lambda returning seconds or datetime),
+                the time of arrival is used by default.
+            allowed_lateness: Seconds the window waits for items with older timestamps.
+            max_windows: The maximum number of open windows; the oldest window is closed
+                when the limit is exceeded. It limits item counters of keys without
+                open windows (count windows) too, see `Window.start`.
+            finalize: Returns the result of the closed window (the aggregated value by default).
+            name: The name of the processor.
+        """
+        super().__init__(name=name)
+        if sum(p is not None for p in (size, duration, gap)) != 1:
+            raise ValueError("Exactly one of size, duration or gap must be set")
+        if slide is not None and gap is not None:
+            raise ValueError("slide cannot be used with session windows")
+        if (size is not None and size <= 0) or (duration is not None and duration <= 0) or (gap is not None and gap <= 0):
+            raise ValueError("Window size, duration and gap must be greater than 0")
+        if slide is not None and slide <= 0:
+            raise ValueError("slide must be greater than 0")
+        self.init_window = init_window
+        self.aggregate = aggregate
+        self.size = size
+        self.duration = duration
+        self.slide = slide
+        self.gap = gap
+        self.key = key
+        self.timestamp = timestamp
+        self.allowed_lateness = allowed_lateness
+        self.max_windows = max_windows
+        self.finalize = finalize
+        self._get_key = compile_getter(key) if key is not None else None
+        self._get_timestamp = compile_getter(timestamp) if timestamp is not None else None
+
+    @override
+    async def process(self, data) -> AsyncIterator[Any]:
+        iterator = self._get_iterator(data)
+        windows = _Windows(self)
+        next_item: Optional[asyncio.Future] = None
+        try:
+            if isinstance(iterator, Iterator):
+                for item in iterator:
+                    for ret in windows.add(item):
+                        yield ret
+            elif self.size is not None or self._get_timestamp:
+                async for item in iterator:
+                    for ret in windows.add(item):
+                        yield ret
+            else:
+                # Windows of arrival time are closed also when no item arrives
+                while True:
+                    if next_item is None:
+                        next_item = asyncio.ensure_future(anext(iterator))
+                    close_at = windows.next_end()
+                    timeout = max(close_at - time.time(), 0) if close_at is not None else None
+                    done, _ = await asyncio.wait({next_item}, timeout=timeout)
+                    if done:
+                        try:
+                            item = next_item.result()
+                        except StopAsyncIteration:
+                            break
+                        finally:
+                            next_item = None
+                        for ret in windows.add(item):
+                            yield ret
+                    for ret in windows.close_until(time.time()):
+                        yield ret
+            for ret in windows.close_all():
+                yield ret
+        finally:
+            if next_item is not None:
+                next_item.cancel()
+                await asyncio.gather(next_item, return_exceptions=True)
+            await close_iterator(iterator)
+
+
+class _Windows:
+    """Open windows of one run of `WindowProcessor`."""
+
+    def __init__(self, p: WindowProcessor):
+        self.p = p
+        self.is_count = p.size is not None
+        self.length = p.size if self.is_count else p.duration
+        self.step = p.slide or self.length
+        self.states: Dict[Any, _WindowState] = {}
+        self.heap: List[Tuple[float, int, Any]] = []
+        self.seq = 0
+        self.counters: Dict[Any, int] = {}
+        """Position of the next item of the key (count windows)"""
+        self.idle_keys: Dict[Any, None] = {}
+        """Keys with a counter and without open windows, the oldest first"""
+        self.open_per_key: Dict[Any, int] = {}
+        self.sessions: Dict[Any, Any] = {}
+        self.watermark = -math.inf
+        self.late = 0
+
+    def add(self, item: Any) -> List[Any]:
+        p = self.p
+        key = p._get_key(item) if p._get_key else None
+        if self.is_count:
+            pos = self.counters.get(key, 0)
+            self.counters[key] = pos + 1
+        elif p._get_timestamp:
+            pos = p._get_timestamp(item)
+            if isinstance(pos, datetime):
+                pos = pos.timestamp()
+        else:
+            pos = time.time()
+
+        states = self._session_state(key, pos) if p.gap else self._window_states(key, pos)
+        for state in states:
+            if state.count == 0:
+                state.value = p.init_window(key, item)
+            state.value = p.aggregate(state.value, key, item) or state.value
+            state.count += 1
+
+        if self.is_count:
+            closed = self._close_count_window(key, pos + 1)
+        else:
+            if p._get_timestamp:
+                self.watermark = max(self.watermark, pos - p.allowed_lateness)
+            closed = self.close_until(self.watermark if p._get_timestamp else pos)
+        if len(self.states) > p.max_windows:
+            closed.extend(self._close_oldest(len(self.states) - p.max_windows))
+        while len(self.idle_keys) > p.max_windows:
+            # Counters of keys without open windows are limited too, the dropped key is counted from 0 again
+            idle_key = next(iter(self.idle_keys))
+            del self.idle_keys[idle_key]
+            del self.counters[idle_key]
+        return closed
+
+    def _window_states(self, key: Any, pos: float) -> List[_WindowState]:
+        states = []
+        start = pos // self.step * self.step
+        while start > pos - self.length:
+            end = start + self.length
+            if not self.is_count and end <= self.watermark:
+                # The window was already closed
+                self.late += 1
+                self.p._log.debug("%s: late item (%s) dropped from window %s", self.p.name, pos, start)
+            elif start >= 0 or not self.is_count:
+                states.append(self._get_state((key, start), key, start, end))
+            start -= self.step
+        return states
+
+    def _session_state(self, key: Any, pos: float) -> List[_WindowState]:
+        wid = self.sessions.get(key)
+        state = self.states.get(wid) if wid is not None else None
+        if state is None or pos >= state.end:
+            if pos + self.p.gap <= self.watermark:
+                self.late += 1
+                return []
+            self.seq += 1
+            wid = (key, "session", self.seq)
+            self.sessions[key] = wid
+            return [self._get_state(wid, key, pos, pos + self.p.gap)]
+        state.start = min(state.start, pos)
+        if pos + self.p.gap > state.end:
+            state.end = pos + self.p.gap
+            self._push(state.end, wid)
+        return [state]
+
+    def _get_state(self, wid: Any, key: Any, start: float, end: float) -> _WindowState:
+        state = self.states.get(wid)
+        if state is None:
+            state = self.states[wid] = _WindowState(key, start, end)
+            self.open_per_key[key] = self.open_per_key.get(key, 0) + 1
+            if self.is_count:
+                self.idle_keys.pop(key, None)
+            else:
+                self._push(end, wid)
+        return state
+
+    def _push(self, end: float, wid: Any) -> None:
+        self.seq += 1
+        heapq.heappush(self.heap, (end, self.seq, wid))
+
+    def next_end(self) -> Optional[float]:
+        """Returns the end of the window closed as the first one."""
+        while self.heap:
+            end, _, wid = self.heap[0]
+            state = self.states.get(wid)
+            if state is not None and state.end == end:
+                return end
+            heapq.heappop(self.heap)
+        return None
+
+    def close_until(self, watermark: float) -> List[Any]:
+        """Closes windows which end before the watermark."""
+        closed = []
+        while (end := self.next_end()) is not None and end <= watermark:
+            _, _, wid = heapq.heappop(self.heap)
+            closed.append(self._close(wid))
+        return closed
+
+    def _close_count_window(self, key: Any, pos: int) -> List[Any]:
+        """Closes the count window of the key which ends at the position."""
+        wid = (key, pos - self.length)
+        return [self._close(wid)] if wid in self.states else []
+
+    def _close_oldest(self, n: int) -> List[Any]:
+        self.p._log.warning("%s: more than %d open windows, the oldest is closed", self.p.name, self.p.max_windows)
+        if self.is_count:
+            # Count windows are not in the heap, the oldest one is the first created
+            return [self._close(wid) for wid in list(self.states)[:n]]
+        closed = []
+        while n > 0 and self.next_end() is not None:
+            _, _, wid = heapq.heappop(self.heap)
+            closed.append(self._close(wid))
+            n -= 1
+        return closed
+
+    def close_all(self) -> List[Any]:
+        """Closes all windows (the end of the stream)."""
+        if self.is_count:
+            closed = [self._close(wid) for wid in list(self.states)]
+        else:
+            closed = []
+            while self.next_end() is not None:
+                _, _, wid = heapq.heappop(self.heap)
+                closed.append(self._close(wid))
+        if self.late:
+            self.p._log.info("%s: %d late items dropped", self.p.name, self.late)
+        return closed
+
+    def _close(self, wid: Any) -> Any:
+        state = self.states.pop(wid)
+        key = state.key
+        self.open_per_key[key] -= 1
+        if self.open_per_key[key] == 0:
+            del self.open_per_key[key]
+            if self.is_count:
+                self.idle_keys[key] = None
+            if self.sessions.get(key) == wid:
+                del self.sessions[key]
+        if self.p.finalize is None:
+            return state.value
+        return self.p.finalize(
+            Window(key=key, start=state.start, end=state.end, count=state.count, value=state.value)
+        )
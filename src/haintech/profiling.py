@@ -0,0 +1,224 @@
+import asyncio
+import cProfile
+import io
+import logging
+import pstats
+import random
+import sys
+import threading
+import time
+import traceback
+import tracemalloc
+from typing import Awaitable, Dict, List, Optional
+
+from pydantic import BaseModel
+
+
+class StallReport(BaseModel):
+    """Event loop was blocked longer than the threshold."""
+
+    duration_ms: float
+    scope: Optional[str] = None
+    """Processor or tool running when the stall was detected"""
+    stack: List[str] = []
+    """The top of the event loop thread stack"""
+
+
+class Profiler:
+    """Opt-in profiler for pipelines and agents.
+
+    * a sample of items (`sample_rate`) is processed under cProfile
+      and statistics are collected per scope (processor or tool name),
+    * if `memory` is set, top allocators of sampled items are collected
+      per scope with tracemalloc,
+    * if `stall_threshold_ms` is set, event loop stalls are reported together
+      with the scope and the stack of blocking code.
+
+    Only one item is sampled at a time. Other tasks running
+    while it awaits are included in its statistics.
+    """
+
+    _log = logging.getLogger(__name__)
+
+    def __init__(
+        self,
+        sample_rate: float = 0.01,
+        cpu: bool = True,
+        memory: bool = False,
+        stall_threshold_ms: Optional[float] = 100,
+        top: int = 10,
+    ):
+        """Opt-in profiler for pipelines and agents.
+
+        Args:
+            sample_rate: Fraction of items (0.0 - 1.0) which are profiled.
+            cpu: If True, sampled items are profiled with cProfile.
+            memory: If True, allocations of sampled items are traced with tracemalloc.
+            stall_threshold_ms: Event loop blocked longer is reported (None disables detection).
+            top: Number of functions / allocation lines in the report.
+        """
+        self.sample_rate = sample_rate
+        self.cpu = cpu
+        self.memory = memory
+        self.stall_threshold_ms = stall_threshold_ms
+        self.top = top
+        self.cpu_stats: Dict[str, pstats.Stats] = {}
+        self.memory_stats: Dict[str, Dict[str, int]] = {}
+        self.sampled: Dict[str, int] = {}
+        self.stalls: List[StallReport] = []
+        self._sampling = False
+        self._task_scopes: Dict[asyncio.Task, str] = {}
+        self._started = 0
+        self._started_tracemalloc = False
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._loop_thread_id: Optional[int] = None
+        self._heartbeat: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopped = threading.Event()
+        self._beat = 0.0
+        self._stall: Optional[StallReport] = None
+
+    def start(self) -> None:
+        """Starts stall detection and memory tracing. It is called by
+        `Pipeline.run()` and agent `get_response()`; nested calls are counted."""
+        self._started += 1
+        if self._started > 1:
+            return
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self._started_tracemalloc = True
+        if self.stall_threshold_ms:
+            self._loop = asyncio.get_running_loop()
+            self._loop_thread_id = threading.get_ident()
+            self._beat = time.monotonic()
+            self._stopped.clear()
+            self._heartbeat = self._loop.create_task(self._run_heartbeat())
+            self._watchdog = threading.Thread(target=self._run_watchdog, name="haintech-stall-watchdog", daemon=True)
+            self._watchdog.start()
+
+    def stop(self) -> None:
+        """Stops what `start()` started (when the last nested run ends)."""
+        if self._started == 0:
+            return
+        self._started -= 1
+        if self._started > 0:
+            return
+        if self._heartbeat:
+            self._heartbeat.cancel()
+            self._heartbeat = None
+        if self._watchdog:
+            self._stopped.set()
+            self._watchdog = None
+        if self._started_tracemalloc:
+            tracemalloc.stop()
+            self._started_tracemalloc = False
+
+    async def profile[T](self, scope: str, awaitable: Awaitable[T]) -> T:
+        """Awaits the awaitable within the scope, a sample of calls is profiled.
+
+        Args:
+            scope: Name of the processor or tool.
+            awaitable: Processing of the item.
+        """
+        task = asyncio.current_task()
+        prev_scope = self._task_scopes.get(task)
+        self._task_scopes[task] = scope
+        try:
+            if self._sampling or self.sample_rate <= 0 or random.random() >= self.sample_rate:
+                return await awaitable
+            return await self._profile_sample(scope, awaitable)
+        finally:
+            if prev_scope is None:
+                self._task_scopes.pop(task, None)
+            else:
+                self._task_scopes[task] = prev_scope
+
+    async def _profile_sample[T](self, scope: str, awaitable: Awaitable[T]) -> T:
+        self._sampling = True
+        profile = cProfile.Profile() if self.cpu else None
+        snapshot = tracemalloc.take_snapshot() if self.memory and tracemalloc.is_tracing() else None
+        try:
+            if profile:
+                profile.enable()
+            return await awaitable
+        finally:
+            if profile:
+                profile.disable()
+                if scope in self.cpu_stats:
+                    self.cpu_stats[scope].add(profile)
+                else:
+                    self.cpu_stats[scope] = pstats.Stats(profile)
+            if snapshot:
+                self._add_allocations(scope, snapshot)
+            self.sampled[scope] = self.sampled.get(scope, 0) + 1
+            self._sampling = False
+
+    def _add_allocations(self, scope: str, before: tracemalloc.Snapshot) -> None:
+        after = tracemalloc.take_snapshot().filter_traces(
+            (tracemalloc.Filter(False, tracemalloc.__file__), tracemalloc.Filter(False, __file__))
+        )
+        allocations = self.memory_stats.setdefault(scope, {})
+        for diff in after.compare_to(before, "lineno")[: self.top * 3]:
+            if diff.size_diff <= 0:
+                continue
+            frame = diff.traceback[0]
+            line = f"{frame.filename}:{frame.lineno}"
+            allocations[line] = allocations.get(line, 0) + diff.size_diff
+
+    async def _run_heartbeat(self) -> None:
+        interval = self.stall_threshold_ms / 2000
+        while True:
+            now = time.monotonic()
+            lag_ms = (now - self._beat - interval) * 1000
+            if self._stall:
+                self._stall.duration_ms = max(self._stall.duration_ms, lag_ms)
+                self._log.warning(
+                    "Event loop blocked for %.0f ms by %s:\n%s",
+                    self._stall.duration_ms,
+                    self._stall.scope,
+                    "".join(self._stall.stack),
+                )
+                self._stall = None
+            self._beat = now
+            await asyncio.sleep(interval)
+
+    def _run_watchdog(self) -> None:
+        interval = self.stall_threshold_ms / 2000
+        threshold = self.stall_threshold_ms / 1000
+        reported_beat = None
+        while not self._stopped.wait(interval / 2):
+            beat = self._beat
+            elapsed = time.monotonic() - beat - interval
+            if elapsed > threshold and beat != reported_beat:
+                reported_beat = beat
+                self._stall = self._capture_stall(elapsed * 1000)
+                self.stalls.append(self._stall)
+
+    def _capture_stall(self, duration_ms: float) -> StallReport:
+        scope = None
+        try:
+            task = asyncio.current_task(self._loop)
+            scope = self._task_scopes.get(task) if task else None
+        except RuntimeError:
+            pass
+        frame = sys._current_frames().get(self._loop_thread_id)
+        stack = traceback.format_stack(frame)[-self.top :] if frame else []
+        return StallReport(duration_ms=duration_ms, scope=scope, stack=stack)
+
+    def report(self) -> str:
+        """Returns text report with CPU, memory and stall statistics."""
+        out = io.StringIO()
+        for scope, stats in self.cpu_stats.items():
+            out.write(f"=== CPU {scope} ({self.sampled.get(scope, 0)} sampled) ===\n")
+            stats.stream = out
+            stats.sort_stats(pstats.SortKey.CUMULATIVE).print_stats(self.top)
+        for scope, allocations in self.memory_stats.items():
+            out.write(f"=== Memory {scope} ({self.sampled.get(scope, 0)} sampled) ===\n")
+            for line, size in sorted(allocations.items(), key=lambda x: -x[1])[: self.top]:
+                out.write(f"{size / 1024:10.1f} KiB  {line}\n")
+        if self.stalls:
+            out.write(f"=== Event loop stalls ({len(self.stalls)}) ===\n")
+            for stall in self.stalls:
+                out.write(f"{stall.duration_ms:.0f} ms in {stall.scope}\n")
+                out.write("".join(stall.stack[-3:]))
+        return out.getvalue()
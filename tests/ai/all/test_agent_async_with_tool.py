@@ -102,3 +102,45 @@ async def test_agent_without_acceptance(ai_model: BaseAIModel, session):
     content = response.content.replace("’", "'")    # normalize apostrophes for consistent matching
     print(content)
     assert any(msg in content for msg in refusal_messages)
+
+
+@pytest.mark.asyncio
+async def test_agent_stream_with_tools(ai_model: BaseAIModel):
+    # Given: An agent with session and tools
+    session = AIChatSession()
+    ai_agent = HRAgent(ai_model=ai_model, session=session)
+    # When: I ask agent for a streamed answer which needs both tools
+    chunks = [
+        chunk
+        async for chunk in ai_agent.get_text_response_stream(
+            "How many vacation days and home office days do I have left in 2025?"
+        )
+    ]
+    # Then: I should get answer streamed in chunks
+    response = "".join(chunks)
+    assert "26" in response
+    assert "4" in response
+    # And: Tool results follow the response with tool calls in the history
+    roles = [m.role for m in ai_agent.history]
+    assert roles[0] == "user"
+    assert roles[-1] == "assistant"
+    first_tool = roles.index("tool")
+    assert ai_agent.history[first_tool - 1].tool_calls
+
+
+@pytest.mark.asyncio
+async def test_agent_accept_many_tools(ai_model: BaseAIModel, session):
+    # Given: An agent with session and tools
+    ai_agent = HRAgent(ai_model=ai_model, session=session)
+    # When: I ask agent a question which needs both tools
+    response = await ai_agent.get_response("How many vacation days and home office days do I have left in 2025?")
+    assert response.tool_calls and len(response.tool_calls) == 2
+    # And: I accept all tool calls (they are called concurrently)
+    response = await ai_agent.accept_tools([tc.id for tc in response.tool_calls if tc.id])
+    # Then: Tool messages are in the order of tool calls
+    tool_call_ids = [tc.id for tc in ai_agent.history[-4].tool_calls or []]
+    assert [m.tool_call_id for m in ai_agent.history[-3:-1]] == tool_call_ids
+    # And: I should get answer
+    assert response.content
+    assert "26" in response.content
+    assert "4" in response.content
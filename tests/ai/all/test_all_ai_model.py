@@ -1,10 +1,13 @@
 import json
 from haintech.ai import (
     AIChatResponse,
+    AIContext,
+    AIModelInteraction,
     AIModelInteractionMessage,
     AIPrompt,
     BaseAIModel,
 )
+from haintech.ai.cache import get_prompt_cache_stats
 
 
 def test_get_chat_response(ai_model: BaseAIModel):
@@ -49,4 +52,70 @@ def test_get_chat_response_json(ai_model: BaseAIModel):
     assert isinstance(resp, AIChatResponse)
     assert resp.content
     r = json.loads(resp.content)
-    assert "Monday" in r["answer"]
\ No newline at end of file
+    assert "Monday" in r["answer"]
+
+
+def test_get_chat_response_stream(ai_model: BaseAIModel):
+    # Given: An AI Model and an interaction logger
+    interactions: list[AIModelInteraction] = []
+    # When: I get response from chat as a stream
+    deltas = list(
+        ai_model.get_chat_response_stream(
+            history=[AIModelInteractionMessage(role="user", content="The day after Sunday is?")],
+            interaction_logger=interactions.append,
+        )
+    )
+    # Then: The last delta contains the response assembled from text chunks
+    resp = deltas[-1].response
+    assert isinstance(resp, AIChatResponse)
+    assert resp.content
+    assert "Monday" in resp.content
+    assert resp.content == "".join(d.content for d in deltas if d.content)
+    # And: The response is logged
+    assert interactions and interactions[0].response == resp
+
+
+def test_get_chat_response_stream_with_tool_call(ai_model: BaseAIModel):
+    # Given: A function
+    def get_weather(city: str) -> str:
+        """Returns the current weather in the city
+
+        city: The name of the city
+        """
+        return "Sunny"
+
+    functions = {get_weather: ai_model.prepare_function_definition(get_weather)}
+    # When: I get response from chat as a stream
+    deltas = list(
+        ai_model.get_chat_response_stream(
+            message=AIModelInteractionMessage(role="user", content="What is the weather in Paris?"),
+            functions=functions,
+        )
+    )
+    # Then: The tool call is assembled from argument fragments
+    resp = deltas[-1].response
+    assert resp and resp.tool_calls
+    assert resp.tool_calls[0].function_name == "get_weather"
+    assert "Paris" in resp.tool_calls[0].arguments["city"]
+
+
+def test_get_chat_response_reports_input_tokens(ai_model: BaseAIModel):
+    # Given: A long static system prompt (above the minimal size of cached prompts)
+    system_prompt = "You are a calendar assistant. " + " ".join(
+        f"Rule {i}: answer with the name of the day only." for i in range(300)
+    )
+    responses = []
+    # When: The same prefix is sent twice with volatile context
+    for day in ["Sunday", "Monday"]:
+        responses.append(
+            ai_model.get_chat_response(
+                system_prompt=system_prompt,
+                context=AIContext(context=f"Today is {day}."),
+                message=AIModelInteractionMessage(role="user", content="What day is tomorrow?"),
+            )
+        )
+    # Then: Input tokens are reported, so prompt cache hits can be measured
+    stats = get_prompt_cache_stats(responses)
+    assert stats.requests == 2
+    assert stats.input_tokens > 0
+    assert 0 <= stats.hit_ratio <= 1
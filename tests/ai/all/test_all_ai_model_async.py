@@ -66,4 +66,22 @@ async def test_get_chat_response_with_context_documents(ai_model: BaseAIModel):
     # Then: A response is returned
     assert isinstance(resp, AIChatResponse)
     assert resp.content
-    assert "Dorothy" in resp.content
\ No newline at end of file
+    assert "Dorothy" in resp.content
+
+
+@pytest.mark.asyncio
+async def test_get_chat_response_stream(ai_model: BaseAIModel):
+    # Given: An AI Model
+    # When: I get response from chat as a stream
+    deltas = [
+        d
+        async for d in ai_model.get_chat_response_stream_async(
+            history=[AIModelInteractionMessage(role="user", content="The day after Sunday is?")]
+        )
+    ]
+    # Then: Text is streamed and the last delta contains the response
+    resp = deltas[-1].response
+    assert isinstance(resp, AIChatResponse)
+    assert resp.content
+    assert "Monday" in resp.content
+    assert resp.content == "".join(d.content for d in deltas if d.content)
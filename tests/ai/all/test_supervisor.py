@@ -3,8 +3,10 @@ import pytest
 from haintech.ai import (
     AIMultiagentSession,
     BaseAIAgent,
+    BaseAIAgentAsync,
     BaseAIModel,
     BaseAISupervisor,
+    BaseAISupervisorAsync,
 )
 from haintech.ai.google_generativeai.google_ai_model import GoogleAIModel
 from haintech.ai.open_ai.open_ai_model import OpenAIModel
@@ -157,3 +159,60 @@ def test_agent_with_different_model(ai_model: BaseAIModel, agent_ai_model: BaseA
     history = man_session.interactions[-1].interaction.history
     print(str(history))
     assert 3 == len(history)
+
+
+def _specialists(ai_model: BaseAIModel, agent_class=BaseAIAgent) -> list:
+    return [
+        agent_class(
+            ai_model=ai_model,
+            name="Historian",
+            description="Historian assistant. Answer any question about history.",
+            system_prompt="You are a helpful historian assistant.",
+        ),
+        agent_class(
+            ai_model=ai_model,
+            name="Geographer",
+            description="Geographer assistant. Answer any question about geography.",
+            system_prompt="You are a helpful geographer assistant.",
+        ),
+    ]
+
+
+def test_agents_called_concurrently(ai_model: BaseAIModel):
+    # Given: A supervisor calling agents in threads
+    man_session = AIMultiagentSession()
+    man_agent = BaseAISupervisor(
+        ai_model=ai_model,
+        system_prompt="You are a helpful assistant. Always use assistants, ask all of them at once.",
+        agents=_specialists(ai_model),
+        session=man_session,
+        max_concurrent_agents=2,
+    )
+    # When: The manager is asked for something which needs both agents
+    response = man_agent.get_text_response("Who was the first US president and what is the capital of France?")
+    # Then: The answer is correct
+    assert "George" in response
+    assert "Paris" in response
+    # And: Interactions of agents are in the session in the order of agent calls
+    tool_calls = man_session.interactions[0].interaction.response.tool_calls
+    agent_names = [tc.function_name.removeprefix("Agent__") for tc in tool_calls]
+    assert [i.agent_name for i in man_session.interactions[1:-1]] == agent_names
+
+
+@pytest.mark.asyncio
+async def test_async_supervisor(ai_model: BaseAIModel):
+    # Given: An async supervisor with two agents
+    man_session = AIMultiagentSession()
+    man_agent = BaseAISupervisorAsync(
+        ai_model=ai_model,
+        system_prompt="You are a helpful assistant. Always use assistants, ask all of them at once.",
+        agents=_specialists(ai_model, BaseAIAgentAsync),
+        session=man_session,
+    )
+    # When: The manager is asked for something which needs both agents
+    response = await man_agent.get_text_response("Who was the first US president and what is the capital of France?")
+    # Then: The answer is correct
+    assert "George" in response
+    assert "Paris" in response
+    # And: The last interaction is the manager's one
+    assert man_session.interactions[-1].agent_name is None
@@ -0,0 +1,121 @@
+import json
+from types import SimpleNamespace
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+import pytest
+from anthropic.types.messages import MessageBatch, MessageBatchIndividualResponse
+
+from haintech.ai.anthropic import AnthropicAIModel
+from haintech.ai.anthropic.anthropic_batch_backend import AnthropicBatchBackend
+from haintech.ai.batch import BatchJob, BatchRequest
+
+
+def create_batch(processing_status: str, counts: Dict[str, int], **kwargs) -> MessageBatch:
+    """Returns the message batch as it is returned by the API."""
+    return MessageBatch.model_validate(
+        {
+            "id": "msgbatch_1",
+            "type": "message_batch",
+            "created_at": "2025-01-01T00:00:00Z",
+            "expires_at": "2025-01-02T00:00:00Z",
+            "processing_status": processing_status,
+            "request_counts": {"processing": 0, "succeeded": 0, "errored": 0, "canceled": 0, "expired": 0} | counts,
+            **kwargs,
+        }
+    )
+
+
+# Results file of the batch (JSONL)
+RESULTS = """\
+{"custom_id": "france", "result": {"type": "succeeded", "message": {"id": "msg_1", "type": "message", "role": "assistant", "model": "claude-sonnet-4-20250514", "content": [{"type": "text", "text": "Paris"}], "stop_reason": "end_turn", "stop_sequence": null, "usage": {"input_tokens": 12, "output_tokens": 1, "cache_read_input_tokens": 0, "cache_creation_input_tokens": 0}}}}
+{"custom_id": "germany", "result": {"type": "errored", "error": {"type": "error", "error": {"type": "invalid_request_error", "message": "Invalid model"}}}}
+{"custom_id": "italy", "result": {"type": "expired"}}
+"""  # noqa: E501
+
+
+class FakeBatches:
+    def __init__(self, batch: MessageBatch):
+        self.batch = batch
+        self.created: Optional[List[Dict[str, Any]]] = None
+
+    async def create(self, requests: List[Dict[str, Any]]) -> MessageBatch:
+        self.created = requests
+        return self.batch
+
+    async def retrieve(self, batch_id: str) -> MessageBatch:
+        return self.batch
+
+    async def cancel(self, batch_id: str) -> MessageBatch:
+        return self.batch
+
+    async def results(self, batch_id: str) -> AsyncIterator[MessageBatchIndividualResponse]:
+        async def iterate():
+            for line in RESULTS.splitlines():
+                yield MessageBatchIndividualResponse.model_validate(json.loads(line))
+
+        return iterate()
+
+
+def create_backend(batch: MessageBatch, ai_model: Optional[AnthropicAIModel] = None) -> AnthropicBatchBackend:
+    backend = AnthropicBatchBackend(ai_model or AnthropicAIModel())
+    backend.client = SimpleNamespace(messages=SimpleNamespace(batches=FakeBatches(batch)))  # type: ignore
+    return backend
+
+
+async def test_submit():
+    # Given: Backend of the model without prompt caching
+    backend = create_backend(create_batch("in_progress", {"processing": 2}), AnthropicAIModel(prompt_caching=False))
+    # When: Requests with and without system prompt are submitted
+    job = await backend.submit(
+        [
+            BatchRequest(custom_id="france", message="What is the capital of France?"),
+            BatchRequest(custom_id="json", system_prompt="Answer in JSON", message="Capital?", response_format="json"),
+        ]
+    )
+    # Then: Not given parameters are removed
+    created = backend.client.messages.batches.created  # type: ignore
+    assert [r["custom_id"] for r in created] == ["france", "json"]
+    assert "system" not in created[0]["params"]
+    assert created[1]["params"]["system"] == "Answer in JSON"
+    assert created[0]["params"]["max_tokens"] == 1000
+    # And: The job is in progress
+    assert job.id == "msgbatch_1" and job.status == "in_progress" and job.total == 2
+
+
+async def test_results():
+    # Given: Ended batch with a succeeded, an errored and an expired request
+    backend = create_backend(create_batch("ended", {"succeeded": 1, "errored": 1, "expired": 1}))
+    # When: Results are read
+    results = await backend.get_results(BatchJob(id="msgbatch_1"))
+    # Then: The message is parsed and other requests are returned as errors
+    assert [r.custom_id for r in results] == ["france", "germany", "italy"]
+    assert results[0].response and results[0].response.content == "Paris"
+    assert results[0].response.input_tokens == 12 and results[0].response.output_tokens == 1
+    assert results[1].error == "Invalid model"
+    assert results[2].error == "Request expired"
+
+
+@pytest.mark.parametrize(
+    "processing_status,counts,cancel_initiated_at,expected",
+    [
+        ("in_progress", {"processing": 3}, None, "in_progress"),
+        ("canceling", {"processing": 3}, "2025-01-01T01:00:00Z", "in_progress"),
+        ("ended", {"succeeded": 2, "errored": 1}, None, "completed"),
+        ("ended", {"succeeded": 1, "canceled": 2}, "2025-01-01T01:00:00Z", "cancelled"),
+        # Expired requests take precedence over cancellation
+        ("ended", {"succeeded": 1, "canceled": 1, "expired": 1}, "2025-01-01T01:00:00Z", "expired"),
+    ],
+)
+async def test_job_status(
+    processing_status: str, counts: Dict[str, int], cancel_initiated_at: Optional[str], expected: str
+):
+    # Given: Message batch with the status of the API
+    batch = create_batch(processing_status, counts, cancel_initiated_at=cancel_initiated_at)
+    backend = create_backend(batch)
+    # When: The job is read
+    job = await backend.get_job(BatchJob(id="msgbatch_1"))
+    # Then: The status is mapped and requests which are not succeeded are counted as failed
+    assert job.status == expected
+    assert job.total == 3
+    assert job.completed == counts.get("succeeded", 0)
+    assert job.failed == counts.get("errored", 0) + counts.get("canceled", 0) + counts.get("expired", 0)
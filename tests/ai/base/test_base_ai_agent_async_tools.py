@@ -0,0 +1,176 @@
+import asyncio
+import threading
+import time
+
+import pytest
+
+from haintech.ai.base import BaseAIAgentAsync
+from haintech.ai.google_genai import GoogleAIModel
+from haintech.ai.model import AIChatResponse, AIModelToolCall
+from haintech.testing.mocker_ai_model import MockerAIModel, mocker_ai_model  # noqa: F401
+
+
+def tool_calls(name: str, count: int) -> AIChatResponse:
+    return AIChatResponse(
+        tool_calls=[AIModelToolCall(id=str(i), function_name=name, arguments={"i": i}) for i in range(count)]
+    )
+
+
+def tool_results(agent: BaseAIAgentAsync) -> list:
+    return [m.content for m in agent.iter_messages() if m.role == "tool"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_tools_are_limited(mocker_ai_model: MockerAIModel):
+    # Given: Agent with async tool and at most 2 tools called concurrently
+    running = 0
+    max_running = 0
+
+    async def slow_tool(i: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        await asyncio.sleep(0.02)
+        running -= 1
+        return i
+
+    agent = BaseAIAgentAsync(GoogleAIModel("gemini-2.5-flash-lite"), functions=[slow_tool], max_concurrent_tools=2)
+    # And: Model which calls the tool 5 times
+    mocker_ai_model.add(tool_calls("slow_tool", 5))
+    mocker_ai_model.add("Done")
+    # When: The response is requested
+    ret = await agent.get_text_response("Call tools")
+    # Then: Tools are called concurrently up to the limit
+    assert ret == "Done"
+    assert max_running == 2
+    # And: Results are added in the order of tool calls
+    assert tool_results(agent) == ["0", "1", "2", "3", "4"]
+
+
+@pytest.mark.asyncio
+async def test_tool_timeout(mocker_ai_model: MockerAIModel):
+    # Given: Agent with a tool slower than the timeout
+    async def slow_tool(i: int) -> int:
+        await asyncio.sleep(1)
+        return i
+
+    agent = BaseAIAgentAsync(GoogleAIModel("gemini-2.5-flash-lite"), functions=[slow_tool], tool_timeout=0.05)
+    mocker_ai_model.add(tool_calls("slow_tool", 1))
+    mocker_ai_model.add("Done")
+    # When: The response is requested
+    await agent.get_text_response("Call tools")
+    # Then: The timeout is returned as the tool result
+    assert tool_results(agent) == ["Error calling function: timeout after 0.05 s"]
+
+
+@pytest.mark.asyncio
+async def test_sync_tools_run_in_threads(mocker_ai_model: MockerAIModel):
+    # Given: Agent with a blocking sync tool
+    threads = set()
+
+    def blocking_tool(i: int) -> int:
+        threads.add(threading.get_ident())
+        time.sleep(0.1)
+        return i
+
+    agent = BaseAIAgentAsync(GoogleAIModel("gemini-2.5-flash-lite"), functions=[blocking_tool])
+    mocker_ai_model.add(tool_calls("blocking_tool", 3))
+    mocker_ai_model.add("Done")
+    # When: The response is requested
+    start = time.perf_counter()
+    await agent.get_text_response("Call tools")
+    # Then: Sync tools run concurrently in threads other than the event loop thread
+    assert time.perf_counter() - start < 0.25
+    assert len(threads) == 3 and threading.get_ident() not in threads
+    assert tool_results(agent) == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_unknown_tool_is_an_error_result(mocker_ai_model: MockerAIModel):
+    # Given: Agent with one tool
+    async def known_tool(i: int) -> int:
+        return i
+
+    agent = BaseAIAgentAsync(GoogleAIModel("gemini-2.5-flash-lite"), functions=[known_tool])
+    # And: Model which calls the known and an unknown tool
+    mocker_ai_model.add(
+        AIChatResponse(
+            tool_calls=[
+                AIModelToolCall(id="1", function_name="known_tool", arguments={"i": 1}),
+                AIModelToolCall(id="2", function_name="unknown_tool", arguments={}),
+            ]
+        )
+    )
+    mocker_ai_model.add("Done")
+    # When: The response is requested
+    ret = await agent.get_text_response("Call tools")
+    # Then: The known tool result is kept and the unknown tool is reported to the model
+    assert ret == "Done"
+    assert tool_results(agent) == ["1", "Error calling function: function unknown_tool not found"]
+
+
+@pytest.mark.asyncio
+async def test_accept_tools_calls_call_function(mocker_ai_model: MockerAIModel):
+    # Given: Agent which overrides call_function
+    async def tool(i: int) -> int:
+        return i
+
+    class LoggingAgent(BaseAIAgentAsync):
+        called = []
+
+        async def call_function(self, tool_call_id: str, name: str, **arguments):
+            self.called.append(tool_call_id)
+            return await super().call_function(tool_call_id, name, **arguments)
+
+    agent = LoggingAgent(GoogleAIModel("gemini-2.5-flash-lite"), functions=[tool])
+    mocker_ai_model.add(tool_calls("tool", 3))
+    response = await agent.get_response("Call tools")
+    mocker_ai_model.add("Done")
+    # When: Tool calls are accepted
+    await agent.accept_tools([tc.id for tc in response.tool_calls or [] if tc.id])
+    # Then: Tools are called by call_function and results are added once in the order of tool calls
+    assert sorted(agent.called) == ["0", "1", "2"]
+    assert tool_results(agent) == ["0", "1", "2"]
+
+
+@pytest.mark.asyncio
+async def test_sync_tool_keeps_slot_after_timeout(mocker_ai_model: MockerAIModel):
+    # Given: Agent with one tool slot and a sync tool slower than the timeout
+    running = 0
+    max_running = 0
+
+    def blocking_tool(i: int) -> int:
+        nonlocal running, max_running
+        running += 1
+        max_running = max(max_running, running)
+        time.sleep(0.1)
+        running -= 1
+        return i
+
+    agent = BaseAIAgentAsync(
+        GoogleAIModel("gemini-2.5-flash-lite"), functions=[blocking_tool], max_concurrent_tools=1, tool_timeout=0.05
+    )
+    mocker_ai_model.add(tool_calls("blocking_tool", 2))
+    mocker_ai_model.add("Done")
+    # When: The response is requested
+    await agent.get_text_response("Call tools")
+    # Then: The thread of the timed out tool keeps the slot, so tools never run at once
+    assert max_running == 1
+    assert tool_results(agent)[0] == "Error calling function: timeout after 0.05 s"
+
+
+def test_agent_used_by_many_event_loops(mocker_ai_model: MockerAIModel):
+    # Given: Agent with limited concurrent tools
+    async def slow_tool(i: int) -> int:
+        await asyncio.sleep(0.01)
+        return i
+
+    agent = BaseAIAgentAsync(GoogleAIModel("gemini-2.5-flash-lite"), functions=[slow_tool], max_concurrent_tools=2)
+    for _ in range(2):
+        mocker_ai_model.add(tool_calls("slow_tool", 3))
+        mocker_ai_model.add("Done")
+        # When: The agent is used by separate asyncio.run calls
+        ret = asyncio.run(agent.get_text_response("Call tools"))
+        # Then: Tools are called in each event loop
+        assert ret == "Done"
+    assert tool_results(agent) == ["0", "1", "2", "0", "1", "2"]
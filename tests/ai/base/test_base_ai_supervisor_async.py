@@ -0,0 +1,85 @@
+import asyncio
+from typing import Optional
+
+import pytest
+
+from haintech.ai.base import BaseAIAgentAsync
+from haintech.ai.base.base_ai_supervisor_async import BaseAISupervisorAsync
+from haintech.ai.google_genai import GoogleAIModel
+from haintech.ai.model import AIChatResponse, AIModelInteractionMessage, AIModelToolCall, AIMultiagentSession
+from haintech.testing.mocker_ai_model import MockerAIModel, mocker_ai_model  # noqa: F401
+
+
+class SlowAgent(BaseAIAgentAsync):
+    """Agent which responds later than other agents"""
+
+    async def get_response(self, message: Optional[AIModelInteractionMessage | str] = None) -> AIChatResponse:
+        await asyncio.sleep(0.05)
+        return await super().get_response(message)
+
+
+def tool_call(id: str, name: str, **arguments) -> AIModelToolCall:
+    return AIModelToolCall(id=id, function_name=name, arguments=arguments)
+
+
+def get_date() -> str:
+    return "753 BC"
+
+
+def get_map() -> str:
+    return "Italy"
+
+
+@pytest.mark.asyncio
+async def test_agents_requiring_tools(mocker_ai_model: MockerAIModel):
+    # Given: Supervisor with a slow historian and a geographer
+    ai_model = GoogleAIModel("gemini-2.5-flash-lite")
+    session = AIMultiagentSession()
+    historian = SlowAgent(ai_model, name="Historian", functions=[get_date])
+    geographer = BaseAIAgentAsync(ai_model, name="Geographer", functions=[get_map])
+    supervisor = BaseAISupervisorAsync(ai_model, agents=[historian, geographer], session=session)
+    # And: Model which calls both agents and agents which call their tools (with the same tool call id)
+    mocker_ai_model.add(
+        AIChatResponse(
+            tool_calls=[
+                tool_call("1", "Agent__Historian", message="When was Rome founded?"),
+                tool_call("2", "Agent__Geographer", message="Where is Rome?"),
+            ]
+        )
+    )
+    mocker_ai_model.add(AIChatResponse(tool_calls=[tool_call("1", "get_map")]), message="Where is Rome?")
+    mocker_ai_model.add(AIChatResponse(tool_calls=[tool_call("1", "get_date")]), message="When was Rome founded?")
+    response = await supervisor.get_response("Tell me about Rome")
+    # When: Agent calls are accepted
+    response = await supervisor.accept_tools([tc.id for tc in response.tool_calls or [] if tc.id])
+    # Then: Tool calls of agents are merged (in the order of agent calls) with ids prefixed with agent names
+    assert [(tc.id, tc.function_name) for tc in response.tool_calls or []] == [
+        ("Historian__1", "get_date"),
+        ("Geographer__1", "get_map"),
+    ]
+    assert supervisor.agent_tool_calls == {"1": ["Historian__1"], "2": ["Geographer__1"]}
+    # And: Interactions are merged in the order of agent calls (the historian responded later)
+    assert [i.agent_name for i in session.interactions] == [None, "Historian", "Geographer"]
+
+    # Given: Agents which answer with results of their tools
+    mocker_ai_model.add("Rome is in Italy", tool_result="Italy")
+    mocker_ai_model.add("Rome was founded in 753 BC", tool_result="753 BC")
+    mocker_ai_model.add("Rome was founded in 753 BC in Italy", tool_result="Rome is in Italy")
+    # When: Tool calls of agents are accepted
+    response = await supervisor.accept_tools([tc.id for tc in response.tool_calls or [] if tc.id])
+    # Then: Agents get their tool call ids and the supervisor answers with their results
+    assert response.content == "Rome was founded in 753 BC in Italy"
+    assert supervisor.agent_tool_calls == {}
+    assert [m.content for m in supervisor.iter_messages() if m.role == "tool"] == [
+        "Rome was founded in 753 BC",
+        "Rome is in Italy",
+    ]
+    # And: Interactions of agents are still merged in the order of agent calls
+    assert [i.agent_name for i in session.interactions] == [
+        None,
+        "Historian",
+        "Geographer",
+        "Historian",
+        "Geographer",
+        None,
+    ]
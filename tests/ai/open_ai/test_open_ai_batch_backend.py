@@ -0,0 +1,192 @@
+import json
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+import pytest
+from openai.types import Batch
+
+from haintech.ai.batch import BatchJob, BatchRequest
+from haintech.ai.open_ai import OpenAIModel, ResponsesAIModel
+from haintech.ai.open_ai.open_ai_batch_backend import OpenAIBatchBackend
+
+
+def create_batch(status: str, completed: int = 0, failed: int = 0, **kwargs) -> Batch:
+    """Returns the batch object as it is returned by the API."""
+    return Batch.model_validate(
+        {
+            "id": "batch_1",
+            "object": "batch",
+            "endpoint": "/v1/responses",
+            "completion_window": "24h",
+            "created_at": 1_700_000_000,
+            "input_file_id": "file-input",
+            "status": status,
+            "request_counts": {"total": 3, "completed": completed, "failed": failed},
+            **kwargs,
+        }
+    )
+
+
+class FakeFiles:
+    def __init__(self, contents: Dict[str, str]):
+        self.contents = contents
+        self.uploaded: List[bytes] = []
+
+    async def create(self, file: Any, purpose: str) -> Any:
+        self.uploaded.append(file[1])
+        return SimpleNamespace(id="file-input")
+
+    async def content(self, file_id: str) -> Any:
+        return SimpleNamespace(text=self.contents[file_id])
+
+
+class FakeBatches:
+    def __init__(self, batch: Batch):
+        self.batch = batch
+        self.created: Optional[Dict[str, Any]] = None
+
+    async def create(self, **kwargs) -> Batch:
+        self.created = kwargs
+        return self.batch
+
+    async def retrieve(self, batch_id: str) -> Batch:
+        return self.batch
+
+    async def cancel(self, batch_id: str) -> Batch:
+        return self.batch
+
+
+def create_backend(ai_model: ResponsesAIModel | OpenAIModel, batch: Batch, contents: Dict[str, str] = {}):
+    backend = OpenAIBatchBackend(ai_model)
+    backend.client = SimpleNamespace(files=FakeFiles(contents), batches=FakeBatches(batch))  # type: ignore
+    return backend
+
+
+def to_jsonl(*lines: Dict[str, Any]) -> str:
+    return "\n".join(json.dumps(line) for line in lines) + "\n"
+
+
+RESPONSE_BODY = {
+    "id": "resp_1",
+    "object": "response",
+    "created_at": 1_700_000_000,
+    "model": "gpt-5.4-nano",
+    "status": "completed",
+    "output": [
+        {
+            "type": "message",
+            "id": "msg_1",
+            "role": "assistant",
+            "status": "completed",
+            "content": [{"type": "output_text", "text": "Paris", "annotations": []}],
+        }
+    ],
+    "usage": {
+        "input_tokens": 12,
+        "input_tokens_details": {"cached_tokens": 0},
+        "output_tokens": 1,
+        "output_tokens_details": {"reasoning_tokens": 0},
+        "total_tokens": 13,
+    },
+    "parallel_tool_calls": True,
+    "tool_choice": "auto",
+    "tools": [],
+}
+
+
+async def test_submit():
+    # Given: Backend of the model with extended prompt cache retention
+    ai_model = ResponsesAIModel(prompt_cache_key="capitals", prompt_cache_retention="24h")
+    backend = create_backend(ai_model, create_batch("validating"))
+    # When: A request is submitted
+    job = await backend.submit([BatchRequest(custom_id="france", message="What is the capital of France?")])
+    # Then: Extra body is merged into the body and not given parameters are removed
+    line = json.loads(backend.client.files.uploaded[0])  # type: ignore
+    assert line["custom_id"] == "france" and line["url"] == "/v1/responses"
+    body = line["body"]
+    assert body["prompt_cache_key"] == "capitals" and body["prompt_cache_retention"] == "24h"
+    assert "extra_body" not in body and "tools" not in body and "text" not in body
+    assert body["model"] == "gpt-5.4-nano"
+    # And: The batch is created from the uploaded file
+    assert backend.client.batches.created["input_file_id"] == "file-input"  # type: ignore
+    # And: Validating batch is in progress
+    assert job.id == "batch_1" and job.status == "in_progress" and job.total == 3
+
+
+async def test_results_of_output_and_error_files():
+    # Given: Output file with a response and a rejected request and error file with an expired request
+    output = to_jsonl(
+        {"id": "1", "custom_id": "france", "response": {"status_code": 200, "body": RESPONSE_BODY}, "error": None},
+        {
+            "id": "2",
+            "custom_id": "germany",
+            "response": {"status_code": 400, "body": {"error": {"message": "Invalid model", "type": "invalid"}}},
+            "error": None,
+        },
+    )
+    errors = to_jsonl(
+        {
+            "id": "3",
+            "custom_id": "italy",
+            "response": None,
+            "error": {"code": "batch_expired", "message": "The request expired"},
+        }
+    )
+    batch = create_batch("completed", 1, 2, output_file_id="file-output", error_file_id="file-error")
+    backend = create_backend(ResponsesAIModel(), batch, {"file-output": output, "file-error": errors})
+    job = await backend.get_job(BatchJob(id="batch_1"))
+    # When: Results are read
+    results = await backend.get_results(job)
+    # Then: The response is parsed and failed requests are returned as errors
+    assert [r.custom_id for r in results] == ["france", "germany", "italy"]
+    assert results[0].response and results[0].response.content == "Paris"
+    assert results[0].response.input_tokens == 12 and results[0].response.output_tokens == 1
+    assert results[1].error == "Invalid model"
+    assert results[2].error == "The request expired"
+
+
+async def test_chat_completion_result():
+    # Given: Output file of the Chat Completions API
+    body = {
+        "id": "chatcmpl-1",
+        "object": "chat.completion",
+        "created": 1_700_000_000,
+        "model": "gpt-4o-mini",
+        "choices": [
+            {
+                "index": 0,
+                "finish_reason": "stop",
+                "message": {"role": "assistant", "content": "Paris"},
+            }
+        ],
+        "usage": {"prompt_tokens": 12, "completion_tokens": 1, "total_tokens": 13},
+    }
+    output = to_jsonl({"id": "1", "custom_id": "france", "response": {"status_code": 200, "body": body}})
+    batch = create_batch("completed", 1, output_file_id="file-output")
+    backend = create_backend(OpenAIModel(), batch, {"file-output": output})
+    # When: Results are read
+    results = await backend.get_results(await backend.get_job(BatchJob(id="batch_1")))
+    # Then: The completion is parsed
+    assert results[0].response and results[0].response.content == "Paris"
+
+
+@pytest.mark.parametrize(
+    "status,expected",
+    [
+        ("in_progress", "in_progress"),
+        ("finalizing", "in_progress"),
+        ("cancelling", "in_progress"),
+        ("completed", "completed"),
+        ("failed", "failed"),
+        ("cancelled", "cancelled"),
+        ("expired", "expired"),
+    ],
+)
+async def test_job_status(status: str, expected: str):
+    # Given: Batch with the status of the API
+    backend = create_backend(ResponsesAIModel(), create_batch(status, completed=2, failed=1))
+    # When: The job is read
+    job = await backend.get_job(BatchJob(id="batch_1", total=3))
+    # Then: The status and counts are mapped
+    assert job.status == expected
+    assert (job.total, job.completed, job.failed) == (3, 2, 1)
@@ -0,0 +1,67 @@
+from pathlib import Path
+
+import pytest
+
+from haintech.ai.batch import BatchRequest, LocalBatchBackend
+from haintech.ai.google_genai import GoogleAIModel
+from haintech.ai.prompts import PromptExecutor, PromptService
+from haintech.testing import MockerAIModel
+from tests.ai.prompts.model import InfoPageCreate
+
+
+@pytest.fixture
+def prompt_executor(tmp_path: Path) -> PromptExecutor:
+    ai_model = GoogleAIModel("gemini-2.5-flash-lite")
+    return PromptExecutor(
+        ai_model,
+        PromptService(Path("./tests/data/prompts")),
+        batch_backend=LocalBatchBackend(tmp_path, ai_model=ai_model),
+    )
+
+
+async def test_execute_batch(prompt_executor: PromptExecutor, mocker_ai_model: MockerAIModel):
+    # Given: Responses to prompts rendered with items
+    mocker_ai_model.add("First", message="User prompt (1,2)")
+    mocker_ai_model.add("Second", message="User prompt (3,4)")
+    # When: The prompt is executed for items in one batch job
+    ret = await prompt_executor.execute_batch_async("test", [{"a": 1, "b": 2}, {"a": 3, "b": 4}], poll_interval=0)
+    # Then: Responses are returned in the order of items
+    assert ret == ["First", "Second"]
+
+
+async def test_execute_typed_batch(prompt_executor: PromptExecutor, mocker_ai_model: MockerAIModel):
+    # Given: A valid and an invalid response
+    mocker_ai_model.add('{"content": "Verbs are words describing actions."}')
+    mocker_ai_model.add("It is not JSON")
+    items = [{"title": "Verb to be", "language": "en", "level": "A1"}] * 2
+    # When: The typed prompt is executed in one batch job
+    ret = await prompt_executor.execute_typed_batch_async("test_output", InfoPageCreate, items, poll_interval=0)
+    # Then: The valid response is converted and the invalid one is returned as an error
+    assert isinstance(ret[0], InfoPageCreate)
+    assert isinstance(ret[1], Exception)
+
+
+async def test_failed_request_is_returned_as_error(tmp_path: Path, mocker_ai_model: MockerAIModel):
+    # Given: Backend with a model which fails on the second request
+    mocker_ai_model.add("Paris")
+    backend = LocalBatchBackend(tmp_path, ai_model=GoogleAIModel("gemini-2.5-flash-lite"))
+    requests = [
+        BatchRequest(custom_id="france", message="What is the capital of France?"),
+        BatchRequest(custom_id="germany", message="What is the capital of Germany?"),
+    ]
+    # When: The batch is run
+    results = await backend.run(requests, poll_interval=0)
+    # Then: Results are mapped to requests by custom id
+    assert [r.custom_id for r in results] == ["france", "germany"]
+    assert results[0].response and results[0].response.content == "Paris"
+    assert results[1].error
+
+
+async def test_mixed_batch_is_rejected(tmp_path: Path):
+    # Given: Chat and embedding requests
+    backend = LocalBatchBackend(tmp_path)
+    requests = [BatchRequest(custom_id="1", message="Hello"), BatchRequest(custom_id="2", text="Hello")]
+    # When/Then: The batch is rejected
+    with pytest.raises(ValueError):
+        await backend.submit(requests)
+
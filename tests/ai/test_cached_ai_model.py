@@ -0,0 +1,155 @@
+import threading
+from pathlib import Path
+
+from typing import List, Optional
+
+from haintech.ai import AIChatResponse, AIModelInteractionMessage, AIModelToolCall, BaseAITextEmbeddingModel
+from haintech.ai.cache import (
+    CachedAIModel,
+    MemoryResponseCache,
+    SemanticCachedAIModel,
+    SemanticResponseCache,
+    SQLiteResponseCache,
+    TieredResponseCache,
+)
+from haintech.ai.google_genai import GoogleAIModel
+from haintech.testing import MockerAIModel
+
+
+def test_repeated_request_is_cached(mocker_ai_model: MockerAIModel, tmp_path: Path):
+    # Given: Cached model with persistent cache
+    mocker_ai_model.add(AIChatResponse(content="Paris", input_tokens=12, output_tokens=1))
+    ai_model = CachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"), path=tmp_path / "cache.db")
+    message = AIModelInteractionMessage(role="user", content="What is the capital of France?")
+    # When: The same request is sent twice
+    first = ai_model.get_chat_response(system_prompt="Answer shortly", message=message)
+    second = ai_model.get_chat_response(system_prompt="Answer shortly", message=message)
+    # Then: The model is called once
+    assert first.content == second.content == "Paris"
+    assert ai_model.stats.hits == 1 and ai_model.stats.misses == 1
+    assert ai_model.stats.input_tokens == ai_model.stats.input_tokens_saved == 12
+    # And: The response is found by a new model in the persistent cache
+    ai_model = CachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"), path=tmp_path / "cache.db")
+    assert ai_model.get_chat_response(system_prompt="Answer shortly", message=message).content == "Paris"
+    assert ai_model.stats.hits == 1 and ai_model.stats.misses == 0
+
+
+def test_different_request_is_not_cached(mocker_ai_model: MockerAIModel):
+    # Given: Cached model
+    mocker_ai_model.add("Paris")
+    mocker_ai_model.add("Berlin")
+    ai_model = CachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"))
+    # When: The requests differ in the system prompt
+    first = ai_model.get_response("What is the capital?", system_prompt="Country: France")
+    second = ai_model.get_response("What is the capital?", system_prompt="Country: Germany")
+    # Then: Both are sent to the model
+    assert (first, second) == ("Paris", "Berlin")
+    assert ai_model.stats.misses == 2
+
+
+def test_tool_calls_are_not_cached(mocker_ai_model: MockerAIModel):
+    # Given: Cached model returning tool call
+    tool_call_response = AIChatResponse(
+        tool_calls=[AIModelToolCall(id="1", function_name="get_weather", arguments={"city": "Paris"})]
+    )
+    mocker_ai_model.add(tool_call_response)
+    mocker_ai_model.add(tool_call_response)
+    ai_model = CachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"))
+    message = AIModelInteractionMessage(role="user", content="What is the weather in Paris?")
+    # When: The same request is sent twice
+    ai_model.get_chat_response(message=message)
+    ai_model.get_chat_response(message=message)
+    # Then: Both are sent to the model
+    assert ai_model.stats.hits == 0 and ai_model.stats.misses == 2
+
+
+class ThreadRecordingCache(SQLiteResponseCache):
+    """SQLite cache which records threads reading and storing responses."""
+
+    def __init__(self, path: Path):
+        super().__init__(path)
+        self.threads: List[int] = []
+
+    def get(self, key: str) -> Optional[AIChatResponse]:
+        self.threads.append(threading.get_ident())
+        return super().get(key)
+
+    def set(self, key: str, response: AIChatResponse) -> None:
+        self.threads.append(threading.get_ident())
+        super().set(key, response)
+
+
+async def test_persistent_cache_does_not_block_event_loop(mocker_ai_model: MockerAIModel, tmp_path: Path):
+    # Given: Cached model with memory and persistent cache
+    mocker_ai_model.add("Paris")
+    cache = ThreadRecordingCache(tmp_path / "cache.db")
+    tiered_cache = TieredResponseCache(MemoryResponseCache(), cache)
+    ai_model = CachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"), cache=tiered_cache)
+    # When: The same request is sent twice
+    first = await ai_model.get_response_async("What is the capital of France?")
+    second = await ai_model.get_response_async("What is the capital of France?")
+    # Then: The persistent cache is read and written in other threads than the event loop thread
+    assert first == second == "Paris"
+    assert cache.threads and threading.get_ident() not in cache.threads
+    # And: In-memory caches are used on the event loop
+    assert MemoryResponseCache().in_memory and not tiered_cache.in_memory
+
+
+class KeywordEmbeddingModel(BaseAITextEmbeddingModel):
+    """Embeds text as counts of keywords."""
+
+    keywords = ["capital", "france", "germany"]
+
+    def get_embedding(self, text: str) -> List[float]:
+        return [float(text.lower().count(k)) for k in self.keywords]
+
+
+def test_similar_question_is_cached(mocker_ai_model: MockerAIModel):
+    # Given: Semantic cached model
+    mocker_ai_model.add("Paris")
+    mocker_ai_model.add("Berlin")
+    ai_model = SemanticCachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"), KeywordEmbeddingModel(), threshold=0.9)
+    # When: Similar questions are sent
+    first = ai_model.get_response("What is the capital of France?")
+    second = ai_model.get_response("France - what's its capital?")
+    third = ai_model.get_response("What is the capital of Germany?")
+    # Then: The model is called for different questions only
+    assert (first, second, third) == ("Paris", "Paris", "Berlin")
+    assert ai_model.stats.hits == 1 and ai_model.stats.misses == 2
+
+
+async def test_tenants_are_isolated(mocker_ai_model: MockerAIModel):
+    # Given: Semantic cached models of two tenants sharing the cache
+    mocker_ai_model.add("Paris")
+    mocker_ai_model.add("Paris, France")
+    cache = SemanticResponseCache()
+    ai_model = SemanticCachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"), KeywordEmbeddingModel(), cache=cache)
+    tenant_a, tenant_b = ai_model.with_tenant("a"), ai_model.with_tenant("b")
+    # When: Both tenants ask the same question
+    answer_a = await tenant_a.get_response_async("What is the capital of France?")
+    answer_b = await tenant_b.get_response_async("What is the capital of France?")
+    # Then: The response of one tenant is not returned to the other
+    assert (answer_a, answer_b) == ("Paris", "Paris, France")
+    assert len(cache) == 2
+
+
+def test_tenant_limit_removes_least_recently_used(mocker_ai_model: MockerAIModel):
+    # Given: Semantic cache with one entry per tenant
+    mocker_ai_model.add("Paris")
+    mocker_ai_model.add("Berlin")
+    mocker_ai_model.add("Paris, France")
+    cache = SemanticResponseCache(max_size_per_tenant=1)
+    ai_model = SemanticCachedAIModel(GoogleAIModel("gemini-2.5-flash-lite"), KeywordEmbeddingModel(), cache=cache)
+    tenant_a, tenant_b = ai_model.with_tenant("a"), ai_model.with_tenant("b")
+    # When: Tenant A asks two questions and tenant B one question
+    tenant_a.get_response("What is the capital of France?")
+    tenant_b.get_response("What is the capital of Germany?")
+    tenant_a.get_response("What is the capital of France? France!")
+    # Then: Only the last entry of tenant A is kept and the entry of tenant B is not evicted
+    assert len(cache) == 2
+    assert tenant_b.get_response("What is the capital of Germany?") == "Berlin"
+    assert tenant_a.get_response("What is the capital of France? France!") == "Paris, France"
+    # When: Entries of tenant A are cleared
+    cache.clear("a")
+    # Then: Entries of tenant B are kept
+    assert len(cache) == 1 and ai_model.semantic_cache is cache
@@ -0,0 +1,89 @@
+import asyncio
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Iterator
+
+import pytest
+
+from haintech.ai import HTTPClientConfig, HTTPClientPool
+
+
+class OkHandler(BaseHTTPRequestHandler):
+    # Connections are kept alive, so they are reused by next requests
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header("Content-Length", "2")
+        self.end_headers()
+        self.wfile.write(b"ok")
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server_url() -> Iterator[str]:
+    server = ThreadingHTTPServer(("127.0.0.1", 0), OkHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+
+
+async def test_clients_are_shared_per_base_url():
+    # Given: Pool with custom limits
+    pool = HTTPClientPool(HTTPClientConfig(max_connections=10))
+    pool.configure(timeout=30)
+    # When: Clients are requested for URLs of the same and other host
+    client = pool.get_client("https://api.openai.com/v1")
+    # Then: The same client is returned for the same host
+    assert pool.get_client("https://api.openai.com/v1/") is client
+    assert pool.get_client("https://api.anthropic.com") is not client
+    assert pool.get_async_client("https://api.openai.com/v1") is pool.get_async_client("https://api.openai.com")
+    assert client.timeout.read == 30 and client.timeout.connect == 5.0
+    # And: All clients are closed on shutdown
+    async_client = pool.get_async_client("https://api.openai.com")
+    await pool.aclose()
+    assert client.is_closed and async_client.is_closed
+    assert pool.get_client("https://api.openai.com") is not client
+
+
+def test_async_client_is_shared_by_event_loops(server_url: str):
+    # Given: The shared async client of the local server (e.g. held by an SDK client)
+    pool = HTTPClientPool()
+    client = pool.get_async_client(server_url)
+
+    async def get() -> str:
+        return (await client.get(server_url)).text
+
+    # When: It is used by two event loops one after another
+    responses = [asyncio.run(get()), asyncio.run(get())]
+    # Then: Both requests succeed (connections of the closed loop are not reused)
+    assert responses == ["ok", "ok"]
+    assert pool.get_async_client(server_url) is client
+
+
+def test_aclose_closes_connections_of_other_loops(server_url: str):
+    # Given: The shared async client used by an event loop running in another thread
+    pool = HTTPClientPool()
+    client = pool.get_async_client(server_url)
+    other_loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=other_loop.run_forever, daemon=True)
+    thread.start()
+    try:
+        response = asyncio.run_coroutine_threadsafe(client.get(server_url), other_loop).result(5)
+        assert response.text == "ok"
+        transport = client._transport._transports[other_loop]  # type: ignore
+        assert transport._pool.connections
+
+        # When: The pool is closed by the main loop
+        asyncio.run(pool.aclose())
+        # Then: Connections of the other loop are closed in that loop
+        assert not transport._pool.connections
+        assert not client._transport._transports  # type: ignore
+    finally:
+        other_loop.call_soon_threadsafe(other_loop.stop)
+        thread.join()
+        other_loop.close()
@@ -0,0 +1,127 @@
+import httpx
+import openai
+import pytest
+from openai.types.responses import ResponseErrorEvent, ResponseFailedEvent
+
+from haintech.ai import AIChatResponse, AIModelInteractionMessage, RetryPolicy
+from haintech.ai.exceptions import (
+    AIContextTooLongError,
+    AIInvalidRequestError,
+    AIModelError,
+    AIOverloadedError,
+    AIRateLimitError,
+)
+from haintech.ai.open_ai import ResponsesAIModel
+from haintech.ai.retry import to_ai_model_error
+
+request = httpx.Request("POST", "https://api.openai.com/v1/responses")
+
+
+def test_errors_are_converted():
+    # Given: Errors of the OpenAI SDK
+    rate_limit_error = openai.RateLimitError(
+        "Rate limit reached", response=httpx.Response(429, headers={"retry-after": "3"}, request=request), body=None
+    )
+    context_error = openai.BadRequestError(
+        "This model's maximum context length is 128000 tokens", response=httpx.Response(400, request=request), body=None
+    )
+    # When: They are converted
+    # Then: Provider independent errors are returned with Retry-After
+    error = to_ai_model_error(rate_limit_error)
+    assert isinstance(error, AIRateLimitError) and error.retryable and error.retry_after == 3.0
+    assert isinstance(to_ai_model_error(context_error), AIContextTooLongError)
+    # And: Other errors are returned unchanged
+    value_error = ValueError("Invalid JSON")
+    assert to_ai_model_error(value_error) is value_error
+
+
+def test_retry_delay():
+    # Given: Retry policy
+    policy = RetryPolicy(max_attempts=3, initial_delay=1.0, jitter=0.5)
+    error = AIRateLimitError("Rate limit reached")
+    # When: Delays are computed
+    # Then: The delay grows exponentially with jitter
+    assert 0.5 <= policy.get_delay(1, error) <= 1.0  # type: ignore
+    assert 1.0 <= policy.get_delay(2, error) <= 2.0  # type: ignore
+    # And: Retry-After is honoured
+    assert policy.get_delay(1, AIRateLimitError("Rate limit reached", 429, retry_after=5.0)) == 5.0
+    # And: The last attempt and not retryable errors are not retried
+    assert policy.get_delay(3, error) is None
+    assert policy.get_delay(1, AIContextTooLongError("Too long")) is None
+
+
+def test_chat_response_is_retried(mocker):
+    # Given: Model which is rate limited once
+    ai_model = ResponsesAIModel(retry_policy=RetryPolicy(initial_delay=0.01))
+    rate_limit_error = openai.RateLimitError(
+        "Rate limit reached", response=httpx.Response(429, request=request), body=None
+    )
+    mocker.patch.object(ai_model.openai.responses, "create", side_effect=[rate_limit_error, object()])
+    mocker.patch.object(ai_model, "_create_ai_chat_response", return_value=AIChatResponse(content="Hello"))
+    interactions = []
+    # When: The response is requested
+    response = ai_model.get_chat_response(
+        message=AIModelInteractionMessage(role="user", content="Hi"), interaction_logger=interactions.append
+    )
+    # Then: The request is retried and attempts are logged
+    assert response.content == "Hello"
+    assert interactions[0].attempts == 2 and interactions[0].latency is not None
+
+
+def test_invalid_request_is_raised(mocker):
+    # Given: Model which rejects the request
+    ai_model = ResponsesAIModel()
+    bad_request_error = openai.BadRequestError("Invalid", response=httpx.Response(400, request=request), body=None)
+    mock = mocker.patch.object(ai_model.openai.responses, "create", side_effect=bad_request_error)
+    # When: The response is requested
+    # Then: The error is raised (not returned as content) without retries
+    with pytest.raises(AIInvalidRequestError):
+        ai_model.get_response("Hi")
+    assert mock.call_count == 1
+
+
+@pytest.mark.parametrize(
+    "code,error_type",
+    [
+        ("rate_limit_exceeded", AIRateLimitError),
+        ("server_error", AIOverloadedError),
+        ("context_length_exceeded", AIContextTooLongError),
+        ("invalid_prompt", AIInvalidRequestError),
+        (None, AIModelError),
+    ],
+)
+def test_stream_error_events_are_converted(code: str | None, error_type: type):
+    # Given: Error event of the stream
+    event = ResponseErrorEvent(type="error", code=code, message="Failed", param=None, sequence_number=1)
+    # When: Deltas are created
+    # Then: The error is raised as the provider independent error of the code
+    with pytest.raises(error_type) as e:
+        list(ResponsesAIModel._create_ai_chat_response_deltas(event))
+    assert type(e.value) is error_type and str(e.value) == "Response failed: Failed"
+
+
+def test_stream_failed_response_is_retryable():
+    # Given: Failed response event of the stream with a rate limit error
+    event = ResponseFailedEvent.model_validate(
+        {
+            "type": "response.failed",
+            "sequence_number": 1,
+            "response": {
+                "id": "resp_1",
+                "object": "response",
+                "created_at": 1_700_000_000,
+                "model": "gpt-5.4-nano",
+                "status": "failed",
+                "error": {"code": "rate_limit_exceeded", "message": "Rate limit reached"},
+                "output": [],
+                "parallel_tool_calls": True,
+                "tool_choice": "auto",
+                "tools": [],
+            },
+        }
+    )
+    # When: Deltas are created
+    # Then: The retryable error is raised
+    with pytest.raises(AIRateLimitError) as e:
+        list(ResponsesAIModel._create_ai_chat_response_deltas(event))
+    assert e.value.retryable
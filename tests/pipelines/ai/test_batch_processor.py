@@ -0,0 +1,29 @@
+from pathlib import Path
+from typing import List, override
+
+from haintech.ai.base.base_ai_text_embedding_model import BaseAITextEmbeddingModel
+from haintech.ai.batch import LocalBatchBackend
+from haintech.pipelines.ai import BatchTextEmbedder
+from haintech.pipelines.pipeline import Pipeline
+
+
+class LengthEmbeddingModel(BaseAITextEmbeddingModel):
+    """Embeds text as its length, fails on empty text."""
+
+    @override
+    def get_embedding(self, text: str) -> List[float]:
+        if not text:
+            raise ValueError("Empty text")
+        return [float(len(text))]
+
+
+async def test_batch_text_embedder(tmp_path: Path):
+    # Given: Pipeline embedding texts in batches of 2
+    backend = LocalBatchBackend(tmp_path, embedding_model=LengthEmbeddingModel())
+    pl = Pipeline([BatchTextEmbedder(backend, batch_size=2, poll_interval=0, input="text", output="vector")])
+    # When: Pipeline is run with texts
+    ret = await pl.run_and_return([{"text": "a"}, {"text": ""}, {"text": "abc"}])
+    # Then: Items are returned in the input order without the failed one
+    assert ret == [{"text": "a", "vector": [1.0]}, {"text": "abc", "vector": [3.0]}]
+    # And: Each batch is a separate job
+    assert len(list(tmp_path.iterdir())) == 2
@@ -101,6 +101,78 @@ async def test_lambda_storage(factory, data1, data2):
     assert ret[1].content == data2.content
 
 
+@pytest.mark.asyncio
+async def test_concurrent_downloads_keep_order(factory):
+    # Given: Storage with many blobs
+    storage = factory.create_blob_storage("test", D)
+    for i in range(20):
+        await storage.upload_async(
+            Blob[D](name=f"{i:02}", content=b"x" * 100, metadata=D(page_no=f"{i:02}", content="test"))
+        )
+    # And: Iterator with concurrent downloads and memory cap
+    pl = Pipeline([BlobStorageIterator(storage, max_concurrent=4, max_bytes_in_flight=250)])
+    # When: Run pipeline without any data
+    ret = await pl.run_and_return(None)
+    # Then: Returns all blobs
+    assert sorted(b.metadata.page_no for b in ret) == [f"{i:02}" for i in range(20)]
+
+
+@pytest.mark.asyncio
+async def test_blob_filter(factory, data1, data2):
+    # Given: Storage with saved blobs
+    storage = factory.create_blob_storage("test", D)
+    await storage.upload_async(data1)
+    await storage.upload_async(data2)
+    # And: Iterator with filter on blob header
+    pl = Pipeline([BlobStorageIterator(storage, ordered=False, blob_filter=lambda h: h.name != "1")])
+    # When: Run pipeline without any data
+    ret = await pl.run_and_return(None)
+    # Then: Returns only filtered blobs
+    assert [b.content for b in ret] == [data2.content]
+
+
+class StreamStorage:
+    """Storage which downloads blobs chunk by chunk."""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __getattr__(self, name):
+        return getattr(self.storage, name)
+
+    async def download_stream_async(self, name, chunk_size):
+        content = (await self.storage.download_async(name)).content
+        for i in range(0, len(content), chunk_size):
+            yield content[i : i + chunk_size]
+
+
+@pytest.mark.asyncio
+async def test_stream(factory, data1, data2):
+    # Given: Storage with saved blobs which can stream them
+    storage = StreamStorage(factory.create_blob_storage("test", D))
+    await storage.upload_async(data1)
+    await storage.upload_async(data2)
+    # And: Iterator in stream mode
+    pl = Pipeline([BlobStorageIterator(storage, stream=True, chunk_size=2)])
+    # When: Run pipeline without any data
+    ret = await pl.run_and_return(None)
+    # Then: Returns streams of all blobs
+    assert sorted([await b.read() for b in ret]) == sorted([data1.content, data2.content])
+    # And: Content is read in chunks
+    assert all([len(c) <= 2 async for c in ret[0]])
+
+
+@pytest.mark.asyncio
+async def test_stream_not_supported(factory, data1):
+    # Given: Storage which can't stream blobs
+    storage = factory.create_blob_storage("test", D)
+    await storage.upload_async(data1)
+    # And: Iterator in stream mode
+    pl = Pipeline([BlobStorageIterator(storage, stream=True)])
+    # When: Run pipeline
+    # Then: It fails instead of downloading whole blobs
+    with pytest.raises(TypeError):
+        await pl.run_and_return(None)
 
 
 if __name__ == "__main__":
@@ -2,7 +2,7 @@ import pytest
 from ampf.in_memory import InMemoryFactory
 from pydantic import BaseModel
 
-from haintech.pipelines import Pipeline
+from haintech.pipelines import Pipeline, TextSplitter
 from haintech.pipelines.ampf import BlobStorageReader
 
 
@@ -37,3 +37,20 @@ async def test_pipe_file_name_key(factory, metadata):
     # Then: Returns blom and metadata
     assert ret[0] == "test"
     assert ret[1] == metadata
+
+
+@pytest.mark.asyncio
+async def test_stream_local_file(tmp_path):
+    # Given: Local file
+    (tmp_path / "test.txt").write_bytes(b"Ala ma kota.\nKot ma Ale.")
+    # And: Pipeline with BlobStorageReader in stream mode and TextSplitter
+    pl = Pipeline(
+        [
+            BlobStorageReader(tmp_path, stream=True, chunk_size=5),
+            TextSplitter(chunk_size=12, input=lambda d: d[0]),
+        ]
+    )
+    # When: Run pipeline with file name
+    ret = await pl.run_and_return("test.txt")
+    # Then: Returns text chunks
+    assert ret == ["Ala ma kota.", "Kot ma Ale."]
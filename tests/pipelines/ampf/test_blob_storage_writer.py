@@ -3,7 +3,7 @@ from ampf.base import Blob, BaseBlobMetadata
 from ampf.in_memory import InMemoryAsyncFactory
 
 from haintech.pipelines import Pipeline
-from haintech.pipelines.ampf import BlobStorageWriter
+from haintech.pipelines.ampf import BlobStorageWriter, BlobStream
 
 
 class D(BaseBlobMetadata):
@@ -39,3 +39,135 @@ async def test_pipe_file_name_key(factory, metadata):
     assert blobs[0].name == "1"
     blob = await storage.download_async(blobs[0].name)
     assert blob.content == b"test"
+
+
+@pytest.mark.asyncio
+async def test_without_read_after_write(factory, metadata):
+    # Given: Storage
+    storage = factory.create_blob_storage("test", D, "text/plain")
+    # And: Pipeline with BlobStorageWriter which doesn't download uploaded blob
+    pl = Pipeline([BlobStorageWriter[D](storage, read_after_write=False, max_concurrent=4)])
+    blobs = [Blob(name=str(i), content=b"test", metadata=metadata) for i in range(10)]
+    # When: Run pipeline with blobs
+    ret = await pl.run_and_return(blobs)
+    # Then: Uploaded blobs are returned
+    assert sorted(b.name for b in ret) == sorted(b.name for b in blobs)
+    # And: All of them are stored
+    assert len([b async for b in storage.list_blobs()]) == 10
+
+
+class H(BaseBlobMetadata):
+    page_no: int
+    content_hash: str | None = None
+
+
+class MetadataStorage:
+    """Storage which reads metadata alone (without content)."""
+
+    def __init__(self, storage):
+        self.storage = storage
+
+    def __getattr__(self, name):
+        return getattr(self.storage, name)
+
+    async def get_metadata_async(self, name):
+        return (await self.storage.download_async(name)).metadata
+
+
+@pytest.mark.asyncio
+async def test_changed_only(factory):
+    # Given: Storage with a blob uploaded by the writer (with content hash in metadata)
+    storage = MetadataStorage(factory.create_blob_storage("test", H, "text/plain"))
+    await Pipeline([BlobStorageWriter[H](storage, changed_only=True)]).run_and_return(
+        [Blob(name="1", content=b"test", metadata=H(page_no=1))]
+    )
+    # And: Pipeline with BlobStorageWriter uploading changed blobs only
+    pl = Pipeline([BlobStorageWriter[H](storage, changed_only=True, read_after_write=False)])
+    # When: Run pipeline with the same blob and a new one
+    ret = await pl.run_and_return(
+        [
+            Blob(name="1", content=b"test", metadata=H(page_no=1)),
+            Blob(name="2", content=b"test2", metadata=H(page_no=2)),
+        ]
+    )
+    # Then: Only the new blob is uploaded and returned
+    assert [b.name for b in ret] == ["2"]
+
+
+@pytest.mark.asyncio
+async def test_changed_only_without_stored_hash(factory, metadata):
+    # Given: Storage with a blob stored without content hash
+    storage = factory.create_blob_storage("test", D, "text/plain")
+    await storage.upload_async(Blob(name="1", content=b"test", metadata=metadata))
+    # And: Pipeline with BlobStorageWriter uploading changed blobs only
+    pl = Pipeline([BlobStorageWriter[D](storage, changed_only=True, read_after_write=False)])
+    # When: Run pipeline with the same blob
+    ret = await pl.run_and_return([Blob(name="1", content=b"test", metadata=metadata)])
+    # Then: The blob is treated as changed and uploaded again
+    assert [b.name for b in ret] == ["1"]
+
+
+@pytest.mark.asyncio
+async def test_stream_budget(factory, metadata):
+    # Given: Storage which uploads streams chunk by chunk and records bytes held by the writer
+    in_use = []
+
+    class StreamStorage(MetadataStorage):
+        async def upload_stream_async(self, stream):
+            content = b""
+            async for chunk in stream:
+                in_use.append(writer.budget.in_use)
+                content += bytes(chunk)
+            await self.storage.upload_async(Blob(name=stream.name, content=content, metadata=stream.metadata))
+
+    storage = StreamStorage(factory.create_blob_storage("test", D, "text/plain"))
+    # And: Writer with budget smaller than the streams
+    writer = BlobStorageWriter[D](storage, read_after_write=False, max_concurrent=2, max_bytes_in_flight=4)
+    streams = [BlobStream.from_bytes(str(i), b"12345678", metadata, chunk_size=4) for i in range(2)]
+    # When: Run pipeline with streams
+    await Pipeline([writer]).run_and_return(streams)
+    # Then: Streams are uploaded
+    assert (await storage.download_async("1")).content == b"12345678"
+    # And: Only one chunk is held at the same time
+    assert in_use and max(in_use) == 4
+    assert writer.budget.in_use == 0
+
+
+@pytest.mark.asyncio
+async def test_stream_changed_only(factory):
+    # Given: Storage which uploads streams and stream which counts its reads
+    class StreamStorage(MetadataStorage):
+        async def upload_stream_async(self, stream):
+            content = await stream.read()
+            await self.storage.upload_async(Blob(name=stream.name, content=content, metadata=stream.metadata))
+
+    storage = StreamStorage(factory.create_blob_storage("test", H, "text/plain"))
+    reads = []
+
+    def stream(name: str) -> BlobStream[H]:
+        async def chunks():
+            reads.append(name)
+            yield b"test"
+
+        return BlobStream(name, chunks, H(page_no=1))
+
+    writer = BlobStorageWriter[H](storage, changed_only=True, read_after_write=False)
+    # When: The stream is written twice
+    ret1 = await Pipeline([writer]).run_and_return([stream("1")])
+    ret2 = await Pipeline([writer]).run_and_return([stream("1")])
+    # Then: It is uploaded once, with content hash in metadata
+    assert len(ret1) == 1 and ret2 == []
+    assert (await storage.download_async("1")).metadata.content_hash
+    # And: The stream is read once each time
+    assert reads == ["1", "1"]
+
+
+@pytest.mark.asyncio
+async def test_stream_not_supported(factory, metadata):
+    # Given: Storage which can't upload streams
+    storage = factory.create_blob_storage("test", D, "text/plain")
+    pl = Pipeline([BlobStorageWriter[D](storage)])
+    # When: Run pipeline with stream
+    # Then: It fails instead of reading the whole stream into memory
+    with pytest.raises(TypeError):
+        await pl.run_and_return([BlobStream.from_bytes("1", b"test", metadata)])
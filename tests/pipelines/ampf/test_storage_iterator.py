@@ -1,3 +1,6 @@
+import threading
+import time
+
 import pytest
 from ampf.base import CollectionDef
 from ampf.local import LocalFactory
@@ -75,6 +78,62 @@ async def test_iterator_with_progress_tracker(factory, data1, data2):
     storage.drop()
 
 
+@pytest.mark.asyncio
+async def test_iterator_with_pages_and_prefetch(factory):
+    # Given: Storage with more items than page size
+    storage = factory.create_storage("test", D)
+    for i in range(25):
+        storage.save(D(page_no=f"{i:02}", content="test"))
+    # And: Pipeline with StorageIterator reading small pages ahead
+    pl = Pipeline([StorageIterator(storage, prefetch=4, page_size=10)])
+    # When: Run pipeline without any data
+    ret = await pl.run_and_return(None)
+    # Then: Returns all data from storage
+    assert sorted(d.page_no for d in ret) == [f"{i:02}" for i in range(25)]
+
+
+class BulkStorage:
+    """Storage with `get_many` which records the number of pages read at the same time"""
+
+    def __init__(self, items):
+        self.items = {item.page_no: item for item in items}
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def keys(self):
+        return iter(self.items)
+
+    def count(self):
+        return len(self.items)
+
+    def get(self, key):
+        raise AssertionError("Items are read in bulk")
+
+    def get_many(self, keys):
+        with self._lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return [self.items[key] for key in keys]
+
+
+@pytest.mark.asyncio
+async def test_iterator_with_get_many():
+    # Given: Storage which reads pages in bulk
+    storage = BulkStorage([D(page_no=f"{i:02}", content="test") for i in range(60)])
+    # And: Pipeline with StorageIterator with default prefetch (less than page size)
+    pl = Pipeline([StorageIterator(storage, page_size=20)])  # type: ignore
+    # When: Run pipeline without any data
+    ret = await pl.run_and_return(None)
+    # Then: Returns all data from storage in order
+    assert [d.page_no for d in ret] == [f"{i:02}" for i in range(60)]
+    # And: The next pages are read ahead of the page being consumed
+    assert storage.max_in_flight > 1
+
+
 class C(BaseModel):
     name: str
 
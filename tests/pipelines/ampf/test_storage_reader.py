@@ -32,5 +32,20 @@ async def test_pipe_key_name(factory, data):
     assert ret == data
 
 
+@pytest.mark.asyncio
+async def test_read_ahead_keeps_order(factory):
+    # Given: Storage with saved data
+    storage = factory.create_storage("test", D)
+    data = [D(page_no=i, content=f"test{i}") for i in range(10)]
+    for d in data:
+        storage.save(d)
+    # And: Pipeline with StorageReader reading ahead
+    pl = Pipeline([StorageReader(storage, max_concurrent=4)])
+    # When: Run pipeline with keys
+    ret = await pl.run_and_return([d.page_no for d in data])
+    # Then: Returns data in keys order
+    assert ret == data
+
+
 if __name__ == "__main__":
     pytest.main([__file__])
@@ -0,0 +1,95 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+pytest.importorskip("numpy")
+pa = pytest.importorskip("pyarrow")
+
+import pyarrow.compute as pc  # noqa: E402
+import pyarrow.parquet as pq  # noqa: E402
+
+from haintech.pipelines import Pipeline  # noqa: E402
+from haintech.pipelines.columnar import DatasetReader, DatasetWriter, Frame, ModelsToFrame  # noqa: E402
+
+
+class Chunk(BaseModel):
+    id: int
+    lang: str
+    embedding: List[float]
+
+
+def chunks(n: int = 10) -> List[Chunk]:
+    return [Chunk(id=i, lang="en" if i % 2 else "pl", embedding=[float(i), 1.0]) for i in range(n)]
+
+
+@pytest.mark.asyncio
+async def test_write_and_read_parquet(tmp_path):
+    # Given: Models written in row groups of 4 rows
+    await Pipeline([DatasetWriter[Chunk](tmp_path, row_group_size=4)]).run_and_return(chunks())
+    # When
+    ret = await Pipeline([DatasetReader(tmp_path, model=Chunk)]).run_and_return(None)
+    # Then
+    assert sorted(ret, key=lambda c: c.id) == chunks()
+    [file] = tmp_path.glob("part-*.parquet")
+    metadata = pq.ParquetFile(file).metadata
+    assert metadata.num_row_groups == 3
+    # And: Vectors are stored as fixed size lists of float32
+    schema = pq.read_schema(file)
+    assert schema.field("embedding").type == pa.list_(pa.float32(), 2)
+
+
+@pytest.mark.asyncio
+async def test_runs_add_files(tmp_path):
+    # Given: Dataset written by a run
+    await Pipeline([DatasetWriter[Chunk](tmp_path)]).run_and_return(chunks(2))
+    # When: The next run writes other rows
+    await Pipeline([DatasetWriter[Chunk](tmp_path)]).run_and_return(chunks(4)[2:])
+    # Then: Rows of both runs are in the dataset
+    ret = await Pipeline([DatasetReader(tmp_path, model=Chunk)]).run_and_return(None)
+    assert sorted(ret, key=lambda c: c.id) == chunks(4)
+    assert len(list(tmp_path.glob("part-*.parquet"))) == 2
+
+
+@pytest.mark.asyncio
+async def test_file_name_exists(tmp_path):
+    # Given: Dataset written to the file with the given name
+    await Pipeline([DatasetWriter[Chunk](tmp_path, file_name="chunks")]).run_and_return(chunks(2))
+    # When: The next run writes to the same file
+    # Then: It is not overwritten
+    with pytest.raises(FileExistsError):
+        await Pipeline([DatasetWriter[Chunk](tmp_path, file_name="chunks")]).run_and_return(chunks(2))
+    # When: Overwrite is requested
+    await Pipeline([DatasetWriter[Chunk](tmp_path, file_name="chunks", overwrite=True)]).run_and_return(chunks(3))
+    # Then: The file is replaced
+    ret = await Pipeline([DatasetReader(tmp_path, model=Chunk)]).run_and_return(None)
+    assert sorted(ret, key=lambda c: c.id) == chunks(3)
+
+
+@pytest.mark.asyncio
+async def test_partitions_projection_and_filter(tmp_path):
+    # Given: Frames written to dataset partitioned by language
+    await Pipeline(
+        [ModelsToFrame[Chunk](batch_size=3), DatasetWriter(tmp_path, partition_by=["lang"])]
+    ).run_and_return(chunks())
+    assert len(list((tmp_path / "lang=en").glob("part-*.parquet"))) == 1
+    # When: Only ids of English chunks with id > 4 are read
+    ret = await Pipeline(
+        [DatasetReader(tmp_path, columns=["id"], filter=(pc.field("lang") == "en") & (pc.field("id") > 4))]
+    ).run_and_return(None)
+    # Then
+    frame = Frame.concat(ret)
+    assert frame.columns == ["id"]
+    assert sorted(frame["id"].tolist()) == [5, 7, 9]
+
+
+@pytest.mark.asyncio
+async def test_arrow_ipc_with_tuple_filter(tmp_path):
+    # Given
+    await Pipeline([DatasetWriter[Chunk](tmp_path, format="arrow")]).run_and_return(chunks())
+    # When
+    ret = await Pipeline(
+        [DatasetReader(tmp_path, format="arrow", filter=[("id", "<", 2)], model=Chunk)]
+    ).run_and_return(None)
+    # Then
+    assert ret == chunks(2)
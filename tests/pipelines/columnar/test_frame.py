@@ -0,0 +1,101 @@
+from typing import List
+
+import pytest
+from pydantic import BaseModel
+
+np = pytest.importorskip("numpy")
+
+from haintech.pipelines import Pipeline  # noqa: E402
+from haintech.pipelines.columnar import (  # noqa: E402
+    Frame,
+    FrameFilterProcessor,
+    FrameLambdaProcessor,
+    FrameToModels,
+    ModelsToFrame,
+    cosine_similarity,
+    normalize,
+    top_k,
+)
+
+
+class Chunk(BaseModel):
+    id: int
+    text: str
+    embedding: List[float]
+    score: float = 0.0
+
+
+def chunks() -> List[Chunk]:
+    return [
+        Chunk(id=0, text="a", embedding=[3.0, 4.0]),
+        Chunk(id=1, text="b", embedding=[1.0, 0.0]),
+        Chunk(id=2, text="c", embedding=[0.0, 2.0]),
+    ]
+
+
+def test_from_models_and_back():
+    # Given
+    frame = Frame.from_models(chunks())
+    # Then: Vectors are stored as a matrix
+    assert frame["embedding"].shape == (3, 2)
+    assert frame["id"].tolist() == [0, 1, 2]
+    # And: Rows are converted back to models
+    assert frame.to_models(Chunk) == chunks()
+
+
+def test_columns_must_have_the_same_length():
+    frame = Frame({"a": [1, 2]})
+    with pytest.raises(ValueError):
+        frame["b"] = [1, 2, 3]
+
+
+def test_vectors():
+    # Given
+    vectors = np.array([[3.0, 4.0], [0.0, 0.0]])
+    # Then
+    assert np.allclose(normalize(vectors), [[0.6, 0.8], [0.0, 0.0]])
+    assert np.allclose(cosine_similarity(vectors[:1], np.array([[1.0, 0.0], [0.0, 1.0]])), [[0.6, 0.8]])
+    assert top_k(np.array([[0.1, 0.9, 0.5]]), 2).tolist() == [[1, 2]]
+
+
+@pytest.mark.asyncio
+async def test_vectorised_pipeline():
+    # Given: Pipeline which normalizes embeddings and filters by similarity to centroid
+    centroid = np.array([0.0, 1.0])
+    pl = Pipeline(
+        [
+            ModelsToFrame[Chunk](batch_size=2),
+            FrameLambdaProcessor(normalize, input="embedding", output="embedding"),
+            FrameLambdaProcessor(lambda e: e @ centroid, input="embedding", output="score"),
+            FrameFilterProcessor(lambda s: s > 0.5, input="score"),
+            FrameToModels(Chunk),
+        ]
+    )
+    # When
+    ret = await pl.run_and_return(chunks())
+    # Then
+    assert [c.id for c in ret] == [0, 2]
+    assert ret[0].embedding == pytest.approx([0.6, 0.8])
+    assert ret[0].score == pytest.approx(0.8)
+
+
+@pytest.mark.asyncio
+async def test_dicts():
+    # Given
+    pl = Pipeline([ModelsToFrame(batch_size=10), FrameLambdaProcessor(lambda f: f.select("v")), FrameToModels()])
+    # When
+    ret = await pl.run_and_return([{"v": 1, "w": 2}, {"v": 3, "w": 4}])
+    # Then
+    assert ret == [{"v": 1}, {"v": 3}]
+
+
+def test_arrow():
+    pytest.importorskip("pyarrow")
+    # Given
+    frame = Frame.from_models(chunks())
+    # When
+    table = frame.to_arrow()
+    ret = Frame.from_arrow(table)
+    # Then
+    assert ret["embedding"].shape == (3, 2)
+    assert ret.to_models(Chunk) == chunks()
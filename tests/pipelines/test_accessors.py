@@ -0,0 +1,76 @@
+from pydantic import BaseModel
+import pytest
+
+from haintech.pipelines import LambdaProcessor, Pipeline
+from haintech.pipelines.accessors import FieldGetter, FieldSetter, compile_getter
+
+
+class Page(BaseModel):
+    page_no: int
+    content: str = ""
+
+
+class Doc(BaseModel):
+    name: str
+    page: Page
+
+
+def test_getter_reads_model_and_dict():
+    # Given: a getter for one field
+    getter = FieldGetter("page_no")
+    # When / Then: it reads pydantic models and dicts (alternately)
+    assert getter(Page(page_no=1)) == 1
+    assert getter({"page_no": 2}) == 2
+    assert getter(Page(page_no=3)) == 3
+
+
+def test_getter_dotted_path():
+    # Given: a getter for nested field
+    getter = FieldGetter("page.page_no")
+    # When / Then: it walks through models and dicts
+    assert getter(Doc(name="a", page=Page(page_no=5))) == 5
+    assert getter({"page": {"page_no": 6}}) == 6
+    assert getter({"page": Page(page_no=7)}) == 7
+
+
+def test_setter_dotted_path():
+    # Given: nested model and dict
+    doc = Doc(name="a", page=Page(page_no=1))
+    data = {"page": {"page_no": 1}}
+    setter = FieldSetter("page.content")
+    # When: the field is set
+    setter(doc, "x")
+    setter(data, "y")
+    # Then: the nested field is changed
+    assert doc.page.content == "x"
+    assert data["page"]["content"] == "y"
+
+
+def test_compile_getter_wrong_type():
+    with pytest.raises(TypeError):
+        compile_getter(1)
+
+
+def test_get_value_returns_field_value():
+    # Given: a processor and a model with nested model
+    p = LambdaProcessor(lambda x: x)
+    doc = Doc(name="a", page=Page(page_no=1))
+    # When / Then: get_value returns field values (the model is not dumped)
+    assert p.get_value("page", doc) is doc.page
+    assert p.get_value("page.page_no", doc) == 1
+
+
+@pytest.mark.asyncio
+async def test_dotted_input_and_output():
+    # Given: a processor reading and writing nested fields
+    pl = Pipeline(
+        [
+            LambdaProcessor[int, str](
+                lambda x: f"page {x}", input="page.page_no", output="page.content"
+            )
+        ]
+    )
+    # When
+    ret = await pl.run_and_return([Doc(name="a", page=Page(page_no=1))])
+    # Then
+    assert ret[0].page.content == "page 1"
@@ -0,0 +1,32 @@
+import asyncio
+
+import pytest
+
+from haintech.pipelines.byte_budget import ByteBudget
+
+
+@pytest.mark.asyncio
+async def test_acquire_waits_for_release():
+    # Given: Budget with half used
+    budget = ByteBudget(10)
+    await budget.acquire(6)
+    # When: Next request doesn't fit
+    task = asyncio.create_task(budget.acquire(6))
+    await asyncio.sleep(0.01)
+    # Then: It waits
+    assert not task.done()
+    # When: Bytes are released
+    await budget.release(6)
+    await asyncio.wait_for(task, 1)
+    # Then: Request is served
+    assert budget.in_use == 6
+
+
+@pytest.mark.asyncio
+async def test_oversized_request_when_empty():
+    # Given: Empty budget
+    budget = ByteBudget(10)
+    # When: Request bigger than limit
+    await asyncio.wait_for(budget.acquire(100), 1)
+    # Then: It is served anyway
+    assert budget.in_use == 100
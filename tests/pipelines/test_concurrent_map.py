@@ -0,0 +1,73 @@
+import asyncio
+
+import pytest
+
+from haintech.pipelines.concurrent_map import concurrent_map
+
+
+async def sleep_and_return(x: int) -> int:
+    await asyncio.sleep((5 - x) / 20)
+    return x
+
+
+@pytest.mark.asyncio
+async def test_ordered():
+    # When: Items are processed concurrently with ordered output
+    ret = [r async for r in concurrent_map(range(5), sleep_and_return, max_concurrent=5)]
+    # Then: Results are in input order
+    assert ret == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+async def test_unordered():
+    # When: Items are processed concurrently with unordered output
+    ret = [r async for r in concurrent_map(range(5), sleep_and_return, max_concurrent=5, ordered=False)]
+    # Then: Results are returned as soon as they are ready
+    assert ret == [4, 3, 2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_items_are_pulled_lazily():
+    # Given: Async source which counts pulled items
+    pulled = []
+
+    async def source():
+        for i in range(100):
+            pulled.append(i)
+            yield i
+
+    # When: Only first result is taken
+    gen = concurrent_map(source(), sleep_and_return, max_concurrent=3)
+    assert await anext(gen) == 0
+    await gen.aclose()
+    # Then: Only the window of items is pulled from source
+    assert len(pulled) <= 4
+
+
+@pytest.mark.asyncio
+async def test_pending_calls_are_cancelled_on_close():
+    # Given: Function which never finishes for some items
+    cancelled = []
+
+    async def func(x: int) -> int:
+        if x == 0:
+            return x
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.append(x)
+            raise
+        return x
+
+    # When: Generator is closed after the first result
+    gen = concurrent_map(range(3), func, max_concurrent=3)
+    assert await anext(gen) == 0
+    await gen.aclose()
+    # Then: Running calls are cancelled
+    assert sorted(cancelled) == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_wrong_max_concurrent():
+    with pytest.raises(ValueError):
+        [r async for r in concurrent_map(range(5), sleep_and_return, max_concurrent=0)]
@@ -25,3 +25,44 @@ async def test_set_source_and_run(log):
     ret = p.process([0, 1, 2, 3, 4])
     # Then: Reversed data is returned because of processing time
     assert list([r async for r in ret]) == [4, 3, 2, 1, 0]
+
+
+@pytest.mark.asyncio
+async def test_ordered():
+    # Given: Processor where sleep time is in reverse to input data
+    class TestProcessor[I, O](ConcurrentProcessor[I, O]):
+        @override
+        async def process_item(self, data: int) -> int:
+            await asyncio.sleep((5 - data) / 100)
+            return data
+
+    # When: Output order is required
+    p = TestProcessor(max_concurrent=5, ordered=True)
+    ret = p.process([0, 1, 2, 3, 4])
+    # Then: Data is returned in input order
+    assert list([r async for r in ret]) == [0, 1, 2, 3, 4]
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("ordered", [True, False])
+async def test_cancel_tasks_when_output_is_closed(ordered):
+    # Given: Processor with long running tasks
+    cancelled = []
+
+    class TestProcessor(ConcurrentProcessor[int, int]):
+        @override
+        async def process_item(self, data: int) -> int:
+            try:
+                await asyncio.sleep(0 if data == 0 else 10)
+            except asyncio.CancelledError:
+                cancelled.append(data)
+                raise
+            return data
+
+    p = TestProcessor(max_concurrent=3, ordered=ordered)
+    # When: Only the first result is taken
+    ret = p.process([0, 1, 2, 3])
+    assert await anext(ret) == 0
+    await ret.aclose()
+    # Then: Tasks in flight are cancelled and no new items are pulled
+    assert sorted(cancelled) == [1, 2]
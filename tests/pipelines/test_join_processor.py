@@ -0,0 +1,95 @@
+import asyncio
+
+import pytest
+from pydantic import BaseModel
+
+from haintech.pipelines import (
+    ConcurrentProcessor,
+    FilterProcessor,
+    JoinProcessor,
+    LambdaProcessor,
+    Pipeline,
+)
+
+
+class D(BaseModel):
+    id: int
+    text: str
+    enrichment: dict = {}
+
+
+class ReversedLatency(ConcurrentProcessor[dict, dict]):
+    async def process_item(self, data: dict) -> dict:
+        await asyncio.sleep((5 - data["id"]) / 100)
+        return data
+
+
+@pytest.mark.asyncio
+async def test_join_by_key():
+    # Given: Branches returning results in different order
+    pl = Pipeline[D, dict](
+        [
+            JoinProcessor[D, dict](
+                {
+                    "upper": [LambdaProcessor[D, dict](lambda d: {"id": d.id, "v": d.text.upper()})],
+                    "len": [
+                        LambdaProcessor[D, dict](lambda d: {"id": d.id, "v": len(d.text)}),
+                        ReversedLatency(max_concurrent=5),
+                    ],
+                },
+                key="id",
+            )
+        ]
+    )
+    # When
+    ret = await pl.run_and_return([D(id=i, text="ab" * i) for i in range(1, 4)])
+    # Then: Results are merged by key
+    assert sorted(ret, key=lambda r: r["upper"]["id"]) == [
+        {"upper": {"id": 1, "v": "AB"}, "len": {"id": 1, "v": 2}},
+        {"upper": {"id": 2, "v": "ABAB"}, "len": {"id": 2, "v": 4}},
+        {"upper": {"id": 3, "v": "ABABAB"}, "len": {"id": 3, "v": 6}},
+    ]
+
+
+@pytest.mark.asyncio
+async def test_output_and_left_join():
+    # Given: A branch filtering items and output into the item
+    pl = Pipeline[D, D](
+        [
+            JoinProcessor[D, D](
+                {
+                    "all": [LambdaProcessor[D, dict](lambda d: {"id": d.id})],
+                    "even": [FilterProcessor[D](lambda d: d.id % 2 == 0)],
+                },
+                key="id",
+                how="left",
+                output="enrichment",
+            )
+        ]
+    )
+    # When
+    ret = await pl.run_and_return([D(id=i, text="") for i in range(4)])
+    # Then: All items are returned with available results
+    assert sorted((d.id, sorted(d.enrichment)) for d in ret) == [
+        (0, ["all", "even"]),
+        (1, ["all"]),
+        (2, ["all", "even"]),
+        (3, ["all"]),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_inner_join_drops_incomplete():
+    # Given: A branch filtering items
+    pl = Pipeline[D, dict](
+        [
+            JoinProcessor[D, dict](
+                {"even": [FilterProcessor[D](lambda d: d.id % 2 == 0)]},
+                key="id",
+            )
+        ]
+    )
+    # When
+    ret = await pl.run_and_return([D(id=i, text="") for i in range(4)])
+    # Then
+    assert [r["even"].id for r in ret] == [0, 2]
@@ -1,6 +1,6 @@
 import pytest
 
-from haintech.pipelines import Limit, Pipeline
+from haintech.pipelines import LambdaProcessor, Limit, Pipeline
 
 
 @pytest.mark.asyncio
@@ -15,3 +15,21 @@ async def test_range_x_y():
     pl = Pipeline[str, str]([Limit(1,3)])
     ret = await pl.run_and_return(["a", "b", "c", "d", "e", "f"])
     assert ret == ["b", "c", "d"]
+
+
+@pytest.mark.asyncio
+async def test_stop_pulling_after_max():
+    # Given: Source which counts read items
+    read = []
+
+    def source():
+        for i in range(1000):
+            read.append(i)
+            yield i
+
+    pl = Pipeline[int, int]([LambdaProcessor[int, int](lambda x: x), Limit(3)])
+    # When: Pipeline is run
+    ret = await pl.run_and_return(source())
+    # Then: Only needed items are read
+    assert ret == [0, 1, 2]
+    assert read == [0, 1, 2]
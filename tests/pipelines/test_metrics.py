@@ -0,0 +1,95 @@
+import asyncio
+from typing import override
+
+import pytest
+
+from haintech.pipelines import (
+    ConcurrentProcessor,
+    FilterProcessor,
+    InMemoryMetricsExporter,
+    LambdaProcessor,
+    Pipeline,
+    PipelineMetrics,
+    PrometheusMetricsExporter,
+)
+
+
+class SleepProcessor(ConcurrentProcessor[int, int]):
+    @override
+    async def process_item(self, data: int) -> int:
+        await asyncio.sleep(0.01)
+        if data == 3:
+            raise ValueError("3")
+        return data
+
+
+@pytest.mark.asyncio
+async def test_stage_metrics():
+    # Given: Pipeline with metrics
+    exporter = InMemoryMetricsExporter()
+    metrics = PipelineMetrics(exporters=[exporter])
+    pl = Pipeline(
+        [
+            LambdaProcessor[int, int](lambda x: x * 2, name="double"),
+            FilterProcessor[int](lambda x: x < 8, name="filter"),
+            SleepProcessor(max_concurrent=3, name="sleep"),
+        ],
+        metrics=metrics,
+    )
+    # When: Pipeline is run
+    ret = await pl.run_and_return(list(range(10)))
+    # Then: Results are not changed
+    assert sorted(ret) == [0, 2, 4, 6]
+    # And: Metrics are exported at the end of the run
+    stages = {s.name: s for s in exporter.last.stages}
+    assert stages["double"].items_in == 10
+    assert stages["double"].items_out == 10
+    assert stages["double"].latency.count == 10
+    assert stages["filter"].items_in == 10
+    assert stages["filter"].items_out == 4
+    assert stages["sleep"].items_out == 4
+    assert stages["sleep"].max_in_flight == 3
+    assert stages["sleep"].in_flight == 0
+    assert stages["sleep"].latency.sum >= 0.04
+
+
+@pytest.mark.asyncio
+async def test_errors_and_prometheus_format():
+    # Given: Pipeline with failing item and Prometheus exporter
+    exporter = PrometheusMetricsExporter()
+    pl = Pipeline([SleepProcessor(name="sleep")], metrics=PipelineMetrics("test", [exporter]))
+    # When: Pipeline fails
+    with pytest.raises(ValueError):
+        await pl.run_and_return([1, 3])
+    # Then: Error is counted and exported
+    assert 'haintech_pipeline_errors_total{pipeline="test",stage="sleep"} 1' in exporter.text
+    assert 'haintech_pipeline_item_latency_seconds_bucket{pipeline="test",stage="sleep",le="+Inf"} 2' in exporter.text
+
+
+@pytest.mark.asyncio
+async def test_same_names():
+    # Given: Pipeline with processors with the same names
+    metrics = PipelineMetrics()
+    pl = Pipeline([LambdaProcessor(lambda x: x), LambdaProcessor(lambda x: x)], metrics=metrics)
+    # When: Pipeline is run twice
+    await pl.run_and_return([1, 2])
+    await pl.run_and_return([1, 2])
+    # Then: Stages are distinguished and accumulated
+    assert [(s.name, s.items_out) for s in metrics.snapshot().stages] == [
+        ("LambdaProcessor", 4),
+        ("LambdaProcessor#2", 4),
+    ]
+
+
+@pytest.mark.asyncio
+async def test_processors_reused_without_metrics():
+    # Given: Processors run in a pipeline with metrics
+    metrics = PipelineMetrics()
+    processors = [LambdaProcessor[int, int](lambda x: x, name="first"), LambdaProcessor[int, int](lambda x: x * 2)]
+    await Pipeline(processors, metrics=metrics).run_and_return([1, 2])
+    # When: The same processors are run in a pipeline without metrics
+    ret = await Pipeline(processors).run_and_return([1, 2])
+    # Then: Items are processed and not metered any more
+    assert ret == [2, 4]
+    assert all(p.metrics is None for p in processors)
+    assert [s.items_out for s in metrics.snapshot().stages] == [2, 2]
@@ -4,7 +4,7 @@ from typing import override
 
 import pytest
 
-from haintech.pipelines import BaseProcessor, LambdaProcessor, Pipeline
+from haintech.pipelines import BaseProcessor, CancelToken, LambdaProcessor, Pipeline, PipelineCancelledError
 from haintech.pipelines.checkpoint_processor import CheckpointProcessor
 
 
@@ -104,3 +104,47 @@ async def test_get_step():
     # Then: Results are independent
     assert ret0 == 2
     assert ret1 == 3
+
+
+class SlowProcessor(BaseProcessor[int, int]):
+    def __init__(self):
+        super().__init__()
+        self.closed = False
+
+    @override
+    async def process_item(self, data: int) -> int:
+        await asyncio.sleep(0 if data == 0 else 10)
+        return data
+
+    @override
+    async def close(self) -> None:
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_timeout_and_close():
+    # Given: A pipeline with slow processor
+    slow = SlowProcessor()
+    pl = Pipeline([slow])
+    # When: Run with timeout
+    with pytest.raises(TimeoutError):
+        await pl.run_and_return([0, 1], timeout=0.1)
+    # Then: Processors are closed
+    assert slow.closed
+
+
+@pytest.mark.asyncio
+async def test_cancel_token():
+    # Given: A pipeline with slow processor
+    slow = SlowProcessor()
+    pl = Pipeline([slow])
+    token = CancelToken()
+    ret = []
+    # When: Token is cancelled after the first item
+    with pytest.raises(PipelineCancelledError):
+        async for item in await pl.run([0, 1], cancel_token=token):
+            ret.append(item)
+            asyncio.get_running_loop().call_later(0.05, token.cancel)
+    # Then: Run is stopped and processors are closed
+    assert ret == [0]
+    assert slow.closed
@@ -0,0 +1,69 @@
+import asyncio
+
+import pytest
+
+from haintech.pipelines import ProgressTracker
+
+
+def test_notify_every_step_by_default(mocker):
+    # Given: Tracker without throttling
+    pt = ProgressTracker(10)
+    notify = mocker.spy(pt, "notify")
+    # When: Steps are completed
+    for _ in range(10):
+        pt.increment()
+    # Then: Every step is reported
+    assert notify.call_count == 10
+
+
+def test_throttled_by_percent(mocker):
+    # Given: Tracker reporting every 25 percent
+    snapshots = []
+    pt = ProgressTracker(100, min_percent=25, on_progress=snapshots.append)
+    notify = mocker.spy(pt, "notify")
+    # When: Steps are completed
+    for _ in range(100):
+        pt.increment()
+    # Then: Only a few snapshots are reported, the last one on completion
+    assert [s.completed for s in snapshots] == [25, 50, 75, 100]
+    assert notify.call_count == 4
+    assert snapshots[-1].progress == 1.0
+
+
+def test_bulk_increment_and_parent():
+    # Given: Nested trackers
+    parent = ProgressTracker(1)
+    pt = ProgressTracker(100, parent=parent, min_interval_ms=1000)
+    # When: Steps are completed in bulk
+    pt.increment(60)
+    pt.increment(40)
+    # Then: Both trackers are complete
+    assert pt.is_complete()
+    assert parent.is_complete()
+    # And: Exceeding total steps is not allowed
+    with pytest.raises(ValueError):
+        pt.increment()
+
+
+@pytest.mark.asyncio
+async def test_snapshots_stream_with_rate_and_eta():
+    # Given: Tracker and snapshots consumer
+    pt = ProgressTracker(4)
+    received = []
+
+    async def consume():
+        async for snapshot in pt.snapshots():
+            received.append(snapshot)
+
+    task = asyncio.create_task(consume())
+    await asyncio.sleep(0)
+    # When: Steps are completed
+    for _ in range(4):
+        await asyncio.sleep(0.01)
+        pt.increment()
+    await asyncio.wait_for(task, 1)
+    # Then: All snapshots are received with rate and ETA
+    assert [s.completed for s in received] == [1, 2, 3, 4]
+    assert received[1].rate > 0
+    assert received[1].eta > 0
+    assert received[-1].eta == 0
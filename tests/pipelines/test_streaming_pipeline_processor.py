@@ -0,0 +1,205 @@
+import asyncio
+from typing import AsyncIterator, List
+
+import pytest
+from pydantic import BaseModel
+
+from haintech.pipelines import (
+    BaseProcessor,
+    FlatMapProcessor,
+    LambdaProcessor,
+    Limit,
+    Pipeline,
+    StreamingPipelineProcessor,
+)
+
+
+class D(BaseModel):
+    page_no: int
+    subitems: List[str]
+    subitem: str = ""
+
+
+class CountingProcessor(BaseProcessor[str, str]):
+    def __init__(self):
+        super().__init__()
+        self.set_source_calls = 0
+        self.close_calls = 0
+
+    def set_source(self, source):
+        self.set_source_calls += 1
+        super().set_source(source)
+
+    async def process_item(self, data: str) -> str:
+        return f"{data}{data}"
+
+    async def close(self):
+        self.close_calls += 1
+
+
+def items() -> List[D]:
+    return [D(page_no=i, subitems=[f"{i}a", f"{i}b"]) for i in range(3)]
+
+
+@pytest.mark.asyncio
+async def test_flat_map_results():
+    # Given: A pipeline with streaming subpipeline
+    pl = Pipeline[D, str](
+        [
+            StreamingPipelineProcessor[List[str], str](
+                input="subitems",
+                processors=[LambdaProcessor[str, str](lambda s: f"{s}{s}")],
+            ),
+        ]
+    )
+    # When
+    ret = await pl.run_and_return(items())
+    # Then: Results of all subpipelines are flattened
+    assert ret == ["0a0a", "0b0b", "1a1a", "1b1b", "2a2a", "2b2b"]
+
+
+@pytest.mark.asyncio
+async def test_output():
+    # Given: A streaming subpipeline with output
+    pl = Pipeline[D, D](
+        [
+            StreamingPipelineProcessor[List[str], str](
+                input="subitems",
+                processors=[LambdaProcessor[str, str](lambda s: s.upper())],
+                output=lambda d, s: d.model_copy(update={"subitem": s}),
+            ),
+        ]
+    )
+    # When
+    ret = await pl.run_and_return(items()[:1])
+    # Then: Each result is returned with its parent item
+    assert [(d.page_no, d.subitem) for d in ret] == [(0, "0A"), (0, "0B")]
+
+
+@pytest.mark.asyncio
+async def test_built_once_and_closed_once():
+    # Given: A streaming subpipeline with two processors
+    second = CountingProcessor()
+    p = StreamingPipelineProcessor[List[str], str](
+        input="subitems",
+        processors=[CountingProcessor(), second],
+    )
+    # When
+    ret = await Pipeline[D, str]([p]).run_and_return(items())
+    # Then: The subpipeline is built and closed once
+    assert len(ret) == 6
+    assert second.set_source_calls == 1
+    assert second.close_calls == 1
+
+
+@pytest.mark.asyncio
+async def test_pipeline_function_reused():
+    # Given: A function returning the same pipeline
+    counting = CountingProcessor()
+    pipeline = Pipeline[str, str]([FlatMapProcessor(), counting])
+    calls = []
+
+    def create_pipeline(data: D) -> Pipeline:
+        calls.append(data.page_no)
+        return pipeline
+
+    p = StreamingPipelineProcessor[List[str], str](
+        input=lambda d: [d.subitems],
+        pipeline=create_pipeline,
+        max_concurrent=3,
+    )
+    # When
+    ret = await Pipeline[D, str]([p]).run_and_return(items())
+    # Then: The function is called for each item and the pipeline is closed
+    assert sorted(ret) == ["0a0a", "0b0b", "1a1a", "1b1b", "2a2a", "2b2b"]
+    assert calls == [0, 1, 2]
+    assert counting.close_calls >= 1
+
+
+class CollectingProcessor(BaseProcessor[str, List[str]]):
+    """Keeps items of the run (a list) in an attribute and returns them at the end."""
+
+    async def process(self, data) -> AsyncIterator[List[str]]:
+        self.items = []
+        for item in data:
+            self.items.append(item)
+            await asyncio.sleep(0.01)
+        yield self.items
+
+
+class SleepProcessor(BaseProcessor[str, str]):
+    async def process_item(self, data: str) -> str:
+        await asyncio.sleep(int(data[0]) / 50)
+        return data
+
+
+@pytest.mark.asyncio
+async def test_concurrent_unordered():
+    # Given: Sub pipelines where the first parent item is the slowest
+    data = [D(page_no=i, subitems=[f"{i}a", f"{i}b"]) for i in (3, 1, 2)]
+    p = StreamingPipelineProcessor[List[str], str](
+        input="subitems", processors=[SleepProcessor()], max_concurrent=3
+    )
+    # When
+    ret = await Pipeline[D, str]([p]).run_and_return(data)
+    # Then: Results are returned when they are ready
+    assert ret[0] == "1a"
+    assert ret[-1] == "3b"
+    assert sorted(ret) == ["1a", "1b", "2a", "2b", "3a", "3b"]
+
+
+@pytest.mark.asyncio
+async def test_concurrent_ordered():
+    # Given: Ordered concurrent sub pipelines
+    data = [D(page_no=i, subitems=[f"{i}a", f"{i}b"]) for i in (3, 1, 2)]
+    p = StreamingPipelineProcessor[List[str], str](
+        input="subitems", processors=[SleepProcessor()], max_concurrent=3, ordered=True
+    )
+    # When
+    start = asyncio.get_running_loop().time()
+    ret = await Pipeline[D, str]([p]).run_and_return(data)
+    elapsed = asyncio.get_running_loop().time() - start
+    # Then: Results are returned in the order of parent items
+    assert ret == ["3a", "3b", "1a", "1b", "2a", "2b"]
+    # And: Parent items are processed concurrently
+    assert elapsed < (6 + 2 + 4) / 50
+
+
+@pytest.mark.asyncio
+async def test_concurrent_stateful_stage():
+    # Given: Concurrent sub pipelines with a stage keeping state of the run in an attribute
+    p = StreamingPipelineProcessor[List[str], List[str]](
+        input="subitems", processors=[CollectingProcessor()], max_concurrent=3
+    )
+    data = [D(page_no=i, subitems=[f"{i}a", f"{i}b", f"{i}c"]) for i in range(6)]
+    # When
+    ret = await Pipeline[D, List[str]]([p]).run_and_return(data)
+    # Then: Items of concurrent parent items are not mixed
+    assert sorted(ret) == [[f"{i}a", f"{i}b", f"{i}c"] for i in range(6)]
+
+
+@pytest.mark.asyncio
+async def test_error_is_raised():
+    # Given: A sub pipeline which fails
+    p = StreamingPipelineProcessor[List[str], str](
+        input="subitems",
+        processors=[LambdaProcessor[str, str](lambda s: 1 / 0)],
+        max_concurrent=2,
+    )
+    # When / Then
+    with pytest.raises(ZeroDivisionError):
+        await Pipeline[D, str]([p]).run_and_return(items())
+
+
+@pytest.mark.asyncio
+async def test_closing_cancels_sub_pipelines():
+    # Given: Many parent items and limit of results
+    p = StreamingPipelineProcessor[List[str], str](
+        input="subitems", processors=[SleepProcessor()], max_concurrent=4
+    )
+    data = [D(page_no=i, subitems=["1a"] * 10) for i in range(100)]
+    # When
+    ret = await Pipeline[D, str]([p, Limit(3)]).run_and_return(data)
+    # Then
+    assert ret == ["1a"] * 3
+    assert all(t.done() for t in asyncio.all_tasks() if t is not asyncio.current_task())
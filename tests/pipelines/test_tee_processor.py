@@ -0,0 +1,89 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from haintech.pipelines import BaseProcessor, LambdaProcessor, Limit, Pipeline, TeeProcessor
+
+
+class SinkProcessor(BaseProcessor[int, int]):
+    def __init__(self, latency: float = 0):
+        super().__init__()
+        self.latency = latency
+        self.items: List[int] = []
+        self.closed = False
+
+    async def process_item(self, data: int) -> int:
+        await asyncio.sleep(self.latency)
+        self.items.append(data)
+        return data
+
+    async def close(self):
+        self.closed = True
+
+
+@pytest.mark.asyncio
+async def test_items_sent_to_all_branches():
+    # Given: Tee with two branches
+    a = SinkProcessor()
+    b = SinkProcessor()
+    pl = Pipeline[int, int](
+        [TeeProcessor[int]([[a], Pipeline([LambdaProcessor[int, int](lambda x: x * 10), b])])]
+    )
+    # When
+    ret = await pl.run_and_return([1, 2, 3])
+    # Then: Items are passed on
+    assert ret == [1, 2, 3]
+    # And: All branches processed all items and were closed
+    assert a.items == [1, 2, 3]
+    assert b.items == [10, 20, 30]
+    assert a.closed and b.closed
+
+
+@pytest.mark.asyncio
+async def test_branches_run_concurrently():
+    # Given: Two slow sinks
+    pl = Pipeline[int, int](
+        [TeeProcessor[int]([[SinkProcessor(0.02)], [SinkProcessor(0.02)]], buffer_size=10)]
+    )
+    # When
+    start = asyncio.get_running_loop().time()
+    await pl.run_and_return(list(range(10)))
+    elapsed = asyncio.get_running_loop().time() - start
+    # Then: It takes as long as the slowest branch, not the sum
+    assert elapsed < 10 * 0.02 * 1.8
+
+
+@pytest.mark.asyncio
+async def test_input():
+    # Given: Tee sending a field of items
+    sink = SinkProcessor()
+    pl = Pipeline[dict, dict]([TeeProcessor[dict]([[sink]], input="v")])
+    # When
+    ret = await pl.run_and_return([{"v": 1}, {"v": 2}])
+    # Then
+    assert ret == [{"v": 1}, {"v": 2}]
+    assert sink.items == [1, 2]
+
+
+@pytest.mark.asyncio
+async def test_branch_error_is_raised():
+    # Given: A failing branch with a small queue
+    pl = Pipeline[int, int](
+        [TeeProcessor[int]([[LambdaProcessor[int, int](lambda x: 1 / 0)], [SinkProcessor()]], buffer_size=1)]
+    )
+    # When / Then
+    with pytest.raises(ZeroDivisionError):
+        await pl.run_and_return(list(range(100)))
+
+
+@pytest.mark.asyncio
+async def test_branch_with_limit():
+    # Given: A branch which stops reading
+    sink = SinkProcessor()
+    pl = Pipeline[int, int]([TeeProcessor[int]([[Limit(2), sink]], buffer_size=1)])
+    # When
+    ret = await pl.run_and_return(list(range(10)))
+    # Then: Other items are passed on
+    assert ret == list(range(10))
+    assert sink.items == [0, 1]
@@ -0,0 +1,45 @@
+import pytest
+
+from haintech.pipelines import Pipeline, TextSplitter
+
+
+@pytest.mark.asyncio
+async def test_split_at_separators():
+    # Given: Pipeline with TextSplitter
+    pl = Pipeline([TextSplitter(chunk_size=12)])
+    # When: Text longer than chunk size is split
+    ret = await pl.run_and_return("Ala ma kota.\nKot ma Ale. Koniec")
+    # Then: Text is split at separators
+    assert ret == ["Ala ma kota.", "Kot ma Ale.", "Koniec"]
+
+
+@pytest.mark.asyncio
+async def test_split_byte_chunks_with_multibyte_characters():
+    # Given: UTF-8 text split into byte chunks in the middle of characters
+    content = ("zażółć gęślą jaźń " * 20).encode("utf-8")
+    chunks = [memoryview(content)[i : i + 7] for i in range(0, len(content), 7)]
+
+    async def stream():
+        for chunk in chunks:
+            yield chunk
+
+    # When: Chunks are split into text
+    ret = await Pipeline([TextSplitter(chunk_size=50, separators=())]).run_and_return([stream()])
+    # Then: Text is decoded properly and chunks are not longer than chunk size
+    assert all(len(c) <= 50 for c in ret)
+    assert "".join(ret).replace(" ", "") == content.decode("utf-8").replace(" ", "")
+
+
+@pytest.mark.asyncio
+async def test_overlap():
+    # Given: TextSplitter with overlap
+    pl = Pipeline([TextSplitter(chunk_size=4, chunk_overlap=2, separators=())])
+    # When: Text is split
+    ret = await pl.run_and_return("abcdefgh")
+    # Then: Chunks overlap
+    assert ret == ["abcd", "cdef", "efgh"]
+
+
+def test_invalid_overlap():
+    with pytest.raises(ValueError):
+        TextSplitter(chunk_size=4, chunk_overlap=4)
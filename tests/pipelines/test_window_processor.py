@@ -0,0 +1,160 @@
+import asyncio
+from typing import List
+
+import pytest
+
+from haintech.pipelines import Pipeline, WindowProcessor
+
+
+def collect(**kwargs) -> WindowProcessor:
+    return WindowProcessor(
+        init_window=lambda k, x: [],
+        aggregate=lambda w, k, x: w.append(x["v"] if isinstance(x, dict) else x),
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_tumbling_count():
+    # Given
+    pl = Pipeline([collect(size=3)])
+    # When
+    ret = await pl.run_and_return(list(range(8)))
+    # Then: The last (incomplete) window is returned at the end
+    assert ret == [[0, 1, 2], [3, 4, 5], [6, 7]]
+
+
+@pytest.mark.asyncio
+async def test_sliding_count():
+    # Given
+    pl = Pipeline([collect(size=3, slide=1)])
+    # When
+    ret = await pl.run_and_return(list(range(5)))
+    # Then
+    assert ret == [[0, 1, 2], [1, 2, 3], [2, 3, 4], [3, 4], [4]]
+
+
+@pytest.mark.asyncio
+async def test_keyed_count_with_finalize():
+    # Given
+    pl = Pipeline(
+        [
+            WindowProcessor(
+                init_window=lambda k, x: 0,
+                aggregate=lambda w, k, x: w + x["v"],
+                size=2,
+                key="k",
+                finalize=lambda w: (w.key, w.start, w.end, w.count, w.value),
+            )
+        ]
+    )
+    data = [{"k": "a", "v": 1}, {"k": "b", "v": 10}, {"k": "a", "v": 2}, {"k": "a", "v": 3}]
+    # When
+    ret = await pl.run_and_return(data)
+    # Then
+    assert ret == [("a", 0, 2, 2, 3), ("b", 0, 2, 1, 10), ("a", 2, 4, 1, 3)]
+
+
+@pytest.mark.asyncio
+async def test_tumbling_event_time():
+    # Given
+    pl = Pipeline([collect(duration=10, timestamp="t")])
+    data = [{"t": t, "v": t} for t in (1, 5, 9, 10, 15, 31)]
+    # When
+    ret = await pl.run_and_return(data)
+    # Then
+    assert ret == [[1, 5, 9], [10, 15], [31]]
+
+
+@pytest.mark.asyncio
+async def test_sliding_event_time():
+    # Given
+    pl = Pipeline([collect(duration=10, slide=5, timestamp="t")])
+    data = [{"t": t, "v": t} for t in (1, 6, 12)]
+    # When
+    ret = await pl.run_and_return(data)
+    # Then: windows [-5, 5), [0, 10), [5, 15), [10, 20)
+    assert ret == [[1], [1, 6], [6, 12], [12]]
+
+
+@pytest.mark.asyncio
+async def test_allowed_lateness():
+    # Given
+    data = [{"t": t, "v": t} for t in (1, 12, 8, 25, 3)]
+    # When
+    strict = await Pipeline([collect(duration=10, timestamp="t")]).run_and_return(data)
+    lenient = await Pipeline([collect(duration=10, timestamp="t", allowed_lateness=5)]).run_and_return(data)
+    # Then: Late items are dropped unless the window waits for them
+    assert strict == [[1], [12], [25]]
+    assert lenient == [[1, 8], [12], [25]]
+
+
+@pytest.mark.asyncio
+async def test_session_event_time():
+    # Given
+    pl = Pipeline([collect(gap=5, timestamp="t", key="k")])
+    data = [{"k": "a", "t": t, "v": t} for t in (0, 3, 7, 20, 22)]
+    # When
+    ret = await pl.run_and_return(data)
+    # Then
+    assert ret == [[0, 3, 7], [20, 22]]
+
+
+@pytest.mark.asyncio
+async def test_max_windows():
+    # Given: At most two open windows
+    pl = Pipeline([collect(size=2, key=lambda x: x, max_windows=2)])
+    # When
+    ret = await pl.run_and_return([1, 2, 3, 1])
+    # Then: The oldest window is closed early
+    assert ret == [[1], [1], [2], [3]]
+
+
+@pytest.mark.asyncio
+async def test_max_windows_limits_counters():
+    # Given: At most one open window
+    pl = Pipeline(
+        [
+            WindowProcessor(
+                init_window=lambda k, x: 0,
+                aggregate=lambda w, k, x: w + 1,
+                size=2,
+                key=lambda x: x,
+                max_windows=1,
+                finalize=lambda w: (w.key, w.start, w.count),
+            )
+        ]
+    )
+    # When: Keys "b" and "c" close windows of "a" and "b" early
+    ret = await pl.run_and_return(["a", "a", "a", "b", "c", "a"])
+    # Then: The counter of "a" is dropped and its items are counted from 0 again
+    assert ret == [("a", 0, 2), ("a", 2, 1), ("b", 0, 1), ("c", 0, 1), ("a", 0, 1)]
+
+
+async def slow_source(data: List[int], delay: float):
+    for x in data:
+        yield x
+        await asyncio.sleep(delay)
+    await asyncio.sleep(delay * 10)
+
+
+@pytest.mark.asyncio
+async def test_arrival_time_window_closed_without_items():
+    # Given: Arrival time windows and a source which stops sending items
+    p = collect(gap=0.05)
+    p.set_source(lambda data: slow_source(data, 0.01))
+    results = []
+    # When
+    start = asyncio.get_running_loop().time()
+    async for ret in p.process([1, 2, 3]):
+        results.append((ret, asyncio.get_running_loop().time() - start))
+    # Then: The session is returned before the source ends
+    assert [r for r, _ in results] == [[1, 2, 3]]
+    assert results[0][1] < 0.03 + 0.05 + 0.05
+
+
+def test_wrong_parameters():
+    with pytest.raises(ValueError):
+        collect(size=2, duration=1)
+    with pytest.raises(ValueError):
+        collect(gap=1, slide=1)
@@ -0,0 +1,43 @@
+import asyncio
+import time
+from typing import override
+
+import pytest
+
+from haintech.pipelines import BaseProcessor, LambdaProcessor, Pipeline
+from haintech.profiling import Profiler
+
+
+class BlockingProcessor(BaseProcessor[int, int]):
+    @override
+    async def process_item(self, data: int) -> int:
+        time.sleep(0.2)
+        return data
+
+
+@pytest.mark.asyncio
+async def test_cpu_and_memory_per_processor():
+    # Given: Pipeline with profiler sampling all items
+    profiler = Profiler(sample_rate=1.0, memory=True, stall_threshold_ms=None)
+    pl = Pipeline([LambdaProcessor[int, list](lambda x: [x] * 10000, name="alloc")], profiler=profiler)
+    # When: Pipeline is run
+    await pl.run_and_return([1, 2])
+    # Then: Statistics are collected per processor
+    assert profiler.sampled == {"alloc": 2}
+    assert "alloc" in profiler.cpu_stats
+    assert profiler.memory_stats["alloc"]
+    assert "=== CPU alloc" in profiler.report()
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stall():
+    # Given: Pipeline with processor blocking event loop
+    profiler = Profiler(sample_rate=0, stall_threshold_ms=50)
+    pl = Pipeline([BlockingProcessor(name="blocking")], profiler=profiler)
+    # When: Pipeline is run
+    await pl.run_and_return([1])
+    await asyncio.sleep(0.1)
+    # Then: Stall is reported with the processor and blocking code
+    assert profiler.stalls
+    assert profiler.stalls[0].scope == "blocking"
+    assert any("time.sleep" in line for line in profiler.stalls[0].stack)